@@ -282,11 +282,60 @@ DEFAULT_FROM_EMAIL = _env_str("DEFAULT_FROM_EMAIL", default="webmaster@localhost
 # context). Example: https://accounts.almalinux.org
 PUBLIC_BASE_URL = _env_str("PUBLIC_BASE_URL", default="http://localhost:8000") or "http://localhost:8000"
 
+# Days a Send Mail recipient batch (CSV upload, credential reminders) is kept before it is pruned.
+SEND_MAIL_BATCH_RETENTION_DAYS = _env_int("SEND_MAIL_BATCH_RETENTION_DAYS", default=7)
+# Recipients shown per page in the Send Mail recipient preview.
+SEND_MAIL_PREVIEW_PAGE_SIZE = _env_int("SEND_MAIL_PREVIEW_PAGE_SIZE", default=25)
+# Compiled email templates (subjects, bodies, previews) kept per process for reuse.
+EMAIL_TEMPLATE_CACHE_SIZE = _env_int("EMAIL_TEMPLATE_CACHE_SIZE", default=256)
+# Recipients rendered and queued per transaction by `run_mail_jobs`.
+SEND_MAIL_JOB_BATCH_SIZE = _env_int("SEND_MAIL_JOB_BATCH_SIZE", default=200)
+# A running mail job whose worker hasn't finished a batch for this long is claimed again.
+SEND_MAIL_JOB_STALE_SECONDS = _env_int("SEND_MAIL_JOB_STALE_SECONDS", default=15 * 60)
+# Claims of a stale mail job before it is marked failed instead of retried.
+SEND_MAIL_JOB_MAX_ATTEMPTS = _env_int("SEND_MAIL_JOB_MAX_ATTEMPTS", default=3)
+# Seconds `run_mail_jobs --loop` sleeps when the queue is empty.
+SEND_MAIL_JOB_POLL_SECONDS = _env_int("SEND_MAIL_JOB_POLL_SECONDS", default=5)
+
 # Elections
 ELECTION_ELIGIBILITY_MIN_MEMBERSHIP_AGE_DAYS = _env_int(
     "ELECTION_ELIGIBILITY_MIN_MEMBERSHIP_AGE_DAYS",
     default=0 if DEBUG else 90,
 )
+# How long a computed electorate is reused before memberships are re-read.
+ELECTION_ELIGIBILITY_SNAPSHOT_MAX_AGE = _env_int("ELECTION_ELIGIBILITY_SNAPSHOT_MAX_AGE", default=5 * 60)
+# Worker processes used to tally large elections (1 = tally in-process).
+ELECTION_TALLY_WORKERS = _env_int("ELECTION_TALLY_WORKERS", default=1)
+# Extrapolate Meek retention factors between iterations (fewer iterations per stage).
+ELECTION_TALLY_ACCELERATE = _env_bool("ELECTION_TALLY_ACCELERATE", default=False)
+# Rows fetched per round trip when streaming ballots into a tally.
+ELECTION_TALLY_BALLOT_CHUNK_SIZE = _env_int("ELECTION_TALLY_BALLOT_CHUNK_SIZE", default=2000)
+# How long recount results and other tally-derived data stay cached.
+ELECTION_TALLY_CACHE_TIMEOUT = _env_int("ELECTION_TALLY_CACHE_TIMEOUT", default=24 * 60 * 60)
+# Elections whose compiled ballots each process keeps for re-tallies and recounts.
+ELECTION_COMPILED_BALLOTS_CACHE_SIZE = _env_int("ELECTION_COMPILED_BALLOTS_CACHE_SIZE", default=2)
+# How long candidates' FreeIPA display names are reused on the vote and election pages.
+ELECTION_CANDIDATE_ROSTER_CACHE_TIMEOUT = _env_int("ELECTION_CANDIDATE_ROSTER_CACHE_TIMEOUT", default=10 * 60)
+# Tallied elections' receipt index shards kept per process after a storage read.
+ELECTION_RECEIPT_INDEX_CACHE_SIZE = _env_int("ELECTION_RECEIPT_INDEX_CACHE_SIZE", default=1024)
+# Closed elections' stored Merkle trees kept per process for inclusion proofs.
+ELECTION_MERKLE_TREE_CACHE_SIZE = _env_int("ELECTION_MERKLE_TREE_CACHE_SIZE", default=8)
+# Cache-Control max-age for receipt lookups answered from a tallied election's index.
+ELECTION_RECEIPT_VERIFY_MAX_AGE = _env_int("ELECTION_RECEIPT_VERIFY_MAX_AGE", default=24 * 60 * 60)
+# A running election job whose worker hasn't reported progress for this long is claimed again.
+ELECTION_JOB_STALE_SECONDS = _env_int("ELECTION_JOB_STALE_SECONDS", default=15 * 60)
+# Seconds between heartbeats a worker writes while a job's handler runs; keep well under the stale timeout.
+ELECTION_JOB_HEARTBEAT_SECONDS = _env_int("ELECTION_JOB_HEARTBEAT_SECONDS", default=60)
+# Claims of a stale job before it is marked failed instead of retried.
+ELECTION_JOB_MAX_ATTEMPTS = _env_int("ELECTION_JOB_MAX_ATTEMPTS", default=3)
+# Seconds `run_election_jobs --loop` sleeps when the queue is empty.
+ELECTION_JOB_POLL_SECONDS = _env_int("ELECTION_JOB_POLL_SECONDS", default=5)
+# Vote receipts rendered per `send_vote_receipts` batch (one FreeIPA lookup per batch).
+ELECTION_VOTE_RECEIPT_BATCH_SIZE = _env_int("ELECTION_VOTE_RECEIPT_BATCH_SIZE", default=100)
+# Failed sends of a vote receipt before it is left for an admin to look at.
+ELECTION_VOTE_RECEIPT_MAX_ATTEMPTS = _env_int("ELECTION_VOTE_RECEIPT_MAX_ATTEMPTS", default=5)
+# Seconds `send_vote_receipts --loop` sleeps when no receipts are waiting.
+ELECTION_VOTE_RECEIPT_POLL_SECONDS = _env_int("ELECTION_VOTE_RECEIPT_POLL_SECONDS", default=2)
 
 # Membership workflow
 MEMBERSHIP_EXPIRING_SOON_DAYS = _env_int("MEMBERSHIP_EXPIRING_SOON_DAYS", default=60)
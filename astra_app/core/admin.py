@@ -6,6 +6,7 @@ from typing import Any, override
 from urllib.parse import urlparse
 
 from django import forms
+from django.conf import settings
 from django.contrib import admin, messages
 from django.contrib.admin import helpers
 from django.contrib.admin.utils import model_ngettext
@@ -18,6 +19,7 @@ from django.http import Http404, HttpRequest, HttpResponse, HttpResponseRedirect
 from django.shortcuts import redirect
 from django.template.response import TemplateResponse
 from django.urls import path, reverse
+from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from import_export.admin import ImportMixin
@@ -25,14 +27,8 @@ from python_freeipa import exceptions
 
 from core.agreements import missing_required_agreements_for_user_in_group
 from core.chatnicknames import normalize_chat_channels_text
-from core.elections_services import (
-    ElectionError,
-    close_election,
-    issue_voting_credentials_from_memberships,
-    issue_voting_credentials_from_memberships_detailed,
-    send_voting_credential_email,
-    tally_election,
-)
+from core.elections_jobs import enqueue_election_job
+from core.elections_services import refresh_election_turnout, verify_election_chain
 from core.membership_csv_import import (
     MembershipCSVConfirmImportForm,
     MembershipCSVImportForm,
@@ -56,12 +52,14 @@ from .models import (
     Ballot,
     Candidate,
     Election,
+    ElectionJob,
     ExclusionGroup,
     ExclusionGroupCandidate,
     FreeIPAPermissionGrant,
     IPAFASAgreement,
     IPAGroup,
     IPAUser,
+    MailJob,
     MembershipCSVImportLink,
     MembershipType,
     Organization,
@@ -1298,107 +1296,70 @@ class ElectionAdmin(admin.ModelAdmin):
         "issue_and_email_credentials_from_memberships_action",
         "close_elections_action",
         "tally_elections_action",
+        "verify_election_chains_action",
     )
 
-    def issue_credentials_from_memberships_action(self, request: HttpRequest, queryset) -> None:
+    def _enqueue_election_jobs(self, request: HttpRequest, queryset, *, kind: str) -> None:
         for election in queryset:
-            try:
-                affected = issue_voting_credentials_from_memberships(election=election)
-            except ElectionError as exc:
-                self.message_user(request, f"{election}: {exc}", level=messages.ERROR)
-                continue
+            job = enqueue_election_job(election=election, kind=kind, requested_by=request.user.get_username())
+            detail_url = reverse("election-detail", args=[election.id])
             self.message_user(
                 request,
-                f"{election}: issued/updated {affected} credential(s) from memberships.",
+                format_html(
+                    '{}: queued job #{} ({}). <a href="{}">Follow its progress</a>.',
+                    election,
+                    job.id,
+                    job.get_kind_display().lower(),
+                    detail_url,
+                ),
                 level=messages.SUCCESS,
             )
 
+    def issue_credentials_from_memberships_action(self, request: HttpRequest, queryset) -> None:
+        self._enqueue_election_jobs(request, queryset, kind=ElectionJob.Kind.issue_credentials)
+
     issue_credentials_from_memberships_action.short_description = "Issue credentials from memberships"  # type: ignore[attr-defined]
 
     def issue_and_email_credentials_from_memberships_action(self, request: HttpRequest, queryset) -> None:
-        for election in queryset:
-            try:
-                credentials = issue_voting_credentials_from_memberships_detailed(election=election)
-            except ElectionError as exc:
-                self.message_user(request, f"{election}: {exc}", level=messages.ERROR)
-                continue
+        self._enqueue_election_jobs(request, queryset, kind=ElectionJob.Kind.email_credentials)
 
-            emailed = 0
-            skipped = 0
-            failures = 0
-            for cred in credentials:
-                username = str(cred.freeipa_username or "").strip()
-                if not username:
-                    skipped += 1
-                    continue
+    issue_and_email_credentials_from_memberships_action.short_description = (
+        "Issue credentials from memberships and email voters"
+    )  # type: ignore[attr-defined]
 
-                try:
-                    user = FreeIPAUser.get(username)
-                except Exception:
-                    failures += 1
-                    continue
+    def close_elections_action(self, request: HttpRequest, queryset) -> None:
+        self._enqueue_election_jobs(request, queryset, kind=ElectionJob.Kind.close)
 
-                if user is None or not user.email:
-                    skipped += 1
-                    continue
+    close_elections_action.short_description = "Close election(s)"  # type: ignore[attr-defined]
 
-                try:
-                    send_voting_credential_email(
-                        request=request,
-                        election=election,
-                        username=username,
-                        email=user.email,
-                        credential_public_id=str(cred.public_id),
-                    )
-                except Exception:
-                    failures += 1
-                    continue
-                emailed += 1
+    def tally_elections_action(self, request: HttpRequest, queryset) -> None:
+        self._enqueue_election_jobs(request, queryset, kind=ElectionJob.Kind.tally)
 
-            if emailed:
+    tally_elections_action.short_description = "Tally election(s)"  # type: ignore[attr-defined]
+
+    def verify_election_chains_action(self, request: HttpRequest, queryset) -> None:
+        workers = max(1, int(settings.ELECTION_TALLY_WORKERS))
+        for election in queryset:
+            report = verify_election_chain(election=election, workers=workers)
+            if report.ok:
                 self.message_user(
                     request,
-                    f"{election}: emailed {emailed} credential(s).",
+                    f"{election}: chain verified ({report.ballot_count} ballot(s), head {report.chain_head[:12]}).",
                     level=messages.SUCCESS,
                 )
-            if skipped:
-                self.message_user(
-                    request,
-                    f"{election}: skipped {skipped} credential(s) (missing username/email).",
-                    level=messages.WARNING,
-                )
-            if failures:
+                continue
+
+            if report.divergence is not None:
+                d = report.divergence
                 self.message_user(
                     request,
-                    f"{election}: failed to email {failures} credential(s).",
+                    f"{election}: chain diverges at ballot #{d.index} ({d.ballot_hash[:12]}): {d.reason}.",
                     level=messages.ERROR,
                 )
+            for problem in report.problems:
+                self.message_user(request, f"{election}: {problem}.", level=messages.ERROR)
 
-    issue_and_email_credentials_from_memberships_action.short_description = (
-        "Issue credentials from memberships and email voters"
-    )  # type: ignore[attr-defined]
-
-    def close_elections_action(self, request: HttpRequest, queryset) -> None:
-        for election in queryset:
-            try:
-                close_election(election=election)
-            except ElectionError as exc:
-                self.message_user(request, f"{election}: {exc}", level=messages.ERROR)
-                continue
-            self.message_user(request, f"{election}: closed.", level=messages.SUCCESS)
-
-    close_elections_action.short_description = "Close election(s)"  # type: ignore[attr-defined]
-
-    def tally_elections_action(self, request: HttpRequest, queryset) -> None:
-        for election in queryset:
-            try:
-                tally_election(election=election)
-            except ElectionError as exc:
-                self.message_user(request, f"{election}: {exc}", level=messages.ERROR)
-                continue
-            self.message_user(request, f"{election}: tallied.", level=messages.SUCCESS)
-
-    tally_elections_action.short_description = "Tally election(s)"  # type: ignore[attr-defined]
+    verify_election_chains_action.short_description = "Verify ballot chain(s)"  # type: ignore[attr-defined]
 
 
 @admin.register(Candidate)
@@ -1431,6 +1392,25 @@ class VotingCredentialAdmin(admin.ModelAdmin):
     search_fields = ("public_id", "freeipa_username")
     ordering = ("-created_at", "id")
 
+    # Hand edits bypass the election services, so recount the turnout counters.
+    @override
+    def save_model(self, request, obj, form, change) -> None:
+        super().save_model(request, obj, form, change)
+        refresh_election_turnout(election=obj.election)
+
+    @override
+    def delete_model(self, request, obj) -> None:
+        election = obj.election
+        super().delete_model(request, obj)
+        refresh_election_turnout(election=election)
+
+    @override
+    def delete_queryset(self, request, queryset) -> None:
+        elections = list(Election.objects.filter(pk__in=queryset.values("election_id")))
+        super().delete_queryset(request, queryset)
+        for election in elections:
+            refresh_election_turnout(election=election)
+
 
 @admin.register(Ballot)
 class BallotAdmin(admin.ModelAdmin):
@@ -1474,6 +1454,87 @@ class AuditLogEntryAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(ElectionJob)
+class ElectionJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "election", "kind", "status", "progress", "total", "attempts", "created_at", "finished_at")
+    list_filter = ("status", "kind")
+    search_fields = ("election__name", "requested_by")
+    ordering = ("-id",)
+    readonly_fields = (
+        "election",
+        "kind",
+        "status",
+        "params",
+        "result",
+        "progress",
+        "total",
+        "error",
+        "requested_by",
+        "attempts",
+        "created_at",
+        "started_at",
+        "heartbeat_at",
+        "finished_at",
+    )
+
+    @override
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    @override
+    def has_change_permission(self, request: HttpRequest, obj: object | None = None) -> bool:
+        return False
+
+
+@admin.register(MailJob)
+class MailJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "public_id",
+        "subject",
+        "status",
+        "progress",
+        "total",
+        "sent_count",
+        "failed_count",
+        "requested_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("subject", "requested_by")
+    ordering = ("-id",)
+    readonly_fields = (
+        "public_id",
+        "batch",
+        "status",
+        "subject",
+        "html_content",
+        "text_content",
+        "cc",
+        "bcc",
+        "extra_context",
+        "progress",
+        "total",
+        "sent_count",
+        "failed_count",
+        "error",
+        "requested_by",
+        "attempts",
+        "created_at",
+        "started_at",
+        "heartbeat_at",
+        "finished_at",
+    )
+
+    @override
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    @override
+    def has_change_permission(self, request: HttpRequest, obj: object | None = None) -> bool:
+        return False
+
+
 @admin.register(MembershipCSVImportLink)
 class MembershipCSVImportLinkAdmin(ImportMixin, admin.ModelAdmin):
     """Admin entry for the membership CSV importer (django-import-export)."""
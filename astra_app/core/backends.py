@@ -3,7 +3,7 @@ from __future__ import annotations
 import hashlib
 import logging
 import threading
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from functools import lru_cache
 
 from django.conf import settings
@@ -665,6 +665,43 @@ class FreeIPAUser:
             raise
         return None
 
+    @classmethod
+    def get_many(cls, usernames: Iterable[str], *, chunk_size: int = 100) -> dict[str, FreeIPAUser]:
+        """
+        Fetch several users, keyed by username. Unknown users are left out.
+
+        Cached users come from one cache round trip; the rest are fetched with
+        FreeIPA's batch command, `chunk_size` user_show calls per request.
+        """
+        wanted = list(dict.fromkeys(u for u in usernames if u))
+        cached = cache.get_many([_user_cache_key(u) for u in wanted])
+        users: dict[str, FreeIPAUser] = {}
+        missing: list[str] = []
+        for username in wanted:
+            data = cached.get(_user_cache_key(username))
+            if data is not None:
+                users[username] = cls(username, data)
+            else:
+                missing.append(username)
+
+        for start in range(0, len(missing), chunk_size):
+            chunk = missing[start : start + chunk_size]
+            methods = [
+                {"method": "user_show", "params": [[username], {"all": True, "no_members": False}]}
+                for username in chunk
+            ]
+            res = _with_freeipa_service_client_retry(cls.get_client, lambda client: client.batch(a_methods=methods))
+            fetched: dict[str, object] = {}
+            for username, item in zip(chunk, (res or {}).get("results") or [], strict=False):
+                # Per-call failures (e.g. NotFound) come back as an "error" entry.
+                if not isinstance(item, dict) or item.get("error") or not isinstance(item.get("result"), dict):
+                    continue
+                fetched[_user_cache_key(username)] = item["result"]
+                users[username] = cls(username, item["result"])
+            if fetched:
+                cache.set_many(fetched)
+        return users
+
     @classmethod
     def find_by_email(cls, email: str) -> FreeIPAUser | None:
         email = (email or "").strip().lower()
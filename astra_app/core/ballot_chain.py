@@ -0,0 +1,288 @@
+"""Verification of an election's ballot hash chain.
+
+Every ballot stores the chain hash of the ballot before it and its own link:
+
+    chain_hash = sha256("{previous_chain_hash}:{ballot_hash}")
+
+starting from the election's genesis hash. Each link only depends on stored
+columns, so the chain is cut into segments at stored chain hashes
+(checkpoints) and the segments are checked in parallel worker processes. The
+first divergence in chain order is reported.
+
+Ballot hashes themselves can't be recomputed: the nonce that went into each
+one is only ever shown to the voter. What can be cross-checked is that every
+ballot hash is well formed, and that the final ballots reproduce the Merkle
+root published in the `election_closed` audit entry.
+
+This module only uses the standard library so it can be copied and run on its
+own against the published artifacts:
+
+    python ballot_chain.py public_ballots.json [public_audit_log.json] [--workers N]
+
+(with ballot_merkle.py next to it).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain
+from multiprocessing import get_context
+
+try:
+    from core.ballot_merkle import merkle_levels, merkle_root
+except ImportError:  # Run as a standalone script next to ballot_merkle.py.
+    from ballot_merkle import merkle_levels, merkle_root  # type: ignore[no-redef]
+
+# Ballots per segment handed to a worker process.
+SEGMENT_SIZE = 50_000
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+# (ballot_hash, previous_chain_hash, chain_hash)
+ChainLink = tuple[str, str, str]
+
+
+def genesis_chain_hash(election_id: int) -> str:
+    data = f"election:{election_id}. alex estuvo aquí, dejándose el alma.".encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def chain_next_hash(previous_chain_hash: str, ballot_hash: str) -> str:
+    return hashlib.sha256(f"{previous_chain_hash}:{ballot_hash}".encode()).hexdigest()
+
+
+def _is_sha256_hex(value: str) -> bool:
+    return len(value) == 64 and _HEX_DIGITS.issuperset(value)
+
+
+@dataclass(frozen=True, slots=True)
+class ChainDivergence:
+    # 0-based position of the ballot in chain order.
+    index: int
+    ballot_hash: str
+    reason: str
+
+
+@dataclass(slots=True)
+class ChainReport:
+    ballot_count: int = 0
+    final_ballot_count: int = 0
+    chain_head: str = ""
+    merkle_root: str = ""
+    divergence: ChainDivergence | None = None
+    # Mismatches against stored checkpoints (chain head row, audit log, artifact header).
+    problems: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.divergence is None and not self.problems
+
+
+def verify_segment(start: int, checkpoint: str, links: Sequence[ChainLink]) -> ChainDivergence | None:
+    """Check one run of ballots against the chain hash stored just before it."""
+
+    expected_previous = checkpoint
+    for offset, (ballot_hash, previous_chain_hash, chain_hash) in enumerate(links):
+        reason = ""
+        if not _is_sha256_hex(ballot_hash):
+            reason = "ballot_hash is not a sha256 hex digest"
+        elif previous_chain_hash != expected_previous:
+            reason = "previous_chain_hash does not match the preceding ballot's chain_hash"
+        elif chain_hash != chain_next_hash(previous_chain_hash, ballot_hash):
+            reason = "chain_hash does not match sha256(previous_chain_hash:ballot_hash)"
+        if reason:
+            return ChainDivergence(index=start + offset, ballot_hash=ballot_hash, reason=reason)
+        expected_previous = chain_hash
+    return None
+
+
+def verify_chain(
+    rows: Iterable[tuple[str, str, str, bool]],
+    *,
+    genesis_hash: str,
+    workers: int = 1,
+    segment_size: int = SEGMENT_SIZE,
+) -> ChainReport:
+    """Verify `(ballot_hash, previous_chain_hash, chain_hash, is_final)` rows in chain order.
+
+    Rows are consumed as a stream; at most a couple of segments per worker are
+    in flight at once. Stops at the first divergence.
+    """
+
+    report = ChainReport(chain_head=genesis_hash)
+    final_hashes: list[str] = []
+
+    def segments() -> Iterator[tuple[int, str, list[ChainLink]]]:
+        start = 0
+        checkpoint = genesis_hash
+        batch: list[ChainLink] = []
+        for ballot_hash, previous_chain_hash, chain_hash, is_final in rows:
+            batch.append((ballot_hash, previous_chain_hash, chain_hash))
+            if is_final:
+                final_hashes.append(ballot_hash)
+            if len(batch) >= segment_size:
+                yield start, checkpoint, batch
+                start += len(batch)
+                checkpoint = batch[-1][2]
+                batch = []
+        if batch:
+            yield start, checkpoint, batch
+
+    pending_segments = segments()
+    head = [s for s in (next(pending_segments, None), next(pending_segments, None)) if s is not None]
+    all_segments = chain(head, pending_segments)
+
+    def finish(segment: tuple[int, str, list[ChainLink]]) -> None:
+        start, _checkpoint, links = segment
+        report.ballot_count = start + len(links)
+        report.chain_head = links[-1][2]
+
+    if workers <= 1 or len(head) < 2:
+        for segment in all_segments:
+            report.divergence = verify_segment(*segment)
+            if report.divergence is not None:
+                return report
+            finish(segment)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            in_flight: deque[tuple[Future[ChainDivergence | None], tuple[int, str, list[ChainLink]]]] = deque()
+
+            def drain_one() -> bool:
+                future, segment = in_flight.popleft()
+                report.divergence = future.result()
+                if report.divergence is not None:
+                    for other, _segment in in_flight:
+                        other.cancel()
+                    return False
+                finish(segment)
+                return True
+
+            for segment in all_segments:
+                in_flight.append((pool.submit(verify_segment, *segment), segment))
+                if len(in_flight) >= 2 * workers and not drain_one():
+                    return report
+            while in_flight:
+                if not drain_one():
+                    return report
+
+    report.final_ballot_count = len(final_hashes)
+    report.merkle_root = merkle_root(merkle_levels(final_hashes))
+    return report
+
+
+def check_closed_entry(report: ChainReport, payload: Mapping[str, object]) -> None:
+    """Compare a verified chain with the `election_closed` audit payload."""
+
+    published_head = str(payload.get("chain_head") or "")
+    if published_head and published_head != report.chain_head:
+        report.problems.append(
+            f"chain head {report.chain_head} does not match the published chain_head {published_head}"
+        )
+
+    published_root = str(payload.get("merkle_root") or "")
+    if published_root and published_root != report.merkle_root:
+        report.problems.append(
+            f"merkle root {report.merkle_root} does not match the published merkle_root {published_root}"
+        )
+
+    published_leaves = payload.get("merkle_leaf_count")
+    if isinstance(published_leaves, int) and published_leaves != report.final_ballot_count:
+        report.problems.append(
+            f"{report.final_ballot_count} final ballot(s) but the published merkle_leaf_count is {published_leaves}"
+        )
+
+
+def verify_public_artifacts(
+    ballots_export: Mapping[str, object],
+    *,
+    audit_export: Mapping[str, object] | None = None,
+    workers: int = 1,
+) -> ChainReport:
+    """Verify a downloaded public ballots export, and optionally the audit export."""
+
+    election_id = ballots_export.get("election_id")
+    genesis_hash = str(ballots_export.get("genesis_hash") or "")
+    ballots = ballots_export.get("ballots")
+    if not isinstance(ballots, list):
+        ballots = []
+
+    rows = (
+        (
+            str(b.get("ballot_hash") or ""),
+            str(b.get("previous_chain_hash") or ""),
+            str(b.get("chain_hash") or ""),
+            not b.get("superseded_by"),
+        )
+        for b in ballots
+        if isinstance(b, dict)
+    )
+    report = verify_chain(rows, genesis_hash=genesis_hash, workers=workers)
+
+    if isinstance(election_id, int) and genesis_hash != genesis_chain_hash(election_id):
+        report.problems.append(f"genesis_hash does not belong to election {election_id}")
+    if report.divergence is None and ballots_export.get("chain_head") != report.chain_head:
+        report.problems.append(
+            f"chain head {report.chain_head} does not match the export's chain_head {ballots_export.get('chain_head')}"
+        )
+
+    if audit_export is not None and report.divergence is None:
+        if audit_export.get("election_id") != election_id:
+            report.problems.append("the audit export belongs to a different election")
+        entries = audit_export.get("audit_log")
+        closed = [
+            e.get("payload")
+            for e in (entries if isinstance(entries, list) else [])
+            if isinstance(e, dict) and e.get("event_type") == "election_closed"
+        ]
+        if not closed or not isinstance(closed[-1], dict):
+            report.problems.append("the audit export has no election_closed entry")
+        else:
+            check_closed_entry(report, closed[-1])
+
+    return report
+
+
+def describe(report: ChainReport) -> list[str]:
+    lines = [
+        f"ballots: {report.ballot_count} ({report.final_ballot_count} final)",
+        f"chain head: {report.chain_head}",
+    ]
+    if report.divergence is None:
+        lines.append(f"merkle root: {report.merkle_root}")
+    else:
+        d = report.divergence
+        lines.append(f"FIRST DIVERGENCE at ballot #{d.index} ({d.ballot_hash}): {d.reason}")
+    lines.extend(f"MISMATCH: {problem}" for problem in report.problems)
+    lines.append("OK: chain verified" if report.ok else "FAILED: chain did not verify")
+    return lines
+
+
+def main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(prog=argv[0], description="Verify a published election ballot chain.")
+    parser.add_argument("ballots", help="public_ballots.json")
+    parser.add_argument("audit", nargs="?", help="public_audit_log.json (optional)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+    args = parser.parse_args(argv[1:])
+
+    with open(args.ballots, encoding="utf-8") as fh:
+        ballots_export = json.load(fh)
+    audit_export = None
+    if args.audit:
+        with open(args.audit, encoding="utf-8") as fh:
+            audit_export = json.load(fh)
+
+    report = verify_public_artifacts(ballots_export, audit_export=audit_export, workers=max(1, args.workers))
+    for line in describe(report):
+        print(line)
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,111 @@
+"""Merkle tree over an election's final ballot hashes.
+
+The tree root is published in the `election_closed` audit entry, and the
+ballot verification page hands out inclusion proofs against it, so a voter
+can check one receipt without downloading the whole public ballots ledger.
+
+This module only uses the standard library so it can be copied and run on its
+own to check a proof:
+
+    python ballot_merkle.py proof.json [ROOT]
+
+where proof.json is the proof object served by the verification page and ROOT
+is the merkle_root copied from the public audit log (defaults to the root in
+the proof itself).
+
+Hashing (hex strings in, hex strings out):
+
+    leaf = sha256(0x00 || ballot_hash)
+    node = sha256(0x01 || left || right)
+
+Leaves are the final ballots in chain order. A node without a sibling is
+carried up to the next level unchanged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from collections.abc import Sequence
+
+EMPTY_ROOT = hashlib.sha256(b"").hexdigest()
+
+
+def leaf_hash(ballot_hash: str) -> str:
+    return hashlib.sha256(b"\x00" + ballot_hash.encode("ascii")).hexdigest()
+
+
+def node_hash(left: str, right: str) -> str:
+    return hashlib.sha256(b"\x01" + left.encode("ascii") + right.encode("ascii")).hexdigest()
+
+
+def merkle_levels(ballot_hashes: Sequence[str]) -> list[list[str]]:
+    """Return every level of the tree, from the leaf hashes up to `[root]`."""
+
+    levels = [[leaf_hash(h) for h in ballot_hashes]]
+    while len(levels[-1]) > 1:
+        below = levels[-1]
+        above = [node_hash(below[i], below[i + 1]) for i in range(0, len(below) - 1, 2)]
+        if len(below) % 2:
+            above.append(below[-1])
+        levels.append(above)
+    return levels
+
+
+def merkle_root(levels: Sequence[Sequence[str]]) -> str:
+    return levels[-1][0] if levels and levels[-1] else EMPTY_ROOT
+
+
+def inclusion_proof(levels: Sequence[Sequence[str]], index: int) -> list[dict[str, str]]:
+    """Return the sibling path for leaf `index`, bottom-up.
+
+    Each step says which side the sibling sits on, so verifiers don't need the
+    leaf index or tree size.
+    """
+
+    path: list[dict[str, str]] = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append({"side": "left" if sibling < index else "right", "hash": level[sibling]})
+        index //= 2
+    return path
+
+
+def verify_inclusion_proof(*, ballot_hash: str, path: Sequence[dict[str, str]], root: str) -> bool:
+    current = leaf_hash(ballot_hash)
+    for step in path:
+        sibling = str(step.get("hash") or "")
+        match step.get("side"):
+            case "left":
+                current = node_hash(sibling, current)
+            case "right":
+                current = node_hash(current, sibling)
+            case _:
+                return False
+    return current == root
+
+
+def main(argv: Sequence[str]) -> int:
+    if len(argv) not in {2, 3}:
+        print(f"usage: {argv[0]} PROOF.json [ROOT]  (use - to read the proof from stdin)", file=sys.stderr)
+        return 2
+
+    if argv[1] == "-":
+        proof = json.load(sys.stdin)
+    else:
+        with open(argv[1], encoding="utf-8") as fh:
+            proof = json.load(fh)
+
+    ok = verify_inclusion_proof(
+        ballot_hash=str(proof.get("ballot_hash") or ""),
+        path=list(proof.get("path") or []),
+        root=argv[2].strip().lower() if len(argv) == 3 else str(proof.get("root") or ""),
+    )
+    print("OK: ballot is included under the published root" if ok else "FAILED: proof does not match the root")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,118 @@
+"""Aggregate statistics over an election's counted ballots.
+
+First-preference counts, the ranking-length histogram and the pairwise
+preference matrix are computed without loading ballots into Python: the
+database groups identical rankings (on the packed `Ballot.ranking` column) and
+the statistics are built in one pass over the distinct rankings. A tally
+stores them on the election next to its result; until then they are cached by
+ballot-chain head.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable, Iterator, Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+
+from core.models import Ballot, Election
+
+
+def election_ranking_patterns(*, election: Election) -> Iterator[tuple[list[int], int, int]]:
+    """Distinct final rankings as (ranking, ballot count, total weight), most weight first.
+
+    Identical rankings are grouped by the database on the packed column, so
+    Python only sees one row per pattern.
+    """
+
+    rows = (
+        Ballot.objects.filter(election=election, superseded_by__isnull=True)
+        .values("ranking")
+        .annotate(ballots=Count("id"), weight=Sum("weight"))
+        .order_by("-weight", "-ballots", "ranking")
+        .values_list("ranking", "ballots", "weight")
+        .iterator(chunk_size=max(1, int(settings.ELECTION_TALLY_BALLOT_CHUNK_SIZE)))
+    )
+    for ranking, ballots, weight in rows:
+        yield ranking, int(ballots), int(weight or 0)
+
+
+def summarize_ranking_patterns(
+    patterns: Iterable[tuple[Sequence[int], int, int]],
+    *,
+    candidate_ids: Sequence[int],
+) -> dict[str, object]:
+    """Build the ballot statistics from (ranking, ballot count, weight) rows.
+
+    - first_preferences: ballots and weight whose top choice is each candidate.
+    - ranking_lengths: ballots and weight by number of candidates ranked.
+    - pairwise: pairwise[a][b] is the weight preferring a to b. A ranked
+      candidate is preferred to every unranked one; unranked candidates tie.
+
+    Keys are strings so the result survives a JSON round trip unchanged.
+    """
+
+    position = {cid: idx for idx, cid in enumerate(candidate_ids)}
+    n = len(candidate_ids)
+    first_ballots = [0] * n
+    first_weight = [0] * n
+    pairwise = [[0] * n for _ in range(n)]
+    lengths: dict[int, list[int]] = {}
+    total_ballots = 0
+    total_weight = 0
+    distinct = 0
+
+    for ranking, ballots, weight in patterns:
+        distinct += 1
+        total_ballots += ballots
+        total_weight += weight
+        ranked = [position[cid] for cid in ranking if cid in position]
+
+        counts = lengths.setdefault(len(ranked), [0, 0])
+        counts[0] += ballots
+        counts[1] += weight
+        if not ranked:
+            continue
+
+        first_ballots[ranked[0]] += ballots
+        first_weight[ranked[0]] += weight
+
+        unranked = set(range(n)).difference(ranked)
+        for i, a in enumerate(ranked):
+            row = pairwise[a]
+            for b in ranked[i + 1 :]:
+                row[b] += weight
+            for b in unranked:
+                row[b] += weight
+
+    return {
+        "ballots": total_ballots,
+        "weight": total_weight,
+        "distinct_rankings": distinct,
+        "first_preferences": {
+            str(cid): {"ballots": first_ballots[idx], "weight": first_weight[idx]}
+            for cid, idx in position.items()
+        },
+        "ranking_lengths": {
+            str(length): {"ballots": counts[0], "weight": counts[1]} for length, counts in sorted(lengths.items())
+        },
+        "pairwise": {
+            str(a): {str(b): pairwise[ia][ib] for b, ib in position.items() if b != a} for a, ia in position.items()
+        },
+    }
+
+
+def election_ballot_analytics(*, election: Election, chain_head: str, candidate_ids: Sequence[int]) -> dict[str, object]:
+    """Ballot statistics for a closed election awaiting its tally, cached per ballot-chain head."""
+
+    candidates_digest = hashlib.sha256(",".join(str(cid) for cid in candidate_ids).encode("ascii")).hexdigest()
+    cache_key = f"election-ballot-analytics:{election.id}:{chain_head}:{candidates_digest}"
+    analytics = cache.get(cache_key)
+    if isinstance(analytics, dict):
+        return analytics
+
+    analytics = summarize_ranking_patterns(election_ranking_patterns(election=election), candidate_ids=candidate_ids)
+    cache.set(cache_key, analytics, timeout=settings.ELECTION_TALLY_CACHE_TIMEOUT)
+    return analytics
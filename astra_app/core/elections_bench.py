@@ -0,0 +1,277 @@
+"""Seeded synthetic elections and tally benchmarks for `election_bench`.
+
+The same parameters and seed always produce the same candidates, ballots and
+exclusion groups, so a benchmark report can be compared with one recorded
+before an engine change.
+"""
+
+from __future__ import annotations
+
+import random
+import statistics
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+
+from core.elections_meek import compile_ballots, tally_meek
+
+RANKING_DISTRIBUTIONS = ("full", "partial", "short", "geometric")
+WEIGHT_DISTRIBUTIONS = ("one", "membership", "skewed")
+SCENARIOS = ("random", "near-tie", "tie-heavy")
+
+# Weights seen with individual and sponsor memberships.
+_MEMBERSHIP_WEIGHTS = (1, 2, 5, 6, 7, 15, 16, 17, 50, 51, 52)
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticElectionSpec:
+    seed: int = 1
+    candidates: int = 10
+    seats: int = 3
+    ballots: int = 1000
+    ranking: str = "partial"
+    weights: str = "membership"
+    exclusion_groups: int = 0
+    scenario: str = "random"
+
+
+@dataclass(slots=True)
+class SyntheticElection:
+    spec: SyntheticElectionSpec
+    candidates: list[dict[str, object]]
+    ballots: list[dict[str, object]]
+    exclusion_groups: list[dict[str, object]] = field(default_factory=list)
+
+
+def _ranking_length(rng: random.Random, *, distribution: str, candidate_count: int) -> int:
+    match distribution:
+        case "full":
+            return candidate_count
+        case "partial":
+            return rng.randint(1, candidate_count)
+        case "short":
+            return rng.randint(1, min(3, candidate_count))
+        case "geometric":
+            # Each further preference is given with probability 0.7.
+            length = 1
+            while length < candidate_count and rng.random() < 0.7:
+                length += 1
+            return length
+    raise ValueError(f"Unknown ranking distribution: {distribution}")
+
+
+def _weight(rng: random.Random, *, distribution: str) -> int:
+    match distribution:
+        case "one":
+            return 1
+        case "membership":
+            return rng.choice(_MEMBERSHIP_WEIGHTS)
+        case "skewed":
+            # Mostly 1, with a long tail of heavy sponsor votes.
+            return min(1000, int(rng.paretovariate(1.2)))
+    raise ValueError(f"Unknown weight distribution: {distribution}")
+
+
+def _popularity_ranking(rng: random.Random, *, popularity: dict[int, float], length: int) -> list[int]:
+    # Weighted sampling without replacement (Efraimidis-Spirakis keys).
+    keyed = sorted(popularity, key=lambda cid: rng.random() ** (1.0 / popularity[cid]), reverse=True)
+    return keyed[:length]
+
+
+def generate_synthetic_election(spec: SyntheticElectionSpec) -> SyntheticElection:
+    """Build the candidates, ballots and exclusion groups described by `spec`.
+
+    Scenarios:
+    - random: candidates have uneven, randomly drawn popularity.
+    - near-tie: every candidate is equally popular, so margins are small.
+    - tie-heavy: ballots come in rotations of one ranking, so candidates tie
+      exactly on first preferences and tie-breaks decide most stages.
+    """
+
+    if spec.candidates < 1:
+        raise ValueError("candidates must be positive")
+    if spec.ranking not in RANKING_DISTRIBUTIONS:
+        raise ValueError(f"Unknown ranking distribution: {spec.ranking}")
+    if spec.weights not in WEIGHT_DISTRIBUTIONS:
+        raise ValueError(f"Unknown weight distribution: {spec.weights}")
+    if spec.scenario not in SCENARIOS:
+        raise ValueError(f"Unknown scenario: {spec.scenario}")
+
+    rng = random.Random(spec.seed)
+    candidate_ids = list(range(1, spec.candidates + 1))
+    candidates: list[dict[str, object]] = [
+        {"id": cid, "name": f"C{cid}", "tiebreak_uuid": uuid.UUID(int=rng.getrandbits(128))} for cid in candidate_ids
+    ]
+
+    ballots: list[dict[str, object]] = []
+    if spec.scenario == "tie-heavy":
+        while len(ballots) < spec.ballots:
+            base = candidate_ids[:]
+            rng.shuffle(base)
+            length = _ranking_length(rng, distribution=spec.ranking, candidate_count=spec.candidates)
+            weight = _weight(rng, distribution=spec.weights)
+            for shift in range(spec.candidates):
+                if len(ballots) >= spec.ballots:
+                    break
+                rotated = base[shift:] + base[:shift]
+                ballots.append({"weight": weight, "ranking": rotated[:length]})
+    else:
+        if spec.scenario == "near-tie":
+            popularity = dict.fromkeys(candidate_ids, 1.0)
+        else:
+            popularity = {cid: rng.paretovariate(1.5) for cid in candidate_ids}
+        for _ in range(spec.ballots):
+            length = _ranking_length(rng, distribution=spec.ranking, candidate_count=spec.candidates)
+            ballots.append(
+                {
+                    "weight": _weight(rng, distribution=spec.weights),
+                    "ranking": _popularity_ranking(rng, popularity=popularity, length=length),
+                }
+            )
+
+    exclusion_groups: list[dict[str, object]] = []
+    pool = candidate_ids[:]
+    rng.shuffle(pool)
+    for index in range(spec.exclusion_groups):
+        members = pool[index * 2 : index * 2 + 2]
+        if len(members) < 2:
+            break
+        exclusion_groups.append(
+            {"public_id": f"group-{index + 1}", "name": f"Group {index + 1}", "max_elected": 1, "candidate_ids": members}
+        )
+
+    return SyntheticElection(spec=spec, candidates=candidates, ballots=ballots, exclusion_groups=exclusion_groups)
+
+
+def _engines(*, workers: int) -> dict[str, Callable[[SyntheticElection], dict[str, object]]]:
+    def _dicts(election: SyntheticElection) -> dict[str, object]:
+        return tally_meek(
+            ballots=election.ballots,
+            candidates=election.candidates,
+            seats=election.spec.seats,
+            exclusion_groups=election.exclusion_groups,
+        )
+
+    def _compiled(election: SyntheticElection, **kwargs: object) -> dict[str, object]:
+        compiled = compile_ballots((b["weight"], b["ranking"]) for b in election.ballots)
+        return tally_meek(
+            ballots=compiled,
+            candidates=election.candidates,
+            seats=election.spec.seats,
+            exclusion_groups=election.exclusion_groups,
+            **kwargs,
+        )
+
+    engines: dict[str, Callable[[SyntheticElection], dict[str, object]]] = {
+        "dicts": _dicts,
+        "compiled": _compiled,
+        "accelerated": lambda election: _compiled(election, accelerate=True),
+    }
+    if workers > 1:
+        engines["parallel"] = lambda election: _compiled(election, workers=workers)
+    return engines
+
+
+def available_engines(*, workers: int) -> list[str]:
+    return list(_engines(workers=workers))
+
+
+def _outcome(result: dict[str, object]) -> dict[str, object]:
+    return {
+        "quota": str(result["quota"]),
+        "elected": list(result["elected"]),
+        "eliminated": list(result["eliminated"]),
+        "forced_excluded": list(result["forced_excluded"]),
+    }
+
+
+def run_tally_benchmark(
+    election: SyntheticElection,
+    *,
+    engines: list[str] | None = None,
+    repeat: int = 3,
+    workers: int = 1,
+) -> dict[str, object]:
+    """Tally `election` with each engine and report timings, iterations and memory.
+
+    The first engine is the reference; every other engine's outcome (quota,
+    elected, eliminated, force-excluded) is compared with it. Peak memory is
+    Python allocations in this process, so it leaves out pool workers.
+    """
+
+    available = _engines(workers=workers)
+    names = engines or list(available)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown or unavailable engine(s): {', '.join(unknown)}")
+
+    reference: dict[str, object] | None = None
+    report: dict[str, dict[str, object]] = {}
+    for name in names:
+        run = available[name]
+        timings: list[float] = []
+        result: dict[str, object] = {}
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            result = run(election)
+            timings.append(time.perf_counter() - start)
+
+        # Separate run: tracing slows allocation-heavy code enough to skew the timings.
+        tracemalloc.start()
+        try:
+            run(election)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        outcome = _outcome(result)
+        if reference is None:
+            reference = outcome
+        stage_iterations = [int(n) for n in result.get("stage_iterations") or []]
+        report[name] = {
+            "wall_seconds_min": min(timings),
+            "wall_seconds_median": statistics.median(timings),
+            "rounds": len(result.get("rounds") or []),
+            "stages": len(stage_iterations),
+            "iterations": sum(stage_iterations),
+            "peak_memory_bytes": peak,
+            "outcome": outcome,
+            "matches_reference": outcome == reference,
+        }
+
+    total_weight = sum(int(b["weight"]) for b in election.ballots)
+    return {
+        "spec": asdict(election.spec),
+        "total_weight": total_weight,
+        "exclusion_groups": len(election.exclusion_groups),
+        "repeat": max(repeat, 1),
+        "workers": workers,
+        "reference_engine": names[0],
+        "engines": report,
+        "equivalent": all(entry["matches_reference"] for entry in report.values()),
+    }
+
+
+def compare_with_baseline(report: dict[str, object], baseline: dict[str, object]) -> dict[str, object]:
+    """Per-engine speedups and outcome changes against a stored report."""
+
+    comparison: dict[str, object] = {"same_spec": report.get("spec") == baseline.get("spec"), "engines": {}}
+    baseline_engines = baseline.get("engines") or {}
+    for name, entry in (report.get("engines") or {}).items():
+        previous = baseline_engines.get(name)
+        if not isinstance(previous, dict):
+            continue
+        before = Decimal(str(previous["wall_seconds_min"]))
+        after = Decimal(str(entry["wall_seconds_min"]))
+        comparison["engines"][name] = {
+            "baseline_wall_seconds_min": float(before),
+            "wall_seconds_min": float(after),
+            "speedup": float(before / after) if after else None,
+            "iterations_delta": int(entry["iterations"]) - int(previous["iterations"]),
+            "peak_memory_delta_bytes": int(entry["peak_memory_bytes"]) - int(previous["peak_memory_bytes"]),
+            "same_outcome": entry["outcome"] == previous.get("outcome"),
+        }
+    return comparison
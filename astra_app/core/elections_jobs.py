@@ -0,0 +1,327 @@
+"""Database-backed queue for long-running election operations.
+
+Closing, tallying and issuing or emailing credentials can take longer than a
+web request is allowed to run for large elections. Views and admin actions
+enqueue an `ElectionJob` instead, and the `run_election_jobs` worker (or
+`advance_elections`, which the host runs every minute) runs it. Progress is
+written to the job row as the handler goes and polled by the election page.
+
+Handlers are idempotent: a job re-run after its worker died skips work that
+is already done, using the election's state and the resume state saved in
+`job.result`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime
+import logging
+import threading
+from collections.abc import Callable, Iterator
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.backends import FreeIPAUser
+from core.elections_services import (
+    ElectionError,
+    close_election,
+    create_voting_credential_mail_batch,
+    eligible_voters_from_memberships,
+    freeipa_timezone_name,
+    issue_voting_credentials,
+    issue_voting_credentials_from_memberships_detailed,
+    send_voting_credential_email,
+    tally_election,
+)
+from core.models import Election, ElectionJob, VotingCredential
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_election_job(
+    *,
+    election: Election,
+    kind: str,
+    params: dict[str, object] | None = None,
+    requested_by: str = "",
+) -> ElectionJob:
+    """Queue a job, or return the election's queued or running job of the same kind."""
+
+    existing = ElectionJob.objects.filter(
+        election=election,
+        kind=kind,
+        status__in=[ElectionJob.Status.queued, ElectionJob.Status.running],
+    ).first()
+    if existing is not None:
+        return existing
+
+    try:
+        with transaction.atomic():
+            return ElectionJob.objects.create(
+                election=election,
+                kind=kind,
+                params=params or {},
+                requested_by=requested_by,
+            )
+    except IntegrityError:
+        # Another request queued the same job in between.
+        return ElectionJob.objects.get(
+            election=election,
+            kind=kind,
+            status__in=[ElectionJob.Status.queued, ElectionJob.Status.running],
+        )
+
+
+def claim_next_election_job() -> ElectionJob | None:
+    """Claim the oldest runnable job; concurrent workers skip rows another worker holds."""
+
+    while True:
+        now = timezone.now()
+        stale_before = now - datetime.timedelta(seconds=settings.ELECTION_JOB_STALE_SECONDS)
+        with transaction.atomic():
+            job = (
+                ElectionJob.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=ElectionJob.Status.queued)
+                    | Q(status=ElectionJob.Status.running, heartbeat_at__lt=stale_before)
+                )
+                .order_by("id")
+                .first()
+            )
+            if job is None:
+                return None
+
+            if job.status == ElectionJob.Status.running and job.attempts >= settings.ELECTION_JOB_MAX_ATTEMPTS:
+                job.status = ElectionJob.Status.failed
+                job.error = "The worker running this job stopped responding."
+                job.finished_at = now
+                job.save(update_fields=["status", "error", "finished_at"])
+                continue
+
+            job.status = ElectionJob.Status.running
+            job.attempts += 1
+            job.started_at = job.started_at or now
+            job.heartbeat_at = now
+            job.save(update_fields=["status", "attempts", "started_at", "heartbeat_at"])
+            return job
+
+
+def _report_progress(job: ElectionJob, *, progress: int, total: int | None = None) -> None:
+    job.progress = progress
+    if total is not None:
+        job.total = total
+    job.heartbeat_at = timezone.now()
+    ElectionJob.objects.filter(pk=job.pk).update(
+        progress=job.progress,
+        total=job.total,
+        result=job.result,
+        heartbeat_at=job.heartbeat_at,
+    )
+
+
+def _touch_heartbeat(job: ElectionJob) -> None:
+    ElectionJob.objects.filter(pk=job.pk, status=ElectionJob.Status.running).update(heartbeat_at=timezone.now())
+
+
+@contextlib.contextmanager
+def _heartbeat(job: ElectionJob) -> Iterator[None]:
+    """Keep the job's heartbeat fresh from a side thread while its handler runs.
+
+    A close or tally is one long call that reports no progress; without this a
+    job outliving ELECTION_JOB_STALE_SECONDS would be claimed by another worker.
+    """
+
+    stop = threading.Event()
+    interval = max(0.01, float(settings.ELECTION_JOB_HEARTBEAT_SECONDS))
+
+    def _beat() -> None:
+        try:
+            while not stop.wait(interval):
+                _touch_heartbeat(job)
+        except Exception:
+            logger.exception("Election job heartbeat failed: job_id=%s", job.id)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=_beat, name=f"election-job-{job.id}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _run_close(job: ElectionJob) -> None:
+    election = job.election
+    if election.status == Election.Status.open:
+        try:
+            close_election(election=election)
+        except ElectionError:
+            # Another run closed it first; close_election re-read the status under its lock.
+            if election.status not in {Election.Status.closed, Election.Status.tallied}:
+                raise
+    elif election.status not in {Election.Status.closed, Election.Status.tallied}:
+        raise ElectionError("election must be open to close")
+
+    if job.params.get("tally"):
+        tally_job = enqueue_election_job(
+            election=election,
+            kind=ElectionJob.Kind.tally,
+            requested_by=job.requested_by,
+        )
+        job.result["tally_job_id"] = tally_job.id
+
+
+def _run_tally(job: ElectionJob) -> None:
+    election = job.election
+    if election.status == Election.Status.tallied:
+        return
+    try:
+        tally_election(election=election)
+    except ElectionError:
+        # Another run tallied it first; tally_election re-read the status under its lock.
+        if election.status != Election.Status.tallied:
+            raise
+
+
+def _run_issue_credentials(job: ElectionJob) -> None:
+    report = issue_voting_credentials(
+        election=job.election,
+        voters=eligible_voters_from_memberships(election=job.election, refresh=True),
+    )
+    job.result.update({"added": report.added, "changed": report.changed, "unchanged": report.unchanged})
+
+
+def _run_email_credentials(job: ElectionJob) -> None:
+    election = job.election
+    result = job.result
+    if not result.get("issued"):
+        issue_voting_credentials_from_memberships_detailed(election=election)
+        result.update({"issued": True, "last_credential_id": 0, "emailed": 0, "skipped": 0, "failed": 0})
+
+    credentials = VotingCredential.objects.filter(election=election, weight__gt=0, freeipa_username__isnull=False)
+    total = credentials.count()
+    done = credentials.filter(id__lte=int(result["last_credential_id"])).count()
+    _report_progress(job, progress=done, total=total)
+
+    # Resume after the last credential handled by a previous attempt.
+    pending = credentials.filter(id__gt=int(result["last_credential_id"])).order_by("id")
+    for credential in pending.only("id", "freeipa_username", "public_id").iterator():
+        username = str(credential.freeipa_username or "").strip()
+        try:
+            user = FreeIPAUser.get(username) if username else None
+            if user is None or not user.email:
+                result["skipped"] += 1
+            else:
+                send_voting_credential_email(
+                    request=None,
+                    election=election,
+                    username=username,
+                    email=user.email,
+                    credential_public_id=str(credential.public_id),
+                    tz_name=freeipa_timezone_name(user),
+                )
+                result["emailed"] += 1
+        except Exception:
+            logger.exception("Failed to email voting credential: election_id=%s username=%s", election.id, username)
+            result["failed"] += 1
+
+        result["last_credential_id"] = credential.id
+        done += 1
+        _report_progress(job, progress=done)
+
+
+def _run_credential_mail(job: ElectionJob) -> None:
+    election = job.election
+    if election.status != Election.Status.open:
+        raise ElectionError("Only open elections can send credential reminders.")
+
+    credentials = VotingCredential.objects.filter(election=election).exclude(freeipa_username__isnull=True)
+    if not credentials.exists():
+        issue_voting_credentials_from_memberships_detailed(election=election)
+
+    credentials = credentials.order_by("id").only("freeipa_username", "public_id")
+    _report_progress(job, progress=0, total=credentials.count())
+    batch = create_voting_credential_mail_batch(
+        request=None,
+        election=election,
+        credentials=credentials.iterator(),
+        created_by=job.requested_by,
+        on_progress=lambda handled: _report_progress(job, progress=handled),
+    )
+    # Send Mail loads the recipients by batch ID; the job only keeps the reference.
+    job.result["mail_batch"] = str(batch.public_id)
+    job.result["recipient_count"] = batch.recipient_count
+
+
+_HANDLERS: dict[str, Callable[[ElectionJob], None]] = {
+    ElectionJob.Kind.close: _run_close,
+    ElectionJob.Kind.tally: _run_tally,
+    ElectionJob.Kind.issue_credentials: _run_issue_credentials,
+    ElectionJob.Kind.email_credentials: _run_email_credentials,
+    ElectionJob.Kind.credential_mail: _run_credential_mail,
+}
+
+
+def run_election_job(job: ElectionJob) -> bool:
+    """Run a claimed job to completion and record the outcome. Returns True on success."""
+
+    job.election.refresh_from_db()
+    try:
+        with _heartbeat(job):
+            _HANDLERS[job.kind](job)
+    except ElectionError as exc:
+        job.status = ElectionJob.Status.failed
+        job.error = str(exc)
+    except Exception as exc:
+        logger.exception("Election job failed: job_id=%s kind=%s election_id=%s", job.id, job.kind, job.election_id)
+        job.status = ElectionJob.Status.failed
+        job.error = f"Unexpected error: {exc}"
+    else:
+        job.status = ElectionJob.Status.succeeded
+        job.error = ""
+        job.total = max(job.total, 1)
+        job.progress = job.total
+
+    job.finished_at = timezone.now()
+    job.heartbeat_at = job.finished_at
+    job.save(update_fields=["status", "error", "result", "progress", "total", "heartbeat_at", "finished_at"])
+    return job.status == ElectionJob.Status.succeeded
+
+
+def run_pending_election_jobs(*, max_jobs: int | None = None) -> tuple[int, int]:
+    """Claim and run jobs until the queue is empty. Returns (succeeded, failed)."""
+
+    succeeded = 0
+    failed = 0
+    while max_jobs is None or succeeded + failed < max_jobs:
+        job = claim_next_election_job()
+        if job is None:
+            break
+        if run_election_job(job):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+
+def election_job_status(job: ElectionJob) -> dict[str, object]:
+    """JSON-safe snapshot of a job for the progress endpoint."""
+
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "kind_label": job.get_kind_display(),
+        "status": job.status,
+        "progress": job.progress,
+        "total": job.total,
+        "percent": min(100, int(job.progress * 100 / job.total)) if job.total else 0,
+        "error": job.error,
+        "active": job.is_active,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
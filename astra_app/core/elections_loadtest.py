@@ -0,0 +1,393 @@
+"""Load generation against a running server's voting endpoints.
+
+`election_load_test` provisions an open election with one credential per
+voter, then drives concurrent vote submissions, re-submissions (the supersede
+path) and `ballot_verify` lookups over HTTP, exactly as browsers would. It
+runs with the server's settings so it can write the election, credentials and
+sessions into the same database, and re-verify the hash chain afterwards.
+
+The election is named "[Load test] ..." and is soft-deleted (hidden from every
+page) once the run ends; the voters' sessions are deleted too.
+
+Voters must exist in FreeIPA (e.g. the local IPA stand-in): the server restores
+each request's user from FreeIPA, so a made-up username is rejected as
+unauthenticated.
+"""
+
+from __future__ import annotations
+
+import datetime
+import http.cookies
+import json
+import math
+import random
+import secrets
+import ssl
+import string
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from importlib import import_module
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connection, connections
+from django.urls import reverse
+from django.utils import timezone
+
+from core.ballot_chain import describe
+from core.elections_services import EligibleVoter, issue_voting_credentials, verify_election_chain
+from core.models import Candidate, Election, VotingCredential
+
+LOAD_TEST_NOMINATOR = "election-load-test"
+LOAD_TEST_NAME_PREFIX = "[Load test]"
+
+_CSRF_ALPHABET = string.ascii_letters + string.digits
+
+
+@dataclass(slots=True)
+class LoadTestVoter:
+    username: str
+    credential_public_id: str
+    session_key: str = ""
+
+
+@dataclass(slots=True)
+class _Sample:
+    operation: str
+    seconds: float
+    status: int
+    error: str = ""
+
+
+@dataclass(slots=True)
+class _Collector:
+    samples: list[_Sample] = field(default_factory=list)
+    # (previous_chain_hash, chain_hash) of every accepted ballot.
+    links: list[tuple[str, str]] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, sample: _Sample, *, link: tuple[str, str] | None = None) -> None:
+        with self.lock:
+            self.samples.append(sample)
+            if link is not None:
+                self.links.append(link)
+
+
+def provision_load_test_election(
+    *,
+    usernames: list[str],
+    candidates: int,
+    seats: int,
+    name: str = "",
+) -> tuple[Election, list[LoadTestVoter], list[int]]:
+    """Create an open election with `candidates` candidates and a credential per voter."""
+
+    now = timezone.now()
+    election = Election.objects.create(
+        name=f"{LOAD_TEST_NAME_PREFIX} {name or now.strftime('%Y-%m-%d %H:%M:%S')}",
+        description="Synthetic election created by the election_load_test command.",
+        start_datetime=now,
+        end_datetime=now + datetime.timedelta(days=1),
+        number_of_seats=seats,
+        quorum=0,
+        status=Election.Status.open,
+    )
+    Candidate.objects.bulk_create(
+        Candidate(election=election, freeipa_username=f"loadtest-candidate-{index}", nominated_by=LOAD_TEST_NOMINATOR)
+        for index in range(1, candidates + 1)
+    )
+    issue_voting_credentials(election=election, voters=[EligibleVoter(username=u, weight=1) for u in usernames])
+
+    public_ids = dict(
+        VotingCredential.objects.filter(election=election).values_list("freeipa_username", "public_id")
+    )
+    voters = [LoadTestVoter(username=u, credential_public_id=str(public_ids[u])) for u in usernames if u in public_ids]
+    candidate_ids = list(Candidate.objects.filter(election=election).order_by("id").values_list("id", flat=True))
+    return election, voters, candidate_ids
+
+
+def create_voter_sessions(voters: list[LoadTestVoter]) -> None:
+    """Store a logged-in session per voter, as a FreeIPA login would.
+
+    Skips the login form (and its FreeIPA password check) so the load lands on
+    the voting views only.
+    """
+
+    store_class = import_module(settings.SESSION_ENGINE).SessionStore
+    for voter in voters:
+        session = store_class()
+        session["_freeipa_username"] = voter.username
+        session.create()
+        voter.session_key = str(session.session_key)
+
+
+def delete_voter_sessions(voters: list[LoadTestVoter]) -> None:
+    """Delete the sessions `create_voter_sessions` or `login_voters` stored."""
+
+    store_class = import_module(settings.SESSION_ENGINE).SessionStore
+    for voter in voters:
+        if voter.session_key:
+            store_class(session_key=voter.session_key).delete()
+            voter.session_key = ""
+
+
+def retire_load_test_election(election: Election) -> None:
+    """Soft-delete the synthetic election so it drops out of every election page."""
+
+    Election.objects.filter(pk=election.pk).update(status=Election.Status.deleted)
+    election.status = Election.Status.deleted
+
+
+def _ssl_context(*, insecure: bool) -> ssl.SSLContext | None:
+    if not insecure:
+        return None
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+def login_voters(voters: list[LoadTestVoter], *, base_url: str, password: str, insecure: bool = False) -> None:
+    """Log every voter in through the login form and keep the session cookie."""
+
+    opener = urllib.request.build_opener(
+        _NoRedirect(),
+        urllib.request.HTTPSHandler(context=_ssl_context(insecure=insecure)),
+    )
+    csrf_token = "".join(secrets.choice(_CSRF_ALPHABET) for _ in range(32))
+    for voter in voters:
+        request = urllib.request.Request(
+            f"{base_url}{settings.LOGIN_URL}",
+            data=urlencode(
+                {"username": voter.username, "password": password, "csrfmiddlewaretoken": csrf_token}
+            ).encode("utf-8"),
+            headers={
+                "Cookie": f"{settings.CSRF_COOKIE_NAME}={csrf_token}",
+                "Origin": base_url,
+                "Referer": f"{base_url}{settings.LOGIN_URL}",
+            },
+            method="POST",
+        )
+        try:
+            response = opener.open(request)
+        except urllib.error.HTTPError as exc:
+            # A successful login answers with a redirect, which _NoRedirect turns into an error.
+            response = exc
+        cookies = http.cookies.SimpleCookie()
+        for header in response.headers.get_all("Set-Cookie") or []:
+            cookies.load(header)
+        morsel = cookies.get(settings.SESSION_COOKIE_NAME)
+        if morsel is None or not morsel.value:
+            raise ValueError(f"Login failed for {voter.username} (HTTP {response.status}).")
+        voter.session_key = morsel.value
+
+
+def _percentile(values: list[float], q: float) -> float:
+    # Nearest-rank percentile over sorted values.
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+def _latency_summary(samples: list[_Sample], *, elapsed: float) -> dict[str, object]:
+    timings = sorted(s.seconds for s in samples)
+    errors = Counter(s.error or f"HTTP {s.status}" for s in samples if s.error or s.status != 200)
+    return {
+        "requests": len(samples),
+        "errors": sum(errors.values()),
+        "error_counts": dict(errors),
+        "throughput_per_second": len(samples) / elapsed if elapsed else 0.0,
+        "latency_seconds": {
+            "p50": _percentile(timings, 50),
+            "p90": _percentile(timings, 90),
+            "p95": _percentile(timings, 95),
+            "p99": _percentile(timings, 99),
+            "max": timings[-1] if timings else 0.0,
+        },
+    }
+
+
+class _LockWaitSampler(threading.Thread):
+    """Polls pg_stat_activity for backends waiting on a heavyweight lock.
+
+    Sampled wait time is (waiting backends per sample) x (interval), summed: a
+    coarse but server-side measure of how long submissions queue on row locks
+    such as the ballot chain head.
+    """
+
+    def __init__(self, *, interval: float) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = 0
+        self.waiter_samples = 0
+        self.max_waiters = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        try:
+            with connection.cursor() as cursor:
+                while not self._stop_event.wait(self.interval):
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity "
+                        "WHERE wait_event_type = 'Lock' AND datname = current_database() "
+                        "AND pid <> pg_backend_pid()"
+                    )
+                    waiters = int(cursor.fetchone()[0])
+                    self.samples += 1
+                    self.waiter_samples += waiters
+                    self.max_waiters = max(self.max_waiters, waiters)
+        finally:
+            connections.close_all()
+
+    def stop(self) -> dict[str, object]:
+        self._stop_event.set()
+        self.join()
+        return {
+            "samples": self.samples,
+            "sample_interval_seconds": self.interval,
+            "sampled_wait_seconds": self.waiter_samples * self.interval,
+            "max_concurrent_waiters": self.max_waiters,
+        }
+
+
+def run_vote_load(
+    *,
+    base_url: str,
+    election: Election,
+    voters: list[LoadTestVoter],
+    candidate_ids: list[int],
+    concurrency: int = 20,
+    resubmit_ratio: float = 0.2,
+    verify_ratio: float = 0.5,
+    seed: int = 1,
+    timeout: float = 30.0,
+    insecure: bool = False,
+    lock_sample_interval: float = 0.05,
+) -> dict[str, object]:
+    """Drive the voting endpoints with one task per voter and report the results.
+
+    Each voter submits a ballot; `resubmit_ratio` of them then submit a new
+    ranking (superseding the first), and `verify_ratio` look their receipts up
+    on the public verify page. Afterwards the election's chain is re-verified
+    and the accepted ballots are checked for two sharing a previous hash.
+    """
+
+    base_url = base_url.rstrip("/")
+    submit_url = f"{base_url}{reverse('election-vote-submit', args=[election.id])}"
+    verify_url = f"{base_url}{reverse('ballot-verify')}"
+    context = _ssl_context(insecure=insecure)
+    rng = random.Random(seed)
+    plans = [(voter, rng.random() < resubmit_ratio, rng.random() < verify_ratio, rng.random()) for voter in voters]
+    collector = _Collector()
+
+    def _request(operation: str, request: urllib.request.Request) -> dict[str, object] | None:
+        start = time.perf_counter()
+        status = 0
+        body = b""
+        error = ""
+        try:
+            with urllib.request.urlopen(request, timeout=timeout, context=context) as response:
+                status = response.status
+                body = response.read()
+        except urllib.error.HTTPError as exc:
+            status = exc.code
+            body = exc.read()
+        except (OSError, urllib.error.URLError) as exc:
+            error = type(exc).__name__
+        elapsed = time.perf_counter() - start
+
+        payload: dict[str, object] | None = None
+        if operation != "verify" and body:
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                error = error or "invalid JSON"
+        if status == 200 and payload is not None and not payload.get("ok"):
+            error = str(payload.get("error") or "rejected")
+        link = None
+        if status == 200 and payload is not None and payload.get("ok"):
+            link = (str(payload["previous_chain_hash"]), str(payload["chain_hash"]))
+        collector.add(_Sample(operation=operation, seconds=elapsed, status=status, error=error), link=link)
+        return payload
+
+    def _submit(operation: str, voter: LoadTestVoter, ranking: list[int], csrf_token: str) -> str:
+        request = urllib.request.Request(
+            submit_url,
+            data=json.dumps({"credential_public_id": voter.credential_public_id, "ranking": ranking}).encode("utf-8"),
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+                "Cookie": (
+                    f"{settings.SESSION_COOKIE_NAME}={voter.session_key}; {settings.CSRF_COOKIE_NAME}={csrf_token}"
+                ),
+                "X-CSRFToken": csrf_token,
+                "Origin": base_url,
+                "Referer": f"{base_url}/",
+            },
+            method="POST",
+        )
+        payload = _request(operation, request)
+        return str(payload.get("ballot_hash") or "") if payload else ""
+
+    def _vote(plan: tuple[LoadTestVoter, bool, bool, float]) -> None:
+        voter, resubmit, verify, shuffle_seed = plan
+        voter_rng = random.Random(shuffle_seed)
+        csrf_token = "".join(voter_rng.choice(_CSRF_ALPHABET) for _ in range(32))
+        ranking = candidate_ids[:]
+        voter_rng.shuffle(ranking)
+        receipt = _submit("submit", voter, ranking[: voter_rng.randint(1, len(ranking))], csrf_token)
+        if resubmit:
+            voter_rng.shuffle(ranking)
+            receipt = _submit("resubmit", voter, ranking[: voter_rng.randint(1, len(ranking))], csrf_token) or receipt
+        if verify and receipt:
+            _request("verify", urllib.request.Request(f"{verify_url}?{urlencode({'receipt': receipt})}"))
+
+    sampler: _LockWaitSampler | None = None
+    if connection.vendor == "postgresql":
+        sampler = _LockWaitSampler(interval=lock_sample_interval)
+        sampler.start()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        list(pool.map(_vote, plans))
+    elapsed = time.perf_counter() - started
+
+    lock_wait = sampler.stop() if sampler is not None else None
+
+    by_operation: dict[str, list[_Sample]] = {}
+    for sample in collector.samples:
+        by_operation.setdefault(sample.operation, []).append(sample)
+
+    # Two accepted ballots chained onto the same previous hash means the chain forked.
+    previous_counts = Counter(previous for previous, _ in collector.links)
+    forks = sorted(previous for previous, count in previous_counts.items() if count > 1)
+
+    chain = verify_election_chain(election=election)
+    return {
+        "election_id": election.id,
+        "voters": len(voters),
+        "concurrency": concurrency,
+        "elapsed_seconds": elapsed,
+        "overall": _latency_summary(collector.samples, elapsed=elapsed),
+        "operations": {name: _latency_summary(samples, elapsed=elapsed) for name, samples in by_operation.items()},
+        "lock_wait": lock_wait,
+        "chain": {
+            "ok": chain.ok and not forks,
+            "ballots": chain.ballot_count,
+            "final_ballots": chain.final_ballot_count,
+            "accepted_submissions": len(collector.links),
+            "forked_previous_hashes": forks,
+            "report": describe(chain),
+        },
+    }
@@ -1,8 +1,30 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Mapping
+import atexit
+import sys
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from decimal import ROUND_DOWN, Decimal, localcontext
+from decimal import MAX_EMAX, MAX_PREC, MIN_EMIN, ROUND_DOWN, Context, Decimal, localcontext
+from multiprocessing import get_context, shared_memory
+
+# Identifies the counting rules behind a cached tally result. Bump whenever a change
+# to this module can alter the output of a tally.
+TALLY_ALGORITHM_VERSION = "meek-1"
+
+# Working precision for per-ballot arithmetic (retention products and remainders).
+TALLY_PRECISION = 80
+
+# Per-candidate sums are accumulated without rounding so the result does not depend on
+# ballot order or on how ballots are split across shards; they are rounded to
+# TALLY_PRECISION once, after the reduction.
+_EXACT_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+# Below this many ballots, worker start-up and per-iteration IPC cost more than they save.
+PARALLEL_MIN_BALLOTS = 20_000
+MAX_TALLY_WORKERS = 64
 
 
 @dataclass(frozen=True, slots=True)
@@ -26,8 +48,7 @@ def _decimal(value: int | str | Decimal) -> Decimal:
     return Decimal(str(value))
 
 
-def _ballot_ranking(ballot: Mapping[str, object]) -> list[int]:
-    ranking = ballot.get("ranking")
+def _parse_ranking(ranking: object) -> list[int]:
     if not isinstance(ranking, list):
         return []
     result: list[int] = []
@@ -43,30 +64,132 @@ def _ballot_ranking(ballot: Mapping[str, object]) -> list[int]:
     return result
 
 
-def _distribute_votes(
+def pack_ranking(ranking: Iterable[int]) -> bytes:
+    """Encode candidate IDs as little-endian int32s: the stored form of `Ballot.ranking`."""
+
+    packed = array("i", ranking)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_ranking(data: bytes | bytearray | memoryview) -> array[int]:
+    """Decode a ranking written by `pack_ranking`."""
+
+    packed = array("i")
+    packed.frombytes(data)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed
+
+
+def _parse_packed_ranking(data: bytes | bytearray | memoryview) -> Sequence[int]:
+    ranking = unpack_ranking(data)
+    # Stored rankings are validated on submission; re-check bounds without a per-ID loop.
+    if ranking and (min(ranking) < 0 or max(ranking) > 1_000_000):
+        return _parse_ranking(ranking.tolist())
+    return ranking
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledBallots:
+    """Validated ballots packed into flat integer arrays.
+
+    Ballot ``i`` has weight ``weights[i]`` and ranks
+    ``rankings[offsets[i]:offsets[i + 1]]``. Ballots that can never contribute
+    (malformed, zero, negative or out-of-range weights) are dropped at compile time
+    so the per-iteration loop does not re-validate them.
+    """
+
+    weights: Sequence[int]
+    offsets: Sequence[int]
+    rankings: Sequence[int]
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    @property
+    def nbytes(self) -> int:
+        return 8 * (len(self.weights) + len(self.offsets)) + 4 * len(self.rankings)
+
+    def write_to(self, buf: memoryview) -> None:
+        weights_end = 8 * len(self.weights)
+        offsets_end = weights_end + 8 * len(self.offsets)
+        buf[:weights_end] = array("q", self.weights).tobytes()
+        buf[weights_end:offsets_end] = array("q", self.offsets).tobytes()
+        buf[offsets_end : self.nbytes] = array("i", self.rankings).tobytes()
+
+    @classmethod
+    def from_buffer(cls, buf: memoryview, *, ballot_count: int, ranking_count: int) -> CompiledBallots:
+        weights_end = 8 * ballot_count
+        offsets_end = weights_end + 8 * (ballot_count + 1)
+        return cls(
+            weights=buf[:weights_end].cast("q"),
+            offsets=buf[weights_end:offsets_end].cast("q"),
+            rankings=buf[offsets_end : offsets_end + 4 * ranking_count].cast("i"),
+        )
+
+
+def compile_ballots(rows: Iterable[tuple[object, object]]) -> CompiledBallots:
+    """Pack `(weight, ranking)` rows into the compact form `tally_meek` counts from.
+
+    Rows are consumed one at a time, so ballots can be streamed from a database
+    cursor without ever holding them all as Python objects. A ranking may be a
+    list of candidate IDs or the packed bytes stored in `Ballot.ranking`.
+    """
+
+    weights = array("q")
+    offsets = array("q", [0])
+    rankings = array("i")
+
+    for weight, ranking in rows:
+        try:
+            weight_val = int(weight or 0)
+        except (ValueError, TypeError, OverflowError):
+            continue
+        # Reasonable bounds: weights should be positive and not absurdly large
+        if weight_val <= 0 or weight_val > 1_000_000:
+            continue
+
+        weights.append(weight_val)
+        if isinstance(ranking, bytes | bytearray | memoryview):
+            rankings.extend(_parse_packed_ranking(ranking))
+        else:
+            rankings.extend(_parse_ranking(ranking))
+        offsets.append(len(rankings))
+
+    return CompiledBallots(weights=weights, offsets=offsets, rankings=rankings)
+
+
+def _accumulate_votes(
     *,
-    ballots: Iterable[Mapping[str, object]],
+    ballots: CompiledBallots,
+    start: int,
+    end: int,
     retention: Mapping[int, Decimal],
     continuing_ids: frozenset[int],
 ) -> tuple[dict[int, Decimal], dict[int, Decimal]]:
+    """Return exact (unrounded) incoming/retained sums for ballots[start:end].
+
+    Must run under a context with TALLY_PRECISION so per-ballot arithmetic is
+    identical no matter which process evaluates it.
+    """
+
+    exact_add = _EXACT_CONTEXT.add
     incoming: dict[int, Decimal] = {cid: Decimal(0) for cid in continuing_ids}
     retained: dict[int, Decimal] = {cid: Decimal(0) for cid in continuing_ids}
 
-    for ballot in ballots:
-        try:
-            weight_val = int(ballot.get("weight") or 0)
-            # Reasonable bounds: weights should be positive and not absurdly large
-            if weight_val < 0 or weight_val > 1_000_000:
-                continue
-            remaining = _decimal(weight_val)
-        except (ValueError, TypeError, OverflowError):
-            continue
-        if remaining <= 0:
-            continue
+    weights = ballots.weights
+    offsets = ballots.offsets
+    rankings = ballots.rankings
 
-        for cid in _ballot_ranking(ballot):
+    for idx in range(start, end):
+        remaining = Decimal(weights[idx])
+
+        for pos in range(offsets[idx], offsets[idx + 1]):
             if remaining <= 0:
                 break
+            cid = rankings[pos]
             if cid not in continuing_ids:
                 continue
 
@@ -74,26 +197,213 @@ def _distribute_votes(
             if r <= 0:
                 continue
 
-            incoming[cid] += remaining
+            incoming[cid] = exact_add(incoming[cid], remaining)
             portion = remaining * r
             if portion:
-                retained[cid] += portion
+                retained[cid] = exact_add(retained[cid], portion)
                 remaining -= portion
 
     return incoming, retained
 
 
-def _first_preferences(*, ballots: Iterable[Mapping[str, object]], continuing_ids: frozenset[int]) -> dict[int, Decimal]:
-    first: dict[int, Decimal] = {cid: Decimal(0) for cid in continuing_ids}
-    for ballot in ballots:
-        w = _decimal(int(ballot.get("weight") or 0))
-        if w <= 0:
+def _round_totals(totals: Mapping[int, Decimal]) -> dict[int, Decimal]:
+    # Unary plus rounds to the active (TALLY_PRECISION) context.
+    return {cid: +value for cid, value in totals.items()}
+
+
+def _distribute_votes(
+    *,
+    ballots: CompiledBallots,
+    retention: Mapping[int, Decimal],
+    continuing_ids: frozenset[int],
+) -> tuple[dict[int, Decimal], dict[int, Decimal]]:
+    incoming, retained = _accumulate_votes(
+        ballots=ballots,
+        start=0,
+        end=len(ballots),
+        retention=retention,
+        continuing_ids=continuing_ids,
+    )
+    return _round_totals(incoming), _round_totals(retained)
+
+
+# Per-process state for sharded tallies. Workers attach to the parent's shared-memory
+# ballot buffer once, at start-up, so ballots are never re-pickled per iteration.
+_shard_memory: shared_memory.SharedMemory | None = None
+_shard_ballots: CompiledBallots | None = None
+
+
+def _shard_worker_init(shm_name: str, ballot_count: int, ranking_count: int) -> None:
+    global _shard_memory, _shard_ballots
+    _shard_memory = shared_memory.SharedMemory(name=shm_name, track=False)
+    _shard_ballots = CompiledBallots.from_buffer(
+        _shard_memory.buf,
+        ballot_count=ballot_count,
+        ranking_count=ranking_count,
+    )
+    atexit.register(_shard_worker_close)
+
+
+def _shard_worker_close() -> None:
+    global _shard_memory, _shard_ballots
+    # Views into the shared buffer must be released before it can be closed.
+    if _shard_ballots is not None:
+        for view in (_shard_ballots.weights, _shard_ballots.offsets, _shard_ballots.rankings):
+            if isinstance(view, memoryview):
+                view.release()
+        _shard_ballots = None
+    if _shard_memory is not None:
+        _shard_memory.close()
+        _shard_memory = None
+
+
+def _shard_distribute(
+    start: int,
+    end: int,
+    retention: dict[int, Decimal],
+    continuing_ids: frozenset[int],
+) -> tuple[dict[int, Decimal], dict[int, Decimal]]:
+    if _shard_ballots is None:
+        raise RuntimeError("tally shard worker was not initialized")
+    with localcontext() as ctx:
+        ctx.prec = TALLY_PRECISION
+        return _accumulate_votes(
+            ballots=_shard_ballots,
+            start=start,
+            end=end,
+            retention=retention,
+            continuing_ids=continuing_ids,
+        )
+
+
+@contextmanager
+def _vote_distributor(ballots: CompiledBallots, *, workers: int) -> Iterator[Callable[..., tuple[dict[int, Decimal], dict[int, Decimal]]]]:
+    """Yield a `distribute(retention=..., continuing_ids=...)` callable.
+
+    With more than one worker and enough ballots, the ballots are split into
+    contiguous shards evaluated in a process pool; partial sums are exact, so the
+    reduction matches the serial result digit for digit.
+    """
+
+    if len(ballots) < PARALLEL_MIN_BALLOTS:
+        workers = 1
+    workers = min(workers, len(ballots))
+    if workers <= 1:
+        yield lambda *, retention, continuing_ids: _distribute_votes(
+            ballots=ballots,
+            retention=retention,
+            continuing_ids=continuing_ids,
+        )
+        return
+
+    shm = shared_memory.SharedMemory(create=True, size=max(ballots.nbytes, 1))
+    try:
+        ballots.write_to(shm.buf)
+
+        step, extra = divmod(len(ballots), workers)
+        bounds: list[tuple[int, int]] = []
+        start = 0
+        for shard in range(workers):
+            end = start + step + (1 if shard < extra else 0)
+            bounds.append((start, end))
+            start = end
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_shard_worker_init,
+            initargs=(shm.name, len(ballots), len(ballots.rankings)),
+        ) as pool:
+
+            def distribute(
+                *,
+                retention: Mapping[int, Decimal],
+                continuing_ids: frozenset[int],
+            ) -> tuple[dict[int, Decimal], dict[int, Decimal]]:
+                shard_retention = {cid: retention[cid] for cid in continuing_ids}
+                futures = [
+                    pool.submit(_shard_distribute, start, end, shard_retention, continuing_ids)
+                    for start, end in bounds
+                ]
+
+                exact_add = _EXACT_CONTEXT.add
+                incoming: dict[int, Decimal] = {cid: Decimal(0) for cid in continuing_ids}
+                retained: dict[int, Decimal] = {cid: Decimal(0) for cid in continuing_ids}
+                for future in futures:
+                    part_incoming, part_retained = future.result()
+                    for cid in continuing_ids:
+                        incoming[cid] = exact_add(incoming[cid], part_incoming[cid])
+                        retained[cid] = exact_add(retained[cid], part_retained[cid])
+
+                return _round_totals(incoming), _round_totals(retained)
+
+            yield distribute
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _extrapolate_retention(history: list[dict[int, Decimal]]) -> dict[int, Decimal] | None:
+    """Aitken-style estimate of the limit of the elected candidates' retention factors.
+
+    `history` holds consecutive plain (unaccelerated) iterates of the retention
+    vector. Coupled surpluses often make the factors step unevenly from one
+    iteration to the next, so every other iterate is tried as well. An estimate is
+    returned only when every factor moved monotonically (same direction, shrinking
+    steps) over the sampled iterates. The smallest per-candidate step ratio is
+    used, so for a geometrically converging sequence the estimate stops short of
+    the limit rather than overshooting it; overshooting could push a hopeful
+    candidate over quota on a transient iterate.
+    """
+
+    for stride in (1, 2):
+        if len(history) < 2 * stride + 1:
+            return None
+        x0, x1, x2 = history[-1 - 2 * stride :: stride]
+        if not (x0.keys() == x1.keys() == x2.keys()):
+            return None
+
+        ratio: Decimal | None = None
+        monotone = True
+        for cid, value in x2.items():
+            d1 = x1[cid] - x0[cid]
+            d2 = value - x1[cid]
+            if not d2:
+                continue
+            if not d1 or (d1 > 0) != (d2 > 0) or d2 / d1 >= 1:
+                monotone = False
+                break
+            step_ratio = d2 / d1
+            ratio = step_ratio if ratio is None else min(ratio, step_ratio)
+
+        if not monotone or ratio is None:
             continue
-        for cid in _ballot_ranking(ballot):
+
+        factor = ratio / (1 - ratio)
+        estimate = {cid: value + (value - x1[cid]) * factor for cid, value in x2.items()}
+        if all(0 < v <= 1 for v in estimate.values()):
+            return estimate
+    return None
+
+
+def _round_values(values: Mapping[int, Decimal], candidate_ids: Iterable[int]) -> dict[str, str]:
+    """Per-candidate values for a round record; candidates absent from the map have a value of zero."""
+
+    return {str(cid): str(values[cid]) for cid in sorted(candidate_ids) if values.get(cid)}
+
+
+def _first_preferences(*, ballots: CompiledBallots, continuing_ids: frozenset[int]) -> dict[int, Decimal]:
+    first: dict[int, int] = dict.fromkeys(continuing_ids, 0)
+    offsets = ballots.offsets
+    rankings = ballots.rankings
+    for idx, weight in enumerate(ballots.weights):
+        for pos in range(offsets[idx], offsets[idx + 1]):
+            cid = rankings[pos]
             if cid in continuing_ids:
-                first[cid] += w
+                first[cid] += weight
                 break
-    return first
+    return {cid: Decimal(total) for cid, total in first.items()}
+
 
 def _format_list(items: Iterable[str], joiner: str = "and") -> str:
     items_list = list(items)
@@ -513,20 +823,42 @@ def generate_meek_round_explanations(
     return {"audit_text": audit_text, "summary_text": summary_text}
 
 
+def explain_meek_rounds(
+    rounds: Iterable[Mapping[str, object]],
+    *,
+    quota: int | str | Decimal,
+    candidate_name_by_id: Mapping[int, str] | None = None,
+) -> list[dict[str, str]]:
+    """Render `generate_meek_round_explanations` for each round record of a tally.
+
+    `tally_meek` only records the numbers; the prose is rendered when something
+    needs to display or export it.
+    """
+
+    quota_value = _decimal(quota)
+    return [
+        generate_meek_round_explanations(round_data, quota=quota_value, candidate_name_by_id=candidate_name_by_id)
+        for round_data in rounds
+    ]
+
+
 def tally_meek(
     *,
-    ballots: list[dict[str, object]],
+    ballots: list[dict[str, object]] | CompiledBallots,
     candidates: list[dict[str, object]],
     seats: int,
     exclusion_groups: list[dict[str, object]] | None = None,
     epsilon: Decimal = Decimal("1e-28"),
     max_iterations: int = 200,
+    workers: int = 1,
+    accelerate: bool = False,
 ) -> dict[str, object]:
     """Tally an STV election using Meek STV.
 
     Design goals:
     - Deterministic: tie-breaks are fully specified and stable.
-    - Auditable: the returned rounds include per-iteration retained totals and retention factors.
+    - Auditable: the returned rounds include per-iteration retained totals and retention factors
+      (non-zero values only); `explain_meek_rounds` renders the prose for them.
     - Privacy-preserving: operates on anonymous ballots and candidate IDs only.
 
     Notes:
@@ -535,6 +867,15 @@ def tally_meek(
     - Elected candidates remain in circulation with retention adjusted towards quota.
     - If no new elections occur after convergence, the lowest candidate is eliminated.
     - Exclusion groups force-exclude candidates once a group reaches its max elected.
+    - Each stage (fixed-point solve for one continuing set) starts from the previous
+      stage's retention factors; `stage_iterations` reports how many iterations each took.
+    - With `accelerate`, retention updates are extrapolated (Aitken-style) when they
+      converge monotonically. Convergence is still only declared on a plain
+      update, but intermediate iterations differ, so this is opt-in.
+    - With `workers` > 1, large ballot sets are distributed across a process pool;
+      the result is identical to a serial tally.
+    - `ballots` may also be pre-packed with `compile_ballots`. Ballots with an invalid
+      weight are ignored entirely, including in the quota and first preferences.
     """
 
     # Input validation to prevent crashes and DoS attacks
@@ -542,7 +883,7 @@ def tally_meek(
         raise ValueError("seats must be positive")
     if seats > 10_000:
         raise ValueError("seats must not exceed 10,000")
-    if not isinstance(ballots, list):
+    if not isinstance(ballots, list | CompiledBallots):
         raise TypeError("ballots must be a list")
     if len(ballots) > 1_000_000:
         raise ValueError("ballot count must not exceed 1,000,000")
@@ -556,6 +897,8 @@ def tally_meek(
         raise ValueError("epsilon must be positive")
     if max_iterations < 1 or max_iterations > 1000:
         raise ValueError("max_iterations must be between 1 and 1000")
+    if workers < 1 or workers > MAX_TALLY_WORKERS:
+        raise ValueError(f"workers must be between 1 and {MAX_TALLY_WORKERS}")
 
     parsed_candidates: list[_Candidate] = []
     for c in candidates:
@@ -614,10 +957,15 @@ def tally_meek(
             )
         )
 
-    with localcontext() as ctx:
-        ctx.prec = 80
+    if isinstance(ballots, CompiledBallots):
+        compiled_ballots = ballots
+    else:
+        compiled_ballots = compile_ballots((b.get("weight"), b.get("ranking")) for b in ballots)
+
+    with localcontext() as ctx, _vote_distributor(compiled_ballots, workers=workers) as distribute_votes:
+        ctx.prec = TALLY_PRECISION
 
-        total_weight = sum((_decimal(int(b.get("weight") or 0)) for b in ballots), start=Decimal(0))
+        total_weight = Decimal(sum(compiled_ballots.weights))
         quota = (total_weight / Decimal(seats + 1)).to_integral_value(rounding=ROUND_DOWN) + Decimal(1)
 
         retention: dict[int, Decimal] = {cid: Decimal(1) for cid in all_candidate_ids}
@@ -626,10 +974,11 @@ def tally_meek(
         forced_excluded: list[int] = []
 
         continuing_ids: set[int] = set(all_candidate_ids)
-        first_pref = _first_preferences(ballots=ballots, continuing_ids=frozenset(continuing_ids))
+        first_pref = _first_preferences(ballots=compiled_ballots, continuing_ids=frozenset(continuing_ids))
         previous_totals: dict[int, Decimal] = {cid: Decimal(0) for cid in continuing_ids}
 
         rounds: list[dict[str, object]] = []
+        stage_iterations: list[int] = []
 
         retention_uuid: dict[int, str] = {c.id: c.tiebreak_uuid for c in parsed_candidates}
 
@@ -812,10 +1161,12 @@ def tally_meek(
             return forced_events
 
         while len(elected) < seats and continuing_ids:
-            # Fixed-point iteration for current continuing set.
+            # Fixed-point iteration for current continuing set. Retention factors carry
+            # over from the previous stage, which is already close to the new solution.
+            stage = len(stage_iterations) + 1
+            retention_history: list[dict[int, Decimal]] = []
             for iter_idx in range(1, max_iterations + 1):
-                incoming_totals, retained_totals = _distribute_votes(
-                    ballots=ballots,
+                incoming_totals, retained_totals = distribute_votes(
                     retention=retention,
                     continuing_ids=frozenset(continuing_ids),
                 )
@@ -891,7 +1242,7 @@ def tally_meek(
                         forced_events.extend(apply_exclusions(triggered_by=cid))
 
                 # Update retention factors for all elected candidates.
-                max_delta = Decimal(0)
+                updated: dict[int, Decimal] = {}
                 for cid in elected:
                     if cid not in continuing_ids:
                         continue
@@ -903,12 +1254,33 @@ def tally_meek(
                         new_r = Decimal(1)
                     if new_r < 0:
                         new_r = Decimal(0)
+                    updated[cid] = new_r
+
+                accelerated = False
+                if accelerate:
+                    # Elections and exclusions change the fixed-point map, so earlier
+                    # iterates no longer belong to the sequence being extrapolated.
+                    if elected_this_iteration or forced_events:
+                        retention_history.clear()
+                    retention_history.append(dict(updated))
+                    estimate = _extrapolate_retention(retention_history)
+                    if estimate is not None:
+                        updated = estimate
+                        accelerated = True
+                        retention_history[:] = [estimate]
+                    else:
+                        del retention_history[:-4]
+
+                max_delta = Decimal(0)
+                for cid, new_r in updated.items():
                     delta = abs(new_r - retention[cid])
                     if delta > max_delta:
                         max_delta = delta
                     retention[cid] = new_r
 
-                numerically_converged = max_delta < epsilon and not newly_elected and not forced_events
+                numerically_converged = (
+                    max_delta < epsilon and not newly_elected and not forced_events and not accelerated
+                )
 
                 eligible_candidates = eligible_candidates_list()
                 eligible_candidates, elected_this_iteration, tie_breaks, elected_to_fill_remaining_seats = elect_remaining_if_exact_fit(
@@ -922,6 +1294,9 @@ def tally_meek(
                 count_complete = is_count_complete(elected_total=elected_total, eligible_candidates=eligible_candidates)
                 round_data: dict[str, object] = {
                         "iteration": len(rounds) + 1,
+                        "stage": stage,
+                        "stage_iteration": iter_idx,
+                        "accelerated": accelerated,
                         "quota_reached": list(quota_reached),
                         "elected": list(elected_this_iteration),
                         "elected_to_fill_remaining_seats": list(elected_to_fill_remaining_seats),
@@ -929,23 +1304,14 @@ def tally_meek(
                         "forced_exclusions": forced_events,
                         "tie_breaks": tie_breaks,
                         "eligible_candidates": eligible_candidates,
-                        "retention_factors": {str(cid): str(retention.get(cid, Decimal(0))) for cid in sorted(all_candidate_ids)},
-                        "retained_totals": {
-                            str(cid): str(retained_totals.get(cid, Decimal(0))) for cid in sorted(all_candidate_ids)
-                        },
+                        "retention_factors": _round_values(retention, all_candidate_ids),
+                        "retained_totals": _round_values(retained_totals, all_candidate_ids),
                         "numerically_converged": numerically_converged,
                         "max_retention_delta": str(max_delta),
                         "seats": seats,
                         "elected_total": elected_total,
                         "count_complete": count_complete,
                     }
-                round_data.update(
-                    generate_meek_round_explanations(
-                        round_data,
-                        quota=quota,
-                        candidate_name_by_id=candidate_name_by_id,
-                    )
-                )
                 rounds.append(round_data)
 
                 previous_totals = {cid: retained_totals.get(cid, Decimal(0)) for cid in continuing_ids}
@@ -956,6 +1322,7 @@ def tally_meek(
                     break
             else:
                 raise ValueError("Meek STV did not converge within max_iterations")
+            stage_iterations.append(iter_idx)
 
             if len(elected) >= seats:
                 break
@@ -970,8 +1337,7 @@ def tally_meek(
             remaining_seats = seats - len(elected)
             if len(remaining_candidates) == remaining_seats:
                 # Compute current vote distribution for tie-break rule 2 (cumulative support).
-                incoming_totals, _retained_totals = _distribute_votes(
-                    ballots=ballots,
+                incoming_totals, _retained_totals = distribute_votes(
                     retention=retention,
                     continuing_ids=frozenset(continuing_ids),
                 )
@@ -1028,27 +1394,21 @@ def tally_meek(
                 count_complete = is_count_complete(elected_total=elected_total, eligible_candidates=eligible_candidates)
                 round_data: dict[str, object] = {
                         "iteration": len(rounds) + 1,
+                        "stage": stage,
                         "elected": list(remaining_candidates),
                         "elected_to_fill_remaining_seats": list(remaining_candidates),
                         "eliminated": None,
                         "forced_exclusions": [],
                         "tie_breaks": tie_breaks,
                         "eligible_candidates": eligible_candidates,
-                        "retention_factors": {str(cid): str(retention.get(cid, Decimal(0))) for cid in sorted(all_candidate_ids)},
-                        "retained_totals": {str(cid): str(previous_totals.get(cid, Decimal(0))) for cid in sorted(all_candidate_ids)},
+                        "retention_factors": _round_values(retention, all_candidate_ids),
+                        "retained_totals": _round_values(previous_totals, all_candidate_ids),
                         "numerically_converged": True,
                         "max_retention_delta": "0",
                         "seats": seats,
                         "elected_total": elected_total,
                         "count_complete": count_complete,
                     }
-                round_data.update(
-                    generate_meek_round_explanations(
-                        round_data,
-                        quota=quota,
-                        candidate_name_by_id=candidate_name_by_id,
-                    )
-                )
                 rounds.append(round_data)
                 break
 
@@ -1057,8 +1417,7 @@ def tally_meek(
             if not remaining_candidates:
                 break
 
-            totals = _distribute_votes(
-                ballots=ballots,
+            totals = distribute_votes(
                 retention=retention,
                 continuing_ids=frozenset(continuing_ids),
             )
@@ -1106,29 +1465,21 @@ def tally_meek(
 
             round_data: dict[str, object] = {
                     "iteration": len(rounds) + 1,
+                    "stage": stage,
                     "elected": list(elected_this_iteration),
                     "elected_to_fill_remaining_seats": list(elected_to_fill_remaining_seats),
                     "eliminated": to_eliminate,
                     "forced_exclusions": [],
                     "tie_breaks": tie_breaks,
                     "eligible_candidates": eligible_candidates,
-                    "retention_factors": {str(cid): str(retention.get(cid, Decimal(0))) for cid in sorted(all_candidate_ids)},
-                    "retained_totals": {
-                        str(cid): str(retained_totals.get(cid, Decimal(0))) for cid in sorted(all_candidate_ids)
-                    },
+                    "retention_factors": _round_values(retention, all_candidate_ids),
+                    "retained_totals": _round_values(retained_totals, all_candidate_ids),
                     "numerically_converged": True,
                     "max_retention_delta": "0",
                     "seats": seats,
                     "elected_total": elected_total,
                     "count_complete": count_complete,
                 }
-            round_data.update(
-                generate_meek_round_explanations(
-                    round_data,
-                    quota=quota,
-                    candidate_name_by_id=candidate_name_by_id,
-                )
-            )
             rounds.append(round_data)
 
         return {
@@ -1136,5 +1487,6 @@ def tally_meek(
             "elected": elected[:seats],
             "eliminated": eliminated,
             "forced_excluded": forced_excluded,
+            "stage_iterations": stage_iterations,
             "rounds": rounds,
         }
@@ -0,0 +1,154 @@
+"""Precomputed receipt index for tallied elections.
+
+Once an election is tallied its ballots never change, so every answer the
+receipt verification page can give is known. `publish_receipt_index` writes
+them out once the tally commits: one JSON shard per receipt-hash prefix,
+addressed by the election's chain head (which commits to every ballot), to
+the default storage. The head is recorded on the election only after its
+shards are written.
+
+A lookup finds the receipt's election and published head with one indexed
+query on the ballot hash, then reads that election's single shard. Shards are
+immutable under their head, so each process keeps recently read ones in a
+bounded LRU instead of the shared cache. Receipts of open and closed elections
+are not indexed and keep the live query path.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.urls import reverse
+
+from core.ballot_merkle import inclusion_proof, leaf_hash, merkle_levels, merkle_root
+from core.models import AuditLogEntry, Ballot, Election
+from core.tokens import election_genesis_chain_hash
+
+logger = logging.getLogger(__name__)
+
+# Receipts are sharded by their first two hex digits: 256 shards per election.
+RECEIPT_INDEX_PREFIX_LENGTH = 2
+
+
+@dataclass(frozen=True, slots=True)
+class IndexedReceipt:
+    # id, name, public_ballots_url, audit_log_url and published_merkle_root.
+    election: dict[str, object]
+    submitted_date: str
+    is_superseded: bool
+    proof: dict[str, object] | None
+
+
+def published_merkle_root(*, election: Election | None) -> str:
+    payload = (
+        AuditLogEntry.objects.filter(election=election, event_type="election_closed", is_public=True)
+        .values_list("payload", flat=True)
+        .first()
+    )
+    return str(payload.get("merkle_root") or "") if isinstance(payload, dict) else ""
+
+
+def _shard_path(*, election_id: int, chain_head: str, prefix: str) -> str:
+    return f"elections/{election_id}/receipts/{chain_head}/{prefix}.json"
+
+
+def build_receipt_index(*, election: Election) -> tuple[str, dict[str, dict[str, object]]]:
+    """Return the election's chain head and its receipt shards, keyed by prefix."""
+
+    rows = list(
+        Ballot.objects.filter(election=election)
+        .order_by("created_at", "id")
+        .values_list("ballot_hash", "created_at", "superseded_by_id", "chain_hash")
+    )
+    chain_head = rows[-1][3] if rows else election_genesis_chain_hash(election.id)
+
+    # Same tree as ballot_inclusion_proof: final ballots in chain order.
+    levels = merkle_levels([ballot_hash for ballot_hash, _, superseded_by_id, _ in rows if superseded_by_id is None])
+    root = merkle_root(levels)
+    leaf_index = {leaf: index for index, leaf in enumerate(levels[0])}
+
+    summary: dict[str, object] = {
+        "id": election.id,
+        "name": election.name,
+        "public_ballots_url": (
+            election.public_ballots_file.url
+            if election.public_ballots_file
+            else reverse("election-public-ballots", args=[election.id])
+        ),
+        "audit_log_url": reverse("election-audit-log", args=[election.id]),
+        "published_merkle_root": published_merkle_root(election=election),
+    }
+
+    shards: dict[str, dict[str, object]] = {}
+    for ballot_hash, created_at, superseded_by_id, _ in rows:
+        proof = None
+        if superseded_by_id is None:
+            index = leaf_index.get(leaf_hash(ballot_hash))
+            if index is not None:
+                proof = {
+                    "election_id": election.id,
+                    "ballot_hash": ballot_hash,
+                    "leaf_count": len(levels[0]),
+                    "root": root,
+                    "path": inclusion_proof(levels, index),
+                }
+        shard = shards.setdefault(ballot_hash[:RECEIPT_INDEX_PREFIX_LENGTH], {"election": summary, "receipts": {}})
+        shard["receipts"][ballot_hash] = {
+            # Privacy guardrail: the date only, as on the live page.
+            "submitted_date": created_at.date().isoformat(),
+            "is_superseded": superseded_by_id is not None,
+            "proof": proof,
+        }
+    return chain_head, shards
+
+
+def publish_receipt_index(*, election: Election) -> None:
+    """Write the receipt index of a tallied election to storage."""
+
+    chain_head, shards = build_receipt_index(election=election)
+    for prefix, shard in shards.items():
+        path = _shard_path(election_id=election.id, chain_head=chain_head, prefix=prefix)
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        default_storage.save(path, ContentFile(json.dumps(shard, sort_keys=True).encode("utf-8")))
+
+    Election.objects.filter(pk=election.pk).update(receipt_index_chain_head=chain_head)
+    election.receipt_index_chain_head = chain_head
+
+
+@lru_cache(maxsize=settings.ELECTION_RECEIPT_INDEX_CACHE_SIZE)
+def _stored_shard(election_id: int, chain_head: str, prefix: str) -> dict[str, object]:
+    # Raises on a failed read, so lru_cache doesn't remember it.
+    path = _shard_path(election_id=election_id, chain_head=chain_head, prefix=prefix)
+    with default_storage.open(path, "rb") as fh:
+        return json.loads(fh.read())
+
+
+def lookup_indexed_receipt(*, election_id: int, chain_head: str, receipt: str) -> IndexedReceipt | None:
+    """Answer a receipt from its tallied election's published index.
+
+    `chain_head` is the election's `receipt_index_chain_head`. Returns None if
+    the shard can't be read, so the caller falls back to the live query.
+    """
+
+    try:
+        shard = _stored_shard(election_id, chain_head, receipt[:RECEIPT_INDEX_PREFIX_LENGTH])
+    except (OSError, ValueError):
+        logger.exception("Receipt index shard unreadable: election=%s chain_head=%s", election_id, chain_head)
+        return None
+
+    entry = shard["receipts"].get(receipt)
+    if entry is None:
+        return None
+    return IndexedReceipt(
+        election=shard["election"],
+        submitted_date=str(entry["submitted_date"]),
+        is_superseded=bool(entry["is_superseded"]),
+        proof=entry["proof"],
+    )
@@ -0,0 +1,100 @@
+"""Background delivery of vote receipt emails.
+
+`election_vote_submit` only records a `PendingVoteReceipt` in the ballot's
+transaction, so a voter never waits on FreeIPA or the mail queue. The
+`send_vote_receipts` worker picks the rows up in batches, looks the voters up
+in one FreeIPA call per batch, queues the emails and deletes the rows.
+
+A pending row ties the voter to their ballot and holds the ballot's nonce,
+which is stored nowhere else, so the worker must keep running while an
+election is open (the deployment runs it every minute from cron). Rows that
+exhaust ELECTION_VOTE_RECEIPT_MAX_ATTEMPTS keep their nonce until the election
+is closed, which deletes them.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from core.backends import FreeIPAUser
+from core.elections_services import BallotReceipt, freeipa_timezone_name, send_vote_receipt_email
+from core.models import PendingVoteReceipt
+
+logger = logging.getLogger(__name__)
+
+
+def _record_failures(rows: list[PendingVoteReceipt]) -> None:
+    for row in rows:
+        row.attempts += 1
+    PendingVoteReceipt.objects.bulk_update(rows, ["attempts", "last_error"])
+
+
+def send_pending_vote_receipts(*, batch_size: int | None = None) -> tuple[int, int]:
+    """Send every waiting vote receipt once. Returns (sent, failed).
+
+    Rows another worker holds are skipped, and a row that fails is retried by
+    the next run until ELECTION_VOTE_RECEIPT_MAX_ATTEMPTS.
+    """
+
+    batch_size = batch_size or settings.ELECTION_VOTE_RECEIPT_BATCH_SIZE
+    sent = 0
+    failed = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                PendingVoteReceipt.objects.select_for_update(skip_locked=True, of=("self",))
+                .select_related("election", "ballot")
+                .filter(id__gt=last_id, attempts__lt=settings.ELECTION_VOTE_RECEIPT_MAX_ATTEMPTS)
+                .order_by("id")[:batch_size]
+            )
+            if not batch:
+                return sent, failed
+            last_id = batch[-1].id
+
+            try:
+                users = FreeIPAUser.get_many(row.freeipa_username for row in batch)
+            except Exception as exc:
+                logger.exception("Vote receipt user lookup failed: receipts=%s", len(batch))
+                for row in batch:
+                    row.last_error = f"FreeIPA lookup failed: {exc}"
+                _record_failures(batch)
+                failed += len(batch)
+                continue
+
+            done: list[int] = []
+            errored: list[PendingVoteReceipt] = []
+            for row in batch:
+                user = users.get(row.freeipa_username)
+                email = str(user.email or "").strip() if user is not None else ""
+                if not email:
+                    # Nothing to send to, as when receipts were sent inline.
+                    done.append(row.id)
+                    continue
+                try:
+                    # Savepoint: a failed send must not break the batch's transaction.
+                    with transaction.atomic():
+                        send_vote_receipt_email(
+                            request=None,
+                            election=row.election,
+                            username=row.freeipa_username,
+                            email=email,
+                            receipt=BallotReceipt(ballot=row.ballot, nonce=row.nonce),
+                            tz_name=freeipa_timezone_name(user),
+                            user=user,
+                        )
+                except Exception as exc:
+                    logger.exception("Vote receipt email failed: receipt_id=%s election_id=%s", row.id, row.election_id)
+                    row.last_error = str(exc)
+                    errored.append(row)
+                    continue
+                done.append(row.id)
+                sent += 1
+
+            PendingVoteReceipt.objects.filter(id__in=done).delete()
+            if errored:
+                _record_failures(errored)
+                failed += len(errored)
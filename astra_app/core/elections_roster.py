@@ -0,0 +1,123 @@
+"""Per-election candidate roster.
+
+The vote page and the election page need the same few facts about an
+election's candidates. The roster is read from the database in one query on
+every call, so a candidate edit is seen at once by every process.
+
+Display names come from FreeIPA and are only resolved for callers that ask for
+them (`labels=True`), in one FreeIPA batch for the uncached ones. They are the
+only part that is cached (per username, for ELECTION_CANDIDATE_ROSTER_CACHE_TIMEOUT);
+a stale display name is harmless.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from dataclasses import dataclass, replace
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.backends import FreeIPAUser
+from core.models import Candidate, Election
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class RosterCandidate:
+    id: int
+    freeipa_username: str
+    nominated_by: str
+    description: str
+    url: str
+    tiebreak_uuid: uuid.UUID
+    # Empty until the roster is labelled.
+    full_name: str = ""
+    nominator_full_name: str = ""
+
+    @property
+    def label(self) -> str:
+        return f"{self.full_name or self.freeipa_username} ({self.freeipa_username})"
+
+
+@dataclass(frozen=True, slots=True)
+class CandidateRoster:
+    # Ordered by username, like Candidate's default ordering.
+    candidates: tuple[RosterCandidate, ...]
+    allowed_ids: frozenset[int]
+    username_by_id: dict[int, str]
+    labelled: bool = False
+
+
+def _build_candidate_roster(*, election: Election) -> CandidateRoster:
+    rows = Candidate.objects.filter(election=election).order_by("freeipa_username", "id").values_list(
+        "id",
+        "freeipa_username",
+        "nominated_by",
+        "description",
+        "url",
+        "tiebreak_uuid",
+    )
+    candidates = tuple(RosterCandidate(*row) for row in rows)
+    return CandidateRoster(
+        candidates=candidates,
+        allowed_ids=frozenset(c.id for c in candidates),
+        username_by_id={c.id: c.freeipa_username for c in candidates},
+    )
+
+
+def _full_name_cache_key(username: str) -> str:
+    return f"election-candidate-full-name:{username}"
+
+
+def _freeipa_full_names(usernames: set[str]) -> dict[str, str]:
+    """Map usernames to FreeIPA display names, looking up only those not cached."""
+
+    wanted = sorted(u for u in usernames if u)
+    cached = cache.get_many([_full_name_cache_key(u) for u in wanted])
+    full_names = {u: cached[_full_name_cache_key(u)] for u in wanted if _full_name_cache_key(u) in cached}
+
+    missing = [u for u in wanted if u not in full_names]
+    if not missing:
+        return full_names
+    try:
+        users = FreeIPAUser.get_many(missing)
+    except Exception:
+        # Labels are cosmetic: show usernames and retry on the next call.
+        logger.exception("Candidate display name lookup failed: usernames=%s", len(missing))
+        return full_names | {u: u for u in missing}
+
+    fetched: dict[str, str] = {}
+    for username in missing:
+        user = users.get(username)
+        fetched[username] = str(user.full_name if user is not None else "").strip() or username
+    cache.set_many(
+        {_full_name_cache_key(u): name for u, name in fetched.items()},
+        timeout=settings.ELECTION_CANDIDATE_ROSTER_CACHE_TIMEOUT,
+    )
+    return full_names | fetched
+
+
+def _label_candidate_roster(roster: CandidateRoster) -> CandidateRoster:
+    full_names = _freeipa_full_names(
+        {c.freeipa_username for c in roster.candidates} | {c.nominated_by for c in roster.candidates}
+    )
+
+    candidates = tuple(
+        replace(
+            c,
+            full_name=full_names.get(c.freeipa_username, c.freeipa_username),
+            nominator_full_name=full_names.get(c.nominated_by, c.nominated_by),
+        )
+        for c in roster.candidates
+    )
+    return replace(roster, candidates=candidates, labelled=True)
+
+
+def election_candidate_roster(*, election: Election, labels: bool = False) -> CandidateRoster:
+    """Return the election's candidate roster; with `labels`, include FreeIPA display names."""
+
+    roster = _build_candidate_roster(election=election)
+    return _label_candidate_roster(roster) if labels else roster
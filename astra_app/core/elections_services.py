@@ -1,39 +1,63 @@
 from __future__ import annotations
 
 import datetime
+import hashlib
+import itertools
 import json
 import secrets
+import tempfile
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass
 from decimal import Decimal
+from functools import lru_cache
+from typing import TYPE_CHECKING
 from urllib.parse import quote
 from zoneinfo import ZoneInfo
 
 import post_office.mail
 from django.conf import settings
-from django.core.files.base import ContentFile
+from django.core.cache import cache
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import default_storage
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import IntegrityError, transaction
-from django.db.models import Count, Q, Sum
+from django.db.models import BinaryField, Count, Max, Q, Sum
+from django.db.models.functions import Cast, Lower
 from django.http import HttpRequest
-from django.template import Context, Template
 from django.template.exceptions import TemplateSyntaxError
 from django.urls import reverse
 from django.utils import timezone
 from post_office.models import Email
 
 from core.backends import FreeIPAGroup, FreeIPAUser
+from core.ballot_chain import ChainReport, check_closed_entry, verify_chain
+from core.ballot_merkle import inclusion_proof, leaf_hash, merkle_levels, merkle_root
+from core.elections_analytics import election_ballot_analytics, election_ranking_patterns, summarize_ranking_patterns
+from core.elections_receipt_index import publish_receipt_index
+from core.elections_roster import election_candidate_roster
 from core.email_context import user_email_context, user_email_context_from_user
+from core.mail_batches import create_mail_batch
 from core.models import (
     AuditLogEntry,
     Ballot,
+    BallotChainHead,
     Candidate,
     Election,
+    ElectionEligibilitySnapshot,
+    ElectionEligibleVoter,
+    MailBatch,
+    MailJobRecipient,
     Membership,
     OrganizationSponsorship,
+    PendingVoteReceipt,
     VotingCredential,
 )
+from core.templated_email import compiled_template
 from core.tokens import election_chain_next_hash, election_genesis_chain_hash
 
+if TYPE_CHECKING:
+    from core.elections_meek import CompiledBallots
+
 
 class ElectionError(Exception):
     pass
@@ -53,6 +77,10 @@ class ElectionNotClosedError(ElectionError):
 
 @transaction.atomic
 def extend_election_end_datetime(*, election: Election, new_end_datetime: datetime.datetime) -> None:
+    # The audit entry below needs the chain head lock; take it before the
+    # election row, in the same order as close_election() and tally_election().
+    _lock_ballot_chain_head(election=election)
+
     # IMPORTANT: ModelForms populate their instance during validation. Views that
     # validate end_datetime via a ModelForm may pass an already-mutated instance.
     # Re-load under a row lock so validation compares against the persisted end.
@@ -73,15 +101,19 @@ def extend_election_end_datetime(*, election: Election, new_end_datetime: dateti
     locked.save(update_fields=["end_datetime", "updated_at"])
 
     status = election_quorum_status(election=locked)
-    AuditLogEntry.objects.create(
+    write_audit_log(
         election=locked,
-        event_type="election_end_extended",
-        payload={
-            "previous_end_datetime": old_end.isoformat(),
-            "new_end_datetime": new_end_datetime.isoformat(),
-            **status,
-        },
-        is_public=True,
+        events=[
+            AuditEvent(
+                event_type="election_end_extended",
+                payload={
+                    "previous_end_datetime": old_end.isoformat(),
+                    "new_end_datetime": new_end_datetime.isoformat(),
+                    **status,
+                },
+                is_public=True,
+            )
+        ],
     )
 
 
@@ -97,6 +129,22 @@ class EligibleVoter:
     weight: int
 
 
+@dataclass(frozen=True)
+class AuditEvent:
+    event_type: str
+    payload: dict[str, object]
+    is_public: bool = False
+
+
+@dataclass(frozen=True)
+class CredentialIssueReport:
+    # One credential per eligible voter, in the order the voters were given.
+    credentials: list[VotingCredential]
+    added: int
+    changed: int
+    unchanged: int
+
+
 def _post_office_json_context(context: dict[str, object]) -> dict[str, object]:
     # django-post-office stores template context in a DB JSON field and runs
     # model validation before saving. Canonicalizing through DjangoJSONEncoder
@@ -126,9 +174,21 @@ def _format_datetime_in_timezone(*, dt: datetime.datetime, tz_name: str | None)
     return f"{local.strftime('%b %d, %Y %H:%M')} ({target_tz_name})"
 
 
+def freeipa_timezone_name(user: FreeIPAUser) -> str | None:
+    """Return the user's configured FreeIPA timezone (IANA name), if set."""
+
+    raw = user._user_data.get("fasTimezone")
+    if raw is None:
+        raw = user._user_data.get("fastimezone")
+
+    if isinstance(raw, list):
+        raw = raw[0] if raw else ""
+    return str(raw or "").strip() or None
+
+
 def _render_template_string(value: str, context: dict[str, object]) -> str:
     try:
-        return Template(value or "").render(Context(context))
+        return compiled_template(value or "", using="django").render(context)
     except TemplateSyntaxError as exc:
         raise ElectionError(str(exc)) from exc
 
@@ -145,47 +205,106 @@ def _jsonify_tally_result(result: dict[str, object]) -> dict[str, object]:
         "elected": list(result.get("elected") or []),
         "eliminated": list(result.get("eliminated") or []),
         "forced_excluded": list(result.get("forced_excluded") or []),
+        "stage_iterations": list(result.get("stage_iterations") or []),
         "rounds": list(result.get("rounds") or []),
     }
 
 
-def build_public_ballots_export(*, election: Election) -> dict[str, object]:
-    candidate_usernames_by_id = dict(
-        Candidate.objects.filter(election=election).values_list(
-            "id",
-            "freeipa_username",
+def tally_round_explanations(*, election: Election) -> dict[int, dict[str, str]]:
+    """Return the `audit_text`/`summary_text` prose for each tally round, keyed by round number.
+
+    The tally stores numeric round records only; the prose is rendered from them on
+    first use and cached under the election's tally_completed audit entry, which a
+    tally writes exactly once.
+    """
+
+    from core.elections_meek import explain_meek_rounds
+
+    result = election.tally_result if isinstance(election.tally_result, dict) else {}
+    rounds = [r for r in result.get("rounds") or [] if isinstance(r, dict)]
+    quota = result.get("quota")
+    if not rounds or quota is None:
+        return {}
+
+    tally_sequence = (
+        AuditLogEntry.objects.filter(election=election, event_type="tally_completed")
+        .values_list("sequence", flat=True)
+        .first()
+    )
+    cache_key = f"election-round-explanations:{election.id}:{tally_sequence}" if tally_sequence is not None else ""
+    if cache_key:
+        cached = cache.get(cache_key)
+        if isinstance(cached, dict):
+            return cached
+
+    candidate_name_by_id = {
+        cid: username for cid, username in election_candidate_roster(election=election).username_by_id.items() if username
+    }
+    explanations = dict(
+        enumerate(
+            explain_meek_rounds(rounds, quota=str(quota), candidate_name_by_id=candidate_name_by_id),
+            start=1,
         )
     )
+    if cache_key:
+        cache.set(cache_key, explanations, timeout=settings.ELECTION_TALLY_CACHE_TIMEOUT)
+    return explanations
+
+
+def tally_round_record(*, election: Election, payload: dict[str, object]) -> dict[str, object]:
+    """Return a `tally_round` audit payload with the round record it refers to.
+
+    Tallies log only the round number and keep the record itself in
+    election.tally_result; older entries carry a copy and are returned as is.
+    """
+
+    round_idx = payload.get("round")
+    if payload.keys() != {"round"} or not isinstance(round_idx, int):
+        return payload
+
+    result = election.tally_result if isinstance(election.tally_result, dict) else {}
+    rounds = result.get("rounds") or []
+    if not 1 <= round_idx <= len(rounds) or not isinstance(rounds[round_idx - 1], dict):
+        return payload
+    return {"round": round_idx, **rounds[round_idx - 1]}
+
+
+_PUBLIC_BALLOT_FIELDS = (
+    "ranking",
+    "weight",
+    "ballot_hash",
+    "is_counted",
+    "chain_hash",
+    "previous_chain_hash",
+    "superseded_by__ballot_hash",
+)
+
+# Artifacts larger than this are spooled to disk before upload.
+_ARTIFACT_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+def _iter_public_ballot_rows(*, election: Election) -> Iterator[dict[str, object]]:
+    """Yield the public ballot rows in chain order, read through a DB cursor."""
+
+    candidate_usernames_by_id = election_candidate_roster(election=election).username_by_id
 
-    ballots = list(
+    rows = (
         Ballot.objects.filter(election=election)
         .order_by("created_at", "id")
-        .values(
-            "ranking",
-            "weight",
-            "ballot_hash",
-            "is_counted",
-            "chain_hash",
-            "previous_chain_hash",
-            "superseded_by__ballot_hash",
-        )
+        .values_list(*_PUBLIC_BALLOT_FIELDS)
+        .iterator(chunk_size=max(1, int(settings.ELECTION_TALLY_BALLOT_CHUNK_SIZE)))
     )
-    for row in ballots:
-        ranking_ids = row.get("ranking") or []
-        if isinstance(ranking_ids, list):
-            ranking_usernames: list[str] = []
-            for cid in ranking_ids:
-                try:
-                    candidate_id = int(cid)
-                except (TypeError, ValueError):
-                    continue
-
-                username = str(candidate_usernames_by_id.get(candidate_id) or candidate_id).strip()
-                if username:
-                    ranking_usernames.append(username)
-            row["ranking"] = ranking_usernames
+    for values in rows:
+        row: dict[str, object] = dict(zip(_PUBLIC_BALLOT_FIELDS, values, strict=True))
+        # Rankings come out of the packed column as ints; no per-ID validation needed.
+        row["ranking"] = [str(candidate_usernames_by_id.get(cid) or cid) for cid in row["ranking"]]
 
         row["superseded_by"] = row.pop("superseded_by__ballot_hash")
+        yield row
+
+
+def build_public_ballots_export(*, election: Election) -> dict[str, object]:
+    ballots = list(_iter_public_ballot_rows(election=election))
 
     genesis_hash = election_genesis_chain_hash(election.id)
     chain_head = ballots[-1]["chain_hash"] if ballots else genesis_hash
@@ -198,33 +317,86 @@ def build_public_ballots_export(*, election: Election) -> dict[str, object]:
     }
 
 
+def _dump_json(value: object) -> str:
+    return json.dumps(value, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def iter_public_ballots_export(*, election: Election) -> Iterator[bytes]:
+    """Encode build_public_ballots_export() incrementally, as UTF-8 chunks.
+
+    The output is byte-identical to dumping the whole export with sorted keys,
+    but only one chunk of ballots is in memory at a time.
+    """
+
+    genesis_hash = election_genesis_chain_hash(election.id)
+    chain_head = genesis_hash
+    chunk_size = max(1, int(settings.ELECTION_TALLY_BALLOT_CHUNK_SIZE))
+
+    # Top-level keys in sorted order: ballots, chain_head, election_id, genesis_hash.
+    parts: list[str] = ['{"ballots": [']
+    separator = ""
+    for row in _iter_public_ballot_rows(election=election):
+        parts.append(separator + _dump_json(row))
+        separator = ", "
+        chain_head = str(row["chain_hash"])
+        if len(parts) >= chunk_size:
+            yield "".join(parts).encode("utf-8")
+            parts = []
+
+    parts.append(
+        f"], \"chain_head\": {_dump_json(chain_head)}, \"election_id\": {_dump_json(election.id)}, "
+        f"\"genesis_hash\": {_dump_json(genesis_hash)}}}"
+    )
+    yield "".join(parts).encode("utf-8")
+
+
 def build_public_audit_export(*, election: Election) -> dict[str, object]:
     rows = list(
         AuditLogEntry.objects.filter(election=election, is_public=True)
-        .order_by("timestamp", "id")
+        .order_by("sequence", "id")
         .values(
             "timestamp",
             "event_type",
             "payload",
         )
     )
+    round_explanations: dict[int, dict[str, str]] | None = None
     for row in rows:
         row["timestamp"] = row["timestamp"].isoformat()
 
+        payload = row["payload"]
+        if row["event_type"] == "tally_round" and isinstance(payload, dict):
+            payload = row["payload"] = tally_round_record(election=election, payload=payload)
+        # Older tallies stored the round prose inline; newer ones render it on export.
+        if row["event_type"] == "tally_round" and isinstance(payload, dict) and "audit_text" not in payload:
+            if round_explanations is None:
+                round_explanations = tally_round_explanations(election=election)
+            round_idx = payload.get("round")
+            if isinstance(round_idx, int) and round_idx in round_explanations:
+                row["payload"] = {**payload, **round_explanations[round_idx]}
+
     return {
         "election_id": election.id,
         "audit_log": rows,
     }
 
 
+def _spool_chunks(chunks: Iterable[bytes]) -> File:
+    spool = tempfile.SpooledTemporaryFile(max_size=_ARTIFACT_SPOOL_MAX_BYTES)
+    for chunk in chunks:
+        spool.write(chunk)
+    spool.seek(0)
+    return File(spool)
+
+
 def persist_public_election_artifacts(*, election: Election) -> None:
-    ballots_payload = build_public_ballots_export(election=election)
     audit_payload = build_public_audit_export(election=election)
 
-    ballots_json = json.dumps(ballots_payload, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False).encode(
-        "utf-8"
-    )
-    audit_json = json.dumps(audit_payload, sort_keys=True, cls=DjangoJSONEncoder, ensure_ascii=False).encode("utf-8")
+    # Storage backends read the spooled files in chunks (S3 uses a multipart
+    # upload), so neither artifact is held in memory as a single bytes object.
+    ballots_file = _spool_chunks(iter_public_ballots_export(election=election))
+    audit_encoder = DjangoJSONEncoder(sort_keys=True, ensure_ascii=False)
+    audit_file = _spool_chunks(chunk.encode("utf-8") for chunk in audit_encoder.iterencode(audit_payload))
 
     try:
         if election.public_ballots_file:
@@ -232,8 +404,9 @@ def persist_public_election_artifacts(*, election: Election) -> None:
         if election.public_audit_file:
             election.public_audit_file.delete(save=False)
 
-        election.public_ballots_file.save("public_ballots.json", ContentFile(ballots_json), save=False)
-        election.public_audit_file.save("public_audit_log.json", ContentFile(audit_json), save=False)
+        with ballots_file, audit_file:
+            election.public_ballots_file.save("public_ballots.json", ballots_file, save=False)
+            election.public_audit_file.save("public_audit_log.json", audit_file, save=False)
 
         election.artifacts_generated_at = timezone.now()
         election.save(
@@ -261,12 +434,7 @@ def persist_public_election_artifacts(*, election: Election) -> None:
 
 
 def _sanitize_ranking(*, election: Election, ranking: list[int]) -> list[int]:
-    allowed = set(
-        Candidate.objects.filter(election=election).values_list(
-            "id",
-            flat=True,
-        )
-    )
+    allowed = set(Candidate.objects.filter(election=election).values_list("id", flat=True))
 
     sanitized: list[int] = []
     seen: set[int] = set()
@@ -313,9 +481,11 @@ def send_vote_receipt_email(
     email: str,
     receipt: BallotReceipt,
     tz_name: str | None = None,
+    user: FreeIPAUser | None = None,
 ) -> None:
+    user_context = user_email_context_from_user(user=user) if user is not None else user_email_context(username=username)
     context: dict[str, object] = {
-        **user_email_context(username=username),
+        **user_context,
         "election_id": election.id,
         "election_name": election.name,
         "election_description": election.description,
@@ -424,55 +594,141 @@ def build_voting_credential_email_context(
     }
 
 
-def _eligible_voters_from_memberships(*, election: Election) -> list[EligibleVoter]:
+# Send Mail variables of a credential reminder batch, in preview order.
+VOTING_CREDENTIAL_MAIL_VARIABLES = [
+    "email",
+    "username",
+    "first_name",
+    "last_name",
+    "full_name",
+    "election_id",
+    "election_name",
+    "election_description",
+    "election_url",
+    "election_start_datetime",
+    "election_end_datetime",
+    "election_number_of_seats",
+    "credential_public_id",
+    "vote_url",
+    "vote_url_with_credential_fragment",
+]
+
+_CREDENTIAL_MAIL_LOOKUP_CHUNK_SIZE = 100
+
+
+def build_voting_credential_mail_recipients(
+    *,
+    request: HttpRequest | None,
+    election: Election,
+    credentials: Iterable[VotingCredential],
+    on_progress: Callable[[int], None] | None = None,
+) -> Iterator[dict[str, str]]:
+    """Yield Send Mail recipient rows for credential reminders, one per voter with an email address.
+
+    Voters are looked up in FreeIPA a chunk at a time; `on_progress` is called
+    with the number of credentials handled so far.
+    """
+
+    handled = 0
+    for chunk in itertools.batched(credentials, _CREDENTIAL_MAIL_LOOKUP_CHUNK_SIZE):
+        users = FreeIPAUser.get_many(str(c.freeipa_username or "").strip() for c in chunk)
+        for credential in chunk:
+            username = str(credential.freeipa_username or "").strip()
+            user = users.get(username)
+            if user is not None and user.email:
+                ctx = build_voting_credential_email_context(
+                    request=request,
+                    election=election,
+                    username=username,
+                    credential_public_id=str(credential.public_id),
+                    tz_name=freeipa_timezone_name(user),
+                    user=user,
+                )
+                yield {str(k): str(v) for k, v in ctx.items()}
+        handled += len(chunk)
+        if on_progress is not None:
+            on_progress(handled)
+
+
+def create_voting_credential_mail_batch(
+    *,
+    request: HttpRequest | None,
+    election: Election,
+    credentials: Iterable[VotingCredential],
+    created_by: str = "",
+    on_progress: Callable[[int], None] | None = None,
+) -> MailBatch:
+    """Store credential reminder recipients as a Send Mail batch."""
+
+    return create_mail_batch(
+        recipients=build_voting_credential_mail_recipients(
+            request=request,
+            election=election,
+            credentials=credentials,
+            on_progress=on_progress,
+        ),
+        variables=VOTING_CREDENTIAL_MAIL_VARIABLES,
+        source=MailBatch.Source.election_credentials,
+        created_by=created_by,
+        election=election,
+    )
+
+
+def _membership_cutoff(*, election: Election) -> datetime.datetime:
+    return election.start_datetime - datetime.timedelta(days=settings.ELECTION_ELIGIBILITY_MIN_MEMBERSHIP_AGE_DAYS)
+
+
+def _eligible_voters_from_memberships(
+    *,
+    election: Election,
+    member_usernames: set[str] | None = None,
+) -> list[EligibleVoter]:
     # Eligibility: must hold a non-expired individual membership that started at least
     # ELECTION_ELIGIBILITY_MIN_MEMBERSHIP_AGE_DAYS (configured as 90 days) before election start.
-    cutoff = election.start_datetime - datetime.timedelta(days=settings.ELECTION_ELIGIBILITY_MIN_MEMBERSHIP_AGE_DAYS)
-    eligible_qs = (
-        Membership.objects.filter(
-            membership_type__isIndividual=True,
-            membership_type__enabled=True,
-            membership_type__votes__gt=0,
-            created_at__lte=cutoff,
+    # Organization representatives also get their sponsorship's votes.
+    cutoff = _membership_cutoff(election=election)
+    memberships = Membership.objects.filter(
+        membership_type__isIndividual=True,
+        membership_type__enabled=True,
+        membership_type__votes__gt=0,
+        created_at__lte=cutoff,
+    ).filter(Q(expires_at__isnull=True) | Q(expires_at__gte=election.start_datetime))
+    sponsorships = OrganizationSponsorship.objects.filter(
+        membership_type__enabled=True,
+        membership_type__votes__gt=0,
+        created_at__lte=cutoff,
+    ).filter(Q(expires_at__isnull=True) | Q(expires_at__gte=election.start_datetime))
+
+    if member_usernames is not None:
+        # member_usernames is lowercased (see _freeipa_group_recursive_member_usernames).
+        lowered = sorted(member_usernames)
+        memberships = memberships.alias(username_lower=Lower("target_username")).filter(username_lower__in=lowered)
+        sponsorships = sponsorships.alias(username_lower=Lower("organization__representative")).filter(
+            username_lower__in=lowered
         )
-        .filter(Q(expires_at__isnull=True) | Q(expires_at__gte=election.start_datetime))
-        .values("target_username")
+
+    # One round trip: weights per username from each source, summed below.
+    rows = (
+        memberships.values_list("target_username")
         .annotate(weight=Sum("membership_type__votes"))
-        .order_by("target_username")
+        .order_by()
+        .union(
+            sponsorships.values_list("organization__representative")
+            .annotate(weight=Sum("membership_type__votes"))
+            .order_by(),
+            all=True,
+        )
+        .order_by()
     )
 
     weights_by_username: dict[str, int] = {}
-    for row in eligible_qs:
-        username = str(row["target_username"])
-        weight = int(row["weight"] or 0)
-        if not username.strip() or weight <= 0:
+    for username_raw, weight_raw in rows:
+        username = str(username_raw or "").strip()
+        weight = int(weight_raw or 0)
+        if not username or weight <= 0:
             continue
         weights_by_username[username] = weights_by_username.get(username, 0) + weight
 
-    sponsorships = (
-        OrganizationSponsorship.objects.select_related("organization", "membership_type")
-        .filter(
-            membership_type__enabled=True,
-            membership_type__votes__gt=0,
-            created_at__lte=cutoff,
-        )
-        .filter(Q(expires_at__isnull=True) | Q(expires_at__gte=election.start_datetime))
-        .only(
-            "organization__representative",
-            "membership_type__votes",
-        )
-    )
-
-    for sponsorship in sponsorships:
-        votes = int(sponsorship.membership_type.votes or 0)
-        if votes <= 0:
-            continue
-
-        username = str(sponsorship.organization.representative or "").strip()
-        if not username:
-            continue
-        weights_by_username[username] = weights_by_username.get(username, 0) + votes
-
     eligible: list[EligibleVoter] = [
         EligibleVoter(username=username, weight=weight)
         for username, weight in sorted(weights_by_username.items(), key=lambda kv: kv[0].lower())
@@ -518,105 +774,104 @@ def _freeipa_group_recursive_member_usernames(*, group_cn: str) -> set[str]:
     return members
 
 
-def eligible_voters_from_memberships(*, election: Election) -> list[EligibleVoter]:
-    """Compute the eligible voters for an election from memberships.
-
-    This is used both for issuing credentials and for admin visibility.
-    """
-
-    eligible = _eligible_voters_from_memberships(election=election)
-
+def _compute_eligible_voters(*, election: Election) -> list[EligibleVoter]:
     group_cn = str(election.eligible_group_cn or "").strip()
     if not group_cn:
-        return eligible
+        return _eligible_voters_from_memberships(election=election)
 
     eligible_usernames = _freeipa_group_recursive_member_usernames(group_cn=group_cn)
     if not eligible_usernames:
         return []
 
-    return [v for v in eligible if v.username.lower() in eligible_usernames]
+    return _eligible_voters_from_memberships(election=election, member_usernames=eligible_usernames)
 
 
-def eligible_vote_weight_for_username(*, election: Election, username: str) -> int:
-    """Return the election vote weight for a specific user, or 0 if ineligible."""
+@transaction.atomic
+def refresh_eligibility_snapshot(*, election: Election) -> ElectionEligibilitySnapshot:
+    """Recompute and store the electorate for the election's current eligible group."""
+
+    voters = _compute_eligible_voters(election=election)
+    snapshot, _created = ElectionEligibilitySnapshot.objects.select_for_update().get_or_create(
+        election_id=election.pk,
+        eligible_group_cn=str(election.eligible_group_cn or "").strip(),
+        defaults={
+            "start_datetime": election.start_datetime,
+            "membership_cutoff": _membership_cutoff(election=election),
+            "refreshed_at": timezone.now(),
+        },
+    )
+    snapshot.start_datetime = election.start_datetime
+    snapshot.membership_cutoff = _membership_cutoff(election=election)
+    snapshot.voter_count = len(voters)
+    snapshot.vote_weight_total = sum(v.weight for v in voters)
+    snapshot.refreshed_at = timezone.now()
+    snapshot.save()
+
+    snapshot.voters.all().delete()
+    ElectionEligibleVoter.objects.bulk_create(
+        [ElectionEligibleVoter(snapshot=snapshot, username=v.username, weight=v.weight) for v in voters],
+        batch_size=1000,
+    )
+    return snapshot
 
-    username = str(username or "").strip()
-    if not username:
-        return 0
 
-    group_cn = str(election.eligible_group_cn or "").strip()
-    if group_cn:
-        eligible_usernames = _freeipa_group_recursive_member_usernames(group_cn=group_cn)
-        if not eligible_usernames or username.lower() not in eligible_usernames:
-            return 0
-
-    cutoff = election.start_datetime - datetime.timedelta(days=settings.ELECTION_ELIGIBILITY_MIN_MEMBERSHIP_AGE_DAYS)
-    membership_weight = (
-        Membership.objects.filter(
-            target_username=username,
-            membership_type__isIndividual=True,
-            membership_type__enabled=True,
-            membership_type__votes__gt=0,
-            created_at__lte=cutoff,
-        )
-        .filter(Q(expires_at__isnull=True) | Q(expires_at__gte=election.start_datetime))
-        .aggregate(weight=Sum("membership_type__votes"))
-        .get("weight")
-        or 0
-    )
+def _eligibility_snapshot(*, election: Election, refresh: bool = False) -> ElectionEligibilitySnapshot:
+    if not refresh:
+        max_age = datetime.timedelta(seconds=settings.ELECTION_ELIGIBILITY_SNAPSHOT_MAX_AGE)
+        snapshot = ElectionEligibilitySnapshot.objects.filter(
+            election_id=election.pk,
+            eligible_group_cn=str(election.eligible_group_cn or "").strip(),
+            start_datetime=election.start_datetime,
+            membership_cutoff=_membership_cutoff(election=election),
+            refreshed_at__gte=timezone.now() - max_age,
+        ).first()
+        if snapshot is not None:
+            return snapshot
+    return refresh_eligibility_snapshot(election=election)
 
-    sponsorship_weight = 0
 
-    sponsorships = (
-        OrganizationSponsorship.objects.select_related("organization", "membership_type")
-        .filter(
-            membership_type__enabled=True,
-            membership_type__votes__gt=0,
-            created_at__lte=cutoff,
-        )
-        .filter(Q(expires_at__isnull=True) | Q(expires_at__gte=election.start_datetime))
-        .only(
-            "organization__representative",
-            "membership_type__votes",
-        )
-    )
-    for sponsorship in sponsorships:
-        votes = int(sponsorship.membership_type.votes or 0)
-        if votes <= 0:
-            continue
+def eligible_voters_from_memberships(*, election: Election, refresh: bool = False) -> list[EligibleVoter]:
+    """Compute the eligible voters for an election from memberships.
 
-        if sponsorship.organization.representative == username:
-            sponsorship_weight += votes
+    This is used both for issuing credentials and for admin visibility. Saved
+    elections read their eligibility snapshot, recomputing it when stale or
+    when `refresh` is set.
+    """
 
-    return int(membership_weight) + sponsorship_weight
+    if election.pk is None:
+        return _compute_eligible_voters(election=election)
 
+    snapshot = _eligibility_snapshot(election=election, refresh=refresh)
+    rows = snapshot.voters.values_list("username", "weight")
+    return [
+        EligibleVoter(username=username, weight=int(weight))
+        for username, weight in sorted(rows, key=lambda row: row[0].lower())
+    ]
 
-def election_quorum_status(*, election: Election) -> dict[str, int | bool]:
-    """Return the election's current quorum/turnout status.
 
-    Prefer issued credentials when they exist, since they represent the
-    election's frozen eligibility snapshot.
-    """
+def eligible_vote_weight_for_username(*, election: Election, username: str) -> int:
+    """Return the election vote weight for a specific user, or 0 if ineligible."""
 
-    quorum_percent = int(election.quorum or 0)
+    username = str(username or "").strip()
+    if not username:
+        return 0
 
-    credentials_qs = VotingCredential.objects.filter(election=election, weight__gt=0)
-    if election.status != Election.Status.draft:
-        cred_agg = credentials_qs.aggregate(voters=Count("id"), votes=Sum("weight"))
-        eligible_voter_count = int(cred_agg.get("voters") or 0)
-        eligible_vote_weight_total = int(cred_agg.get("votes") or 0)
-    else:
-        eligible = eligible_voters_from_memberships(election=election)
-        eligible_voter_count = len(eligible)
-        eligible_vote_weight_total = sum(v.weight for v in eligible)
+    if election.pk is None:
+        weights = {v.username: v.weight for v in _compute_eligible_voters(election=election)}
+        return int(weights.get(username, 0))
 
-    ballot_agg = Ballot.objects.filter(election=election, superseded_by__isnull=True).aggregate(
-        ballots=Count("id"),
-        weight_total=Sum("weight"),
-    )
-    participating_voter_count = int(ballot_agg.get("ballots") or 0)
-    participating_vote_weight_total = int(ballot_agg.get("weight_total") or 0)
+    snapshot = _eligibility_snapshot(election=election)
+    return int(snapshot.voters.filter(username=username).values_list("weight", flat=True).first() or 0)
 
+
+def _quorum_status(
+    *,
+    quorum_percent: int,
+    eligible_voter_count: int,
+    eligible_vote_weight_total: int,
+    participating_voter_count: int,
+    participating_vote_weight_total: int,
+) -> dict[str, int | bool]:
     required_participating_voter_count = 0
     if quorum_percent > 0 and eligible_voter_count > 0:
         # Ceil(eligible * pct / 100) with integer arithmetic.
@@ -640,11 +895,172 @@ def election_quorum_status(*, election: Election) -> dict[str, int | bool]:
     }
 
 
+def _turnout_counts(*, election: Election) -> dict[str, int]:
+    """Count turnout from the credential and ballot tables.
+
+    Used to seed and repair the counters on the chain head row; the hot path
+    reads those counters instead.
+    """
+
+    cred_agg = VotingCredential.objects.filter(election=election, weight__gt=0).aggregate(
+        voters=Count("id"),
+        votes=Sum("weight"),
+    )
+    ballot_agg = Ballot.objects.filter(election=election, superseded_by__isnull=True).aggregate(
+        ballots=Count("id"),
+        weight_total=Sum("weight"),
+    )
+    return {
+        "eligible_voter_count": int(cred_agg.get("voters") or 0),
+        "eligible_vote_weight_total": int(cred_agg.get("votes") or 0),
+        "participating_voter_count": int(ballot_agg.get("ballots") or 0),
+        "participating_vote_weight_total": int(ballot_agg.get("weight_total") or 0),
+    }
+
+
+def _head_quorum_status(*, head: BallotChainHead, quorum_percent: int) -> dict[str, int | bool]:
+    return _quorum_status(
+        quorum_percent=quorum_percent,
+        eligible_voter_count=head.eligible_voter_count,
+        eligible_vote_weight_total=head.eligible_vote_weight_total,
+        participating_voter_count=head.participating_voter_count,
+        participating_vote_weight_total=head.participating_vote_weight_total,
+    )
+
+
+def election_quorum_status(*, election: Election) -> dict[str, int | bool]:
+    """Return the election's current quorum/turnout status.
+
+    Prefer issued credentials when they exist, since they represent the
+    election's frozen eligibility snapshot. Once an election has a chain head
+    row, this reads its counters rather than aggregating over the tables.
+    """
+
+    quorum_percent = int(election.quorum or 0)
+
+    if election.status == Election.Status.draft:
+        snapshot = _eligibility_snapshot(election=election)
+        counts = _turnout_counts(election=election)
+        counts["eligible_voter_count"] = snapshot.voter_count
+        counts["eligible_vote_weight_total"] = snapshot.vote_weight_total
+        return _quorum_status(quorum_percent=quorum_percent, **counts)
+
+    head = BallotChainHead.objects.filter(election=election).first()
+    if head is None:
+        return _quorum_status(quorum_percent=quorum_percent, **_turnout_counts(election=election))
+    return _head_quorum_status(head=head, quorum_percent=quorum_percent)
+
+
+def _lock_ballot_chain_head(*, election: Election) -> BallotChainHead:
+    """Lock and return the election's chain head row, creating it on first use.
+
+    Must be called inside a transaction; the lock is held until it commits.
+    """
+
+    head = BallotChainHead.objects.select_for_update().filter(election=election).first()
+    if head is not None:
+        return head
+
+    try:
+        last_audit = AuditLogEntry.objects.filter(election=election).aggregate(sequence=Max("sequence"))
+        with transaction.atomic():
+            BallotChainHead.objects.create(
+                election=election,
+                chain_hash=_election_chain_head(election=election),
+                sequence=Ballot.objects.filter(election=election).count(),
+                audit_sequence=int(last_audit["sequence"] or 0),
+                **_turnout_counts(election=election),
+            )
+    except IntegrityError:
+        # A concurrent submission created the row first.
+        pass
+    return BallotChainHead.objects.select_for_update().get(election=election)
+
+
+def _reserve_audit_sequence(*, head: BallotChainHead, count: int) -> int:
+    """Claim `count` audit sequence numbers from a locked head; returns the first.
+
+    The caller saves `audit_sequence` along with its other head updates.
+    """
+
+    first = head.audit_sequence + 1
+    head.audit_sequence += count
+    return first
+
+
+def write_audit_log(
+    *,
+    election: Election,
+    events: Sequence[AuditEvent],
+    first_sequence: int | None = None,
+) -> list[AuditLogEntry]:
+    """Write audit log entries with one bulk INSERT, numbered in the order given.
+
+    Sequence numbers come from the election's chain head row. Callers that
+    already hold the head lock reserve them with _reserve_audit_sequence() and
+    pass `first_sequence`.
+    """
+
+    if not events:
+        return []
+
+    if first_sequence is None:
+        with transaction.atomic():
+            head = _lock_ballot_chain_head(election=election)
+            first_sequence = _reserve_audit_sequence(head=head, count=len(events))
+            head.save(update_fields=["audit_sequence", "updated_at"])
+
+    return AuditLogEntry.objects.bulk_create(
+        [
+            AuditLogEntry(
+                election=election,
+                event_type=event.event_type,
+                payload=event.payload,
+                is_public=event.is_public,
+                sequence=first_sequence + offset,
+            )
+            for offset, event in enumerate(events)
+        ],
+        batch_size=500,
+    )
+
+
 @transaction.atomic
-def submit_ballot(*, election: Election, credential_public_id: str, ranking: list[int]) -> BallotReceipt:
-    if election.status != Election.Status.open:
-        raise ElectionNotOpenError("election is not open")
+def refresh_election_turnout(*, election: Election) -> None:
+    """Recount the turnout counters from the credential and ballot tables.
+
+    Needed only after credentials are edited outside the election services,
+    e.g. in the Django admin.
+    """
+
+    head = _lock_ballot_chain_head(election=election)
+    for field, value in _turnout_counts(election=election).items():
+        setattr(head, field, value)
+    head.save()
+
 
+def _track_eligible_weight(*, head: BallotChainHead, old_weight: int, new_weight: int) -> None:
+    head.eligible_voter_count += int(new_weight > 0) - int(old_weight > 0)
+    head.eligible_vote_weight_total += max(new_weight, 0) - max(old_weight, 0)
+
+
+@transaction.atomic
+def _append_ballot(
+    *,
+    election: Election,
+    credential_public_id: str,
+    ranking: list[int],
+    nonce: str,
+    queue_receipt: bool = False,
+) -> Ballot:
+    """Append a ballot to the election's hash chain and return it.
+
+    The ballot's audit entries (and the quorum entry, if this ballot met the
+    quorum) are written in the same transaction. With `queue_receipt`, a
+    PendingVoteReceipt is written in it too.
+    """
+
+    # Per-voter lock: serializes re-submissions with the same credential only.
     try:
         credential = VotingCredential.objects.select_for_update().get(
             election=election,
@@ -653,34 +1069,15 @@ def submit_ballot(*, election: Election, credential_public_id: str, ranking: lis
     except VotingCredential.DoesNotExist as exc:
         raise InvalidCredentialError("invalid credential") from exc
 
-    sanitized_ranking = _sanitize_ranking(election=election, ranking=ranking)
     weight = int(credential.weight)
-
-    # Include a random nonce in the hash input so identical re-submissions get
-    # distinct receipts. This nonce is intentionally not stored.
-    nonce = secrets.token_hex(16)
     ballot_hash = Ballot.compute_hash(
         election_id=election.id,
         credential_public_id=credential_public_id,
-        ranking=sanitized_ranking,
+        ranking=ranking,
         weight=weight,
         nonce=nonce,
     )
 
-    # Commitment chaining is per-election; lock the election row so concurrent
-    # submissions can't both claim the same previous chain head.
-    Election.objects.select_for_update().only("id").get(pk=election.pk)
-
-    last_ballot = (
-        Ballot.objects.select_for_update()
-        .filter(election=election)
-        .order_by("-created_at", "-id")
-        .first()
-    )
-    genesis_hash = election_genesis_chain_hash(election.id)
-    previous_chain_hash = str(last_ballot.chain_hash if last_ballot is not None else genesis_hash)
-    chain_hash = election_chain_next_hash(previous_chain_hash=previous_chain_hash, ballot_hash=ballot_hash)
-
     current = (
         Ballot.objects.select_for_update()
         .filter(
@@ -692,12 +1089,27 @@ def submit_ballot(*, election: Election, credential_public_id: str, ranking: lis
         .first()
     )
 
+    # Commitment chaining is per-election: from here until commit, concurrent
+    # submissions wait on the chain head row so they can't claim the same
+    # previous hash. Keep this section to the append itself.
+    head = _lock_ballot_chain_head(election=election)
+
+    # close_election takes the same lock, so this sees a close that won the race.
+    status, quorum_percent = Election.objects.filter(pk=election.pk).values_list("status", "quorum").get()
+    if status != Election.Status.open:
+        raise ElectionNotOpenError("election is not open")
+
+    previous_chain_hash = head.chain_hash
+    chain_hash = election_chain_next_hash(previous_chain_hash=previous_chain_hash, ballot_hash=ballot_hash)
+
     supersedes_ballot_hash = ""
     if current is None:
+        head.participating_voter_count += 1
+        head.participating_vote_weight_total += weight
         ballot = Ballot.objects.create(
             election=election,
             credential_public_id=credential_public_id,
-            ranking=sanitized_ranking,
+            ranking=ranking,
             weight=weight,
             ballot_hash=ballot_hash,
             previous_chain_hash=previous_chain_hash,
@@ -706,6 +1118,7 @@ def submit_ballot(*, election: Election, credential_public_id: str, ranking: lis
         )
     else:
         supersedes_ballot_hash = str(current.ballot_hash or "").strip()
+        head.participating_vote_weight_total += weight - int(current.weight)
 
         # We need to avoid violating the partial unique constraint on
         # (election, credential_public_id) where superseded_by IS NULL.
@@ -713,7 +1126,7 @@ def submit_ballot(*, election: Election, credential_public_id: str, ranking: lis
         ballot = Ballot.objects.create(
             election=election,
             credential_public_id=credential_public_id,
-            ranking=sanitized_ranking,
+            ranking=ranking,
             weight=weight,
             ballot_hash=ballot_hash,
             previous_chain_hash=previous_chain_hash,
@@ -732,29 +1145,80 @@ def submit_ballot(*, election: Election, credential_public_id: str, ranking: lis
         )
         ballot.refresh_from_db(fields=["superseded_by", "is_counted"])
 
-    payload: dict[str, object] = {"ballot_hash": ballot_hash}
+    if queue_receipt and credential.freeipa_username:
+        PendingVoteReceipt.objects.create(
+            election=election,
+            ballot=ballot,
+            freeipa_username=credential.freeipa_username,
+            nonce=nonce,
+        )
+
+    head.chain_hash = chain_hash
+    head.sequence += 1
+
+    # Latch: only the ballot that first meets the quorum reports it.
+    quorum_status: dict[str, int | bool] | None = None
+    if head.quorum_reached_at is None:
+        status_now = _head_quorum_status(head=head, quorum_percent=int(quorum_percent or 0))
+        if status_now["quorum_met"]:
+            head.quorum_reached_at = timezone.now()
+            quorum_status = status_now
+
+    first_audit_sequence = _reserve_audit_sequence(head=head, count=1 if quorum_status is None else 2)
+
+    head.save(
+        update_fields=[
+            "chain_hash",
+            "sequence",
+            "participating_voter_count",
+            "participating_vote_weight_total",
+            "quorum_reached_at",
+            "audit_sequence",
+            "updated_at",
+        ]
+    )
+
+    payload: dict[str, object] = {"ballot_hash": ballot.ballot_hash}
     if supersedes_ballot_hash:
         payload["supersedes_ballot_hash"] = supersedes_ballot_hash
 
-    AuditLogEntry.objects.create(
+    events = [AuditEvent(event_type="ballot_submitted", payload=payload)]
+    if quorum_status is not None:
+        events.append(AuditEvent(event_type="quorum_reached", payload=quorum_status, is_public=True))
+    write_audit_log(election=election, events=events, first_sequence=first_audit_sequence)
+
+    return ballot
+
+
+def submit_ballot(
+    *,
+    election: Election,
+    credential_public_id: str,
+    ranking: list[int],
+    queue_receipt: bool = False,
+) -> BallotReceipt:
+    """Record a ballot, superseding the credential's previous ballot if any.
+
+    Only the chain append, with its audit entries, runs under the per-election
+    lock; the ranking is validated before it. With `queue_receipt`, the voter's
+    receipt email is left for `send_vote_receipts` instead of being sent here.
+    """
+
+    if election.status != Election.Status.open:
+        raise ElectionNotOpenError("election is not open")
+
+    sanitized_ranking = _sanitize_ranking(election=election, ranking=ranking)
+
+    # Include a random nonce in the hash input so identical re-submissions get
+    # distinct receipts. This nonce is intentionally not stored.
+    nonce = secrets.token_hex(16)
+    ballot = _append_ballot(
         election=election,
-        event_type="ballot_submitted",
-        payload=payload,
-        is_public=False,
-    )
-
-    status = election_quorum_status(election=election)
-    required_participating_voter_count = int(status.get("required_participating_voter_count") or 0)
-    quorum_met = bool(status.get("quorum_met"))
-    if required_participating_voter_count and quorum_met:
-        already_logged = AuditLogEntry.objects.filter(election=election, event_type="quorum_reached").exists()
-        if not already_logged:
-            AuditLogEntry.objects.create(
-                election=election,
-                event_type="quorum_reached",
-                payload=status,
-                is_public=True,
-            )
+        credential_public_id=credential_public_id,
+        ranking=sanitized_ranking,
+        nonce=nonce,
+        queue_receipt=queue_receipt,
+    )
 
     return BallotReceipt(
         ballot=ballot,
@@ -762,8 +1226,24 @@ def submit_ballot(*, election: Election, credential_public_id: str, ranking: lis
     )
 
 
-@transaction.atomic
 def issue_voting_credential(*, election: Election, freeipa_username: str, weight: int) -> VotingCredential:
+    credential, _previous_weight = _issue_voting_credential(
+        election=election,
+        freeipa_username=freeipa_username,
+        weight=weight,
+    )
+    return credential
+
+
+@transaction.atomic
+def _issue_voting_credential(
+    *,
+    election: Election,
+    freeipa_username: str,
+    weight: int,
+) -> tuple[VotingCredential, int | None]:
+    """Issue or re-weight one credential; also returns its previous weight (None if it was created)."""
+
     if not freeipa_username.strip():
         raise ElectionError("freeipa_username is required")
     if weight <= 0:
@@ -779,36 +1259,52 @@ def issue_voting_credential(*, election: Election, freeipa_username: str, weight
     except VotingCredential.DoesNotExist:
         credential = None
 
+    # Taken after the credential lock, in the same order as ballot submission.
+    head = _lock_ballot_chain_head(election=election)
+
     if credential is not None:
-        if credential.weight != weight:
-            credential.weight = weight
-            credential.save(update_fields=["weight"])
-        return credential
+        previous_weight = int(credential.weight)
+        _set_credential_weight(head=head, credential=credential, weight=weight)
+        return credential, previous_weight
 
     while True:
         public_id = VotingCredential.generate_public_id()
         try:
-            return VotingCredential.objects.create(
-                election=election,
-                public_id=public_id,
-                freeipa_username=freeipa_username,
-                weight=weight,
-            )
+            with transaction.atomic():
+                credential = VotingCredential.objects.create(
+                    election=election,
+                    public_id=public_id,
+                    freeipa_username=freeipa_username,
+                    weight=weight,
+                )
         except IntegrityError:
             # Another process may have created the credential concurrently, or we hit a
             # (very unlikely) public_id collision. In either case, retry by fetching.
             try:
-                credential = VotingCredential.objects.get(
+                credential = VotingCredential.objects.select_for_update().get(
                     election=election,
                     freeipa_username=freeipa_username,
                 )
             except VotingCredential.DoesNotExist:
                 continue
 
-            if credential.weight != weight:
-                credential.weight = weight
-                credential.save(update_fields=["weight"])
-            return credential
+            previous_weight = int(credential.weight)
+            _set_credential_weight(head=head, credential=credential, weight=weight)
+            return credential, previous_weight
+
+        _track_eligible_weight(head=head, old_weight=0, new_weight=weight)
+        head.save(update_fields=["eligible_voter_count", "eligible_vote_weight_total", "updated_at"])
+        return credential, None
+
+
+def _set_credential_weight(*, head: BallotChainHead, credential: VotingCredential, weight: int) -> None:
+    if credential.weight == weight:
+        return
+
+    _track_eligible_weight(head=head, old_weight=int(credential.weight), new_weight=weight)
+    credential.weight = weight
+    credential.save(update_fields=["weight"])
+    head.save(update_fields=["eligible_voter_count", "eligible_vote_weight_total", "updated_at"])
 
 
 @transaction.atomic
@@ -824,42 +1320,157 @@ def anonymize_election(*, election: Election) -> dict[str, int]:
         election=election, freeipa_username__isnull=False
     ).update(freeipa_username=None)
 
+    # Unsent receipts would only be scrubbed below once queued; drop them with their nonces.
+    PendingVoteReceipt.objects.filter(election=election).delete()
     emails_scrubbed = scrub_election_emails(election=election)
 
-    AuditLogEntry.objects.create(
+    # Credential reminder batches pair each username with its credential ID.
+    # Drop them with the emails sent from them (already rendered, so the
+    # context scrub above can't find them); their jobs and outcomes cascade.
+    credential_batches = MailBatch.objects.filter(election=election, source=MailBatch.Source.election_credentials)
+    reminder_email_ids = MailJobRecipient.objects.filter(
+        job__batch__in=credential_batches, email__isnull=False
+    ).values_list("email_id", flat=True)
+    reminders_scrubbed, _ = Email.objects.filter(pk__in=list(reminder_email_ids)).delete()
+    emails_scrubbed += reminders_scrubbed
+    credential_batches.delete()
+
+    write_audit_log(
         election=election,
-        event_type="election_anonymized",
-        payload={
-            "credentials_affected": credentials_affected,
-            "emails_scrubbed": emails_scrubbed,
-        },
-        is_public=True,
+        events=[
+            AuditEvent(
+                event_type="election_anonymized",
+                payload={
+                    "credentials_affected": credentials_affected,
+                    "emails_scrubbed": emails_scrubbed,
+                },
+                is_public=True,
+            )
+        ],
     )
 
     return {"credentials_affected": credentials_affected, "emails_scrubbed": emails_scrubbed}
 
 
 @transaction.atomic
+def issue_voting_credentials(*, election: Election, voters: Iterable[EligibleVoter]) -> CredentialIssueReport:
+    """Issue or re-weight credentials for a whole electorate in a few statements.
+
+    Existing credentials keep their public ID; only their weight is updated.
+    """
+
+    if election.status in {Election.Status.closed, Election.Status.tallied}:
+        raise ElectionError("cannot issue credentials for a closed election")
+
+    weight_by_username: dict[str, int] = {}
+    for voter in voters:
+        if voter.username.strip() and voter.weight > 0:
+            weight_by_username[voter.username] = voter.weight
+
+    # Lock in id order so concurrent issuers can't deadlock on each other.
+    existing = {
+        str(c.freeipa_username): c
+        for c in VotingCredential.objects.select_for_update()
+        .filter(election=election, freeipa_username__in=list(weight_by_username))
+        .order_by("id")
+    }
+
+    eligible_voter_delta = 0
+    eligible_weight_delta = 0
+    changed: list[VotingCredential] = []
+    for username, credential in existing.items():
+        weight = weight_by_username[username]
+        if credential.weight != weight:
+            # Same accounting as _track_eligible_weight: a credential re-weighted
+            # up from zero becomes an eligible voter.
+            eligible_voter_delta += int(weight > 0) - int(credential.weight > 0)
+            eligible_weight_delta += max(weight, 0) - max(credential.weight, 0)
+            credential.weight = weight
+            changed.append(credential)
+    if changed:
+        VotingCredential.objects.bulk_update(changed, ["weight"], batch_size=1000)
+
+    new_credentials = [
+        VotingCredential(
+            election=election,
+            public_id=VotingCredential.generate_public_id(),
+            freeipa_username=username,
+            weight=weight,
+        )
+        for username, weight in weight_by_username.items()
+        if username not in existing
+    ]
+    unchanged_count = len(existing) - len(changed)
+    try:
+        with transaction.atomic():
+            created = VotingCredential.objects.bulk_create(new_credentials, batch_size=1000)
+        eligible_voter_delta += len(created)
+        eligible_weight_delta += sum(c.weight for c in created)
+    except IntegrityError:
+        # Another issuer created some of these concurrently; fall back to the
+        # per-voter path, which reconciles each one and its turnout counters.
+        created = []
+        for new_credential in new_credentials:
+            credential, previous_weight = _issue_voting_credential(
+                election=election,
+                freeipa_username=str(new_credential.freeipa_username),
+                weight=new_credential.weight,
+            )
+            if previous_weight is None:
+                created.append(credential)
+                continue
+            existing[str(credential.freeipa_username)] = credential
+            if previous_weight != credential.weight:
+                changed.append(credential)
+            else:
+                unchanged_count += 1
+    by_username = existing | {str(c.freeipa_username): c for c in created}
+
+    # Credential rows are written before the chain head is locked, matching the
+    # lock order of ballot submission. A head row created here is seeded from
+    # the tables, which already include this issuance.
+    head = BallotChainHead.objects.select_for_update().filter(election=election).first()
+    if head is None:
+        head = _lock_ballot_chain_head(election=election)
+    else:
+        head.eligible_voter_count += eligible_voter_delta
+        head.eligible_vote_weight_total += eligible_weight_delta
+    first_audit_sequence = _reserve_audit_sequence(head=head, count=1)
+    head.save(update_fields=["eligible_voter_count", "eligible_vote_weight_total", "audit_sequence", "updated_at"])
+
+    report = CredentialIssueReport(
+        credentials=[by_username[username] for username in weight_by_username],
+        added=len(created),
+        changed=len(changed),
+        unchanged=unchanged_count,
+    )
+    write_audit_log(
+        election=election,
+        events=[
+            AuditEvent(
+                event_type="credentials_issued",
+                payload={"added": report.added, "changed": report.changed, "unchanged": report.unchanged},
+            )
+        ],
+        first_sequence=first_audit_sequence,
+    )
+    return report
+
+
 def issue_voting_credentials_from_memberships(*, election: Election) -> int:
     if election.status in {Election.Status.closed, Election.Status.tallied}:
         raise ElectionError("cannot issue credentials for a closed election")
-    eligible = eligible_voters_from_memberships(election=election)
-    for voter in eligible:
-        issue_voting_credential(election=election, freeipa_username=voter.username, weight=voter.weight)
+    eligible = eligible_voters_from_memberships(election=election, refresh=True)
+    issue_voting_credentials(election=election, voters=eligible)
     return len(eligible)
 
 
-@transaction.atomic
 def issue_voting_credentials_from_memberships_detailed(*, election: Election) -> list[VotingCredential]:
     if election.status in {Election.Status.closed, Election.Status.tallied}:
         raise ElectionError("cannot issue credentials for a closed election")
 
-    eligible = eligible_voters_from_memberships(election=election)
-    issued: list[VotingCredential] = []
-    for voter in eligible:
-        credential = issue_voting_credential(election=election, freeipa_username=voter.username, weight=voter.weight)
-        issued.append(credential)
-    return issued
+    eligible = eligible_voters_from_memberships(election=election, refresh=True)
+    return issue_voting_credentials(election=election, voters=eligible).credentials
 
 
 @transaction.atomic
@@ -871,22 +1482,32 @@ def scrub_election_emails(*, election: Election) -> int:
     return count
 
 
-@transaction.atomic
-def close_election(*, election: Election) -> None:
-    election.refresh_from_db(fields=["status"])
-    if election.status != Election.Status.open:
-        raise ElectionError("election must be open to close")
-
-    ended_at = timezone.now()
-
+def _election_chain_head(*, election: Election) -> str:
     last_chain_hash = (
         Ballot.objects.filter(election=election)
         .order_by("-created_at", "-id")
         .values_list("chain_hash", flat=True)
         .first()
     )
-    genesis_hash = election_genesis_chain_hash(election.id)
-    chain_head = str(last_chain_hash or genesis_hash)
+    return str(last_chain_hash or election_genesis_chain_hash(election.id))
+
+
+@transaction.atomic
+def close_election(*, election: Election) -> None:
+    # Lock order: chain head, then election row (as in ballot appends and
+    # extend_election_end_datetime). The head lock waits for in-flight ballot
+    # appends; later ones see the closed status. The election lock is held
+    # until commit, so a concurrent close (e.g. a reclaimed job) waits and then
+    # sees it closed. It is a no-key lock, so it doesn't block the foreign key
+    # checks of rows inserted for the election.
+    chain_head = _lock_ballot_chain_head(election=election).chain_hash
+    election.status = (
+        Election.objects.select_for_update(no_key=True).filter(pk=election.pk).values_list("status", flat=True).get()
+    )
+    if election.status != Election.Status.open:
+        raise ElectionError("election must be open to close")
+
+    ended_at = timezone.now()
 
     election.status = Election.Status.closed
     election.end_datetime = ended_at
@@ -894,34 +1515,140 @@ def close_election(*, election: Election) -> None:
 
     anonymize_election(election=election)
 
-    AuditLogEntry.objects.create(
+    merkle = _final_ballot_merkle_levels(election=election)
+    _store_merkle_tree(election=election, chain_head=chain_head, levels=merkle)
+    write_audit_log(
         election=election,
-        event_type="election_closed",
-        payload={"chain_head": chain_head},
-        is_public=True,
+        events=[
+            AuditEvent(
+                event_type="election_closed",
+                payload={
+                    "chain_head": chain_head,
+                    "merkle_root": merkle_root(merkle),
+                    "merkle_leaf_count": len(merkle[0]),
+                },
+                is_public=True,
+            )
+        ],
     )
 
 
-@transaction.atomic
-def tally_election(*, election: Election) -> dict[str, object]:
-    from core.elections_meek import tally_meek
-    from core.models import ExclusionGroup, ExclusionGroupCandidate
+def _final_ballot_merkle_levels(*, election: Election) -> list[list[str]]:
+    """Merkle tree levels over the final ballot hashes, in chain order."""
 
-    election.refresh_from_db(fields=["status", "number_of_seats"])
-    if election.status != Election.Status.closed:
-        raise ElectionError("election must be closed to tally")
+    ballot_hashes = (
+        Ballot.objects.filter(election=election, superseded_by__isnull=True)
+        .order_by("created_at", "id")
+        .values_list("ballot_hash", flat=True)
+    )
+    return merkle_levels(list(ballot_hashes))
+
+
+def _store_merkle_tree(*, election: Election, chain_head: str, levels: list[list[str]]) -> None:
+    # Written once at close; inclusion proofs read it back instead of
+    # rebuilding the tree from the ballots.
+    if election.merkle_tree_file:
+        election.merkle_tree_file.delete(save=False)
+    payload = json.dumps({"chain_head": chain_head, "levels": levels}, separators=(",", ":"))
+    election.merkle_tree_file.save("merkle_tree.json", ContentFile(payload.encode("utf-8")), save=False)
+    election.save(update_fields=["merkle_tree_file", "updated_at"])
+
+
+@lru_cache(maxsize=settings.ELECTION_MERKLE_TREE_CACHE_SIZE)
+def _stored_merkle_tree(name: str) -> tuple[list[list[str]], dict[str, int]]:
+    # Keyed by the stored file name, which is unique per closed election.
+    with default_storage.open(name, "rb") as fh:
+        levels = json.loads(fh.read())["levels"]
+    return levels, {leaf: index for index, leaf in enumerate(levels[0])}
+
+
+def ballot_inclusion_proof(*, ballot: Ballot) -> dict[str, object] | None:
+    """Return a Merkle inclusion proof for a final ballot of a closed election.
+
+    The proof can be checked with core.ballot_merkle against the root in the
+    election_closed audit entry. Returns None while the election is open and
+    for superseded ballots.
+    """
+
+    election = ballot.election
+    if election.status not in {Election.Status.closed, Election.Status.tallied} or ballot.superseded_by_id:
+        return None
+
+    if election.merkle_tree_file:
+        levels, leaf_index = _stored_merkle_tree(election.merkle_tree_file.name)
+        index = leaf_index.get(leaf_hash(ballot.ballot_hash))
+    else:
+        # Elections closed before the tree was stored at close.
+        levels = _final_ballot_merkle_levels(election=election)
+        try:
+            index = levels[0].index(leaf_hash(ballot.ballot_hash))
+        except ValueError:
+            index = None
+    if index is None:
+        return None
 
-    candidates_qs = Candidate.objects.filter(election=election).only(
-        "id",
-        "freeipa_username",
-        "tiebreak_uuid",
+    return {
+        "election_id": election.id,
+        "ballot_hash": ballot.ballot_hash,
+        "leaf_count": len(levels[0]),
+        "root": merkle_root(levels),
+        "path": inclusion_proof(levels, index),
+    }
+
+
+def verify_election_chain(*, election: Election, workers: int = 1) -> ChainReport:
+    """Re-verify an election's ballot chain from the database.
+
+    Ballot hash columns are streamed through a cursor and checked in segments
+    (see core.ballot_chain). The result is also compared with the chain head
+    row and, once the election is closed, with the published chain head and
+    Merkle root.
+    """
+
+    rows = (
+        Ballot.objects.filter(election=election)
+        .order_by("created_at", "id")
+        .values_list("ballot_hash", "previous_chain_hash", "chain_hash", "superseded_by_id")
+        .iterator(chunk_size=max(1, int(settings.ELECTION_TALLY_BALLOT_CHUNK_SIZE)))
+    )
+    report = verify_chain(
+        ((*links, superseded_by_id is None) for *links, superseded_by_id in rows),
+        genesis_hash=election_genesis_chain_hash(election.id),
+        workers=workers,
     )
-    candidates: list[dict[str, object]] = [
-        {"id": c.id, "name": c.freeipa_username, "tiebreak_uuid": c.tiebreak_uuid} for c in candidates_qs
+    if report.divergence is not None:
+        return report
+
+    head = BallotChainHead.objects.filter(election=election).values_list("chain_hash", "sequence").first()
+    if head is not None:
+        head_hash, sequence = head
+        if head_hash != report.chain_head:
+            report.problems.append(f"chain head {report.chain_head} does not match the stored head {head_hash}")
+        if sequence != report.ballot_count:
+            report.problems.append(f"{report.ballot_count} ballot(s) but the stored head sequence is {sequence}")
+
+    closed_payload = (
+        AuditLogEntry.objects.filter(election=election, event_type="election_closed")
+        .order_by("-sequence", "-id")
+        .values_list("payload", flat=True)
+        .first()
+    )
+    if isinstance(closed_payload, dict):
+        check_closed_entry(report, closed_payload)
+    return report
+
+
+def _tally_candidates(*, election: Election) -> list[dict[str, object]]:
+    return [
+        {"id": cid, "name": username, "tiebreak_uuid": tiebreak_uuid}
+        for cid, username, tiebreak_uuid in Candidate.objects.filter(election=election)
+        .order_by("freeipa_username", "id")
+        .values_list("id", "freeipa_username", "tiebreak_uuid")
     ]
 
-    ballots_qs = Ballot.objects.filter(election=election, superseded_by__isnull=True).only("weight", "ranking")
-    ballots: list[dict[str, object]] = [{"weight": b.weight, "ranking": list(b.ranking)} for b in ballots_qs]
+
+def _tally_exclusion_groups(*, election: Election) -> list[dict[str, object]]:
+    from core.models import ExclusionGroup, ExclusionGroupCandidate
 
     group_rows = list(
         ExclusionGroup.objects.filter(election=election).values("id", "public_id", "max_elected", "name")
@@ -948,43 +1675,245 @@ def tally_election(*, election: Election) -> dict[str, object]:
                 "candidate_ids": candidate_ids_by_group_id.get(gid, []),
             }
         )
+    return exclusion_groups
+
+
+def _compiled_election_ballots(*, election: Election, chain_head: str) -> CompiledBallots:
+    """Return the election's final ballots in compact form, reused per ballot-chain head.
+
+    Kept in a small per-process LRU rather than the shared cache: the arrays
+    run to megabytes for large elections and would be pickled on every read.
+    """
+
+    return _compiled_ballots(election.id, chain_head)
+
+
+@lru_cache(maxsize=settings.ELECTION_COMPILED_BALLOTS_CACHE_SIZE)
+def _compiled_ballots(election_id: int, chain_head: str) -> CompiledBallots:
+    from core.elections_meek import compile_ballots
+
+    # Stream (weight, packed ranking) rows through a server-side cursor straight into
+    # the compact representation; no model instances or per-ballot lists are built.
+    # The cast reads the column's raw bytes instead of RankingField's decoded list.
+    return compile_ballots(
+        Ballot.objects.filter(election_id=election_id, superseded_by__isnull=True)
+        .annotate(packed_ranking=Cast("ranking", output_field=BinaryField()))
+        .values_list("weight", "packed_ranking")
+        .iterator(chunk_size=max(1, int(settings.ELECTION_TALLY_BALLOT_CHUNK_SIZE)))
+    )
+
+
+def election_tally_input_analytics(*, election: Election) -> dict[str, object]:
+    """First preferences, ranking lengths and pairwise preferences of a closed election.
+
+    See core.elections_analytics. Tallied elections read them from
+    election.tally_analytics, written by tally_election().
+    """
+
+    if election.status not in {Election.Status.closed, Election.Status.tallied}:
+        raise ElectionError("ballot statistics are only available once the election is closed")
+
+    if election.status == Election.Status.tallied and election.tally_analytics:
+        return election.tally_analytics
+
+    # Closed and awaiting a tally, or tallied before the statistics were stored.
+    return election_ballot_analytics(
+        election=election,
+        chain_head=_election_chain_head(election=election),
+        candidate_ids=[int(c["id"]) for c in _tally_candidates(election=election)],
+    )
+
+
+def _tally_cache_key(
+    *,
+    chain_head: str,
+    candidates: list[dict[str, object]],
+    seats: int,
+    exclusion_groups: list[dict[str, object]],
+) -> str:
+    """Content address of a tally: everything that determines its result.
+
+    The ballot chain head (which commits to every ballot), the candidate set,
+    the seat count, the exclusion groups and the counting algorithm version.
+    """
+
+    from core.elections_meek import TALLY_ALGORITHM_VERSION
+
+    key_material = {
+        "algorithm": TALLY_ALGORITHM_VERSION,
+        "accelerate": bool(settings.ELECTION_TALLY_ACCELERATE),
+        "chain_head": chain_head,
+        "seats": seats,
+        "candidates": sorted([int(c["id"]), str(c["name"]), str(c["tiebreak_uuid"])] for c in candidates),
+        "exclusion_groups": sorted(
+            [str(g["public_id"]), str(g["name"]), int(g["max_elected"]), sorted(g["candidate_ids"])]
+            for g in exclusion_groups
+        ),
+    }
+    digest = hashlib.sha256(json.dumps(key_material, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"election-tally:{digest}"
+
+
+def _run_tally(
+    *,
+    election: Election,
+    chain_head: str,
+    candidates: list[dict[str, object]],
+    seats: int,
+    exclusion_groups: list[dict[str, object]],
+) -> dict[str, object]:
+    """Run a Meek tally and return its JSON-ready result."""
+
+    from core.elections_meek import tally_meek
 
     raw_result = tally_meek(
-        ballots=ballots,
+        ballots=_compiled_election_ballots(election=election, chain_head=chain_head),
         candidates=candidates,
-        seats=int(election.number_of_seats),
+        seats=seats,
         exclusion_groups=exclusion_groups,
+        workers=max(1, int(settings.ELECTION_TALLY_WORKERS)),
+        accelerate=bool(settings.ELECTION_TALLY_ACCELERATE),
     )
-    result = _jsonify_tally_result(raw_result)
+    return _jsonify_tally_result(raw_result)
+
+
+def _cached_tally(
+    *,
+    election: Election,
+    chain_head: str,
+    candidates: list[dict[str, object]],
+    seats: int,
+    exclusion_groups: list[dict[str, object]],
+) -> dict[str, object]:
+    """Run (or reuse) an unofficial recount. The official tally never reads this cache."""
+
+    tally_input = {
+        "chain_head": chain_head,
+        "candidates": candidates,
+        "seats": seats,
+        "exclusion_groups": exclusion_groups,
+    }
+    cache_key = _tally_cache_key(**tally_input)
+    cached = cache.get(cache_key)
+    if isinstance(cached, dict):
+        return cached
+
+    result = _run_tally(election=election, **tally_input)
+    cache.set(cache_key, result, timeout=settings.ELECTION_TALLY_CACHE_TIMEOUT)
+    return result
+
+
+def recount_election(
+    *,
+    election: Election,
+    withdrawn_candidate_ids: Iterable[int] = (),
+    seats: int | None = None,
+) -> dict[str, object]:
+    """Tally a closed or tallied election under hypothetical changes ("what-if" recount).
+
+    Withdrawn candidates are removed from the count, so their votes pass to later
+    preferences; `seats` overrides the number of seats. The official result, the
+    audit log and the public artifacts are never modified.
+    """
+
+    election.refresh_from_db(fields=["status", "number_of_seats"])
+    if election.status not in {Election.Status.closed, Election.Status.tallied}:
+        raise ElectionError("election must be closed or tallied to recount")
+
+    seat_count = int(election.number_of_seats) if seats is None else int(seats)
+
+    all_candidates = _tally_candidates(election=election)
+    withdrawn = {int(cid) for cid in withdrawn_candidate_ids}
+    unknown = withdrawn - {int(c["id"]) for c in all_candidates}
+    if unknown:
+        raise ElectionError(f"unknown candidate id(s): {', '.join(str(cid) for cid in sorted(unknown))}")
+    candidates = [c for c in all_candidates if int(c["id"]) not in withdrawn]
+    if not candidates:
+        raise ElectionError("at least one candidate must remain")
+    if seats is not None and not 1 <= seat_count <= len(candidates):
+        raise ElectionError(f"seats must be between 1 and {len(candidates)}")
+
+    exclusion_groups = [
+        {
+            **group,
+            "max_elected": min(int(group["max_elected"]), seat_count),
+            "candidate_ids": [cid for cid in group["candidate_ids"] if cid not in withdrawn],
+        }
+        for group in _tally_exclusion_groups(election=election)
+    ]
+
+    return _cached_tally(
+        election=election,
+        chain_head=_election_chain_head(election=election),
+        candidates=candidates,
+        seats=seat_count,
+        exclusion_groups=exclusion_groups,
+    )
+
+
+@transaction.atomic
+def tally_election(*, election: Election) -> dict[str, object]:
+    # Held until commit, so a second tally of the election (e.g. a job reclaimed
+    # while this one is still counting) waits and then sees it tallied. Same
+    # lock order as close_election(): the audit entries below need the head.
+    _lock_ballot_chain_head(election=election)
+    election.status, election.number_of_seats = (
+        Election.objects.select_for_update(no_key=True)
+        .filter(pk=election.pk)
+        .values_list("status", "number_of_seats")
+        .get()
+    )
+    if election.status != Election.Status.closed:
+        raise ElectionError("election must be closed to tally")
+
+    # Always counted afresh, so a fix to the counting code can't be masked by a cached result.
+    tally_input = {
+        "chain_head": _election_chain_head(election=election),
+        "candidates": _tally_candidates(election=election),
+        "seats": int(election.number_of_seats),
+        "exclusion_groups": _tally_exclusion_groups(election=election),
+    }
+    result = _run_tally(election=election, **tally_input)
+    # A recount with the official inputs reuses the certified result.
+    cache.set(_tally_cache_key(**tally_input), result, timeout=settings.ELECTION_TALLY_CACHE_TIMEOUT)
 
     election.tally_result = result
+    # The ballot statistics for the election page are stored with the result.
+    election.tally_analytics = summarize_ranking_patterns(
+        election_ranking_patterns(election=election),
+        candidate_ids=[int(c["id"]) for c in tally_input["candidates"]],
+    )
     election.status = Election.Status.tallied
-    election.save(update_fields=["tally_result", "status"])
+    election.save(update_fields=["tally_result", "tally_analytics", "status"])
 
     persist_public_election_artifacts(election=election)
 
-    for idx, round_payload in enumerate(result.get("rounds") or [], start=1):
-        AuditLogEntry.objects.create(
-            election=election,
-            event_type="tally_round",
+    # Round entries point into election.tally_result["rounds"] rather than
+    # carrying a copy; readers expand them with tally_round_record().
+    events = [
+        AuditEvent(event_type="tally_round", payload={"round": idx}, is_public=True)
+        for idx in range(1, len(result.get("rounds") or []) + 1)
+    ]
+    events.append(
+        AuditEvent(
+            event_type="tally_completed",
             payload={
-                "round": idx,
-                **(round_payload if isinstance(round_payload, dict) else {"data": round_payload}),
+                "quota": result.get("quota"),
+                "elected": result.get("elected"),
+                "eliminated": result.get("eliminated"),
+                "forced_excluded": result.get("forced_excluded"),
+                "stage_iterations": result.get("stage_iterations"),
+                "method": "meek",
             },
             is_public=True,
         )
-
-    AuditLogEntry.objects.create(
-        election=election,
-        event_type="tally_completed",
-        payload={
-            "quota": result.get("quota"),
-            "elected": result.get("elected"),
-            "eliminated": result.get("eliminated"),
-            "forced_excluded": result.get("forced_excluded"),
-            "method": "meek",
-        },
-        is_public=True,
     )
+    write_audit_log(election=election, events=events)
+
+    # Receipt lookups for this election are answered from the index once it is
+    # published. Building it reads every ballot and writes one file per shard, so
+    # it runs after commit instead of under the election lock; until then, or if
+    # it fails, lookups keep using the live query.
+    transaction.on_commit(lambda: publish_receipt_index(election=election), robust=True)
 
     return result
@@ -0,0 +1,101 @@
+"""Server-side Send Mail recipient batches.
+
+CSV uploads and election credential reminders can run to thousands of
+recipients. They are written to `MailBatch` rows and referenced by ID, so the
+session only ever carries a UUID and the preview and send loop read the rows
+back in pages. Old batches are removed by the `prune_mail_batches` command,
+which the host runs daily.
+"""
+
+from __future__ import annotations
+
+import datetime
+from collections.abc import Iterable, Mapping
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Election, MailBatch, MailBatchRecipient, MailJob
+
+_INSERT_CHUNK_SIZE = 1000
+
+
+def create_mail_batch(
+    *,
+    recipients: Iterable[Mapping[str, object]],
+    variables: list[str],
+    source: str,
+    created_by: str = "",
+    election: Election | None = None,
+) -> MailBatch:
+    """Store recipient contexts in order and return the new batch.
+
+    `recipients` is consumed once, so it may be a generator.
+    """
+
+    with transaction.atomic():
+        batch = MailBatch.objects.create(
+            source=source,
+            election=election,
+            created_by=created_by,
+            variables=list(variables),
+        )
+
+        count = 0
+        best: dict[str, str] = {}
+        best_score = -1
+        rows: list[MailBatchRecipient] = []
+        for recipient in recipients:
+            context = {str(k): str(v or "").strip() for k, v in recipient.items()}
+            if best_score < len(variables):
+                score = sum(1 for var in variables if context.get(var))
+                if score > best_score:
+                    best, best_score = context, score
+
+            rows.append(MailBatchRecipient(batch=batch, position=count, context=context))
+            count += 1
+            if len(rows) >= _INSERT_CHUNK_SIZE:
+                MailBatchRecipient.objects.bulk_create(rows)
+                rows = []
+        if rows:
+            MailBatchRecipient.objects.bulk_create(rows)
+
+        batch.recipient_count = count
+        batch.example_context = best
+        batch.save(update_fields=["recipient_count", "example_context"])
+
+    return batch
+
+
+def get_mail_batch(public_id: str | None) -> MailBatch | None:
+    try:
+        return MailBatch.objects.filter(public_id=str(public_id or "")).first()
+    except ValidationError:
+        # Not a UUID (e.g. a stale or tampered session value).
+        return None
+
+
+def mail_batch_page(*, batch: MailBatch, page: int, per_page: int) -> list[dict[str, str]]:
+    """One page (1-based) of recipients, read by position range."""
+
+    start = max(page - 1, 0) * per_page
+    return list(
+        MailBatchRecipient.objects.filter(batch=batch, position__gte=start, position__lt=start + per_page)
+        .order_by("position")
+        .values_list("context", flat=True)
+    )
+
+
+def prune_mail_batches() -> int:
+    """Delete batches older than the retention period. Returns the number of batches deleted."""
+
+    cutoff = timezone.now() - datetime.timedelta(days=settings.SEND_MAIL_BATCH_RETENTION_DAYS)
+    # Keep batches a mail job is still sending to, however old.
+    _, deleted = (
+        MailBatch.objects.filter(created_at__lt=cutoff)
+        .exclude(jobs__status__in=[MailJob.Status.queued, MailJob.Status.running])
+        .delete()
+    )
+    return deleted.get(MailBatch._meta.label, 0)
@@ -0,0 +1,366 @@
+"""Background delivery of Send Mail messages.
+
+The Send Mail page only records a `MailJob` (a snapshot of the message and a
+reference to its recipient `MailBatch`) and polls its progress; the
+`run_mail_jobs` worker does the sending. Recipients are rendered a batch at a
+time and the whole batch is queued with post_office's `send_many` (one bulk
+insert instead of a save per message), in the same transaction as the
+recipients' `MailJobRecipient` outcomes.
+
+A job whose worker died is claimed again once its heartbeat goes stale and
+resumes after the last recorded position. Each batch locks the job row and
+re-reads its claim and progress first, so a worker that was only slow (and
+whose job has since been reclaimed) stops instead of racing the new one.
+Outcomes are unique per position as a backstop, so a batch that was already
+queued can never commit a second time.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import os
+
+import post_office.mail
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.mail import EmailMultiAlternatives
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from post_office.models import PRIORITY, Attachment, Email
+from post_office.settings import get_default_priority
+from post_office.utils import create_attachments
+
+from core.membership_notes import add_note
+from core.models import MailBatch, MailBatchRecipient, MailJob, MailJobRecipient, MembershipRequest
+from core.templated_email import (
+    compiled_template,
+    preview_drop_inline_image_tags,
+    stage_inline_images_for_sending,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_mail_job(
+    *,
+    batch: MailBatch,
+    subject: str,
+    html_content: str,
+    text_content: str,
+    cc: list[str],
+    bcc: list[str],
+    extra_context: dict[str, str],
+    requested_by: str = "",
+) -> MailJob:
+    return MailJob.objects.create(
+        batch=batch,
+        subject=subject,
+        html_content=html_content,
+        text_content=text_content,
+        cc=list(cc),
+        bcc=list(bcc),
+        extra_context=dict(extra_context),
+        total=batch.recipient_count,
+        requested_by=requested_by,
+    )
+
+
+def get_mail_job(public_id: str | None) -> MailJob | None:
+    try:
+        return MailJob.objects.filter(public_id=str(public_id or "")).first()
+    except ValidationError:
+        # Not a UUID (e.g. a hand-edited link).
+        return None
+
+
+def claim_next_mail_job() -> MailJob | None:
+    """Claim the oldest runnable job; concurrent workers skip rows another worker holds."""
+
+    while True:
+        now = timezone.now()
+        stale_before = now - datetime.timedelta(seconds=settings.SEND_MAIL_JOB_STALE_SECONDS)
+        with transaction.atomic():
+            job = (
+                MailJob.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(status=MailJob.Status.queued) | Q(status=MailJob.Status.running, heartbeat_at__lt=stale_before)
+                )
+                .order_by("id")
+                .first()
+            )
+            if job is None:
+                return None
+
+            if job.status == MailJob.Status.running and job.attempts >= settings.SEND_MAIL_JOB_MAX_ATTEMPTS:
+                job.status = MailJob.Status.failed
+                job.error = "The worker running this job stopped responding."
+                job.finished_at = now
+                job.save(update_fields=["status", "error", "finished_at"])
+                continue
+
+            job.status = MailJob.Status.running
+            job.attempts += 1
+            job.started_at = job.started_at or now
+            job.heartbeat_at = now
+            job.save(update_fields=["status", "attempts", "started_at", "heartbeat_at"])
+            return job
+
+
+class _TemplateError(Exception):
+    pass
+
+
+class _JobTakenOver(Exception):
+    """Another worker reclaimed the job while this one was stalled."""
+
+
+class _InlineImages:
+    """post_office attachments for the inline images a job's HTML references.
+
+    Each distinct image is stored once per run and linked to every email whose
+    HTML refers to its content ID.
+    """
+
+    def __init__(self) -> None:
+        self._attachments: dict[str, Attachment] = {}
+
+    def link(self, *, html_template, emails: list[tuple[Email, str]]) -> None:
+        # attach_related() hands over the images the template's renders referenced.
+        probe = EmailMultiAlternatives()
+        html_template.attach_related(probe)
+        images = {image.get_filename(): image for image in probe.attachments if image.get_filename()}
+
+        missing = {name: image for name, image in images.items() if name not in self._attachments}
+        if missing:
+            # Same shape as post_office's EmailBackend, so delivery rebuilds identical MIME parts.
+            created = create_attachments(
+                {
+                    name: {
+                        "file": ContentFile(image.get_payload()),
+                        "mimetype": image.get_content_type(),
+                        "headers": dict(image.items()),
+                    }
+                    for name, image in missing.items()
+                }
+            )
+            self._attachments.update(zip(missing, created, strict=True))
+
+        through = Attachment.emails.through
+        links = [
+            through(attachment_id=self._attachments[name].pk, email_id=email.pk)
+            for email, html in emails
+            for name in images
+            if f"cid:{name}" in html
+        ]
+        if links:
+            through.objects.bulk_create(links)
+
+
+def _send_next_batch(
+    job: MailJob,
+    *,
+    subject_template,
+    text_template,
+    html_source: str,
+    inline_images: _InlineImages,
+) -> bool:
+    """Queue the next batch of recipients after `job.progress`. Returns False once none are left.
+
+    Raises `_JobTakenOver` if the job was claimed again or moved on without this worker.
+    """
+
+    batch_size = max(1, int(settings.SEND_MAIL_JOB_BATCH_SIZE))
+    immediate = get_default_priority() == "now"
+
+    with transaction.atomic():
+        # Held until the batch commits, so a reclaiming worker can't claim the job mid-batch.
+        current = (
+            MailJob.objects.select_for_update().filter(pk=job.pk).values_list("status", "attempts", "progress").first()
+        )
+        if current != (MailJob.Status.running, job.attempts, job.progress):
+            raise _JobTakenOver
+
+        rows = list(
+            MailBatchRecipient.objects.filter(batch_id=job.batch_id, position__gte=job.progress)
+            .order_by("position")
+            .values_list("position", "context")[:batch_size]
+        )
+        if not rows:
+            return False
+
+        # Per batch: a template with inline images is compiled afresh and keeps
+        # every image it renders, which would otherwise grow with each recipient.
+        html_template = compiled_template(html_source)
+
+        outcomes: list[MailJobRecipient] = []
+        kwargs_list: list[dict[str, object]] = []
+        queued: list[tuple[MailJobRecipient, str]] = []
+        for position, recipient in rows:
+            context = {**job.extra_context, **recipient}
+            to_email = str(context.get("email") or "").strip()
+            outcome = MailJobRecipient(job=job, position=position, email_address=to_email)
+            outcomes.append(outcome)
+            if not to_email:
+                outcome.status = MailJobRecipient.Status.skipped
+                continue
+            try:
+                validate_email(to_email)
+                rendered_html = html_template.render(context)
+                kwargs_list.append(
+                    {
+                        "sender": settings.DEFAULT_FROM_EMAIL,
+                        "recipients": [to_email],
+                        "cc": job.cc,
+                        "bcc": job.bcc,
+                        "subject": subject_template.render(context),
+                        "message": text_template.render(context),
+                        "html_message": rendered_html if rendered_html.strip() else "",
+                        # send_many() can't deliver at once; such emails are dispatched after commit below.
+                        "priority": PRIORITY.high if immediate else None,
+                    }
+                )
+            except Exception as exc:
+                logger.exception("Send mail failed job=%s email=%s", job.public_id, to_email)
+                outcome.status = MailJobRecipient.Status.failed
+                outcome.error = str(exc)
+                continue
+            outcome.status = MailJobRecipient.Status.queued
+            queued.append((outcome, rendered_html))
+
+        emails = post_office.mail.send_many(kwargs_list)
+        for (outcome, _html), email in zip(queued, emails, strict=True):
+            outcome.email = email
+        inline_images.link(
+            html_template=html_template,
+            emails=[(email, html) for (_outcome, html), email in zip(queued, emails, strict=True) if html.strip()],
+        )
+        # Raises if another worker already recorded these positions, rolling back the emails too.
+        MailJobRecipient.objects.bulk_create(outcomes)
+
+        failed = sum(1 for outcome in outcomes if outcome.status == MailJobRecipient.Status.failed)
+        job.progress = rows[-1][0] + 1
+        job.sent_count += len(emails)
+        job.failed_count += failed
+        job.heartbeat_at = timezone.now()
+        MailJob.objects.filter(pk=job.pk).update(
+            progress=job.progress,
+            sent_count=job.sent_count,
+            failed_count=job.failed_count,
+            heartbeat_at=job.heartbeat_at,
+        )
+
+    if immediate:
+        for email in emails:
+            email.dispatch()
+    return True
+
+
+def _record_contacted_note(job: MailJob) -> None:
+    raw_request_id = str(job.extra_context.get("membership_request_id") or "").strip()
+    if not raw_request_id.isdigit():
+        return
+    membership_request = MembershipRequest.objects.filter(pk=int(raw_request_id)).first()
+    if membership_request is None:
+        return
+    try:
+        add_note(membership_request=membership_request, username=job.requested_by, action={"type": "contacted"})
+    except Exception:
+        logger.exception("Send mail contacted-note failed membership_request_id=%s", raw_request_id)
+
+
+def run_mail_job(job: MailJob) -> bool | None:
+    """Send a claimed job's remaining recipients and record the outcome. Returns True on success.
+
+    Returns None, leaving the job untouched, if another worker took it over.
+    """
+
+    staged_files: list[str] = []
+    try:
+        try:
+            staged_html, staged_files = stage_inline_images_for_sending(job.html_content)
+        except ValueError as exc:
+            raise _TemplateError(str(exc)) from exc
+
+        subject_template = compiled_template(job.subject)
+        # inline_image tags are HTML-only; avoid rendering them in text.
+        text_template = compiled_template(preview_drop_inline_image_tags(job.text_content))
+        inline_images = _InlineImages()
+        while _send_next_batch(
+            job,
+            subject_template=subject_template,
+            text_template=text_template,
+            html_source=staged_html,
+            inline_images=inline_images,
+        ):
+            pass
+    except _JobTakenOver:
+        logger.info("Mail job taken over by another worker: job=%s", job.public_id)
+        return None
+    except _TemplateError as exc:
+        job.status = MailJob.Status.failed
+        job.error = f"Template error: {exc}"
+    except Exception as exc:
+        logger.exception("Mail job failed: job=%s", job.public_id)
+        job.status = MailJob.Status.failed
+        job.error = f"Unexpected error: {exc}"
+    else:
+        job.status = MailJob.Status.succeeded
+        job.error = ""
+    finally:
+        for path in staged_files:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except Exception:
+                logger.exception("Send mail failed to delete temp inline image path=%s", path)
+
+    if job.status == MailJob.Status.succeeded and job.sent_count:
+        _record_contacted_note(job)
+
+    job.finished_at = timezone.now()
+    job.heartbeat_at = job.finished_at
+    job.save(update_fields=["status", "error", "heartbeat_at", "finished_at"])
+    return job.status == MailJob.Status.succeeded
+
+
+def run_pending_mail_jobs(*, max_jobs: int | None = None) -> tuple[int, int]:
+    """Claim and run jobs until the queue is empty. Returns (succeeded, failed)."""
+
+    succeeded = 0
+    failed = 0
+    while max_jobs is None or succeeded + failed < max_jobs:
+        job = claim_next_mail_job()
+        if job is None:
+            break
+        outcome = run_mail_job(job)
+        if outcome is None:
+            continue
+        if outcome:
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+
+def mail_job_status(job: MailJob) -> dict[str, object]:
+    """JSON-safe snapshot of a job for the progress endpoint."""
+
+    return {
+        "id": str(job.public_id),
+        "status": job.status,
+        "status_label": job.get_status_display(),
+        "progress": job.progress,
+        "total": job.total,
+        "sent": job.sent_count,
+        "failed": job.failed_count,
+        "percent": min(100, int(job.progress * 100 / job.total)) if job.total else 0,
+        "error": job.error,
+        "active": job.is_active,
+        "created_at": job.created_at.isoformat(),
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
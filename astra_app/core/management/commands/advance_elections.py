@@ -5,12 +5,12 @@ from typing import override
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from core.elections_services import ElectionError, close_election, tally_election
-from core.models import Election
+from core.elections_jobs import enqueue_election_job, run_pending_election_jobs
+from core.models import Election, ElectionJob
 
 
 class Command(BaseCommand):
-    help = "Close and tally elections whose end_datetime has passed."
+    help = "Queue (and by default run) close and tally jobs for elections whose end_datetime has passed."
 
     def add_arguments(self, parser) -> None:
         parser.add_argument(
@@ -18,6 +18,11 @@ class Command(BaseCommand):
             action="store_true",
             help="Show what would be done without modifying elections.",
         )
+        parser.add_argument(
+            "--enqueue-only",
+            action="store_true",
+            help="Queue the jobs for a separate run_election_jobs worker instead of running them here.",
+        )
 
     @override
     def handle(self, *args, **options) -> None:
@@ -32,39 +37,22 @@ class Command(BaseCommand):
             Election.objects.filter(status=Election.Status.closed, end_datetime__lte=now).only("id")
         )
 
-        closed = 0
-        tallied = 0
-        failed = 0
-
         if dry_run:
             self.stdout.write(
                 f"[dry-run] Would close {len(to_close)} election(s) and tally {len(to_tally)} election(s)."
             )
             return
 
+        # Closing queues the tally as a follow-up job once the election is closed.
         for election in to_close:
-            try:
-                close_election(election=election)
-                closed += 1
-            except ElectionError as exc:
-                failed += 1
-                self.stderr.write(f"Failed to close election {election.id}: {exc}")
-
-        # Refresh the reference time: close_election() sets end_datetime=timezone.now(),
-        # which can be slightly after the 'now' captured at command start.
-        now = timezone.now()
+            enqueue_election_job(election=election, kind=ElectionJob.Kind.close, params={"tally": True})
+        for election in to_tally:
+            enqueue_election_job(election=election, kind=ElectionJob.Kind.tally)
 
-        # Requery after close step so elections closed above are eligible to tally.
-        to_tally = list(
-            Election.objects.filter(status=Election.Status.closed, end_datetime__lte=now).only("id")
-        )
+        self.stdout.write(f"Queued close for {len(to_close)} election(s); queued tally for {len(to_tally)} election(s).")
 
-        for election in to_tally:
-            try:
-                tally_election(election=election)
-                tallied += 1
-            except ElectionError as exc:
-                failed += 1
-                self.stderr.write(f"Failed to tally election {election.id}: {exc}")
+        if options.get("enqueue_only"):
+            return
 
-        self.stdout.write(f"Closed {closed} election(s); tallied {tallied} election(s); failed {failed}.")
+        succeeded, failed = run_pending_election_jobs()
+        self.stdout.write(f"Ran {succeeded + failed} election job(s); failed {failed}.")
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import override
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.elections_bench import (
+    RANKING_DISTRIBUTIONS,
+    SCENARIOS,
+    WEIGHT_DISTRIBUTIONS,
+    SyntheticElectionSpec,
+    compare_with_baseline,
+    generate_synthetic_election,
+    run_tally_benchmark,
+)
+from core.elections_meek import MAX_TALLY_WORKERS
+
+
+class Command(BaseCommand):
+    help = "Benchmark the Meek tally engines on a seeded synthetic election and print a JSON report."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--seed", type=int, default=1, help="Random seed for the synthetic election.")
+        parser.add_argument("--candidates", type=int, default=10)
+        parser.add_argument("--seats", type=int, default=3)
+        parser.add_argument("--ballots", type=int, default=1000)
+        parser.add_argument("--ranking", choices=RANKING_DISTRIBUTIONS, default="partial", help="Ranking length distribution.")
+        parser.add_argument("--weights", choices=WEIGHT_DISTRIBUTIONS, default="membership", help="Ballot weight distribution.")
+        parser.add_argument("--exclusion-groups", type=int, default=0, help="Number of two-candidate groups (max 1 elected).")
+        parser.add_argument("--scenario", choices=SCENARIOS, default="random")
+        parser.add_argument(
+            "--engines",
+            default="",
+            help="Comma-separated engines to run (default: all). The first one is the reference for equivalence.",
+        )
+        parser.add_argument("--workers", type=int, default=1, help="Process pool size; >1 adds the parallel engine.")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per engine.")
+        parser.add_argument("--baseline", default="", help="A previous report to compare against.")
+        parser.add_argument("--output", default="", help="Also write the report to this file.")
+
+    @override
+    def handle(self, *args, **options) -> None:
+        workers = int(options["workers"])
+        if workers < 1 or workers > MAX_TALLY_WORKERS:
+            raise CommandError(f"--workers must be between 1 and {MAX_TALLY_WORKERS}.")
+        if int(options["seats"]) < 1 or int(options["ballots"]) < 0:
+            raise CommandError("--seats must be positive and --ballots non-negative.")
+
+        spec = SyntheticElectionSpec(
+            seed=int(options["seed"]),
+            candidates=int(options["candidates"]),
+            seats=int(options["seats"]),
+            ballots=int(options["ballots"]),
+            ranking=str(options["ranking"]),
+            weights=str(options["weights"]),
+            exclusion_groups=int(options["exclusion_groups"]),
+            scenario=str(options["scenario"]),
+        )
+        engines = [name.strip() for name in str(options["engines"] or "").split(",") if name.strip()]
+
+        try:
+            election = generate_synthetic_election(spec)
+            report = run_tally_benchmark(election, engines=engines or None, repeat=int(options["repeat"]), workers=workers)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        baseline_path = str(options["baseline"] or "")
+        if baseline_path:
+            try:
+                baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not read baseline {baseline_path}: {exc}") from exc
+            report["baseline"] = compare_with_baseline(report, baseline)
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        output_path = str(options["output"] or "")
+        if output_path:
+            Path(output_path).write_text(output + "\n", encoding="utf-8")
+        self.stdout.write(output)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import override
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.elections_loadtest import (
+    create_voter_sessions,
+    delete_voter_sessions,
+    login_voters,
+    provision_load_test_election,
+    retire_load_test_election,
+    run_vote_load,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create an open synthetic election and drive concurrent vote submissions, re-submissions and "
+        "receipt lookups against a running server; print throughput, latency and chain checks as JSON. "
+        "The election is soft-deleted and the voters' sessions removed when the run ends."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--base-url", required=True, help="Server to load, e.g. https://astra.tinystage.test")
+        parser.add_argument("--voters", type=int, default=100, help="Number of voters (with --voter-prefix).")
+        parser.add_argument(
+            "--voter-prefix",
+            default="loadtest",
+            help="Voters are <prefix>1..<prefix>N; they must exist in FreeIPA.",
+        )
+        parser.add_argument("--voters-file", default="", help="File with one FreeIPA username per line instead.")
+        parser.add_argument(
+            "--password",
+            default="",
+            help="Log every voter in through the login form with this password (default: create sessions directly).",
+        )
+        parser.add_argument("--candidates", type=int, default=5)
+        parser.add_argument("--seats", type=int, default=2)
+        parser.add_argument("--concurrency", type=int, default=20, help="Concurrent voters.")
+        parser.add_argument("--resubmit", type=float, default=0.2, help="Fraction of voters who vote twice.")
+        parser.add_argument("--verify", type=float, default=0.5, help="Fraction of voters who look up their receipt.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+        parser.add_argument("--insecure", action="store_true", help="Skip TLS certificate verification.")
+        parser.add_argument("--output", default="", help="Also write the report to this file.")
+        parser.add_argument(
+            "--keep-election",
+            action="store_true",
+            help="Leave the synthetic election open afterwards instead of soft-deleting it.",
+        )
+        parser.add_argument(
+            "--allow-non-debug",
+            action="store_true",
+            help="Run even though DEBUG is off; the election, credentials and sessions go into this database.",
+        )
+
+    @override
+    def handle(self, *args, **options) -> None:
+        if not settings.DEBUG and not options["allow_non_debug"]:
+            raise CommandError(
+                "Refusing to create a synthetic election with DEBUG off; pass --allow-non-debug to run anyway."
+            )
+
+        voters_file = str(options["voters_file"] or "")
+        if voters_file:
+            try:
+                lines = Path(voters_file).read_text(encoding="utf-8").splitlines()
+            except OSError as exc:
+                raise CommandError(f"Could not read {voters_file}: {exc}") from exc
+            usernames = list(dict.fromkeys(line.strip() for line in lines if line.strip()))
+        else:
+            prefix = str(options["voter_prefix"])
+            usernames = [f"{prefix}{index}" for index in range(1, int(options["voters"]) + 1)]
+        if not usernames:
+            raise CommandError("No voters.")
+        if int(options["candidates"]) < 1 or int(options["seats"]) < 1:
+            raise CommandError("--candidates and --seats must be positive.")
+
+        election, voters, candidate_ids = provision_load_test_election(
+            usernames=usernames,
+            candidates=int(options["candidates"]),
+            seats=int(options["seats"]),
+        )
+        self.stderr.write(f"Provisioned election {election.id} with {len(voters)} credential(s).")
+
+        base_url = str(options["base_url"]).rstrip("/")
+        password = str(options["password"] or "")
+        try:
+            if password:
+                try:
+                    login_voters(voters, base_url=base_url, password=password, insecure=bool(options["insecure"]))
+                except ValueError as exc:
+                    raise CommandError(str(exc)) from exc
+            else:
+                create_voter_sessions(voters)
+
+            report = run_vote_load(
+                base_url=base_url,
+                election=election,
+                voters=voters,
+                candidate_ids=candidate_ids,
+                concurrency=int(options["concurrency"]),
+                resubmit_ratio=float(options["resubmit"]),
+                verify_ratio=float(options["verify"]),
+                seed=int(options["seed"]),
+                timeout=float(options["timeout"]),
+                insecure=bool(options["insecure"]),
+            )
+        finally:
+            delete_voter_sessions(voters)
+            if not options["keep_election"]:
+                retire_load_test_election(election)
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        output_path = str(options["output"] or "")
+        if output_path:
+            Path(output_path).write_text(output + "\n", encoding="utf-8")
+        self.stdout.write(output)
+
+        if not report["chain"]["ok"]:
+            raise CommandError(f"Election {election.id}: ballot chain did not verify after the load test.")
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import override
+
+from django.core.management.base import BaseCommand
+
+from core.mail_batches import prune_mail_batches
+
+
+class Command(BaseCommand):
+    help = "Delete Send Mail recipient batches older than SEND_MAIL_BATCH_RETENTION_DAYS."
+
+    @override
+    def handle(self, *args, **options) -> None:
+        deleted = prune_mail_batches()
+        self.stdout.write(f"Deleted {deleted} mail batch(es).")
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import time
+from typing import override
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.elections_jobs import run_pending_election_jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued election jobs (close, tally, credential issuing and emailing)."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for new jobs instead of exiting once the queue is empty.",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=None,
+            help="Stop after running this many jobs.",
+        )
+
+    @override
+    def handle(self, *args, **options) -> None:
+        loop: bool = bool(options.get("loop"))
+        max_jobs: int | None = options.get("max_jobs")
+
+        succeeded = 0
+        failed = 0
+        while True:
+            remaining = None if max_jobs is None else max_jobs - succeeded - failed
+            ok, bad = run_pending_election_jobs(max_jobs=remaining)
+            succeeded += ok
+            failed += bad
+            if not loop or (max_jobs is not None and succeeded + failed >= max_jobs):
+                break
+            if not ok and not bad:
+                time.sleep(settings.ELECTION_JOB_POLL_SECONDS)
+
+        self.stdout.write(f"Ran {succeeded + failed} election job(s); failed {failed}.")
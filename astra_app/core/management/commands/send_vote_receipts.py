@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import time
+from typing import override
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.elections_receipts import send_pending_vote_receipts
+
+
+class Command(BaseCommand):
+    help = "Send vote receipt emails recorded by ballot submissions."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for new receipts instead of exiting once none are waiting.",
+        )
+
+    @override
+    def handle(self, *args, **options) -> None:
+        loop: bool = bool(options.get("loop"))
+
+        sent = 0
+        failed = 0
+        while True:
+            ok, bad = send_pending_vote_receipts()
+            sent += ok
+            failed += bad
+            if not loop:
+                break
+            if not ok:
+                # Nothing sent: either idle, or retrying failures that need time to clear.
+                time.sleep(settings.ELECTION_VOTE_RECEIPT_POLL_SECONDS)
+
+        self.stdout.write(f"Sent {sent} vote receipt(s); failed {failed}.")
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from typing import override
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.ballot_chain import describe, verify_public_artifacts
+from core.elections_services import verify_election_chain
+from core.models import Election
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-verify the ballot hash chain of elections, or of a downloaded public ballots artifact "
+        "(--artifact), and report the first divergence."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("election_ids", nargs="*", type=int, help="Elections to verify (default: all).")
+        parser.add_argument(
+            "--artifact",
+            help="Verify a public_ballots.json file offline instead of the database.",
+        )
+        parser.add_argument(
+            "--audit",
+            help="With --artifact: public_audit_log.json to check the published chain head and Merkle root against.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Worker processes (default: ELECTION_TALLY_WORKERS).",
+        )
+
+    @override
+    def handle(self, *args, **options) -> None:
+        workers = options.get("workers")
+        if workers is None:
+            workers = int(settings.ELECTION_TALLY_WORKERS)
+        workers = max(1, workers)
+
+        artifact: str | None = options.get("artifact")
+        if artifact:
+            audit: str | None = options.get("audit")
+            try:
+                with open(artifact, encoding="utf-8") as fh:
+                    ballots_export = json.load(fh)
+                audit_export = None
+                if audit:
+                    with open(audit, encoding="utf-8") as fh:
+                        audit_export = json.load(fh)
+            except (OSError, ValueError) as exc:
+                raise CommandError(f"Could not read artifact: {exc}") from exc
+
+            report = verify_public_artifacts(ballots_export, audit_export=audit_export, workers=workers)
+            for line in describe(report):
+                self.stdout.write(line)
+            if not report.ok:
+                raise CommandError(f"{artifact}: chain did not verify.")
+            return
+
+        elections = Election.objects.exclude(status=Election.Status.draft).order_by("id")
+        election_ids: list[int] = options.get("election_ids") or []
+        if election_ids:
+            elections = Election.objects.filter(id__in=election_ids).order_by("id")
+
+        failed = 0
+        verified = 0
+        for election in elections.only("id", "name", "status"):
+            report = verify_election_chain(election=election, workers=workers)
+            out = self.stdout if report.ok else self.stderr
+            out.write(f"Election {election.id} ({election.name}):")
+            for line in describe(report):
+                out.write(f"  {line}")
+            if report.ok:
+                verified += 1
+            else:
+                failed += 1
+
+        self.stdout.write(f"Verified {verified} election chain(s); failed {failed}.")
+        if failed:
+            raise CommandError(f"{failed} election chain(s) did not verify.")
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _backfill_ballot_chain_heads(apps, schema_editor) -> None:
+    Ballot = apps.get_model("core", "Ballot")
+    BallotChainHead = apps.get_model("core", "BallotChainHead")
+
+    election_ids = Ballot.objects.order_by().values_list("election_id", flat=True).distinct()
+    for election_id in election_ids.iterator():
+        ballots = Ballot.objects.filter(election_id=election_id)
+        last_chain_hash = ballots.order_by("-created_at", "-id").values_list("chain_hash", flat=True).first()
+        BallotChainHead.objects.update_or_create(
+            election_id=election_id,
+            defaults={
+                "chain_hash": last_chain_hash,
+                "sequence": ballots.count(),
+            },
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0050_reset_agreements_to_almalinux_coc"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BallotChainHead",
+            fields=[
+                (
+                    "election",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="ballot_chain_head",
+                        serialize=False,
+                        to="core.election",
+                    ),
+                ),
+                ("chain_hash", models.CharField(max_length=64)),
+                ("sequence", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(_backfill_ballot_chain_heads, migrations.RunPython.noop),
+    ]
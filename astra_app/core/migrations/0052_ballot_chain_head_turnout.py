@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def _backfill_turnout_counters(apps, schema_editor) -> None:
+    AuditLogEntry = apps.get_model("core", "AuditLogEntry")
+    Ballot = apps.get_model("core", "Ballot")
+    BallotChainHead = apps.get_model("core", "BallotChainHead")
+    VotingCredential = apps.get_model("core", "VotingCredential")
+
+    for head in BallotChainHead.objects.all().iterator():
+        ballots = Ballot.objects.filter(election_id=head.election_id, superseded_by__isnull=True).aggregate(
+            voters=Count("id"),
+            votes=Sum("weight"),
+        )
+        credentials = VotingCredential.objects.filter(election_id=head.election_id, weight__gt=0).aggregate(
+            voters=Count("id"),
+            votes=Sum("weight"),
+        )
+        reached = AuditLogEntry.objects.filter(
+            election_id=head.election_id,
+            event_type="quorum_reached",
+        ).aggregate(first=Min("timestamp"))
+
+        head.participating_voter_count = int(ballots["voters"] or 0)
+        head.participating_vote_weight_total = int(ballots["votes"] or 0)
+        head.eligible_voter_count = int(credentials["voters"] or 0)
+        head.eligible_vote_weight_total = int(credentials["votes"] or 0)
+        head.quorum_reached_at = reached["first"]
+        head.save(
+            update_fields=[
+                "participating_voter_count",
+                "participating_vote_weight_total",
+                "eligible_voter_count",
+                "eligible_vote_weight_total",
+                "quorum_reached_at",
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0051_ballot_chain_head"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ballotchainhead",
+            name="participating_voter_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="ballotchainhead",
+            name="participating_vote_weight_total",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="ballotchainhead",
+            name="eligible_voter_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="ballotchainhead",
+            name="eligible_vote_weight_total",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="ballotchainhead",
+            name="quorum_reached_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(_backfill_turnout_counters, migrations.RunPython.noop),
+    ]
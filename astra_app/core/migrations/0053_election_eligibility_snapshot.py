@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0052_ballot_chain_head_turnout"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ElectionEligibilitySnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("eligible_group_cn", models.CharField(blank=True, default="", max_length=255)),
+                ("start_datetime", models.DateTimeField()),
+                ("membership_cutoff", models.DateTimeField()),
+                ("voter_count", models.PositiveIntegerField(default=0)),
+                ("vote_weight_total", models.PositiveBigIntegerField(default=0)),
+                ("refreshed_at", models.DateTimeField()),
+                (
+                    "election",
+                    models.ForeignKey(
+                        on_delete=models.deletion.CASCADE,
+                        related_name="eligibility_snapshots",
+                        to="core.election",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ElectionEligibleVoter",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("username", models.CharField(max_length=255)),
+                ("weight", models.PositiveIntegerField()),
+                (
+                    "snapshot",
+                    models.ForeignKey(
+                        on_delete=models.deletion.CASCADE,
+                        related_name="voters",
+                        to="core.electioneligibilitysnapshot",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="electioneligibilitysnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("election", "eligible_group_cn"),
+                name="uniq_eligibilitysnapshot_election_group",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="electioneligiblevoter",
+            constraint=models.UniqueConstraint(
+                fields=("snapshot", "username"),
+                name="uniq_eligiblevoter_snapshot_username",
+            ),
+        ),
+    ]
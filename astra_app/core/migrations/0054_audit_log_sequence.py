@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+def _backfill_audit_sequence(apps, schema_editor) -> None:
+    AuditLogEntry = apps.get_model("core", "AuditLogEntry")
+    BallotChainHead = apps.get_model("core", "BallotChainHead")
+
+    election_ids = AuditLogEntry.objects.order_by().values_list("election_id", flat=True).distinct()
+    for election_id in election_ids.iterator():
+        entries = list(AuditLogEntry.objects.filter(election_id=election_id).order_by("timestamp", "id").only("id"))
+        for sequence, entry in enumerate(entries, start=1):
+            entry.sequence = sequence
+        AuditLogEntry.objects.bulk_update(entries, ["sequence"], batch_size=1000)
+        BallotChainHead.objects.filter(election_id=election_id).update(audit_sequence=len(entries))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0053_election_eligibility_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ballotchainhead",
+            name="audit_sequence",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="auditlogentry",
+            name="sequence",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AlterModelOptions(
+            name="auditlogentry",
+            options={"ordering": ("timestamp", "sequence", "id"), "verbose_name_plural": "Audit log entries"},
+        ),
+        migrations.AddIndex(
+            model_name="auditlogentry",
+            index=models.Index(fields=["election", "sequence"], name="audit_el_seq"),
+        ),
+        migrations.RunPython(_backfill_audit_sequence, migrations.RunPython.noop),
+    ]
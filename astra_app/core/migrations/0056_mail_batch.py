@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0055_election_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MailBatch",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("public_id", models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("csv", "CSV upload"),
+                            ("election_credentials", "Election credentials"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("created_by", models.CharField(blank=True, default="", max_length=255)),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+                ("variables", models.JSONField(blank=True, default=list)),
+                ("example_context", models.JSONField(blank=True, default=dict)),
+                ("recipient_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ("-created_at", "id"),
+            },
+        ),
+        migrations.CreateModel(
+            name="MailBatchRecipient",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("position", models.PositiveIntegerField()),
+                ("context", models.JSONField(default=dict)),
+                (
+                    "batch",
+                    models.ForeignKey(
+                        on_delete=models.deletion.CASCADE,
+                        related_name="recipients",
+                        to="core.mailbatch",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("batch", "position"),
+                "constraints": [
+                    models.UniqueConstraint(fields=("batch", "position"), name="mail_batch_recipient_position")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0056_mail_batch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingVoteReceipt",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("freeipa_username", models.CharField(max_length=255)),
+                ("nonce", models.CharField(max_length=64)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "ballot",
+                    models.ForeignKey(
+                        on_delete=models.deletion.CASCADE,
+                        related_name="+",
+                        to="core.ballot",
+                    ),
+                ),
+                (
+                    "election",
+                    models.ForeignKey(
+                        on_delete=models.deletion.CASCADE,
+                        related_name="pending_vote_receipts",
+                        to="core.election",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("id",),
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from django.db import migrations
+from django.db.migrations.exceptions import IrreversibleError
+
+import core.models
+
+
+def _pack_rankings(apps, schema_editor) -> None:
+    Ballot = apps.get_model("core", "Ballot")
+
+    batch = []
+    for ballot in Ballot.objects.order_by("id").only("id", "ranking").iterator(chunk_size=1000):
+        ballot.ranking_packed = [int(cid) for cid in ballot.ranking or []]
+        batch.append(ballot)
+        if len(batch) >= 1000:
+            Ballot.objects.bulk_update(batch, ["ranking_packed"])
+            batch = []
+    if batch:
+        Ballot.objects.bulk_update(batch, ["ranking_packed"])
+
+
+def _unpack_rankings(apps, schema_editor) -> None:
+    # Restoring the old column means rewriting `ranking` on every ballot, which the
+    # append-only trigger from 0037 rejects. (The forward step only writes
+    # `ranking_packed`, which that trigger does not guard.)
+    raise IrreversibleError("Ballot rankings can't be unpacked: core_ballot rows are append-only.")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0057_pending_vote_receipt"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ballot",
+            name="ranking_packed",
+            field=core.models.RankingField(blank=True, default=list),
+        ),
+        migrations.RunPython(_pack_rankings, _unpack_rankings),
+        migrations.RemoveField(
+            model_name="ballot",
+            name="ranking",
+        ),
+        migrations.RenameField(
+            model_name="ballot",
+            old_name="ranking_packed",
+            new_name="ranking",
+        ),
+    ]
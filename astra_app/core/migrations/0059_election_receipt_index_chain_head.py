@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0058_ballot_packed_ranking"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="election",
+            name="receipt_index_chain_head",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0059_election_receipt_index_chain_head"),
+        ("post_office", "0013_email_recipient_delivery_status_alter_log_status"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="mailbatch",
+            name="source",
+            field=models.CharField(
+                choices=[
+                    ("csv", "CSV upload"),
+                    ("election_credentials", "Election credentials"),
+                    ("send_mail", "Send Mail recipients"),
+                ],
+                max_length=32,
+            ),
+        ),
+        migrations.CreateModel(
+            name="MailJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("public_id", models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("running", "Running"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        max_length=16,
+                    ),
+                ),
+                ("subject", models.TextField(blank=True, default="")),
+                ("html_content", models.TextField(blank=True, default="")),
+                ("text_content", models.TextField(blank=True, default="")),
+                ("cc", models.JSONField(blank=True, default=list)),
+                ("bcc", models.JSONField(blank=True, default=list)),
+                ("extra_context", models.JSONField(blank=True, default=dict)),
+                ("progress", models.PositiveIntegerField(default=0)),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("sent_count", models.PositiveIntegerField(default=0)),
+                ("failed_count", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True, default="")),
+                ("requested_by", models.CharField(blank=True, default="", max_length=255)),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("heartbeat_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "batch",
+                    models.ForeignKey(
+                        on_delete=models.deletion.CASCADE,
+                        related_name="jobs",
+                        to="core.mailbatch",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("id",),
+                "indexes": [models.Index(fields=["status", "id"], name="mail_job_status")],
+            },
+        ),
+        migrations.CreateModel(
+            name="MailJobRecipient",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("position", models.PositiveIntegerField()),
+                ("email_address", models.CharField(blank=True, default="", max_length=255)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("queued", "Queued"), ("skipped", "Skipped"), ("failed", "Failed")],
+                        max_length=16,
+                    ),
+                ),
+                ("error", models.TextField(blank=True, default="")),
+                (
+                    "email",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=models.deletion.SET_NULL,
+                        related_name="+",
+                        to="post_office.email",
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=models.deletion.CASCADE,
+                        related_name="outcomes",
+                        to="core.mailjob",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("job", "position"),
+                "constraints": [
+                    models.UniqueConstraint(fields=("job", "position"), name="mail_job_recipient_position")
+                ],
+            },
+        ),
+    ]
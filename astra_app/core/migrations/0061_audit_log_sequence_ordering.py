@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0060_mail_job"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="auditlogentry",
+            options={"ordering": ("election", "sequence", "id"), "verbose_name_plural": "Audit log entries"},
+        ),
+    ]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+def _link_credential_batches(apps, schema_editor) -> None:
+    MailBatch = apps.get_model("core", "MailBatch")
+    Election = apps.get_model("core", "Election")
+
+    election_ids = set(Election.objects.values_list("id", flat=True))
+    for batch in MailBatch.objects.filter(source="election_credentials", election__isnull=True).only(
+        "id", "example_context"
+    ):
+        raw_id = str((batch.example_context or {}).get("election_id") or "").strip()
+        if raw_id.isdigit() and int(raw_id) in election_ids:
+            batch.election_id = int(raw_id)
+            batch.save(update_fields=["election"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0061_audit_log_sequence_ordering"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mailbatch",
+            name="election",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=models.deletion.CASCADE,
+                related_name="mail_batches",
+                to="core.election",
+            ),
+        ),
+        migrations.RunPython(_link_credential_batches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+import core.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0062_mail_batch_election"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="election",
+            name="merkle_tree_file",
+            field=models.FileField(
+                blank=True,
+                default="",
+                upload_to=core.models.election_artifact_upload_to,
+            ),
+        ),
+    ]
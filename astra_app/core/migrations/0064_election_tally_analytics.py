@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0063_election_merkle_tree_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="election",
+            name="tally_analytics",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import base64
 import datetime
 import hashlib
 import json
@@ -18,6 +19,8 @@ from django.db.models import Q
 from django.utils import timezone
 from PIL import Image
 
+from core.elections_meek import pack_ranking, unpack_ranking
+
 
 def organization_logo_upload_to(instance: Organization, filename: str) -> str:
     # Always store organizations' logos with a deterministic name.
@@ -1011,6 +1014,8 @@ class Election(models.Model):
 
     # Published machine-readable tally output.
     tally_result = models.JSONField(blank=True, default=dict)
+    # Ballot statistics computed by the tally (see core.elections_analytics).
+    tally_analytics = models.JSONField(blank=True, default=dict)
 
     public_ballots_file = models.FileField(
         upload_to=election_artifact_upload_to,
@@ -1022,7 +1027,15 @@ class Election(models.Model):
         blank=True,
         default="",
     )
+    # Merkle tree over the final ballots, written at close (see ballot_inclusion_proof).
+    merkle_tree_file = models.FileField(
+        upload_to=election_artifact_upload_to,
+        blank=True,
+        default="",
+    )
     artifacts_generated_at = models.DateTimeField(blank=True, null=True)
+    # Chain head the published receipt index was built for (see core.elections_receipt_index).
+    receipt_index_chain_head = models.CharField(max_length=64, blank=True, default="")
 
     # Per-election voting credential email configuration.
     # We snapshot the subject/body at election configuration time so the election can
@@ -1115,6 +1128,52 @@ class ExclusionGroupCandidate(models.Model):
         return f"{self.exclusion_group_id}:{self.candidate_id}"
 
 
+class ElectionEligibilitySnapshot(models.Model):
+    """Materialized electorate of an election for one eligible-group filter.
+
+    Computing eligibility means aggregating memberships and sponsorships and
+    expanding a FreeIPA group, so readers reuse this until its inputs change or
+    it ages past ELECTION_ELIGIBILITY_SNAPSHOT_MAX_AGE.
+    """
+
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name="eligibility_snapshots")
+    eligible_group_cn = models.CharField(max_length=255, blank=True, default="")
+    # Inputs the snapshot was computed from; a change to either makes it stale.
+    start_datetime = models.DateTimeField()
+    membership_cutoff = models.DateTimeField()
+    voter_count = models.PositiveIntegerField(default=0)
+    vote_weight_total = models.PositiveBigIntegerField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["election", "eligible_group_cn"],
+                name="uniq_eligibilitysnapshot_election_group",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.election_id}:{self.eligible_group_cn or '*'}"
+
+
+class ElectionEligibleVoter(models.Model):
+    snapshot = models.ForeignKey(ElectionEligibilitySnapshot, on_delete=models.CASCADE, related_name="voters")
+    username = models.CharField(max_length=255)
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["snapshot", "username"],
+                name="uniq_eligiblevoter_snapshot_username",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.snapshot_id}:{self.username}"
+
+
 class VotingCredential(models.Model):
     election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name="credentials")
     public_id = models.CharField(max_length=128, unique=True, db_index=True)
@@ -1142,6 +1201,44 @@ class VotingCredential(models.Model):
         return secrets.token_urlsafe(32)
 
 
+class RankingField(models.BinaryField):
+    """An ordered list of candidate PKs, stored as packed little-endian int32s.
+
+    Python code sees a list of ints. The raw bytes are 4 bytes per candidate,
+    compare and GROUP BY as whole rankings, and `compile_ballots` reads them
+    without decoding each ID.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        kwargs.setdefault("default", list)
+        super().__init__(*args, **kwargs)
+
+    def from_db_value(self, value, expression, connection) -> list[int]:
+        if value is None:
+            return []
+        return unpack_ranking(value).tolist()
+
+    @override
+    def to_python(self, value):
+        if isinstance(value, list):
+            return value
+        if isinstance(value, str):
+            value = base64.b64decode(value.encode("ascii"))
+        if isinstance(value, bytes | bytearray | memoryview):
+            return unpack_ranking(value).tolist()
+        return super().to_python(value)
+
+    @override
+    def get_prep_value(self, value):
+        if isinstance(value, list | tuple):
+            value = pack_ranking(int(cid) for cid in value)
+        return super().get_prep_value(value)
+
+    @override
+    def value_to_string(self, obj) -> str:
+        return base64.b64encode(pack_ranking(self.value_from_object(obj))).decode("ascii")
+
+
 class Ballot(models.Model):
     election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name="ballots")
 
@@ -1149,7 +1246,7 @@ class Ballot(models.Model):
     credential_public_id = models.CharField(max_length=128, db_index=True)
 
     # Ordered list of Candidate PKs.
-    ranking = models.JSONField(blank=True, default=list)
+    ranking = RankingField(blank=True)
     weight = models.PositiveIntegerField(default=0)
 
     superseded_by = models.ForeignKey(
@@ -1209,25 +1306,279 @@ class Ballot(models.Model):
         return hashlib.sha256(data).hexdigest()
 
 
+class BallotChainHead(models.Model):
+    """Tip of an election's ballot hash chain, plus its turnout counters.
+
+    Ballot submission locks only this row while appending to the chain, so
+    concurrent voters are serialized for the append alone rather than for the
+    whole submission. The participation and eligibility counters are kept in
+    step under the same lock, so quorum status is a single-row read.
+    """
+
+    election = models.OneToOneField(
+        Election,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="ballot_chain_head",
+    )
+    chain_hash = models.CharField(max_length=64)
+    # Number of ballots appended to the chain, including superseded ones.
+    sequence = models.PositiveBigIntegerField(default=0)
+    # Non-superseded ballots and their total weight.
+    participating_voter_count = models.PositiveIntegerField(default=0)
+    participating_vote_weight_total = models.PositiveBigIntegerField(default=0)
+    # Issued credentials with a positive weight, and their total weight.
+    eligible_voter_count = models.PositiveIntegerField(default=0)
+    eligible_vote_weight_total = models.PositiveBigIntegerField(default=0)
+    # Set once, by the ballot that first met the quorum.
+    quorum_reached_at = models.DateTimeField(null=True, blank=True)
+    # Last sequence number handed out to the election's audit log entries.
+    audit_sequence = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"ballot-chain:{self.election_id}:{self.sequence}"
+
+
 class AuditLogEntry(models.Model):
     election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name="audit_log")
     timestamp = models.DateTimeField(auto_now_add=True)
     event_type = models.CharField(max_length=64)
     payload = models.JSONField(blank=True, default=dict)
     is_public = models.BooleanField(default=False)
+    # Per-election position in the log, handed out by the chain head row.
+    # Entries written in one batch keep the order they were logged in.
+    sequence = models.PositiveBigIntegerField(default=0)
 
     class Meta:
         verbose_name_plural = "Audit log entries"
-        ordering = ("timestamp", "id")
+        ordering = ("election", "sequence", "id")
         indexes = [
             models.Index(fields=["election", "timestamp"], name="audit_el_ts"),
             models.Index(fields=["election", "is_public"], name="audit_el_pub"),
+            models.Index(fields=["election", "sequence"], name="audit_el_seq"),
         ]
 
     def __str__(self) -> str:
         return f"{self.election_id}:{self.event_type}"
 
 
+class ElectionJob(models.Model):
+    """A long-running election operation, queued by the UI and run by `run_election_jobs`.
+
+    Workers claim queued rows with SELECT ... FOR UPDATE SKIP LOCKED. Handlers
+    are idempotent and keep their resume state in `result`, so a job whose
+    worker died can be claimed again once its heartbeat goes stale.
+    """
+
+    class Kind(models.TextChoices):
+        close = "close", "Close"
+        tally = "tally", "Tally"
+        issue_credentials = "issue_credentials", "Issue credentials"
+        email_credentials = "email_credentials", "Issue and email credentials"
+        credential_mail = "credential_mail", "Prepare credential reminders"
+
+    class Status(models.TextChoices):
+        queued = "queued", "Queued"
+        running = "running", "Running"
+        succeeded = "succeeded", "Succeeded"
+        failed = "failed", "Failed"
+
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name="jobs")
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.queued)
+    params = models.JSONField(blank=True, default=dict)
+    result = models.JSONField(blank=True, default=dict)
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    requested_by = models.CharField(max_length=255, blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("id",)
+        indexes = [
+            models.Index(fields=["status", "id"], name="election_job_status"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["election", "kind"],
+                condition=Q(status__in=["queued", "running"]),
+                name="election_job_one_active",
+            ),
+        ]
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in {self.Status.queued, self.Status.running}
+
+    def __str__(self) -> str:
+        return f"election-job:{self.pk}:{self.election_id}:{self.kind}"
+
+
+class PendingVoteReceipt(models.Model):
+    """A vote receipt email waiting to be sent, written in the ballot's transaction.
+
+    `send_vote_receipts` renders and queues the email, then deletes the row, so
+    the nonce (which is never stored on the ballot) only lives here until then.
+    Closing the election deletes whatever is left.
+    """
+
+    election = models.ForeignKey(Election, on_delete=models.CASCADE, related_name="pending_vote_receipts")
+    ballot = models.ForeignKey(Ballot, on_delete=models.CASCADE, related_name="+")
+    freeipa_username = models.CharField(max_length=255)
+    nonce = models.CharField(max_length=64)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ("id",)
+
+    def __str__(self) -> str:
+        return f"pending-vote-receipt:{self.pk}:{self.election_id}"
+
+
+class MailBatch(models.Model):
+    """A Send Mail recipient list, stored server-side and referenced by ID.
+
+    CSV uploads and election credential reminders can run to thousands of rows;
+    the session only holds `public_id`, and rows are read back a page at a time.
+    Credential reminder batches belong to their election and are deleted when
+    it is anonymized.
+    """
+
+    class Source(models.TextChoices):
+        csv = "csv", "CSV upload"
+        election_credentials = "election_credentials", "Election credentials"
+        send_mail = "send_mail", "Send Mail recipients"
+
+    public_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    source = models.CharField(max_length=32, choices=Source.choices)
+    election = models.ForeignKey(
+        Election,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="mail_batches",
+    )
+    created_by = models.CharField(max_length=255, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Ordered template variable names, e.g. CSV headers as identifiers.
+    variables = models.JSONField(blank=True, default=list)
+    # The row with the most variables filled in, for previews.
+    example_context = models.JSONField(blank=True, default=dict)
+    recipient_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ("-created_at", "id")
+
+    def __str__(self) -> str:
+        return f"mail-batch:{self.public_id}"
+
+
+class MailBatchRecipient(models.Model):
+    batch = models.ForeignKey(MailBatch, on_delete=models.CASCADE, related_name="recipients")
+    position = models.PositiveIntegerField()
+    context = models.JSONField(default=dict)
+
+    class Meta:
+        ordering = ("batch", "position")
+        constraints = [
+            models.UniqueConstraint(fields=["batch", "position"], name="mail_batch_recipient_position"),
+        ]
+
+    def __str__(self) -> str:
+        return f"mail-batch-recipient:{self.batch_id}:{self.position}"
+
+
+class MailJob(models.Model):
+    """A Send Mail delivery, queued by the Send Mail page and run by `run_mail_jobs`.
+
+    The message is a snapshot of the form as it was sent; recipients are read
+    from `batch`. The worker renders a batch of recipients at a time and
+    queues the post_office emails in the same transaction as their
+    `MailJobRecipient` outcomes, so a job claimed again after its worker died
+    resumes after the last recorded position without queueing anyone twice.
+    """
+
+    class Status(models.TextChoices):
+        queued = "queued", "Queued"
+        running = "running", "Running"
+        succeeded = "succeeded", "Succeeded"
+        failed = "failed", "Failed"
+
+    public_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    batch = models.ForeignKey(MailBatch, on_delete=models.CASCADE, related_name="jobs")
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.queued)
+    subject = models.TextField(blank=True, default="")
+    html_content = models.TextField(blank=True, default="")
+    text_content = models.TextField(blank=True, default="")
+    cc = models.JSONField(blank=True, default=list)
+    bcc = models.JSONField(blank=True, default=list)
+    # Form variables; a recipient's own values take precedence.
+    extra_context = models.JSONField(blank=True, default=dict)
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    requested_by = models.CharField(max_length=255, blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ("id",)
+        indexes = [
+            models.Index(fields=["status", "id"], name="mail_job_status"),
+        ]
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in {self.Status.queued, self.Status.running}
+
+    def __str__(self) -> str:
+        return f"mail-job:{self.public_id}"
+
+
+class MailJobRecipient(models.Model):
+    """What a mail job did with the recipient at `position` in its batch."""
+
+    class Status(models.TextChoices):
+        queued = "queued", "Queued"
+        skipped = "skipped", "Skipped"
+        failed = "failed", "Failed"
+
+    job = models.ForeignKey(MailJob, on_delete=models.CASCADE, related_name="outcomes")
+    position = models.PositiveIntegerField()
+    email_address = models.CharField(max_length=255, blank=True, default="")
+    status = models.CharField(max_length=16, choices=Status.choices)
+    email = models.ForeignKey(
+        "post_office.Email",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    error = models.TextField(blank=True, default="")
+
+    class Meta:
+        ordering = ("job", "position")
+        constraints = [
+            models.UniqueConstraint(fields=["job", "position"], name="mail_job_recipient_position"),
+        ]
+
+    def __str__(self) -> str:
+        return f"mail-job-recipient:{self.job_id}:{self.position}"
+
+
 class FreeIPAPermissionGrant(models.Model):
     """Grant an arbitrary Django permission string to a FreeIPA user or group.
 
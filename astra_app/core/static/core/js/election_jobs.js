@@ -0,0 +1,53 @@
+(function () {
+  var POLL_INTERVAL_MS = 2000;
+
+  function pollElectionJobs() {
+    var rows = Array.prototype.slice.call(document.querySelectorAll('.js-election-job[data-status-url]'));
+    if (!rows.length) return;
+
+    var pending = rows.length;
+    var anyFinished = false;
+
+    rows.forEach(function (row) {
+      fetch(row.getAttribute('data-status-url'), {
+        credentials: 'same-origin',
+        headers: { Accept: 'application/json' },
+      })
+        .then(function (resp) {
+          return resp.ok ? resp.json() : null;
+        })
+        .then(function (job) {
+          if (!job) return;
+
+          var bar = row.querySelector('.js-election-job-bar');
+          var status = row.querySelector('.js-election-job-status');
+          if (bar) {
+            bar.style.width = (job.active ? job.percent : 100) + '%';
+            bar.setAttribute('aria-valuenow', String(job.progress));
+            bar.setAttribute('aria-valuemax', String(job.total));
+          }
+          if (status) {
+            status.textContent = job.total ? job.status + ' (' + job.progress + '/' + job.total + ')' : job.status;
+          }
+          if (!job.active) anyFinished = true;
+        })
+        .catch(function () {})
+        .finally(function () {
+          pending -= 1;
+          if (pending > 0) return;
+          // A finished job changes the election (status, results, links): reload to show it.
+          if (anyFinished) {
+            window.location.reload();
+          } else {
+            window.setTimeout(pollElectionJobs, POLL_INTERVAL_MS);
+          }
+        });
+    });
+  }
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', pollElectionJobs);
+  } else {
+    pollElectionJobs();
+  }
+})();
@@ -285,7 +285,59 @@
     return false;
   }
 
+  function initBatchRecipientsPager() {
+    var container = $('send-mail-batch-recipients');
+    var prev = $('send-mail-batch-prev');
+    var next = $('send-mail-batch-next');
+    if (!container || !prev || !next) return;
+
+    var numPages = parseInt(container.getAttribute('data-num-pages') || '1', 10) || 1;
+
+    async function loadPage(page) {
+      if (page < 1 || page > numPages) return;
+      prev.disabled = true;
+      next.disabled = true;
+      try {
+        var url = container.getAttribute('data-url') + '?page=' + encodeURIComponent(String(page));
+        var resp = await window.fetch(url, { headers: { 'Accept': 'application/json' } });
+        if (!resp.ok) throw new Error('HTTP ' + resp.status);
+        var payload = await resp.json();
+
+        var tbody = $('send-mail-batch-recipients-rows');
+        tbody.textContent = '';
+        (payload.rows || []).forEach(function (row) {
+          var tr = document.createElement('tr');
+          row.forEach(function (value) {
+            var td = document.createElement('td');
+            td.textContent = String(value == null ? '' : value);
+            tr.appendChild(td);
+          });
+          tbody.appendChild(tr);
+        });
+
+        numPages = payload.num_pages || numPages;
+        container.setAttribute('data-page', String(payload.page));
+        var label = $('send-mail-batch-page-label');
+        if (label) label.textContent = 'Page ' + payload.page + ' of ' + numPages;
+      } catch (_e) {
+        /* keep the current page */
+      }
+      var current = parseInt(container.getAttribute('data-page') || '1', 10) || 1;
+      prev.disabled = current <= 1;
+      next.disabled = current >= numPages;
+    }
+
+    prev.addEventListener('click', function () {
+      loadPage((parseInt(container.getAttribute('data-page') || '1', 10) || 1) - 1);
+    });
+    next.addEventListener('click', function () {
+      loadPage((parseInt(container.getAttribute('data-page') || '1', 10) || 1) + 1);
+    });
+  }
+
   function onReady() {
+    initBatchRecipientsPager();
+
     document.addEventListener('templated-email-compose:save-confirmed', function () {
       setAction('save');
       var form = $('send-mail-form');
@@ -0,0 +1,48 @@
+(function () {
+  var POLL_INTERVAL_MS = 2000;
+
+  function pollSendMailJob() {
+    var card = document.getElementById('send-mail-job');
+    if (!card || !card.getAttribute('data-status-url')) return;
+
+    fetch(card.getAttribute('data-status-url'), {
+      credentials: 'same-origin',
+      headers: { Accept: 'application/json' },
+    })
+      .then(function (resp) {
+        return resp.ok ? resp.json() : null;
+      })
+      .then(function (job) {
+        if (!job) return;
+
+        var bar = card.querySelector('.js-send-mail-job-bar');
+        var status = card.querySelector('.js-send-mail-job-status');
+        var counts = card.querySelector('.js-send-mail-job-counts');
+        var error = card.querySelector('.js-send-mail-job-error');
+        if (bar) {
+          bar.style.width = (job.active ? job.percent : 100) + '%';
+          bar.setAttribute('aria-valuenow', String(job.progress));
+          bar.setAttribute('aria-valuemax', String(job.total));
+          if (job.status === 'succeeded') bar.classList.add('bg-success');
+          if (job.status === 'failed') bar.classList.add('bg-danger');
+        }
+        if (status) status.textContent = job.status_label;
+        if (counts) {
+          counts.textContent =
+            'Queued ' + job.sent + ' of ' + job.total + (job.failed ? '; ' + job.failed + ' failed' : '');
+        }
+        if (error) error.textContent = job.error || '';
+        if (!job.active) card.removeAttribute('data-status-url');
+      })
+      .catch(function () {})
+      .finally(function () {
+        if (card.getAttribute('data-status-url')) window.setTimeout(pollSendMailJob, POLL_INTERVAL_MS);
+      });
+  }
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', pollSendMailJob);
+  } else {
+    pollSendMailJob();
+  }
+})();
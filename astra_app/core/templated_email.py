@@ -5,6 +5,7 @@ import tempfile
 from collections.abc import Iterable, Mapping
 from email import policy
 from email.message import EmailMessage
+from functools import lru_cache
 from pathlib import PurePosixPath
 from urllib.parse import urlsplit
 
@@ -12,7 +13,7 @@ from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage
 from django.http import HttpRequest, JsonResponse
-from django.template import Context, Template, engines
+from django.template import engines
 from django.template.exceptions import TemplateSyntaxError
 from post_office.models import EmailTemplate
 
@@ -355,6 +356,31 @@ def placeholderize_empty_values(context: Mapping[str, object]) -> dict[str, obje
     return out
 
 
+@lru_cache(maxsize=settings.EMAIL_TEMPLATE_CACHE_SIZE)
+def _compiled_template(using: str, source: str):
+    return engines[using].from_string(source)
+
+
+def compiled_template(source: str, *, using: str = "post_office"):
+    """Compiled template for `source`, shared by every render of the same text.
+
+    Compiled templates are kept in a per-process LRU keyed by engine and
+    source, so a template is parsed once rather than once per recipient or per
+    preview keystroke. Sources with inline_image tags are compiled afresh each
+    time: post_office's template collects the images it renders, which must
+    not leak between messages.
+    """
+
+    if _INLINE_IMAGE_TAG_PATTERN.search(source):
+        return engines[using].from_string(source)
+    return _compiled_template(using, source)
+
+
+def compiled_template_cache_stats() -> dict[str, int]:
+    info = _compiled_template.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize or 0}
+
+
 def render_template_string(value: str, context: Mapping[str, object]) -> str:
     """Render a Django template string with a plain context.
 
@@ -370,14 +396,14 @@ def render_template_string(value: str, context: Mapping[str, object]) -> str:
 
     if post_office_engine is not None:
         try:
-            return post_office_engine.from_string(value or "").render(dict(context))
+            return compiled_template(value or "").render(dict(context))
         except TemplateSyntaxError as exc:
             raise ValueError(str(exc)) from exc
         except Exception as exc:
             raise ValueError(str(exc)) from exc
 
     try:
-        return Template(value or "").render(Context(dict(context)))
+        return compiled_template(value or "", using="django").render(dict(context))
     except TemplateSyntaxError as exc:
         raise ValueError(str(exc)) from exc
 
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
 import datetime
+import io
 from unittest.mock import patch
 
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
 
 from core.backends import FreeIPAUser
-from core.models import AuditLogEntry, Ballot, Candidate, Election, Membership, MembershipType, VotingCredential
+from core.models import (
+    AuditLogEntry,
+    Ballot,
+    Candidate,
+    Election,
+    ElectionJob,
+    Membership,
+    MembershipType,
+    VotingCredential,
+)
 from core.tests.ballot_chain import compute_chain_hash
 from core.tokens import election_genesis_chain_hash
 
@@ -49,6 +60,8 @@ class AdminElectionLifecycleActionTests(TestCase):
                 },
                 follow=False,
             )
+            self.assertEqual(ElectionJob.objects.filter(election=election, status="queued").count(), 1)
+            call_command("run_election_jobs", stdout=io.StringIO())
 
         self.assertEqual(resp.status_code, 302)
         election.refresh_from_db()
@@ -102,6 +115,8 @@ class AdminElectionLifecycleActionTests(TestCase):
                 },
                 follow=False,
             )
+            self.assertEqual(ElectionJob.objects.filter(election=election, status="queued").count(), 1)
+            call_command("run_election_jobs", stdout=io.StringIO())
 
         self.assertEqual(resp.status_code, 302)
         election.refresh_from_db()
@@ -162,6 +177,8 @@ class AdminElectionLifecycleActionTests(TestCase):
                 },
                 follow=False,
             )
+            self.assertEqual(ElectionJob.objects.filter(election=election, status="queued").count(), 1)
+            call_command("run_election_jobs", stdout=io.StringIO())
 
         self.assertEqual(resp.status_code, 302)
         self.assertTrue(VotingCredential.objects.filter(election=election, freeipa_username="voter1").exists())
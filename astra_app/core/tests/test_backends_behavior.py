@@ -56,6 +56,31 @@ class FreeIPABackendBehaviorTests(TestCase):
             if isinstance(key, str):
                 self.assertFalse(key.startswith("freeipa_session_uid_"))
 
+    def test_get_many_uses_cache_and_one_batch_call_for_misses(self) -> None:
+        from django.core.cache import cache
+
+        cache.clear()
+        cache.set("freeipa_user_alice", {"uid": ["alice"], "mail": ["alice@example.com"]})
+
+        client = patch("core.backends.FreeIPAUser.get_client").start()
+        self.addCleanup(patch.stopall)
+        client.return_value.batch.return_value = {
+            "count": 2,
+            "results": [
+                {"result": {"uid": ["bob"], "mail": ["bob@example.com"]}, "error": None},
+                {"result": None, "error": "carol: user not found", "error_code": 4001},
+            ],
+        }
+
+        users = FreeIPAUser.get_many(["alice", "bob", "carol", "alice", ""])
+
+        self.assertEqual(sorted(users), ["alice", "bob"])
+        self.assertEqual(users["bob"].email, "bob@example.com")
+        client.return_value.batch.assert_called_once()
+        methods = client.return_value.batch.call_args.kwargs["a_methods"]
+        self.assertEqual([m["params"][0] for m in methods], [["bob"], ["carol"]])
+        self.assertEqual(cache.get("freeipa_user_bob"), {"uid": ["bob"], "mail": ["bob@example.com"]})
+
     def test_get_user_is_intentionally_disabled(self):
         backend = FreeIPAAuthBackend()
         self.assertIsNone(backend.get_user(123))
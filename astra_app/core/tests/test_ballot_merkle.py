@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import hashlib
+
+from django.test import SimpleTestCase
+
+from core.ballot_merkle import (
+    EMPTY_ROOT,
+    inclusion_proof,
+    merkle_levels,
+    merkle_root,
+    verify_inclusion_proof,
+)
+
+
+class BallotMerkleTreeTests(SimpleTestCase):
+    def _hashes(self, n: int) -> list[str]:
+        return [hashlib.sha256(f"ballot-{i}".encode()).hexdigest() for i in range(n)]
+
+    def test_every_leaf_has_a_logarithmic_proof_for_all_tree_shapes(self) -> None:
+        for n in range(1, 34):
+            hashes = self._hashes(n)
+            levels = merkle_levels(hashes)
+            root = merkle_root(levels)
+            for index, ballot_hash in enumerate(hashes):
+                path = inclusion_proof(levels, index)
+                self.assertLessEqual(len(path), max(1, (n - 1).bit_length()))
+                self.assertTrue(verify_inclusion_proof(ballot_hash=ballot_hash, path=path, root=root), (n, index))
+
+    def test_proof_rejects_other_ballots_and_tampered_paths(self) -> None:
+        hashes = self._hashes(7)
+        levels = merkle_levels(hashes)
+        root = merkle_root(levels)
+        path = inclusion_proof(levels, 3)
+
+        self.assertFalse(verify_inclusion_proof(ballot_hash=hashes[4], path=path, root=root))
+
+        swapped = [{**step, "side": "left" if step["side"] == "right" else "right"} for step in path]
+        self.assertFalse(verify_inclusion_proof(ballot_hash=hashes[3], path=swapped, root=root))
+
+        # An inner node must not be accepted as a leaf.
+        self.assertFalse(verify_inclusion_proof(ballot_hash=levels[1][0], path=inclusion_proof(levels, 0)[1:], root=root))
+
+    def test_empty_tree_has_fixed_root(self) -> None:
+        self.assertEqual(merkle_root(merkle_levels([])), EMPTY_ROOT)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import datetime
 from unittest.mock import patch
 
+from django.core.files.storage import default_storage
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -215,3 +216,183 @@ class BallotVerificationPageTests(TestCase):
         self.assertContains(resp, "replaced")
         # Must not leak the replacement receipt.
         self.assertNotContains(resp, ballot2.ballot_hash)
+
+    def test_verify_serves_merkle_inclusion_proof_for_final_ballots_of_closed_elections(self) -> None:
+        from core.ballot_merkle import merkle_levels, merkle_root, verify_inclusion_proof
+        from core.models import AuditLogEntry
+
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Proof election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=10),
+            end_datetime=now - datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.closed,
+        )
+        c1 = Candidate.objects.create(election=election, freeipa_username="alice", nominated_by="n")
+
+        previous_chain_hash = election_genesis_chain_hash(election.id)
+        ballots: list[Ballot] = []
+        for i in range(5):
+            ballot = self._create_ballot(
+                election=election,
+                credential_public_id=f"cred-{i}",
+                ranking=[c1.id],
+                weight=1,
+                previous_chain_hash=previous_chain_hash,
+                created_at=timezone.make_aware(datetime.datetime(2026, 1, 2, 12, i)),
+            )
+            previous_chain_hash = ballot.chain_hash
+            ballots.append(ballot)
+
+        root = merkle_root(merkle_levels([b.ballot_hash for b in ballots]))
+        AuditLogEntry.objects.create(
+            election=election,
+            event_type="election_closed",
+            payload={"chain_head": previous_chain_hash, "merkle_root": root, "merkle_leaf_count": 5},
+            is_public=True,
+        )
+
+        resp = self.client.get(reverse("ballot-verify-proof"), data={"receipt": ballots[2].ballot_hash})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["root"], root)
+        self.assertEqual(data["published_root"], root)
+        self.assertEqual(data["leaf_count"], 5)
+        self.assertLessEqual(len(data["path"]), 3)
+        self.assertTrue(verify_inclusion_proof(ballot_hash=ballots[2].ballot_hash, path=data["path"], root=root))
+
+        page = self.client.get(reverse("ballot-verify"), data={"receipt": ballots[2].ballot_hash})
+        self.assertContains(page, "Inclusion proof")
+        self.assertContains(page, "matches the audit log")
+
+        self.assertEqual(self.client.get(reverse("ballot-verify-proof"), data={"receipt": "0" * 64}).status_code, 404)
+
+    def test_closed_election_proofs_are_read_from_the_tree_stored_at_close(self) -> None:
+        from core.ballot_merkle import merkle_levels, merkle_root, verify_inclusion_proof
+        from core.elections_services import _store_merkle_tree, _stored_merkle_tree
+        from core.models import AuditLogEntry
+
+        _stored_merkle_tree.cache_clear()
+        self.addCleanup(_stored_merkle_tree.cache_clear)
+
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Stored tree election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=10),
+            end_datetime=now - datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.closed,
+        )
+        c1 = Candidate.objects.create(election=election, freeipa_username="alice", nominated_by="n")
+
+        previous_chain_hash = election_genesis_chain_hash(election.id)
+        ballots: list[Ballot] = []
+        for i in range(4):
+            ballot = self._create_ballot(
+                election=election,
+                credential_public_id=f"cred-{i}",
+                ranking=[c1.id],
+                weight=1,
+                previous_chain_hash=previous_chain_hash,
+                created_at=timezone.make_aware(datetime.datetime(2026, 1, 2, 12, i)),
+            )
+            previous_chain_hash = ballot.chain_hash
+            ballots.append(ballot)
+
+        levels = merkle_levels([b.ballot_hash for b in ballots])
+        root = merkle_root(levels)
+        _store_merkle_tree(election=election, chain_head=previous_chain_hash, levels=levels)
+        AuditLogEntry.objects.create(
+            election=election,
+            event_type="election_closed",
+            payload={"chain_head": previous_chain_hash, "merkle_root": root, "merkle_leaf_count": 4},
+            is_public=True,
+        )
+
+        # The ballot and the published root; the tree itself comes from storage, once.
+        with patch("core.elections_services.default_storage.open", wraps=default_storage.open) as storage_open:
+            for ballot in ballots:
+                with self.assertNumQueries(2):
+                    resp = self.client.get(reverse("ballot-verify-proof"), data={"receipt": ballot.ballot_hash})
+                data = resp.json()
+                self.assertEqual(data["root"], root)
+                self.assertTrue(verify_inclusion_proof(ballot_hash=ballot.ballot_hash, path=data["path"], root=root))
+        self.assertEqual(storage_open.call_count, 1)
+
+    def test_tallied_election_receipts_are_answered_from_the_published_index(self) -> None:
+        from core.ballot_merkle import merkle_levels, merkle_root, verify_inclusion_proof
+        from core.elections_receipt_index import _stored_shard, publish_receipt_index
+        from core.models import AuditLogEntry
+
+        _stored_shard.cache_clear()
+        self.addCleanup(_stored_shard.cache_clear)
+
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Indexed election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=10),
+            end_datetime=now - datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.tallied,
+            tally_result={"quota": "1", "elected": [], "eliminated": [], "forced_excluded": [], "rounds": []},
+        )
+        c1 = Candidate.objects.create(election=election, freeipa_username="alice", nominated_by="n")
+
+        previous_chain_hash = election_genesis_chain_hash(election.id)
+        ballots: list[Ballot] = []
+        for i in range(3):
+            ballot = self._create_ballot(
+                election=election,
+                credential_public_id=f"cred-{i}",
+                ranking=[c1.id],
+                weight=1,
+                previous_chain_hash=previous_chain_hash,
+                created_at=timezone.make_aware(datetime.datetime(2026, 1, 2, 12, i)),
+            )
+            previous_chain_hash = ballot.chain_hash
+            ballots.append(ballot)
+
+        root = merkle_root(merkle_levels([b.ballot_hash for b in ballots]))
+        AuditLogEntry.objects.create(
+            election=election,
+            event_type="election_closed",
+            payload={"chain_head": previous_chain_hash, "merkle_root": root, "merkle_leaf_count": 3},
+            is_public=True,
+        )
+        publish_receipt_index(election=election)
+        election.refresh_from_db()
+        self.assertEqual(election.receipt_index_chain_head, previous_chain_hash)
+
+        # One indexed query finds the election; the proof and root come from its shard.
+        with self.assertNumQueries(2):
+            page = self.client.get(reverse("ballot-verify"), data={"receipt": ballots[1].ballot_hash})
+            proof = self.client.get(reverse("ballot-verify-proof"), data={"receipt": ballots[1].ballot_hash})
+
+        self.assertContains(page, "Indexed election")
+        self.assertContains(page, "included in the final")
+        self.assertContains(page, "2026-01-02")
+        self.assertContains(page, "matches the audit log")
+        self.assertContains(page, reverse("election-public-ballots", args=[election.id]))
+        self.assertIn("max-age=", page["Cache-Control"])
+        self.assertIn("public", page["Cache-Control"])
+
+        data = proof.json()
+        self.assertEqual(data["published_root"], root)
+        self.assertTrue(verify_inclusion_proof(ballot_hash=ballots[1].ballot_hash, path=data["path"], root=root))
+
+        # Shards are read from storage once per process, then reused.
+        _stored_shard.cache_clear()
+        with patch("core.elections_receipt_index.default_storage.open", wraps=default_storage.open) as storage_open:
+            for ballot in ballots:
+                page = self.client.get(reverse("ballot-verify"), data={"receipt": ballot.ballot_hash})
+                self.assertContains(page, "included in the final")
+        self.assertEqual(storage_open.call_count, len({b.ballot_hash[:2] for b in ballots}))
+
+        # Receipts outside any indexed election keep the live query path.
+        resp = self.client.get(reverse("ballot-verify"), data={"receipt": "a" * 64})
+        self.assertContains(resp, "No ballot with this receipt")
+        self.assertNotIn("max-age=", resp.get("Cache-Control", ""))
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+class ElectionBenchCommandTests(SimpleTestCase):
+    def test_same_seed_generates_same_election(self) -> None:
+        from core.elections_bench import SyntheticElectionSpec, generate_synthetic_election
+
+        spec = SyntheticElectionSpec(seed=7, candidates=6, seats=2, ballots=50, exclusion_groups=2, scenario="tie-heavy")
+        first = generate_synthetic_election(spec)
+        second = generate_synthetic_election(spec)
+
+        self.assertEqual(first.ballots, second.ballots)
+        self.assertEqual(first.candidates, second.candidates)
+        self.assertEqual(first.exclusion_groups, second.exclusion_groups)
+        self.assertEqual(len(first.ballots), 50)
+        self.assertEqual(len(first.exclusion_groups), 2)
+
+        other = generate_synthetic_election(SyntheticElectionSpec(seed=8, candidates=6, seats=2, ballots=50))
+        self.assertNotEqual(first.ballots, other.ballots)
+
+    def test_engines_agree_and_report_is_json(self) -> None:
+        with TemporaryDirectory() as tmp:
+            out_path = Path(tmp) / "bench.json"
+            stdout = io.StringIO()
+            call_command(
+                "election_bench",
+                "--candidates=5",
+                "--seats=2",
+                "--ballots=60",
+                "--scenario=near-tie",
+                "--exclusion-groups=1",
+                "--repeat=1",
+                f"--output={out_path}",
+                stdout=stdout,
+            )
+            report = json.loads(stdout.getvalue())
+            self.assertEqual(json.loads(out_path.read_text(encoding="utf-8")), report)
+
+            self.assertTrue(report["equivalent"])
+            self.assertEqual(set(report["engines"]), {"dicts", "compiled", "accelerated"})
+            for entry in report["engines"].values():
+                self.assertEqual(len(entry["outcome"]["elected"]), 2)
+                self.assertGreater(entry["iterations"], 0)
+                self.assertGreater(entry["peak_memory_bytes"], 0)
+
+            stdout = io.StringIO()
+            call_command(
+                "election_bench",
+                "--candidates=5",
+                "--seats=2",
+                "--ballots=60",
+                "--scenario=near-tie",
+                "--exclusion-groups=1",
+                "--repeat=1",
+                "--engines=compiled",
+                f"--baseline={out_path}",
+                stdout=stdout,
+            )
+            compared = json.loads(stdout.getvalue())["baseline"]
+            self.assertTrue(compared["same_spec"])
+            self.assertTrue(compared["engines"]["compiled"]["same_outcome"])
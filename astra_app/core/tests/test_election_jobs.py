@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import datetime
+import io
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.backends import FreeIPAUser
+from core.models import Election, ElectionJob, FreeIPAPermissionGrant, VotingCredential
+from core.permissions import ASTRA_ADD_ELECTION
+
+
+class ElectionJobQueueTests(TestCase):
+    def _election(self, *, status: str = Election.Status.open) -> Election:
+        now = timezone.now()
+        return Election.objects.create(
+            name="Job election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=1),
+            end_datetime=now + datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=status,
+        )
+
+    def test_enqueue_reuses_the_active_job_of_the_same_kind(self) -> None:
+        from core.elections_jobs import enqueue_election_job
+
+        election = self._election()
+        first = enqueue_election_job(election=election, kind=ElectionJob.Kind.tally, requested_by="alice")
+        again = enqueue_election_job(election=election, kind=ElectionJob.Kind.tally, requested_by="bob")
+        other = enqueue_election_job(election=election, kind=ElectionJob.Kind.issue_credentials)
+
+        self.assertEqual(first.id, again.id)
+        self.assertNotEqual(first.id, other.id)
+
+        ElectionJob.objects.filter(pk=first.pk).update(status=ElectionJob.Status.failed)
+        retry = enqueue_election_job(election=election, kind=ElectionJob.Kind.tally)
+        self.assertNotEqual(retry.id, first.id)
+
+    @override_settings(ELECTION_JOB_STALE_SECONDS=60, ELECTION_JOB_MAX_ATTEMPTS=2)
+    def test_stale_running_jobs_are_reclaimed_until_attempts_run_out(self) -> None:
+        from core.elections_jobs import claim_next_election_job
+
+        election = self._election()
+        now = timezone.now()
+        fresh = ElectionJob.objects.create(
+            election=election,
+            kind=ElectionJob.Kind.close,
+            status=ElectionJob.Status.running,
+            attempts=1,
+            heartbeat_at=now,
+        )
+        stale = ElectionJob.objects.create(
+            election=election,
+            kind=ElectionJob.Kind.tally,
+            status=ElectionJob.Status.running,
+            attempts=1,
+            heartbeat_at=now - datetime.timedelta(minutes=5),
+        )
+        exhausted = ElectionJob.objects.create(
+            election=election,
+            kind=ElectionJob.Kind.issue_credentials,
+            status=ElectionJob.Status.running,
+            attempts=2,
+            heartbeat_at=now - datetime.timedelta(minutes=5),
+        )
+
+        claimed = claim_next_election_job()
+        assert claimed is not None
+        self.assertEqual(claimed.id, stale.id)
+        self.assertEqual(claimed.attempts, 2)
+
+        self.assertIsNone(claim_next_election_job())
+        exhausted.refresh_from_db()
+        self.assertEqual(exhausted.status, ElectionJob.Status.failed)
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, ElectionJob.Status.running)
+
+    def test_email_credentials_job_resumes_after_the_last_emailed_credential(self) -> None:
+        from core.elections_jobs import run_pending_election_jobs
+
+        election = self._election()
+        for username in ("v1", "v2", "v3"):
+            VotingCredential.objects.create(
+                election=election,
+                public_id=f"cred-{username}",
+                freeipa_username=username,
+                weight=1,
+            )
+        first = VotingCredential.objects.get(election=election, freeipa_username="v1")
+
+        # A previous attempt issued credentials and emailed v1 before its worker died.
+        job = ElectionJob.objects.create(
+            election=election,
+            kind=ElectionJob.Kind.email_credentials,
+            status=ElectionJob.Status.running,
+            attempts=1,
+            heartbeat_at=timezone.now() - datetime.timedelta(hours=1),
+            result={"issued": True, "last_credential_id": first.id, "emailed": 1, "skipped": 0, "failed": 0},
+        )
+
+        def get_user(username: str) -> FreeIPAUser:
+            return FreeIPAUser(username, {"uid": [username], "mail": [f"{username}@example.com"]})
+
+        with (
+            patch("core.backends.FreeIPAUser.get", side_effect=get_user),
+            patch("core.elections_jobs.send_voting_credential_email", autospec=True) as send_mock,
+        ):
+            self.assertEqual(run_pending_election_jobs(), (1, 0))
+
+        self.assertEqual([c.kwargs["username"] for c in send_mock.call_args_list], ["v2", "v3"])
+        job.refresh_from_db()
+        self.assertEqual(job.status, ElectionJob.Status.succeeded)
+        self.assertEqual((job.progress, job.total), (3, 3))
+        self.assertEqual(job.result["emailed"], 3)
+
+    def test_failed_job_records_the_error_and_command_reports_it(self) -> None:
+        from core.elections_jobs import enqueue_election_job
+
+        election = self._election()
+        job = enqueue_election_job(election=election, kind=ElectionJob.Kind.tally)
+
+        stdout = io.StringIO()
+        call_command("run_election_jobs", stdout=stdout)
+
+        self.assertIn("Ran 1 election job(s); failed 1.", stdout.getvalue())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ElectionJob.Status.failed)
+        self.assertEqual(job.error, "election must be closed to tally")
+        self.assertIsNotNone(job.finished_at)
+
+    def test_tally_job_finishes_quietly_when_another_run_tallied_first(self) -> None:
+        from core.elections_jobs import claim_next_election_job, enqueue_election_job, run_election_job
+        from core.models import AuditLogEntry
+
+        election = self._election(status=Election.Status.closed)
+        enqueue_election_job(election=election, kind=ElectionJob.Kind.tally)
+        job = claim_next_election_job()
+        assert job is not None
+
+        # The other run commits between this worker's status read and its tally.
+        def _tallied_by_other_run(instance, *args, **kwargs) -> None:
+            Election.objects.filter(pk=election.pk).update(status=Election.Status.tallied)
+
+        with patch.object(Election, "refresh_from_db", side_effect=_tallied_by_other_run, autospec=True):
+            self.assertTrue(run_election_job(job))
+
+        self.assertEqual(job.status, ElectionJob.Status.succeeded)
+        self.assertFalse(AuditLogEntry.objects.filter(election=election, event_type="tally_completed").exists())
+
+    @override_settings(ELECTION_JOB_HEARTBEAT_SECONDS=0.01)
+    def test_long_handlers_keep_the_heartbeat_fresh(self) -> None:
+        import threading
+
+        from core import elections_jobs
+
+        election = self._election(status=Election.Status.closed)
+        elections_jobs.enqueue_election_job(election=election, kind=ElectionJob.Kind.tally)
+        job = elections_jobs.claim_next_election_job()
+        assert job is not None
+
+        beats = threading.Semaphore(0)
+
+        def _slow_tally(job: ElectionJob) -> None:
+            # Finishes only once the side thread has beaten twice.
+            self.assertTrue(beats.acquire(timeout=5))
+            self.assertTrue(beats.acquire(timeout=5))
+
+        with (
+            patch.object(elections_jobs, "_touch_heartbeat", side_effect=lambda job: beats.release()),
+            patch.dict(elections_jobs._HANDLERS, {ElectionJob.Kind.tally: _slow_tally}),
+        ):
+            self.assertTrue(elections_jobs.run_election_job(job))
+
+    def test_advance_elections_enqueue_only_leaves_jobs_for_the_worker(self) -> None:
+        election = self._election(status=Election.Status.closed)
+        Election.objects.filter(pk=election.pk).update(end_datetime=timezone.now() - datetime.timedelta(hours=1))
+
+        call_command("advance_elections", enqueue_only=True, stdout=io.StringIO())
+
+        job = ElectionJob.objects.get(election=election)
+        self.assertEqual((job.kind, job.status), (ElectionJob.Kind.tally, ElectionJob.Status.queued))
+
+    def test_status_endpoint_requires_manage_permission(self) -> None:
+        election = self._election()
+        job = ElectionJob.objects.create(election=election, kind=ElectionJob.Kind.close, progress=2, total=8)
+        url = reverse("election-job-status", args=[election.id, job.id])
+
+        session = self.client.session
+        session["_freeipa_username"] = "viewer"
+        session.save()
+        viewer = FreeIPAUser("viewer", {"uid": ["viewer"], "memberof_group": []})
+
+        with patch("core.backends.FreeIPAUser.get", return_value=viewer):
+            self.assertEqual(self.client.get(url).status_code, 403)
+
+            FreeIPAPermissionGrant.objects.create(
+                principal_type=FreeIPAPermissionGrant.PrincipalType.user,
+                principal_name="viewer",
+                permission=ASTRA_ADD_ELECTION,
+            )
+            resp = self.client.get(url)
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual((data["status"], data["percent"], data["active"]), ("queued", 25, True))
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import LiveServerTestCase, override_settings
+
+
+@override_settings(DEBUG=True)
+class ElectionLoadTestCommandTests(LiveServerTestCase):
+    def test_drives_votes_resubmissions_and_verifies_chain(self) -> None:
+        from django.contrib.sessions.models import Session
+
+        from core.backends import FreeIPAUser
+        from core.models import Ballot, Election
+
+        def _get_user(username: str) -> FreeIPAUser:
+            return FreeIPAUser(username, {"uid": [username], "memberof_group": []})
+
+        with TemporaryDirectory() as tmp:
+            voters_file = Path(tmp) / "voters.txt"
+            voters_file.write_text("alice\nbob\ncarol\nalice\n", encoding="utf-8")
+            stdout = io.StringIO()
+            with patch("core.backends.FreeIPAUser.get", side_effect=_get_user):
+                call_command(
+                    "election_load_test",
+                    f"--base-url={self.live_server_url}",
+                    f"--voters-file={voters_file}",
+                    "--candidates=3",
+                    "--concurrency=1",
+                    "--resubmit=1",
+                    "--verify=1",
+                    stdout=stdout,
+                    stderr=io.StringIO(),
+                )
+
+        report = json.loads(stdout.getvalue())
+        election = Election.objects.get(pk=report["election_id"])
+        # The synthetic election is hidden and the voters' sessions are gone once the run ends.
+        self.assertEqual(election.status, Election.Status.deleted)
+        self.assertTrue(election.name.startswith("[Load test] "))
+        self.assertFalse(Session.objects.exists())
+        self.assertEqual(report["voters"], 3)
+        self.assertEqual(report["overall"]["errors"], 0)
+        self.assertEqual(report["operations"]["submit"]["requests"], 3)
+        self.assertEqual(report["operations"]["resubmit"]["requests"], 3)
+        self.assertEqual(report["operations"]["verify"]["requests"], 3)
+        self.assertTrue(report["chain"]["ok"])
+        self.assertEqual(report["chain"]["ballots"], 6)
+        self.assertEqual(report["chain"]["final_ballots"], 3)
+        self.assertEqual(Ballot.objects.filter(election=election, superseded_by__isnull=True).count(), 3)
+
+    @override_settings(DEBUG=False)
+    def test_refuses_without_debug_unless_allowed(self) -> None:
+        from core.models import Election
+
+        with self.assertRaisesMessage(CommandError, "--allow-non-debug"):
+            call_command("election_load_test", f"--base-url={self.live_server_url}", "--voters=1")
+        self.assertFalse(Election.objects.exists())
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import datetime
-import json
 from unittest.mock import patch
 
 from django.conf import settings
@@ -11,8 +10,26 @@ from django.utils import timezone
 from post_office.models import EmailTemplate
 
 from core.backends import FreeIPAUser
-from core.models import Candidate, Election, FreeIPAPermissionGrant, Membership, MembershipType, VotingCredential
-from core.permissions import ASTRA_ADD_ELECTION
+from core.elections_jobs import run_pending_election_jobs
+from core.models import (
+    Candidate,
+    Election,
+    ElectionJob,
+    FreeIPAPermissionGrant,
+    MailBatch,
+    Membership,
+    MembershipType,
+    VotingCredential,
+)
+from core.permissions import ASTRA_ADD_ELECTION, ASTRA_ADD_SEND_MAIL
+
+
+def _get_many_from(get_user):
+    def _get_many(usernames, **_kwargs):
+        users = {username: get_user(username) for username in usernames}
+        return {username: user for username, user in users.items() if user is not None}
+
+    return _get_many
 
 
 class ElectionDetailAdminControlsTests(TestCase):
@@ -189,8 +206,25 @@ class ElectionDetailAdminControlsTests(TestCase):
                 )
             return FreeIPAUser(username, {"uid": [username], "mail": [f"{username}@example.com"], "memberof_group": []})
 
-        with patch("core.backends.FreeIPAUser.get", side_effect=_get_user):
+        with (
+            patch("core.backends.FreeIPAUser.get", side_effect=_get_user),
+            patch("core.backends.FreeIPAUser.get_many", side_effect=_get_many_from(_get_user)),
+        ):
             resp = self.client.get(reverse("election-send-mail-credentials", args=[election.id]))
+            self.assertEqual(resp.status_code, 302)
+            self.assertEqual(resp["Location"], reverse("election-detail", args=[election.id]))
+
+            job = ElectionJob.objects.get(election=election, kind=ElectionJob.Kind.credential_mail)
+            status_url = reverse("election-job-status", args=[election.id, job.id])
+            self.assertEqual(self.client.get(status_url).json()["status"], "queued")
+
+            run_pending_election_jobs()
+            status = self.client.get(status_url).json()
+            self.assertEqual((status["status"], status["progress"], status["total"]), ("succeeded", 1, 1))
+
+            resp = self.client.get(
+                reverse("election-send-mail-credentials", args=[election.id]) + f"?job={job.id}"
+            )
 
         self.assertEqual(resp.status_code, 302)
         location = str(resp["Location"])
@@ -199,10 +233,27 @@ class ElectionDetailAdminControlsTests(TestCase):
         self.assertIn(settings.ELECTION_VOTING_CREDENTIAL_EMAIL_TEMPLATE_NAME, location)
         self.assertIn("type=csv", location)
 
-        raw_csv_payload = self.client.session.get("send_mail_csv_payload_v1")
-        self.assertTrue(raw_csv_payload)
-        payload = json.loads(str(raw_csv_payload))
-        self.assertEqual(payload["recipients"][0]["credential_public_id"], "cred-alice")
+        batch = MailBatch.objects.get(public_id=self.client.session["send_mail_batch_v1"])
+        job.refresh_from_db()
+        self.assertEqual(str(batch.public_id), job.result["mail_batch"])
+        self.assertEqual(batch.source, MailBatch.Source.election_credentials)
+        self.assertEqual(batch.recipient_count, 1)
+        self.assertEqual(batch.recipients.get().context["credential_public_id"], "cred-alice")
+        self.assertNotIn("recipients", job.result)
+
+        FreeIPAPermissionGrant.objects.create(
+            permission=ASTRA_ADD_SEND_MAIL,
+            principal_type=FreeIPAPermissionGrant.PrincipalType.user,
+            principal_name="viewer",
+        )
+        with (
+            patch("core.backends.FreeIPAUser.get", side_effect=_get_user),
+            patch("core.backends.FreeIPAUser.all", return_value=[]),
+            patch("core.backends.FreeIPAGroup.all", return_value=[]),
+        ):
+            resp = self.client.get(location)
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "alice@example.com")
 
     def test_resend_single_credential_opens_send_mail_for_one_user(self) -> None:
         self._login_as_freeipa_user("viewer")
@@ -250,18 +301,19 @@ class ElectionDetailAdminControlsTests(TestCase):
         def _get_user(username: str):
             return FreeIPAUser(username, {"uid": [username], "mail": [f"{username}@example.com"], "memberof_group": []})
 
-        with patch("core.backends.FreeIPAUser.get", side_effect=_get_user):
+        with (
+            patch("core.backends.FreeIPAUser.get", side_effect=_get_user),
+            patch("core.backends.FreeIPAUser.get_many", side_effect=_get_many_from(_get_user)),
+        ):
             resp = self.client.get(
                 reverse("election-send-mail-credentials", args=[election.id]) + "?username=alice"
             )
 
         self.assertEqual(resp.status_code, 302)
 
-        raw_csv_payload = self.client.session.get("send_mail_csv_payload_v1")
-        self.assertTrue(raw_csv_payload)
-        payload = json.loads(str(raw_csv_payload))
-        self.assertEqual(len(payload["recipients"]), 1)
-        self.assertEqual(payload["recipients"][0]["username"], "alice")
+        batch = MailBatch.objects.get(public_id=self.client.session["send_mail_batch_v1"])
+        self.assertEqual(batch.recipient_count, 1)
+        self.assertEqual(batch.recipients.get().context["username"], "alice")
     def test_does_not_show_resend_buttons_when_not_open(self) -> None:
         self._login_as_freeipa_user("viewer")
 
@@ -372,6 +424,7 @@ class ElectionDetailAdminControlsTests(TestCase):
 
         with (
             patch("core.backends.FreeIPAUser.get", side_effect=_get_user),
+            patch("core.backends.FreeIPAUser.get_many", side_effect=_get_many_from(_get_user)),
             patch(
                 "core.views_elections.issue_voting_credentials_from_memberships_detailed",
                 side_effect=AssertionError("should not bulk issue"),
@@ -383,10 +436,8 @@ class ElectionDetailAdminControlsTests(TestCase):
 
         self.assertEqual(resp.status_code, 302)
 
-        raw_csv_payload = self.client.session.get("send_mail_csv_payload_v1")
-        self.assertTrue(raw_csv_payload)
-        payload = json.loads(str(raw_csv_payload))
-        self.assertEqual(payload["recipients"][0]["credential_public_id"], "cred-alice-existing")
+        batch = MailBatch.objects.get(public_id=self.client.session["send_mail_batch_v1"])
+        self.assertEqual(batch.recipients.get().context["credential_public_id"], "cred-alice-existing")
 
 
 class ElectionVoteNoJsFallbackTests(TestCase):
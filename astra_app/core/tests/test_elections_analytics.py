@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from django.test import SimpleTestCase
+
+
+class SummarizeRankingPatternsTests(SimpleTestCase):
+    def test_first_preferences_lengths_and_pairwise_matrix(self) -> None:
+        from core.elections_analytics import summarize_ranking_patterns
+
+        stats = summarize_ranking_patterns(
+            [
+                ([1, 2, 3], 2, 10),
+                ([2], 1, 4),
+                ([3, 9], 1, 1),  # 9 is not a candidate (withdrawn); it is ignored.
+                ([], 1, 1),
+            ],
+            candidate_ids=[1, 2, 3],
+        )
+
+        self.assertEqual((stats["ballots"], stats["weight"], stats["distinct_rankings"]), (5, 16, 4))
+        self.assertEqual(
+            stats["first_preferences"],
+            {"1": {"ballots": 2, "weight": 10}, "2": {"ballots": 1, "weight": 4}, "3": {"ballots": 1, "weight": 1}},
+        )
+        self.assertEqual(
+            stats["ranking_lengths"],
+            {"0": {"ballots": 1, "weight": 1}, "1": {"ballots": 2, "weight": 5}, "3": {"ballots": 2, "weight": 10}},
+        )
+        self.assertEqual(
+            stats["pairwise"],
+            {
+                "1": {"2": 10, "3": 10},
+                "2": {"1": 4, "3": 14},
+                "3": {"1": 1, "2": 1},
+            },
+        )
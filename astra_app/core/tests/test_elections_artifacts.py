@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import datetime
+import json
 
-from django.test import TestCase
+from django.core.serializers.json import DjangoJSONEncoder
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
@@ -51,6 +53,58 @@ class ElectionArtifactGenerationTests(TestCase):
         payload = elections_services.build_public_ballots_export(election=election)
         self.assertEqual(payload["ballots"][0]["ranking"], ["alice"])
 
+    @override_settings(ELECTION_TALLY_BALLOT_CHUNK_SIZE=2)
+    def test_streamed_ballots_export_matches_sorted_json_dump(self) -> None:
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Artifact election (streaming)",
+            description="",
+            start_datetime=now - datetime.timedelta(days=2),
+            end_datetime=now - datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.closed,
+        )
+        c1 = Candidate.objects.create(election=election, freeipa_username="alice", nominated_by="nominator")
+        c2 = Candidate.objects.create(election=election, freeipa_username="bób", nominated_by="nominator")
+
+        previous_chain_hash = election_genesis_chain_hash(election.id)
+        for i in range(5):
+            ranking = [c2.id, c1.id] if i % 2 else [c1.id]
+            ballot_hash = Ballot.compute_hash(
+                election_id=election.id,
+                credential_public_id=f"cred-{i}",
+                ranking=ranking,
+                weight=i + 1,
+                nonce="0" * 32,
+            )
+            chain_hash = compute_chain_hash(previous_chain_hash=previous_chain_hash, ballot_hash=ballot_hash)
+            Ballot.objects.create(
+                election=election,
+                credential_public_id=f"cred-{i}",
+                ranking=ranking,
+                weight=i + 1,
+                ballot_hash=ballot_hash,
+                previous_chain_hash=previous_chain_hash,
+                chain_hash=chain_hash,
+            )
+            previous_chain_hash = chain_hash
+
+        chunks = list(elections_services.iter_public_ballots_export(election=election))
+        self.assertGreater(len(chunks), 1)
+
+        expected = json.dumps(
+            elections_services.build_public_ballots_export(election=election),
+            sort_keys=True,
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False,
+        ).encode("utf-8")
+        self.assertEqual(b"".join(chunks), expected)
+
+        resp = self.client.get(reverse("election-public-ballots", args=[election.id]))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(b"".join(resp.streaming_content), expected)
+
     def test_tally_generates_public_ballots_and_audit_artifacts(self) -> None:
         now = timezone.now()
         election = Election.objects.create(
@@ -95,6 +149,48 @@ class ElectionArtifactGenerationTests(TestCase):
         self.assertIn(f"elections/{election.id}/", election.public_ballots_file.name)
         self.assertIn(f"elections/{election.id}/", election.public_audit_file.name)
 
+    def test_receipt_index_is_published_after_the_tally_commits(self) -> None:
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Indexed election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=2),
+            end_datetime=now - datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.closed,
+        )
+        c1 = Candidate.objects.create(election=election, freeipa_username="alice", nominated_by="nominator")
+
+        genesis_hash = election_genesis_chain_hash(election.id)
+        ballot_hash = Ballot.compute_hash(
+            election_id=election.id,
+            credential_public_id="cred-1",
+            ranking=[c1.id],
+            weight=1,
+            nonce="0" * 32,
+        )
+        chain_hash = compute_chain_hash(previous_chain_hash=genesis_hash, ballot_hash=ballot_hash)
+        Ballot.objects.create(
+            election=election,
+            credential_public_id="cred-1",
+            ranking=[c1.id],
+            weight=1,
+            ballot_hash=ballot_hash,
+            previous_chain_hash=genesis_hash,
+            chain_hash=chain_hash,
+        )
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            elections_services.tally_election(election=election)
+        election.refresh_from_db()
+        self.assertEqual(election.status, Election.Status.tallied)
+        self.assertEqual(election.receipt_index_chain_head, "")
+
+        for callback in callbacks:
+            callback()
+        election.refresh_from_db()
+        self.assertEqual(election.receipt_index_chain_head, chain_hash)
+
     def test_public_export_endpoints_redirect_to_stored_artifacts_when_tallied(self) -> None:
         now = timezone.now()
         election = Election.objects.create(
@@ -237,4 +237,83 @@ class ElectionAuditLogPageTests(TestCase):
         
         # Verify raw payload is not shown
         self.assertNotContains(resp, "&#x27;chain_head&#x27;:")
-        self.assertNotContains(resp, "&#x27;credentials_affected&#x27;:")
\ No newline at end of file
+        self.assertNotContains(resp, "&#x27;credentials_affected&#x27;:")
+    def test_audit_log_pages_by_cursor_and_caches_tallied_public_timeline(self) -> None:
+        from django.core.cache import cache
+
+        cache.clear()
+        self._login_as_freeipa_user("admin")
+        FreeIPAPermissionGrant.objects.create(
+            principal_type=FreeIPAPermissionGrant.PrincipalType.user,
+            principal_name="admin",
+            permission=ASTRA_ADD_ELECTION,
+        )
+
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Paged election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=10),
+            end_datetime=now - datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.tallied,
+            tally_result={"quota": "1", "elected": [], "eliminated": [], "forced_excluded": [], "rounds": []},
+        )
+        base = (now - datetime.timedelta(days=5)).replace(microsecond=0)
+        for i in range(70):
+            AuditLogEntry.objects.create(
+                election=election,
+                event_type=f"note_{i:02d}",
+                payload={"i": i},
+                is_public=True,
+                sequence=i + 1 if i < 22 else i + 2,
+            )
+        AuditLogEntry.objects.create(
+            election=election,
+            event_type="ballot_submitted",
+            payload={"ballot_hash": "hash-paged"},
+            is_public=False,
+            sequence=23,
+        )
+        # Every entry shares one timestamp; the timeline is ordered by sequence alone.
+        AuditLogEntry.objects.filter(election=election).update(timestamp=base)
+
+        url = reverse("election-audit-log", args=[election.id])
+        admin = FreeIPAUser("admin", {"uid": ["admin"], "memberof_group": []})
+
+        def _titles(resp) -> list[str]:
+            return [str(ev["title"]) for ev in resp.context["events"]]
+
+        with patch("core.backends.FreeIPAUser.get", return_value=admin):
+            first = self.client.get(url)
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(first.context["newer_url"], "")
+            self.assertTrue(first.context["older_url"])
+            first_titles = _titles(first)
+            self.assertEqual(len(first_titles), 60)
+            self.assertEqual(first_titles[0], "note 69")
+
+            older = self.client.get(first.context["older_url"])
+            older_titles = _titles(older)
+            self.assertEqual(older.context["older_url"], "")
+            self.assertTrue(older.context["newer_url"])
+
+            # Every entry and the day's ballot summary appear exactly once, newest first.
+            expected = [f"note {i:02d}" for i in range(69, 21, -1)]
+            expected += ["Ballots submitted"]
+            expected += [f"note {i:02d}" for i in range(21, -1, -1)]
+            self.assertEqual(first_titles + older_titles, expected)
+
+            newer = self.client.get(older.context["newer_url"])
+            self.assertEqual(_titles(newer), first_titles)
+            self.assertEqual(newer.context["newer_url"], "")
+
+        # The public view of a tallied election is served from the cache.
+        self._login_as_freeipa_user("viewer")
+        viewer = FreeIPAUser("viewer", {"uid": ["viewer"], "memberof_group": []})
+        with patch("core.backends.FreeIPAUser.get", return_value=viewer):
+            public = self.client.get(url)
+            self.assertNotIn("Ballots submitted", _titles(public))
+            AuditLogEntry.objects.filter(election=election, event_type="note_69").update(event_type="edited")
+            cached = self.client.get(url)
+        self.assertEqual(_titles(cached), _titles(public))
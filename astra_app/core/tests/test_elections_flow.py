@@ -1,26 +1,39 @@
 from __future__ import annotations
 
 import datetime
+import io
 import json
+import threading
+import time
+import unittest
 from unittest.mock import patch
 
 from django.conf import settings
-from django.test import TestCase, override_settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
 from core.backends import FreeIPAUser
 from core.elections_services import (
     BallotReceipt,
+    ElectionError,
+    ElectionNotOpenError,
     InvalidCredentialError,
     anonymize_election,
+    ballot_inclusion_proof,
+    build_public_audit_export,
     close_election,
+    election_tally_input_analytics,
     issue_voting_credential,
     issue_voting_credentials_from_memberships,
+    recount_election,
     send_vote_receipt_email,
     send_voting_credential_email,
     submit_ballot,
     tally_election,
+    tally_round_explanations,
 )
 from core.models import AuditLogEntry, Ballot, Candidate, Election, Membership, MembershipType, VotingCredential
 from core.tests.ballot_chain import compute_chain_hash
@@ -169,6 +182,138 @@ class ElectionCredentialAndBallotTests(TestCase):
         self.assertNotEqual(ballot2.ballot_hash, ballot1.ballot_hash)
 
 
+    def test_submit_ballot_advances_chain_head_row(self) -> None:
+        from core.models import BallotChainHead
+
+        receipt1 = submit_ballot(
+            election=self.election,
+            credential_public_id=self.cred.public_id,
+            ranking=[self.c1.id],
+        )
+        receipt2 = submit_ballot(
+            election=self.election,
+            credential_public_id=self.cred.public_id,
+            ranking=[self.c2.id],
+        )
+
+        self.assertEqual(receipt1.ballot.previous_chain_hash, election_genesis_chain_hash(self.election.id))
+        self.assertEqual(receipt2.ballot.previous_chain_hash, receipt1.ballot.chain_hash)
+
+        head = BallotChainHead.objects.get(election=self.election)
+        self.assertEqual(head.chain_hash, receipt2.ballot.chain_hash)
+        self.assertEqual(head.sequence, 2)
+
+    def test_submit_ballot_rejects_election_closed_after_validation(self) -> None:
+        # The caller's instance is stale: the election was closed after it was loaded.
+        Election.objects.filter(pk=self.election.pk).update(status=Election.Status.closed)
+
+        with self.assertRaises(ElectionNotOpenError):
+            submit_ballot(
+                election=self.election,
+                credential_public_id=self.cred.public_id,
+                ranking=[self.c1.id],
+            )
+        self.assertFalse(Ballot.objects.filter(election=self.election).exists())
+
+    def test_submit_ballot_commits_ballot_and_audit_entry_together(self) -> None:
+        from core.models import BallotChainHead
+
+        with (
+            patch.object(AuditLogEntry.objects, "bulk_create", side_effect=RuntimeError("audit write failed")),
+            self.assertRaises(RuntimeError),
+        ):
+            submit_ballot(
+                election=self.election,
+                credential_public_id=self.cred.public_id,
+                ranking=[self.c1.id],
+            )
+        self.assertFalse(Ballot.objects.filter(election=self.election).exists())
+        self.assertFalse(BallotChainHead.objects.filter(election=self.election, sequence__gt=0).exists())
+
+        receipt = submit_ballot(
+            election=self.election,
+            credential_public_id=self.cred.public_id,
+            ranking=[self.c1.id],
+        )
+        entry = AuditLogEntry.objects.get(election=self.election, event_type="ballot_submitted")
+        self.assertEqual(entry.payload, {"ballot_hash": receipt.ballot.ballot_hash})
+        head = BallotChainHead.objects.get(election=self.election)
+        self.assertEqual(
+            list(AuditLogEntry.objects.filter(election=self.election).values_list("sequence", flat=True)),
+            list(range(entry.sequence, head.audit_sequence + 1)),
+        )
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "needs row locks across two connections")
+class ElectionCloseDuringBallotAppendTests(TransactionTestCase):
+    def test_close_waits_for_an_in_flight_ballot_append(self) -> None:
+        from core import elections_services
+
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Race election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=1),
+            end_datetime=now + datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.open,
+        )
+        candidate = Candidate.objects.create(election=election, freeipa_username="alice", nominated_by="nominator")
+        credential = issue_voting_credential(election=election, freeipa_username="voter1", weight=1)
+
+        appending = threading.Event()
+        resume = threading.Event()
+        real_next_hash = elections_services.election_chain_next_hash
+
+        def _paused_next_hash(**kwargs: str) -> str:
+            # The append holds the chain head lock here and has yet to insert its rows.
+            appending.set()
+            resume.wait(timeout=10)
+            return real_next_hash(**kwargs)
+
+        errors: list[BaseException] = []
+
+        def _run(func) -> None:
+            try:
+                func()
+            except BaseException as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        with patch.object(elections_services, "election_chain_next_hash", side_effect=_paused_next_hash):
+            voter = threading.Thread(
+                target=_run,
+                args=(
+                    lambda: submit_ballot(
+                        election=election,
+                        credential_public_id=credential.public_id,
+                        ranking=[candidate.id],
+                    ),
+                ),
+            )
+            voter.start()
+            self.assertTrue(appending.wait(timeout=10))
+
+            closer = threading.Thread(
+                target=_run,
+                args=(lambda: close_election(election=Election.objects.get(pk=election.pk)),),
+            )
+            closer.start()
+            # Let the close reach its locks before the append inserts its rows.
+            time.sleep(0.5)
+            resume.set()
+            voter.join(timeout=10)
+            closer.join(timeout=10)
+
+        self.assertEqual(errors, [])
+        election.refresh_from_db()
+        self.assertEqual(election.status, Election.Status.closed)
+        self.assertEqual(Ballot.objects.filter(election=election).count(), 1)
+        closed = AuditLogEntry.objects.get(election=election, event_type="election_closed")
+        self.assertEqual(closed.payload["chain_head"], Ballot.objects.get(election=election).chain_hash)
+
+
 class ElectionCredentialIssuanceAndAnonymizationTests(TestCase):
     def setUp(self) -> None:
         super().setUp()
@@ -213,6 +358,50 @@ class ElectionCredentialIssuanceAndAnonymizationTests(TestCase):
         cred.refresh_from_db()
         self.assertIsNone(cred.freeipa_username)
 
+    @override_settings(POST_OFFICE={**settings.POST_OFFICE, "DEFAULT_PRIORITY": "medium"})
+    def test_anonymize_election_deletes_credential_reminder_batches_and_their_emails(self) -> None:
+        from post_office.models import Email
+
+        from core.mail_batches import create_mail_batch
+        from core.mail_jobs import enqueue_mail_job, run_pending_mail_jobs
+        from core.models import MailBatch, MailJob, MailJobRecipient
+
+        reminders = create_mail_batch(
+            recipients=[{"email": "voter1@example.com", "username": "voter1", "credential_public_id": "cred-1"}],
+            variables=["email", "username", "credential_public_id"],
+            source=MailBatch.Source.election_credentials,
+            election=self.election,
+        )
+        other = create_mail_batch(
+            recipients=[{"email": "someone@example.com"}],
+            variables=["email"],
+            source=MailBatch.Source.csv,
+        )
+        enqueue_mail_job(
+            batch=reminders,
+            subject="Your credential",
+            html_content="",
+            text_content="{{ credential_public_id }}",
+            cc=[],
+            bcc=[],
+            extra_context={},
+        )
+        self.assertEqual(run_pending_mail_jobs(), (1, 0))
+        self.assertEqual(Email.objects.get().message, "cred-1")
+
+        self.election.status = Election.Status.closed
+        self.election.save(update_fields=["status"])
+        # The context scrub needs Postgres JSON lookups; it is covered by the close tests.
+        with patch("core.elections_services.scrub_election_emails", return_value=0):
+            result = anonymize_election(election=self.election)
+
+        self.assertEqual(result["emails_scrubbed"], 1)
+        self.assertFalse(Email.objects.exists())
+        self.assertFalse(MailBatch.objects.filter(pk=reminders.pk).exists())
+        self.assertFalse(MailJob.objects.exists())
+        self.assertFalse(MailJobRecipient.objects.exists())
+        self.assertTrue(MailBatch.objects.filter(pk=other.pk).exists())
+
 
 @override_settings(ELECTION_ELIGIBILITY_MIN_MEMBERSHIP_AGE_DAYS=90)
 class ElectionBulkCredentialIssuanceTests(TestCase):
@@ -312,6 +501,68 @@ class ElectionBulkCredentialIssuanceTests(TestCase):
         self.assertEqual(cred2.public_id, cred1.public_id)
         self.assertEqual(cred2.weight, 5)
 
+    def test_issue_voting_credentials_reports_counts_in_constant_queries(self) -> None:
+        from core.elections_services import EligibleVoter, issue_voting_credentials
+        from core.models import BallotChainHead
+
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Bulk report election",
+            description="",
+            start_datetime=now,
+            end_datetime=now + datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.open,
+        )
+        existing = issue_voting_credential(election=election, freeipa_username="voter0", weight=1)
+        issue_voting_credential(election=election, freeipa_username="voter1", weight=1)
+
+        voters = [EligibleVoter(username=f"voter{i}", weight=2 if i == 1 else 1) for i in range(50)]
+        with self.assertNumQueries(10):
+            report = issue_voting_credentials(election=election, voters=voters)
+
+        self.assertEqual((report.added, report.changed, report.unchanged), (48, 1, 1))
+        self.assertEqual([c.freeipa_username for c in report.credentials], [v.username for v in voters])
+        self.assertEqual(report.credentials[0].public_id, existing.public_id)
+        self.assertEqual(VotingCredential.objects.get(election=election, freeipa_username="voter1").weight, 2)
+
+        head = BallotChainHead.objects.get(election=election)
+        self.assertEqual(head.eligible_voter_count, 50)
+        self.assertEqual(head.eligible_vote_weight_total, 51)
+
+        entry = AuditLogEntry.objects.get(election=election, event_type="credentials_issued")
+        self.assertEqual(entry.payload, {"added": 48, "changed": 1, "unchanged": 1})
+        self.assertFalse(entry.is_public)
+        self.assertEqual(entry.sequence, head.audit_sequence)
+
+    def test_issue_voting_credentials_counts_reweighting_from_zero_and_fallback(self) -> None:
+        from django.db import IntegrityError
+
+        from core.elections_services import EligibleVoter, issue_voting_credentials, refresh_election_turnout
+        from core.models import BallotChainHead
+
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Reweight election",
+            description="",
+            start_datetime=now,
+            end_datetime=now + datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.open,
+        )
+        VotingCredential.objects.create(election=election, public_id="cred-zero", freeipa_username="zero", weight=0)
+        issue_voting_credential(election=election, freeipa_username="one", weight=1)
+        refresh_election_turnout(election=election)
+        self.assertEqual(BallotChainHead.objects.get(election=election).eligible_voter_count, 1)
+
+        voters = [EligibleVoter(username=name, weight=2) for name in ("zero", "one", "new1", "new2")]
+        with patch.object(VotingCredential.objects, "bulk_create", side_effect=IntegrityError):
+            report = issue_voting_credentials(election=election, voters=voters)
+
+        self.assertEqual((report.added, report.changed, report.unchanged), (2, 2, 0))
+        head = BallotChainHead.objects.get(election=election)
+        self.assertEqual((head.eligible_voter_count, head.eligible_vote_weight_total), (4, 8))
+
 
 class ElectionPublicExportTests(TestCase):
     def test_public_ballots_export_omits_credential_id(self) -> None:
@@ -359,7 +610,7 @@ class ElectionPublicExportTests(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
-        data = response.json()
+        data = json.loads(b"".join(response.streaming_content))
         self.assertIn("ballots", data)
         self.assertIn("chain_head", data)
         self.assertEqual(len(data["ballots"]), 1)
@@ -423,7 +674,7 @@ class ElectionPublicExportTests(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
 
-        data = response.json()
+        data = json.loads(b"".join(response.streaming_content))
         self.assertIn("ballots", data)
         self.assertIn("chain_head", data)
         self.assertEqual(len(data["ballots"]), 2)
@@ -583,6 +834,18 @@ class ElectionCloseAndTallyTests(TestCase):
         self.assertIsInstance(entry.payload, dict)
         self.assertEqual(entry.payload.get("chain_head"), chain_hash_2)
 
+        from core.ballot_merkle import merkle_levels, merkle_root
+
+        self.assertEqual(entry.payload.get("merkle_leaf_count"), 2)
+        self.assertEqual(entry.payload.get("merkle_root"), merkle_root(merkle_levels([ballot_hash_1, ballot_hash_2])))
+
+        # The tree is stored at close and inclusion proofs are served from it.
+        election.refresh_from_db()
+        self.assertTrue(election.merkle_tree_file)
+        proof = ballot_inclusion_proof(ballot=Ballot.objects.get(ballot_hash=ballot_hash_2))
+        self.assertIsNotNone(proof)
+        self.assertEqual(proof["root"], entry.payload.get("merkle_root"))
+
     def test_different_elections_have_unique_genesis_hashes(self) -> None:
         """
         Verify that different elections have different genesis chain hashes.
@@ -669,23 +932,55 @@ class ElectionCloseAndTallyTests(TestCase):
         self.assertEqual(result["elected"], election.tally_result["elected"])
         self.assertGreaterEqual(len(election.tally_result["rounds"]), 1)
 
+        # Ballot statistics are stored with the result and read back without recomputing.
+        with self.assertNumQueries(0):
+            analytics = election_tally_input_analytics(election=election)
+        self.assertEqual(analytics, election.tally_analytics)
+        self.assertEqual(analytics["ballots"], Ballot.objects.filter(election=election).count())
+
+        # Round records are numeric only; the prose is rendered on demand.
         for round_data in election.tally_result["rounds"]:
-            self.assertIn("audit_text", round_data)
-            self.assertIn("summary_text", round_data)
-            self.assertIsInstance(round_data["audit_text"], str)
-            self.assertIsInstance(round_data["summary_text"], str)
-            self.assertTrue(round_data["audit_text"].strip())
-            self.assertTrue(round_data["summary_text"].strip())
+            self.assertNotIn("audit_text", round_data)
+            self.assertNotIn("summary_text", round_data)
+
+        explanations = tally_round_explanations(election=election)
+        self.assertEqual(sorted(explanations), list(range(1, len(election.tally_result["rounds"]) + 1)))
+        for explanation in explanations.values():
+            self.assertTrue(explanation["audit_text"].strip())
+            self.assertTrue(explanation["summary_text"].strip())
+
+        # Rendered once per tally: later reads cost only the tally_completed lookup.
+        with patch("core.elections_meek.explain_meek_rounds") as explain, self.assertNumQueries(1):
+            self.assertEqual(tally_round_explanations(election=election), explanations)
+        explain.assert_not_called()
 
         self.assertTrue(
             AuditLogEntry.objects.filter(election=election, event_type="tally_round", is_public=True).exists()
         )
 
-        for entry in AuditLogEntry.objects.filter(election=election, event_type="tally_round", is_public=True):
-            self.assertIn("audit_text", entry.payload)
-            self.assertIn("summary_text", entry.payload)
-            self.assertIsInstance(entry.payload["audit_text"], str)
-            self.assertIsInstance(entry.payload["summary_text"], str)
+        # Round entries reference the tally result and are numbered in round order.
+        round_entries = list(
+            AuditLogEntry.objects.filter(election=election, event_type="tally_round", is_public=True).order_by(
+                "sequence"
+            )
+        )
+        self.assertEqual([e.payload for e in round_entries], [{"round": i} for i in range(1, len(round_entries) + 1)])
+        completed = AuditLogEntry.objects.get(election=election, event_type="tally_completed")
+        self.assertEqual(
+            [e.sequence for e in round_entries] + [completed.sequence],
+            list(range(round_entries[0].sequence, completed.sequence + 1)),
+        )
+
+        export = build_public_audit_export(election=election)
+        exported_rounds = [row["payload"] for row in export["audit_log"] if row["event_type"] == "tally_round"]
+        self.assertTrue(exported_rounds)
+        for payload in exported_rounds:
+            self.assertEqual(
+                {k: v for k, v in payload.items() if k not in {"round", "audit_text", "summary_text"}},
+                election.tally_result["rounds"][payload["round"] - 1],
+            )
+            self.assertEqual(payload["audit_text"], explanations[payload["round"]]["audit_text"])
+            self.assertEqual(payload["summary_text"], explanations[payload["round"]]["summary_text"])
 
     def test_tally_applies_exclusion_groups(self) -> None:
         from core.models import ExclusionGroup, ExclusionGroupCandidate
@@ -797,10 +1092,87 @@ class ElectionCloseAndTallyTests(TestCase):
         rounds = list(election.tally_result.get("rounds") or [])
         rounds_with_forced = [r for r in rounds if isinstance(r, dict) and (r.get("forced_exclusions") or [])]
         self.assertTrue(rounds_with_forced, "expected at least one forced exclusion round")
-        audit_text = str(rounds_with_forced[0].get("audit_text") or "")
+        round_idx = rounds.index(rounds_with_forced[0]) + 1
+        audit_text = tally_round_explanations(election=election)[round_idx]["audit_text"]
         self.assertIn("Alice-or-Bob", audit_text)
 
 
+    def test_recount_reuses_cached_tally_and_leaves_official_result_alone(self) -> None:
+        from django.core.cache import cache
+
+        from core import elections_meek, elections_services
+
+        cache.clear()
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Recount election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=10),
+            end_datetime=now - datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.closed,
+        )
+        c1 = Candidate.objects.create(election=election, freeipa_username="alice", nominated_by="nominator")
+        c2 = Candidate.objects.create(election=election, freeipa_username="bob", nominated_by="nominator")
+
+        previous = election_genesis_chain_hash(election.id)
+        for i, ranking in enumerate([[c1.id, c2.id], [c1.id, c2.id], [c2.id, c1.id]]):
+            ballot_hash = Ballot.compute_hash(
+                election_id=election.id,
+                credential_public_id=f"c-{i}",
+                ranking=ranking,
+                weight=1,
+                nonce="0" * 32,
+            )
+            chain_hash = compute_chain_hash(previous_chain_hash=previous, ballot_hash=ballot_hash)
+            Ballot.objects.create(
+                election=election,
+                credential_public_id=f"c-{i}",
+                ranking=ranking,
+                weight=1,
+                ballot_hash=ballot_hash,
+                previous_chain_hash=previous,
+                chain_hash=chain_hash,
+            )
+            previous = chain_hash
+
+        # A stale cached result (e.g. from before a counting fix) is never certified.
+        stale_key = elections_services._tally_cache_key(
+            chain_head=previous,
+            candidates=elections_services._tally_candidates(election=election),
+            seats=1,
+            exclusion_groups=[],
+        )
+        cache.set(stale_key, {"elected": [c2.id]})
+
+        official = tally_election(election=election)
+        self.assertEqual(official["elected"], [c1.id])
+
+        with patch.object(elections_meek, "tally_meek", wraps=elections_meek.tally_meek) as tally_mock:
+            self.assertEqual(recount_election(election=election), official)
+            tally_mock.assert_not_called()
+
+            what_if = recount_election(election=election, withdrawn_candidate_ids=[c1.id])
+            self.assertEqual(what_if["elected"], [c2.id])
+            self.assertEqual(tally_mock.call_count, 1)
+
+            self.assertEqual(recount_election(election=election, withdrawn_candidate_ids=[c1.id]), what_if)
+            self.assertEqual(tally_mock.call_count, 1)
+
+        election.refresh_from_db()
+        self.assertEqual(election.status, Election.Status.tallied)
+        self.assertEqual(election.tally_result, official)
+        self.assertEqual(AuditLogEntry.objects.filter(election=election, event_type="tally_completed").count(), 1)
+
+        with self.assertRaisesMessage(ElectionError, "unknown candidate"):
+            recount_election(election=election, withdrawn_candidate_ids=[c2.id + 1000])
+        with self.assertRaisesMessage(ElectionError, "seats must be between 1 and 2"):
+            recount_election(election=election, seats=3)
+        with self.assertRaisesMessage(ElectionError, "seats must be between 1 and 1"):
+            recount_election(election=election, withdrawn_candidate_ids=[c1.id], seats=2)
+        with self.assertRaisesMessage(ElectionError, "seats must be between 1 and 2"):
+            recount_election(election=election, seats=0)
+
 class ElectionEmailTimezoneTests(TestCase):
     def test_vote_receipt_email_uses_recipient_timezone(self) -> None:
         start_utc = timezone.make_aware(datetime.datetime(2026, 1, 2, 12, 0, 0), timezone=timezone.UTC)
@@ -967,6 +1339,9 @@ class ElectionVoteEndpointTests(TestCase):
         self.assertEqual(ballot.weight, 2)
 
     def test_vote_submit_sends_receipt_email_when_user_has_email(self) -> None:
+        from core.elections_receipts import send_pending_vote_receipts
+        from core.models import PendingVoteReceipt
+
         self._login_as_freeipa_user("voter1")
 
         url = reverse("election-vote-submit", args=[self.election.id])
@@ -982,6 +1357,7 @@ class ElectionVoteEndpointTests(TestCase):
 
         with (
             patch("core.backends.FreeIPAUser.get", return_value=voter1),
+            patch("core.backends.FreeIPAUser.get_many", return_value={"voter1": voter1}) as get_many_mock,
             patch("post_office.mail.send", autospec=True) as send_mock,
         ):
             response = self.client.post(
@@ -993,10 +1369,20 @@ class ElectionVoteEndpointTests(TestCase):
                 content_type="application/json",
             )
 
-        self.assertEqual(response.status_code, 200)
-        payload = response.json()
-        self.assertTrue(payload["ok"])
+            self.assertEqual(response.status_code, 200)
+            payload = response.json()
+            self.assertTrue(payload["ok"])
+
+            # The request only records the receipt; the worker sends it.
+            send_mock.assert_not_called()
+            get_many_mock.assert_not_called()
+            pending = PendingVoteReceipt.objects.get(election=self.election)
+            self.assertEqual(pending.freeipa_username, "voter1")
+            self.assertEqual(pending.ballot.ballot_hash, payload["ballot_hash"])
+
+            self.assertEqual(send_pending_vote_receipts(), (1, 0))
 
+        self.assertFalse(PendingVoteReceipt.objects.exists())
         self.assertEqual(send_mock.call_count, 1)
         self.assertEqual(send_mock.call_args.kwargs.get("recipients"), ["voter1@example.com"])
         self.assertEqual(send_mock.call_args.kwargs.get("template"), settings.ELECTION_VOTE_RECEIPT_EMAIL_TEMPLATE_NAME)
@@ -1045,6 +1431,9 @@ class ElectionVoteEndpointTests(TestCase):
                 },
                 content_type="application/json",
             )
+            self.assertEqual(Email.objects.count(), 0)
+            with patch("core.backends.FreeIPAUser.get_many", return_value={"voter1": voter1}):
+                call_command("send_vote_receipts", stdout=io.StringIO())
 
         self.assertEqual(response.status_code, 200)
         payload = response.json()
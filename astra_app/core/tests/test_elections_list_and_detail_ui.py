@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import datetime
+import io
 import json
 from unittest.mock import patch
 
+from django.core.management import call_command
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
@@ -14,6 +16,7 @@ from core.models import (
     Ballot,
     Candidate,
     Election,
+    ElectionJob,
     ExclusionGroup,
     FreeIPAPermissionGrant,
     Membership,
@@ -342,6 +345,70 @@ class ElectionDetailManagerUIStatsTests(TestCase):
         self.assertContains(resp, "election_turnout_chart.js", html=False)
         self.assertNotContains(resp, "cdn.jsdelivr.net/npm/chart.js")
 
+    def test_ballot_statistics_shown_to_managers_once_closed(self) -> None:
+        from django.core.cache import cache
+
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Stats election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=2),
+            end_datetime=now - datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.closed,
+        )
+        alice = Candidate.objects.create(election=election, freeipa_username="alice", nominated_by="n")
+        bob = Candidate.objects.create(election=election, freeipa_username="bob", nominated_by="n")
+
+        previous_chain_hash = election_genesis_chain_hash(election.id)
+        for credential, ranking, weight in (("cred-1", [alice.id, bob.id], 2), ("cred-2", [bob.id], 1)):
+            ballot_hash = Ballot.compute_hash(
+                election_id=election.id,
+                credential_public_id=credential,
+                ranking=ranking,
+                weight=weight,
+                nonce="0" * 32,
+            )
+            chain_hash = compute_chain_hash(previous_chain_hash=previous_chain_hash, ballot_hash=ballot_hash)
+            Ballot.objects.create(
+                election=election,
+                credential_public_id=credential,
+                ranking=ranking,
+                weight=weight,
+                ballot_hash=ballot_hash,
+                previous_chain_hash=previous_chain_hash,
+                chain_hash=chain_hash,
+            )
+            previous_chain_hash = chain_hash
+
+        self._login_as_freeipa_user("viewer")
+        viewer = FreeIPAUser("viewer", {"uid": ["viewer"], "memberof_group": []})
+        with patch("core.backends.FreeIPAUser.get", side_effect=lambda u: viewer if u == "viewer" else None):
+            resp = self.client.get(reverse("election-detail", args=[election.id]))
+        self.assertNotContains(resp, "Ballot statistics")
+
+        self._login_as_freeipa_user("admin")
+        self._grant_manage_permission("admin")
+        admin = FreeIPAUser("admin", {"uid": ["admin"], "memberof_group": []})
+        with patch("core.backends.FreeIPAUser.get", side_effect=lambda u: admin if u == "admin" else None):
+            resp = self.client.get(reverse("election-detail", args=[election.id]))
+        self.assertContains(resp, "Ballot statistics")
+        self.assertContains(resp, "2 counted ballots (3 votes), 2 distinct rankings.")
+
+        stats = resp.context["ballot_stats"]
+        self.assertEqual(
+            [(row["candidate"].freeipa_username, row["weight"]) for row in stats["first_preferences"]],
+            [("alice", 2), ("bob", 1)],
+        )
+        self.assertEqual([(row["length"], row["ballots"]) for row in stats["ranking_lengths"]], [(1, 1), (2, 1)])
+        # alice over bob: 2 (cred-1); bob over alice: 1 (cred-2 leaves alice unranked).
+        alice_row, bob_row = stats["pairwise_rows"]
+        self.assertEqual(alice_row["cells"][1], {"weight": 2, "wins": True})
+        self.assertEqual(bob_row["cells"][0], {"weight": 1, "wins": False})
+
     def test_election_voting_window_renders_in_users_timezone(self) -> None:
         # If the user has a FreeIPA timezone configured, our middleware activates it.
         # The UI should therefore display election datetimes in that timezone.
@@ -595,9 +662,26 @@ class ElectionDetailConcludeElectionTests(TestCase):
         with patch("core.backends.FreeIPAUser.get", return_value=admin):
             resp = self.client.post(reverse("election-conclude", args=[election.id]), data={})
         self.assertEqual(resp.status_code, 302)
+        self.assertEqual(resp["Location"], reverse("election-detail", args=[election.id]))
+
+        job = ElectionJob.objects.get(election=election)
+        self.assertEqual(job.kind, ElectionJob.Kind.close)
+        self.assertEqual(job.params, {"tally": True})
+        self.assertEqual(job.requested_by, "admin")
+
+        with patch("core.backends.FreeIPAUser.get", return_value=admin):
+            resp = self.client.get(reverse("election-detail", args=[election.id]))
+        self.assertContains(resp, "Background jobs")
+        self.assertContains(resp, reverse("election-job-status", args=[election.id, job.id]))
+
+        call_command("run_election_jobs", stdout=io.StringIO())
 
         election.refresh_from_db()
         self.assertEqual(election.status, Election.Status.tallied)
+        self.assertEqual(
+            list(ElectionJob.objects.filter(election=election).values_list("kind", "status")),
+            [("close", "succeeded"), ("tally", "succeeded")],
+        )
         self.assertTrue(election.tally_result)
 
     def test_conclude_post_close_only_when_checkbox_set(self) -> None:
@@ -626,6 +710,7 @@ class ElectionDetailConcludeElectionTests(TestCase):
                 data={"skip_tally": "on"},
             )
         self.assertEqual(resp.status_code, 302)
+        call_command("run_election_jobs", stdout=io.StringIO())
 
         election.refresh_from_db()
         self.assertEqual(election.status, Election.Status.closed)
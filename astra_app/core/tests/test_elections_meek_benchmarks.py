@@ -103,7 +103,7 @@ class MeekRandomizedPerformanceBenchmarks(SimpleTestCase):
         rounds = list(result.get("rounds") or [])
         self.assertGreaterEqual(len(rounds), 1)
         self.assertTrue(all(isinstance(r, dict) for r in rounds))
-        self.assertTrue(all("audit_text" in r and "summary_text" in r for r in rounds if isinstance(r, dict)))
+        self.assertFalse(any("audit_text" in r or "summary_text" in r for r in rounds if isinstance(r, dict)))
 
     def test_meek_tally_timings_randomized_weighted_ballots(self) -> None:
         if os.environ.get("RUN_MEEK_BENCHMARKS") not in {"1", "true", "TRUE", "yes", "YES"}:
@@ -173,3 +173,54 @@ class ElectionQuorumAuditTests(TestCase):
         self.assertIn("previous_end_datetime", payload)
         self.assertIn("new_end_datetime", payload)
         self.assertIn("quorum_percent", payload)
+
+    def test_turnout_counters_track_ballots_and_latch_quorum(self) -> None:
+        from core.elections_services import election_quorum_status, issue_voting_credential, submit_ballot
+        from core.models import BallotChainHead
+
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Counter test",
+            description="",
+            start_datetime=now - datetime.timedelta(days=1),
+            end_datetime=now + datetime.timedelta(days=1),
+            number_of_seats=1,
+            quorum=50,
+            status=Election.Status.open,
+        )
+        alice = Candidate.objects.create(election=election, freeipa_username="alice", nominated_by="nominator")
+
+        cred1 = issue_voting_credential(election=election, freeipa_username="voter1", weight=1)
+        cred2 = issue_voting_credential(election=election, freeipa_username="voter2", weight=3)
+
+        head = BallotChainHead.objects.get(election=election)
+        self.assertEqual(head.eligible_voter_count, 2)
+        self.assertEqual(head.eligible_vote_weight_total, 4)
+        self.assertIsNone(head.quorum_reached_at)
+
+        submit_ballot(election=election, credential_public_id=cred2.public_id, ranking=[alice.id])
+        head.refresh_from_db()
+        self.assertEqual(head.participating_voter_count, 1)
+        self.assertEqual(head.participating_vote_weight_total, 3)
+        self.assertIsNotNone(head.quorum_reached_at)
+
+        # A re-vote after a weight change replaces the weight instead of adding a voter.
+        issue_voting_credential(election=election, freeipa_username="voter2", weight=2)
+        submit_ballot(election=election, credential_public_id=cred2.public_id, ranking=[alice.id])
+        submit_ballot(election=election, credential_public_id=cred1.public_id, ranking=[alice.id])
+
+        with self.assertNumQueries(1):
+            status = election_quorum_status(election=election)
+        self.assertEqual(
+            status,
+            {
+                "quorum_percent": 50,
+                "quorum_met": True,
+                "required_participating_voter_count": 1,
+                "eligible_voter_count": 2,
+                "eligible_vote_weight_total": 3,
+                "participating_voter_count": 2,
+                "participating_vote_weight_total": 3,
+            },
+        )
+        self.assertEqual(AuditLogEntry.objects.filter(election=election, event_type="quorum_reached").count(), 1)
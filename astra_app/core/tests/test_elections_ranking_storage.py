@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import Ballot, Candidate, Election
+
+
+class BallotRankingStorageTests(TestCase):
+    def _election(self) -> tuple[Election, list[int]]:
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Packed rankings",
+            start_datetime=now - datetime.timedelta(days=1),
+            end_datetime=now + datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.open,
+        )
+        candidate_ids = [
+            Candidate.objects.create(election=election, freeipa_username=name, nominated_by="nominator").id
+            for name in ("alice", "bob", "carol")
+        ]
+        return election, candidate_ids
+
+    def _ballot(self, election: Election, *, credential: str, ranking: list[int], weight: int) -> Ballot:
+        return Ballot.objects.create(
+            election=election,
+            credential_public_id=credential,
+            ranking=ranking,
+            weight=weight,
+            ballot_hash=credential.ljust(64, "0"),
+            previous_chain_hash="0" * 64,
+            chain_hash="0" * 64,
+        )
+
+    def test_ranking_round_trips_as_packed_int32s(self) -> None:
+        from core.elections_meek import pack_ranking
+
+        election, (a, b, c) = self._election()
+        ballot = self._ballot(election, credential="cred-1", ranking=[c, a, b], weight=1)
+
+        ballot.refresh_from_db()
+        self.assertEqual(ballot.ranking, [c, a, b])
+        self.assertEqual(Ballot.objects.values_list("ranking", flat=True).get(pk=ballot.pk), [c, a, b])
+        self.assertTrue(Ballot.objects.filter(ranking=[c, a, b]).exists())
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT ranking FROM core_ballot WHERE id = %s", [ballot.pk])
+            raw = bytes(cursor.fetchone()[0])
+        self.assertEqual(raw, pack_ranking([c, a, b]))
+        self.assertEqual(len(raw), 12)
+
+    def test_patterns_are_grouped_and_tally_reads_packed_rankings(self) -> None:
+        from core.elections_analytics import election_ranking_patterns
+        from core.elections_services import _compiled_election_ballots
+
+        election, (a, b, c) = self._election()
+        self._ballot(election, credential="cred-1", ranking=[a, b], weight=2)
+        self._ballot(election, credential="cred-2", ranking=[a, b], weight=3)
+        self._ballot(election, credential="cred-3", ranking=[b], weight=1)
+        self._ballot(election, credential="cred-4", ranking=[c, a, b], weight=1)
+
+        self.assertEqual(
+            list(election_ranking_patterns(election=election)),
+            [([a, b], 2, 5), ([b], 1, 1), ([c, a, b], 1, 1)],
+        )
+
+        compiled = _compiled_election_ballots(election=election, chain_head="test")
+        self.assertEqual(sorted(compiled.weights), [1, 1, 2, 3])
+        rankings = sorted(
+            list(compiled.rankings[compiled.offsets[i] : compiled.offsets[i + 1]]) for i in range(len(compiled))
+        )
+        self.assertEqual(rankings, sorted([[a, b], [a, b], [b], [c, a, b]]))
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import datetime
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.backends import FreeIPAUser
+from core.models import Candidate, Election, PendingVoteReceipt, VotingCredential
+
+
+class PendingVoteReceiptTests(TestCase):
+    def setUp(self) -> None:
+        now = timezone.now()
+        self.election = Election.objects.create(
+            name="Receipt election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=1),
+            end_datetime=now + datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.open,
+        )
+        self.candidate = Candidate.objects.create(election=self.election, freeipa_username="alice", nominated_by="bob")
+        for username in ("v1", "v2", "v3"):
+            VotingCredential.objects.create(
+                election=self.election,
+                public_id=f"cred-{username}",
+                freeipa_username=username,
+                weight=1,
+            )
+
+    def _vote(self, username: str, *, queue_receipt: bool = True) -> None:
+        from core.elections_services import submit_ballot
+
+        submit_ballot(
+            election=self.election,
+            credential_public_id=f"cred-{username}",
+            ranking=[self.candidate.id],
+            queue_receipt=queue_receipt,
+        )
+
+    def test_receipts_are_only_queued_when_asked_for(self) -> None:
+        self._vote("v1", queue_receipt=False)
+        self.assertFalse(PendingVoteReceipt.objects.exists())
+
+        self._vote("v1")
+        self._vote("v1")
+        self.assertEqual(PendingVoteReceipt.objects.filter(freeipa_username="v1").count(), 2)
+
+    @override_settings(ELECTION_VOTE_RECEIPT_MAX_ATTEMPTS=2)
+    def test_worker_batches_lookups_drops_voters_without_email_and_retries_failures(self) -> None:
+        from core.elections_receipts import send_pending_vote_receipts
+
+        for username in ("v1", "v2", "v3"):
+            self._vote(username)
+
+        users = {
+            "v1": FreeIPAUser("v1", {"uid": ["v1"], "mail": ["v1@example.com"]}),
+            "v2": FreeIPAUser("v2", {"uid": ["v2"]}),
+            "v3": FreeIPAUser("v3", {"uid": ["v3"], "mail": ["v3@example.com"]}),
+        }
+
+        def _send(**kwargs):
+            if kwargs["recipients"] == ["v3@example.com"]:
+                raise RuntimeError("mail queue unavailable")
+
+        with (
+            patch("core.backends.FreeIPAUser.get_many", return_value=users) as get_many_mock,
+            patch("post_office.mail.send", side_effect=_send) as send_mock,
+        ):
+            self.assertEqual(send_pending_vote_receipts(batch_size=2), (1, 1))
+            self.assertEqual(get_many_mock.call_count, 2)
+            self.assertEqual(send_mock.call_count, 2)
+
+            pending = PendingVoteReceipt.objects.get()
+            self.assertEqual((pending.freeipa_username, pending.attempts), ("v3", 1))
+            self.assertEqual(pending.last_error, "mail queue unavailable")
+
+            self.assertEqual(send_pending_vote_receipts(), (0, 1))
+            # Out of attempts: the row stays but is no longer picked up.
+            self.assertEqual(send_pending_vote_receipts(), (0, 0))
+
+        self.assertEqual(PendingVoteReceipt.objects.get().attempts, 2)
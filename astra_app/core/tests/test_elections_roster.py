@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import datetime
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from core.backends import FreeIPAUser
+from core.models import Candidate, Election
+
+
+class CandidateRosterTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        now = timezone.now()
+        self.election = Election.objects.create(
+            name="Roster election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=1),
+            end_datetime=now + datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.open,
+        )
+        self.bob = Candidate.objects.create(election=self.election, freeipa_username="bob", nominated_by="carol")
+        self.alice = Candidate.objects.create(election=self.election, freeipa_username="alice", nominated_by="carol")
+
+    def test_roster_reflects_candidate_edits_immediately(self) -> None:
+        from core.elections_roster import election_candidate_roster
+
+        roster = election_candidate_roster(election=self.election)
+        self.assertEqual([c.freeipa_username for c in roster.candidates], ["alice", "bob"])
+        self.assertEqual(roster.allowed_ids, {self.alice.id, self.bob.id})
+        self.assertFalse(roster.labelled)
+
+        # Edits made by another process (no model hooks run here) are seen on the next read.
+        Candidate.objects.filter(pk=self.bob.pk).update(description="Platform")
+        roster = election_candidate_roster(election=self.election)
+        self.assertEqual([c.description for c in roster.candidates], ["", "Platform"])
+
+        Candidate.objects.filter(pk=self.alice.pk).delete()
+        roster = election_candidate_roster(election=self.election)
+        self.assertEqual(roster.username_by_id, {self.bob.id: "bob"})
+
+    def test_only_freeipa_labels_are_cached(self) -> None:
+        from core.elections_roster import election_candidate_roster
+
+        alice = FreeIPAUser("alice", {"uid": ["alice"], "displayname": ["Alice Example"]})
+
+        with patch("core.backends.FreeIPAUser.get_many", return_value={"alice": alice}) as get_many_mock:
+            roster = election_candidate_roster(election=self.election, labels=True)
+            election_candidate_roster(election=self.election, labels=True)
+
+            # One batch lookup for every uncached username.
+            get_many_mock.assert_called_once_with(["alice", "bob", "carol"])
+            self.assertEqual([c.label for c in roster.candidates], ["Alice Example (alice)", "bob (bob)"])
+            self.assertEqual(roster.candidates[0].nominator_full_name, "carol")
+
+            dave = Candidate.objects.create(election=self.election, freeipa_username="dave", nominated_by="carol")
+            roster = election_candidate_roster(election=self.election, labels=True)
+
+        # Only the new candidate is looked up.
+        self.assertEqual(get_many_mock.call_count, 2)
+        get_many_mock.assert_called_with(["dave"])
+        self.assertIn(dave.id, roster.allowed_ids)
+
+    def test_labels_fall_back_to_usernames_when_freeipa_is_unreachable(self) -> None:
+        from core.elections_roster import election_candidate_roster
+
+        with patch("core.backends.FreeIPAUser.get_many", side_effect=ConnectionError("down")) as get_many_mock:
+            with self.assertLogs("core.elections_roster", level="ERROR"):
+                roster = election_candidate_roster(election=self.election, labels=True)
+            self.assertEqual([c.label for c in roster.candidates], ["alice (alice)", "bob (bob)"])
+
+            # Nothing was cached, so the next call asks again.
+            with self.assertLogs("core.elections_roster", level="ERROR"):
+                election_candidate_roster(election=self.election, labels=True)
+        self.assertEqual(get_many_mock.call_count, 2)
+
+    def test_submit_ballot_validates_against_the_database(self) -> None:
+        from core import elections_services
+        from core.models import Ballot, VotingCredential
+
+        VotingCredential.objects.create(election=self.election, public_id="cred-1", freeipa_username="v1", weight=1)
+        Candidate.objects.filter(pk=self.alice.pk).delete()
+
+        elections_services.submit_ballot(
+            election=self.election,
+            credential_public_id="cred-1",
+            ranking=[self.bob.id, 999_999, self.bob.id, self.alice.id],
+        )
+
+        ballot = Ballot.objects.get(election=self.election)
+        self.assertEqual(ballot.ranking, [self.bob.id])
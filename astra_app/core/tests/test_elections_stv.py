@@ -8,6 +8,15 @@ from django.test import TestCase
 from django.utils import timezone
 
 
+def _explain_round(
+    result: dict[str, object], candidates: list[dict[str, object]], round_data: dict[str, object]
+) -> dict[str, str]:
+    from core.elections_meek import explain_meek_rounds
+
+    names = {int(c["id"]): str(c["name"]) for c in candidates}
+    return explain_meek_rounds([round_data], quota=result["quota"], candidate_name_by_id=names)[0]
+
+
 class STVTallyTests(TestCase):
     def test_meek_does_not_elect_more_than_seats_in_single_iteration(self) -> None:
         from core.elections_meek import tally_meek
@@ -71,8 +80,9 @@ class STVTallyTests(TestCase):
         self.assertFalse(bool(r0.get("count_complete")))
 
         # Guardrail: if count_complete is false, do not claim finality.
-        audit_text = str(r0.get("audit_text") or "")
-        summary_text = str(r0.get("summary_text") or "")
+        explanation = _explain_round(result, candidates, r0)
+        audit_text = explanation["audit_text"]
+        summary_text = explanation["summary_text"]
         self.assertNotIn("Final results", audit_text)
         self.assertNotIn("all available seats have been filled", audit_text)
         self.assertNotIn("Final results", summary_text)
@@ -116,7 +126,7 @@ class STVTallyTests(TestCase):
         self.assertIsInstance(elim_round.get("elected"), list)
         self.assertGreaterEqual(len(list(elim_round.get("elected") or [])), 1)
 
-        audit_text = str(elim_round.get("audit_text") or "")
+        audit_text = _explain_round(result, candidates, elim_round)["audit_text"]
         self.assertIn("Final results", audit_text)
         self.assertTrue(
             
@@ -152,7 +162,7 @@ class STVTallyTests(TestCase):
         self.assertTrue(bool(r.get("count_complete")))
         self.assertTrue(list(r.get("elected_to_fill_remaining_seats") or []))
 
-        audit_text = str(r.get("audit_text") or "")
+        audit_text = _explain_round(result, candidates, r)["audit_text"]
         self.assertTrue(
             
                 "remaining eligible candidate exactly filled" in audit_text
@@ -239,7 +249,7 @@ class STVTallyTests(TestCase):
 
         elimination_rounds = [r for r in result2["rounds"] if r.get("eliminated") is not None]
         self.assertGreaterEqual(len(elimination_rounds), 1)
-        audit_text = str(elimination_rounds[0].get("audit_text") or "")
+        audit_text = _explain_round(result2, candidates, elimination_rounds[0])["audit_text"]
         self.assertIn("Candidates A and B", audit_text)
         self.assertIn("predefined deterministic tie-breaking rules", audit_text)
         self.assertIn(
@@ -329,7 +339,7 @@ class STVTallyTests(TestCase):
         self.assertGreaterEqual(len(forced_rounds), 1)
         first_forced_round = forced_rounds[0]
 
-        audit_text = str(first_forced_round.get("audit_text") or "")
+        audit_text = _explain_round(result, candidates, first_forced_round)["audit_text"]
         # Narration may omit a separate "reached quota" sentence to avoid redundancy, but
         # must still be clear that a quota threshold was met and why election did not occur.
         self.assertIn("meeting the quota", audit_text)
@@ -431,7 +441,111 @@ class STVTallyTests(TestCase):
         last = rounds[-1]
         self.assertTrue(bool(last.get("count_complete")))
         self.assertEqual(list(last.get("eligible_candidates") or []), [])
-        self.assertIn("seat remains vacant", str(last.get("audit_text") or ""))
+        self.assertIn("seat remains vacant", _explain_round(result, candidates, last)["audit_text"])
+
+    def test_meek_sharded_tally_matches_serial_tally(self) -> None:
+        import random
+        from unittest.mock import patch
+
+        from core import elections_meek
+
+        rng = random.Random(2026)
+        candidates = [
+            {"id": cid, "name": name, "tiebreak_uuid": uuid.UUID(f"00000000-0000-0000-0000-{cid:012d}")}
+            for cid, name in ((1, "A"), (2, "B"), (3, "C"), (4, "D"), (5, "E"))
+        ]
+        ballots = [
+            {"weight": rng.choice((1, 2, 5)), "ranking": rng.sample([1, 2, 3, 4, 5], rng.randint(1, 5))}
+            for _ in range(300)
+        ]
+        exclusion_groups = [{"public_id": "g", "name": "G", "max_elected": 1, "candidate_ids": [1, 2]}]
+
+        serial = elections_meek.tally_meek(
+            ballots=ballots,
+            candidates=candidates,
+            seats=2,
+            exclusion_groups=exclusion_groups,
+        )
+        with patch.object(elections_meek, "PARALLEL_MIN_BALLOTS", 1):
+            sharded = elections_meek.tally_meek(
+                ballots=ballots,
+                candidates=candidates,
+                seats=2,
+                exclusion_groups=exclusion_groups,
+                workers=3,
+            )
+
+        # Partial sums are reduced exactly, so every round must match digit for digit.
+        self.assertEqual(sharded, serial)
+
+    def test_meek_accelerated_tally_elects_same_candidates_in_fewer_iterations(self) -> None:
+        import random
+
+        from core.elections_meek import tally_meek
+
+        rng = random.Random(0)
+        candidates = [
+            {"id": cid, "name": f"C{cid}", "tiebreak_uuid": uuid.UUID(f"00000000-0000-0000-0000-{cid:012d}")}
+            for cid in range(1, 7)
+        ]
+        ballots = [
+            {"weight": rng.choice((1, 2, 5, 7)), "ranking": rng.sample(range(1, 7), rng.randint(1, 6))}
+            for _ in range(200)
+        ]
+
+        plain = tally_meek(ballots=ballots, candidates=candidates, seats=3)
+        accelerated = tally_meek(ballots=ballots, candidates=candidates, seats=3, accelerate=True)
+
+        self.assertEqual(accelerated["elected"], plain["elected"])
+        self.assertEqual(len(plain["stage_iterations"]), len({r["stage"] for r in plain["rounds"]}))
+        self.assertLess(sum(accelerated["stage_iterations"]), sum(plain["stage_iterations"]))
+        self.assertTrue(any(r.get("accelerated") for r in accelerated["rounds"]))
+        self.assertFalse(any(r.get("accelerated") for r in plain["rounds"]))
+
+    def test_meek_tallies_compiled_ballot_rows_like_ballot_dicts(self) -> None:
+        from core.elections_meek import compile_ballots, tally_meek
+
+        candidates = [
+            {"id": cid, "name": name, "tiebreak_uuid": uuid.UUID(f"00000000-0000-0000-0000-{cid:012d}")}
+            for cid, name in ((1, "A"), (2, "B"), (3, "C"))
+        ]
+        ballots = [
+            {"weight": 3, "ranking": [1, 2]},
+            {"weight": 2, "ranking": [2, 3]},
+            {"weight": 2, "ranking": [3, 1]},
+            {"weight": 1, "ranking": []},
+        ]
+
+        from_dicts = tally_meek(ballots=ballots, candidates=candidates, seats=2)
+        # A generator stands in for a database cursor: it can only be read once.
+        compiled = compile_ballots((b["weight"], b["ranking"]) for b in ballots)
+        from_rows = tally_meek(ballots=compiled, candidates=candidates, seats=2)
+
+        self.assertEqual(len(compiled), 4)
+        self.assertEqual(from_rows, from_dicts)
+
+    def test_meek_quota_ignores_ballots_with_invalid_weights(self) -> None:
+        from core.elections_meek import tally_meek
+
+        candidates = [{"id": 1, "name": "A", "tiebreak_uuid": uuid.UUID("00000000-0000-0000-0000-000000000001")}]
+        ballots = [
+            {"weight": 4, "ranking": [1]},
+            {"weight": -5, "ranking": [1]},
+            {"weight": 1_000_001, "ranking": [1]},
+            {"weight": "bogus", "ranking": [1]},
+        ]
+
+        result = tally_meek(ballots=ballots, candidates=candidates, seats=1)
+
+        # floor(4 / 2) + 1
+        self.assertEqual(result["quota"], Decimal("3"))
+
+    def test_meek_rejects_invalid_worker_count(self) -> None:
+        from core.elections_meek import tally_meek
+
+        candidates = [{"id": 1, "name": "A", "tiebreak_uuid": uuid.UUID("00000000-0000-0000-0000-000000000001")}]
+        with self.assertRaisesMessage(ValueError, "workers must be between"):
+            tally_meek(ballots=[{"weight": 1, "ranking": [1]}], candidates=candidates, seats=1, workers=0)
 
 
 class ElectionPrivacyFlowTests(TestCase):
@@ -606,8 +720,9 @@ class MeekTieBreakEndToEndTests(TestCase):
 
         r0 = rounds[0]
         self.assertTrue(list(r0.get("tie_breaks") or []))
-        summary_text = str(r0.get("summary_text") or "")
-        audit_text = str(r0.get("audit_text") or "")
+        explanation = _explain_round(result, candidates, r0)
+        summary_text = explanation["summary_text"]
+        audit_text = explanation["audit_text"]
         self.assertIn("tie resolved deterministically", summary_text)
         self.assertIn("fixed candidate ordering identifier", audit_text)
 
@@ -635,8 +750,9 @@ class MeekTieBreakEndToEndTests(TestCase):
         self.assertGreaterEqual(len(elimination_rounds), 1)
 
         r = elimination_rounds[0]
-        summary_text = str(r.get("summary_text") or "")
-        audit_text = str(r.get("audit_text") or "")
+        explanation = _explain_round(result, candidates, r)
+        summary_text = explanation["summary_text"]
+        audit_text = explanation["audit_text"]
         self.assertIn("tie resolved deterministically", summary_text)
         self.assertIn("fixed candidate ordering identifier", audit_text)
 
@@ -692,5 +808,6 @@ class MeekTieBreakEndToEndTests(TestCase):
         )
         rounds = [r for r in list(result.get("rounds") or []) if isinstance(r, dict)]
         rnd, _tb = self._find_resolved_rule(rounds, rule=3)
-        self.assertIn("tie resolved deterministically", str(rnd.get("summary_text") or ""))
-        self.assertIn("The tie was resolved using first-preference votes.", str(rnd.get("audit_text") or ""))
+        explanation = _explain_round(result, candidates, rnd)
+        self.assertIn("tie resolved deterministically", explanation["summary_text"])
+        self.assertIn("The tie was resolved using first-preference votes.", explanation["audit_text"])
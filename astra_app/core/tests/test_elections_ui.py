@@ -94,7 +94,13 @@ class ElectionsDetailCandidateCardsTests(TestCase):
                 return nominator
             return None
 
-        with patch("core.backends.FreeIPAUser.get", side_effect=_get_user):
+        def _get_many(usernames):
+            return {u: user for u in usernames if (user := _get_user(u)) is not None}
+
+        with (
+            patch("core.backends.FreeIPAUser.get", side_effect=_get_user),
+            patch("core.backends.FreeIPAUser.get_many", side_effect=_get_many),
+        ):
             resp = self.client.get(reverse("election-detail", args=[election.id]))
 
         self.assertEqual(resp.status_code, 200)
@@ -106,6 +106,46 @@ class ElectionVoteWeightsTests(TestCase):
         eligible_by_username = {v.username: v.weight for v in eligible}
         self.assertEqual(eligible_by_username.get("voter1"), expected)
 
+    def test_eligibility_snapshot_is_reused_until_refreshed(self) -> None:
+        from core.elections_services import election_quorum_status, eligible_vote_weight_for_username
+        from core.models import ElectionEligibilitySnapshot
+
+        now = timezone.now()
+        election = Election.objects.create(
+            name="Snapshot election",
+            description="",
+            start_datetime=now - datetime.timedelta(days=1),
+            end_datetime=now + datetime.timedelta(days=1),
+            number_of_seats=1,
+            status=Election.Status.draft,
+        )
+        expected = self._make_weighted_voter(election=election, username="voter1")
+
+        self.assertEqual(
+            [(v.username, v.weight) for v in eligible_voters_from_memberships(election=election)],
+            [("voter1", expected)],
+        )
+        snapshot = ElectionEligibilitySnapshot.objects.get(election=election)
+        self.assertEqual((snapshot.voter_count, snapshot.vote_weight_total), (1, expected))
+
+        Membership.objects.filter(target_username="voter1").delete()
+
+        # Readers keep using the stored electorate while it is fresh.
+        with self.assertNumQueries(2):
+            self.assertEqual(eligible_vote_weight_for_username(election=election, username="voter1"), expected)
+        self.assertEqual(election_quorum_status(election=election)["eligible_vote_weight_total"], expected)
+
+        refreshed = eligible_voters_from_memberships(election=election, refresh=True)
+        self.assertEqual([(v.username, v.weight) for v in refreshed], [("voter1", 5)])
+
+        with override_settings(ELECTION_ELIGIBILITY_SNAPSHOT_MAX_AGE=0):
+            Organization.objects.filter(representative="voter1").update(representative="voter2")
+            self.assertEqual(
+                [(v.username, v.weight) for v in eligible_voters_from_memberships(election=election)],
+                [("voter2", 5)],
+            )
+        self.assertEqual(ElectionEligibilitySnapshot.objects.filter(election=election).count(), 1)
+
     def test_ballot_weight_and_meek_quota_use_combined_weight(self) -> None:
         now = timezone.now()
         election = Election.objects.create(
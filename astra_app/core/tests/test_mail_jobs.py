@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import datetime
+import io
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.backends import FreeIPAUser
+from core.models import FreeIPAPermissionGrant, MailBatch, MailJob, MailJobRecipient
+from core.permissions import ASTRA_ADD_SEND_MAIL
+
+
+@override_settings(
+    POST_OFFICE={**settings.POST_OFFICE, "DEFAULT_PRIORITY": "medium"},
+    SEND_MAIL_JOB_BATCH_SIZE=2,
+)
+class MailJobTests(TestCase):
+    def _job(self, recipients: list[dict[str, str]], **kwargs: object) -> MailJob:
+        from core.mail_batches import create_mail_batch
+        from core.mail_jobs import enqueue_mail_job
+
+        batch = create_mail_batch(recipients=recipients, variables=["email", "name"], source=MailBatch.Source.send_mail)
+        defaults: dict[str, object] = {
+            "subject": "Hi {{ name }}",
+            "html_content": "<p>Hi {{ name }} from {{ team }}</p>",
+            "text_content": "Hi {{ name }}",
+            "cc": [],
+            "bcc": [],
+            "extra_context": {"team": "Board"},
+            "requested_by": "reviewer",
+        }
+        defaults.update(kwargs)
+        return enqueue_mail_job(batch=batch, **defaults)
+
+    def test_job_queues_one_email_per_recipient_and_records_outcomes(self) -> None:
+        from post_office.models import Email
+
+        from core.mail_jobs import run_pending_mail_jobs
+
+        job = self._job(
+            [
+                {"email": "alice@example.com", "name": "Alice"},
+                {"email": "", "name": "Nobody"},
+                {"email": "not-an-address", "name": "Broken"},
+                {"email": "bob@example.com", "name": "Bob", "team": "Infra"},
+            ]
+        )
+
+        self.assertEqual(run_pending_mail_jobs(), (1, 0))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, MailJob.Status.succeeded)
+        self.assertEqual((job.progress, job.total, job.sent_count, job.failed_count), (4, 4, 2, 1))
+
+        emails = list(Email.objects.order_by("id"))
+        self.assertEqual([email.to for email in emails], [["alice@example.com"], ["bob@example.com"]])
+        self.assertEqual(emails[0].html_message, "<p>Hi Alice from Board</p>")
+        # A recipient's own value wins over the form's extra context.
+        self.assertEqual(emails[1].html_message, "<p>Hi Bob from Infra</p>")
+
+        outcomes = list(job.outcomes.order_by("position").values_list("status", "email_id"))
+        self.assertEqual(
+            outcomes,
+            [
+                (MailJobRecipient.Status.queued, emails[0].id),
+                (MailJobRecipient.Status.skipped, None),
+                (MailJobRecipient.Status.failed, None),
+                (MailJobRecipient.Status.queued, emails[1].id),
+            ],
+        )
+
+    def test_stale_job_resumes_without_queueing_anyone_twice(self) -> None:
+        import post_office.mail
+        from post_office.models import Email
+
+        from core.mail_jobs import run_pending_mail_jobs
+
+        job = self._job([{"email": f"user{i}@example.com", "name": f"User {i}"} for i in range(5)])
+
+        real_send_many = post_office.mail.send_many
+        calls = 0
+
+        def _dies_on_second_batch(kwargs_list):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                # The worker process is killed mid-batch.
+                raise SystemExit(1)
+            return real_send_many(kwargs_list)
+
+        with (
+            patch("post_office.mail.send_many", side_effect=_dies_on_second_batch),
+            self.assertRaises(SystemExit),
+        ):
+            run_pending_mail_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, MailJob.Status.running)
+        self.assertEqual(job.progress, 2)
+        self.assertEqual(Email.objects.count(), 2)
+
+        MailJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - datetime.timedelta(hours=1))
+        self.assertEqual(run_pending_mail_jobs(), (1, 0))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, MailJob.Status.succeeded)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.sent_count, 5)
+        recipients = sorted(address for email in Email.objects.all() for address in email.to)
+        self.assertEqual(recipients, [f"user{i}@example.com" for i in range(5)])
+        self.assertEqual(job.outcomes.count(), 5)
+
+    def test_stalled_worker_stops_once_its_job_is_reclaimed(self) -> None:
+        from post_office.models import Email
+
+        from core.mail_jobs import claim_next_mail_job, run_mail_job
+
+        self._job([{"email": f"user{i}@example.com", "name": f"User {i}"} for i in range(3)])
+        stalled = claim_next_mail_job()
+        MailJob.objects.filter(pk=stalled.pk).update(heartbeat_at=timezone.now() - datetime.timedelta(hours=1))
+        reclaimed = claim_next_mail_job()
+        self.assertEqual(reclaimed.attempts, 2)
+
+        # The stalled worker wakes up: it queues nothing and leaves the job to the new one.
+        self.assertIsNone(run_mail_job(stalled))
+        job = MailJob.objects.get()
+        self.assertEqual((job.status, job.progress), (MailJob.Status.running, 0))
+        self.assertFalse(Email.objects.exists())
+
+        self.assertTrue(run_mail_job(reclaimed))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.sent_count), (MailJob.Status.succeeded, 3))
+        self.assertEqual(Email.objects.count(), 3)
+
+    def test_missing_inline_image_fails_the_job(self) -> None:
+        from post_office.models import Email
+
+        from core.mail_jobs import run_pending_mail_jobs
+
+        job = self._job(
+            [{"email": "alice@example.com", "name": "Alice"}],
+            html_content="{% load post_office %}<img src=\"{% inline_image 'mail-images/missing.png' %}\" />",
+        )
+
+        with patch("django.core.files.storage.default_storage.open", side_effect=FileNotFoundError):
+            self.assertEqual(run_pending_mail_jobs(), (0, 1))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, MailJob.Status.failed)
+        self.assertIn("Template error", job.error)
+        self.assertFalse(Email.objects.exists())
+
+    def test_pruning_keeps_batches_of_unfinished_jobs(self) -> None:
+        from core.mail_batches import prune_mail_batches
+
+        job = self._job([{"email": "alice@example.com", "name": "Alice"}])
+        MailBatch.objects.update(created_at=timezone.now() - datetime.timedelta(days=365))
+
+        prune_mail_batches()
+        self.assertTrue(MailBatch.objects.filter(pk=job.batch_id).exists())
+
+        MailJob.objects.filter(pk=job.pk).update(status=MailJob.Status.succeeded)
+        out = io.StringIO()
+        call_command("prune_mail_batches", stdout=out)
+        self.assertIn("Deleted 1 mail batch(es).", out.getvalue())
+        self.assertFalse(MailBatch.objects.filter(pk=job.batch_id).exists())
+
+    def test_run_mail_jobs_command(self) -> None:
+        self._job([{"email": "alice@example.com", "name": "Alice"}])
+
+        out = io.StringIO()
+        call_command("run_mail_jobs", stdout=out)
+
+        self.assertIn("Ran 1 mail job(s); failed 0.", out.getvalue())
+        self.assertEqual(MailJob.objects.get().status, MailJob.Status.succeeded)
+
+
+@override_settings(POST_OFFICE={**settings.POST_OFFICE, "DEFAULT_PRIORITY": "medium"})
+class SendMailJobViewTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        FreeIPAPermissionGrant.objects.get_or_create(
+            permission=ASTRA_ADD_SEND_MAIL,
+            principal_type=FreeIPAPermissionGrant.PrincipalType.group,
+            principal_name="membership-committee",
+        )
+        session = self.client.session
+        session["_freeipa_username"] = "reviewer"
+        session.save()
+        self.reviewer = FreeIPAUser("reviewer", {"uid": ["reviewer"], "memberof_group": ["membership-committee"]})
+
+    def test_send_queues_a_job_and_reports_its_progress(self) -> None:
+        from post_office.models import Email
+
+        from core.mail_jobs import run_pending_mail_jobs
+
+        with (
+            patch("core.backends.FreeIPAUser.get", return_value=self.reviewer),
+            patch("core.backends.FreeIPAGroup.all", return_value=[]),
+        ):
+            resp = self.client.post(
+                reverse("send-mail"),
+                data={
+                    "recipient_mode": "manual",
+                    "manual_to": "jim@example.com, kim@example.com",
+                    "subject": "Hello",
+                    "text_content": "Hi",
+                    "html_content": "<p>Hi</p>",
+                    "action": "send",
+                },
+            )
+
+            job = MailJob.objects.get()
+            self.assertEqual(job.batch.source, MailBatch.Source.send_mail)
+            self.assertEqual(job.total, 2)
+            self.assertFalse(Email.objects.exists())
+            self.assertContains(resp, "Sending 2 emails")
+            self.assertContains(resp, reverse("send-mail-job-status", args=[job.public_id]))
+
+            status_url = reverse("send-mail-job-status", args=[job.public_id])
+            self.assertEqual(self.client.get(status_url).json()["status"], "queued")
+
+            run_pending_mail_jobs()
+
+            payload = self.client.get(status_url).json()
+            self.assertEqual(payload["status"], "succeeded")
+            self.assertEqual((payload["sent"], payload["total"], payload["percent"]), (2, 2, 100))
+            self.assertFalse(payload["active"])
+
+            resp = self.client.get(reverse("send-mail"), {"job": str(job.public_id)})
+            self.assertContains(resp, "Queued 2 of 2")
+            self.assertEqual(self.client.get(reverse("send-mail-job-status", args=["nope"])).status_code, 404)
+
+        self.assertEqual(Email.objects.count(), 2)
+
+    def test_template_cache_stats_endpoint_requires_send_mail_permission(self) -> None:
+        from core.templated_email import render_template_string
+
+        render_template_string("Hi {{ name }}", {"name": "Alice"})
+        url = reverse("send-mail-template-cache-stats")
+
+        with patch("core.backends.FreeIPAUser.get", return_value=self.reviewer):
+            payload = self.client.get(url).json()
+        self.assertEqual(set(payload), {"hits", "misses", "size", "max_size"})
+        self.assertGreaterEqual(payload["size"], 1)
+
+        outsider = FreeIPAUser("reviewer", {"uid": ["reviewer"], "memberof_group": []})
+        with patch("core.backends.FreeIPAUser.get", return_value=outsider):
+            self.assertEqual(self.client.get(url).status_code, 403)
+
@@ -5,15 +5,34 @@ import json
 from unittest.mock import patch
 from urllib.parse import quote
 
+from django.conf import settings
 from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from core.backends import FreeIPAUser
-from core.models import FreeIPAPermissionGrant
+from core.models import FreeIPAPermissionGrant, MailJob
 from core.permissions import ASTRA_ADD_SEND_MAIL
 
+# Minimal valid 1x1 PNG so MIMEImage can infer subtype.
+_PNG_BYTES = (
+    b"\x89PNG\r\n\x1a\n"
+    b"\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
+    b"\x00\x00\x00\x0bIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xb4"
+    b"\x00\x00\x00\x00IEND\xaeB`\x82"
+)
 
+
+# Queue without delivering, whatever DEBUG says.
+@override_settings(POST_OFFICE={**settings.POST_OFFICE, "DEFAULT_PRIORITY": "medium"})
 class SendMailTests(TestCase):
+    def _run_mail_jobs(self) -> list:
+        from post_office.models import Email
+
+        from core.mail_jobs import run_pending_mail_jobs
+
+        run_pending_mail_jobs()
+        return list(Email.objects.order_by("id"))
+
     def _login_as_freeipa_user(self, username: str) -> None:
         session = self.client.session
         session["_freeipa_username"] = username
@@ -125,6 +144,84 @@ class SendMailTests(TestCase):
         self.assertContains(resp, "{{ company }}")
         self.assertContains(resp, "alice@example.com")
 
+    @override_settings(SEND_MAIL_PREVIEW_PAGE_SIZE=2)
+    def test_csv_recipients_are_stored_as_a_batch_and_paged(self) -> None:
+        from core.models import MailBatch
+
+        self._login_as_freeipa_user("reviewer")
+        reviewer = FreeIPAUser("reviewer", {"uid": ["reviewer"], "memberof_group": ["membership-committee"]})
+
+        csv_bytes = b"Email,Name\n" + b"".join(f"user{i}@example.com,User {i}\n".encode() for i in range(5))
+        csv_file = io.BytesIO(csv_bytes)
+        csv_file.name = "recipients.csv"
+
+        with (
+            patch("core.backends.FreeIPAUser.get", return_value=reviewer),
+            patch("core.backends.FreeIPAGroup.all", return_value=[]),
+        ):
+            resp = self.client.post(reverse("send-mail"), data={"recipient_mode": "csv", "csv_file": csv_file})
+            self.assertEqual(resp.status_code, 200)
+
+            batch = MailBatch.objects.get()
+            self.assertEqual(batch.source, MailBatch.Source.csv)
+            self.assertEqual(batch.created_by, "reviewer")
+            self.assertEqual(batch.variables, ["email", "name"])
+            self.assertEqual(batch.recipient_count, 5)
+            self.assertEqual(self.client.session["send_mail_batch_v1"], str(batch.public_id))
+            self.assertEqual(resp.context["preview"].recipient_count, 5)
+            self.assertEqual(resp.context["recipient_page"]["num_pages"], 3)
+            self.assertContains(resp, "user1@example.com")
+            self.assertNotContains(resp, "user2@example.com")
+
+            page = self.client.get(reverse("send-mail-batch-recipients") + "?page=3").json()
+            self.assertEqual(page["page"], 3)
+            self.assertEqual(page["columns"], ["email", "name"])
+            self.assertEqual(page["rows"], [["user4@example.com", "User 4"]])
+
+            # Without a new upload the saved batch is reused.
+            resp = self.client.post(reverse("send-mail"), data={"recipient_mode": "csv"})
+        self.assertEqual(resp.context["preview"].recipient_count, 5)
+        self.assertEqual(MailBatch.objects.count(), 1)
+
+    def test_send_emails_to_saved_csv_batch_with_extra_context(self) -> None:
+        self._login_as_freeipa_user("reviewer")
+        reviewer = FreeIPAUser("reviewer", {"uid": ["reviewer"], "memberof_group": ["membership-committee"]})
+
+        csv_file = io.BytesIO(b"Email,Name\nalice@example.com,Alice\nbob@example.com,\n")
+        csv_file.name = "recipients.csv"
+
+        with (
+            patch("core.backends.FreeIPAUser.get", return_value=reviewer),
+            patch("core.backends.FreeIPAGroup.all", return_value=[]),
+        ):
+            self.client.post(reverse("send-mail"), data={"recipient_mode": "csv", "csv_file": csv_file})
+            resp = self.client.post(
+                reverse("send-mail"),
+                data={
+                    "recipient_mode": "csv",
+                    "subject": "Hi {{ name }} from {{ team }}",
+                    "text_content": "Body",
+                    "action": "send",
+                    "extra_context_json": json.dumps({"team": "Board", "name": "friend"}),
+                },
+            )
+
+        self.assertEqual(resp.status_code, 200)
+        emails = self._run_mail_jobs()
+        subjects = [email.subject for email in emails]
+        recipients = [email.to for email in emails]
+        self.assertEqual(subjects, ["Hi Alice from Board", "Hi  from Board"])
+        self.assertEqual(recipients, [["alice@example.com"], ["bob@example.com"]])
+
+    def test_batch_recipients_endpoint_requires_a_saved_batch(self) -> None:
+        self._login_as_freeipa_user("reviewer")
+        reviewer = FreeIPAUser("reviewer", {"uid": ["reviewer"], "memberof_group": ["membership-committee"]})
+
+        with patch("core.backends.FreeIPAUser.get", return_value=reviewer):
+            resp = self.client.get(reverse("send-mail-batch-recipients"))
+
+        self.assertEqual(resp.status_code, 404)
+
     def test_manual_recipients_show_variables_and_count(self) -> None:
         self._login_as_freeipa_user("reviewer")
         reviewer = FreeIPAUser("reviewer", {"uid": ["reviewer"], "memberof_group": ["membership-committee"]})
@@ -559,7 +656,6 @@ class SendMailTests(TestCase):
         self.assertContains(resp, f'id="send-mail-autoload-template-id" value="{tpl.pk}"')
 
     def test_send_emails_renders_per_recipient(self) -> None:
-        from django.conf import settings
         from post_office.models import EmailTemplate
 
         self._login_as_freeipa_user("reviewer")
@@ -602,9 +698,7 @@ class SendMailTests(TestCase):
             patch("core.backends.FreeIPAUser.get", side_effect=_get_user),
             patch("core.backends.FreeIPAGroup.get", return_value=_FakeGroup()),
             patch("core.backends.FreeIPAGroup.all", return_value=[_FakeGroup()]),
-            patch("core.views_send_mail.EmailMultiAlternatives", autospec=True) as email_cls,
         ):
-            email_cls.return_value.send.return_value = 1
             resp = self.client.post(
                 reverse("send-mail"),
                 data={
@@ -621,17 +715,15 @@ class SendMailTests(TestCase):
             )
 
         self.assertEqual(resp.status_code, 200)
-        email_cls.assert_called_once()
-        args, kwargs = email_cls.call_args
-        self.assertEqual(args[0], "Hello Alice")
-        self.assertEqual(args[1], "Hi Alice User")
-        self.assertEqual(args[2], settings.DEFAULT_FROM_EMAIL)
-        self.assertEqual(args[3], ["alice@example.com"])
-        self.assertEqual(kwargs["cc"], ["cc1@example.com", "cc2@example.com"])
-        self.assertEqual(kwargs["bcc"], ["bcc1@example.com"])
-
-        email_cls.return_value.attach_alternative.assert_called_once_with("<p>Hi Alice User</p>", "text/html")
-        email_cls.return_value.send.assert_called_once()
+        self.assertContains(resp, "Sending 1 email")
+        [email] = self._run_mail_jobs()
+        self.assertEqual(email.subject, "Hello Alice")
+        self.assertEqual(email.message, "Hi Alice User")
+        self.assertEqual(email.from_email, settings.DEFAULT_FROM_EMAIL)
+        self.assertEqual(email.to, ["alice@example.com"])
+        self.assertEqual(email.cc, ["cc1@example.com", "cc2@example.com"])
+        self.assertEqual(email.bcc, ["bcc1@example.com"])
+        self.assertEqual(email.html_message, "<p>Hi Alice User</p>")
 
     def test_send_emails_accepts_whitespace_separated_cc_bcc(self) -> None:
         from post_office.models import EmailTemplate
@@ -676,9 +768,7 @@ class SendMailTests(TestCase):
             patch("core.backends.FreeIPAUser.get", side_effect=_get_user),
             patch("core.backends.FreeIPAGroup.get", return_value=_FakeGroup()),
             patch("core.backends.FreeIPAGroup.all", return_value=[_FakeGroup()]),
-            patch("core.views_send_mail.EmailMultiAlternatives", autospec=True) as email_cls,
         ):
-            email_cls.return_value.send.return_value = 1
             resp = self.client.post(
                 reverse("send-mail"),
                 data={
@@ -695,10 +785,9 @@ class SendMailTests(TestCase):
             )
 
         self.assertEqual(resp.status_code, 200)
-        email_cls.assert_called_once()
-        _args, kwargs = email_cls.call_args
-        self.assertEqual(kwargs["cc"], ["cc1@example.com", "cc2@example.com", "cc3@example.com"])
-        self.assertEqual(kwargs["bcc"], ["bcc1@example.com", "bcc2@example.com"])
+        [email] = self._run_mail_jobs()
+        self.assertEqual(email.cc, ["cc1@example.com", "cc2@example.com", "cc3@example.com"])
+        self.assertEqual(email.bcc, ["bcc1@example.com", "bcc2@example.com"])
 
     def test_send_emails_renders_extra_context_vars(self) -> None:
         self._login_as_freeipa_user("reviewer")
@@ -707,9 +796,7 @@ class SendMailTests(TestCase):
         with (
             patch("core.backends.FreeIPAUser.get", return_value=reviewer),
             patch("core.backends.FreeIPAGroup.all", return_value=[]),
-            patch("core.views_send_mail.EmailMultiAlternatives", autospec=True) as email_cls,
         ):
-            email_cls.return_value.send.return_value = 1
             resp = self.client.post(
                 reverse("send-mail"),
                 data={
@@ -725,62 +812,41 @@ class SendMailTests(TestCase):
             )
 
         self.assertEqual(resp.status_code, 200)
-        email_cls.assert_called_once()
-        args, _kwargs = email_cls.call_args
-        self.assertEqual(args[0], "Hello Atomic")
+        [email] = self._run_mail_jobs()
+        self.assertEqual(email.subject, "Hello Atomic")
 
+    @override_settings(AWS_STORAGE_BUCKET_NAME="astra-media")
     def test_send_mail_attaches_related_inline_images(self) -> None:
         self._login_as_freeipa_user("reviewer")
         reviewer = FreeIPAUser("reviewer", {"uid": ["reviewer"], "memberof_group": ["membership-committee"]})
 
-        class _FakeTemplate:
-            def __init__(self, rendered: str) -> None:
-                self._rendered = rendered
-                self.attach_related_calls: list[object] = []
-
-            def render(self, context: dict[str, str]) -> str:
-                return self._rendered
-
-            def attach_related(self, email_message: object) -> None:
-                self.attach_related_calls.append(email_message)
-
-        class _FakeEngine:
-            def __init__(self) -> None:
-                self._templates: list[_FakeTemplate] = []
-
-            def from_string(self, _raw: str) -> _FakeTemplate:
-                rendered = ["SUBJ", "TEXT", "<p>HTML</p>"][len(self._templates)]
-                tpl = _FakeTemplate(rendered)
-                self._templates.append(tpl)
-                return tpl
-
-        fake_engine = _FakeEngine()
+        image_url = "http://localhost:9000/astra-media/mail-images/logo.png"
+        html = "{% load post_office %}\n" f"<img src=\"{{% inline_image '{image_url}' %}}\" />\n"
 
         with (
             patch("core.backends.FreeIPAUser.get", return_value=reviewer),
-            patch("core.backends.FreeIPAGroup.all", return_value=[]),
-            patch("core.views_send_mail.engines", {"post_office": fake_engine}),
-            patch("core.views_send_mail.EmailMultiAlternatives", autospec=True) as email_cls,
+            patch("django.core.files.storage.default_storage.open", side_effect=lambda *_a, **_k: io.BytesIO(_PNG_BYTES)),
         ):
-            email_cls.return_value.send.return_value = 1
-            resp = self.client.post(
+            self.client.post(
                 reverse("send-mail"),
                 data={
                     "recipient_mode": "manual",
-                    "manual_to": "jim@example.com",
+                    "manual_to": "jim@example.com, kim@example.com",
                     "subject": "SUBJ",
                     "text_content": "TEXT",
-                    "html_content": "<p>HTML</p>",
+                    "html_content": html,
                     "action": "send",
                 },
-                follow=True,
             )
+            emails = self._run_mail_jobs()
 
-        self.assertEqual(resp.status_code, 200)
-        # html template is the third from_string() call.
-        self.assertEqual(len(fake_engine._templates), 3)
-        html_template = fake_engine._templates[2]
-        self.assertEqual(len(html_template.attach_related_calls), 1)
+        self.assertEqual(len(emails), 2)
+        attachments = [list(email.attachments.all()) for email in emails]
+        # One stored image, linked to every email that refers to it.
+        self.assertEqual(len(attachments[0]), 1)
+        self.assertEqual(attachments[0], attachments[1])
+        content_id = attachments[0][0].headers["Content-ID"].strip("<>")
+        self.assertIn(f"cid:{content_id}", emails[0].html_message)
 
     @override_settings(DEBUG=True)
     def test_send_mail_supports_inline_image_url_from_storage(self) -> None:
@@ -793,18 +859,9 @@ class SendMailTests(TestCase):
         image_url = "http://localhost:9000/astra-media/mail-images/logo.png"
         html = "{% load post_office %}\n" f"<img src=\"{{% inline_image '{image_url}' %}}\" />\n"
 
-        # Minimal valid 1x1 PNG so MIMEImage can infer subtype.
-        png_bytes = (
-            b"\x89PNG\r\n\x1a\n"
-            b"\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x06\x00\x00\x00\x1f\x15\xc4\x89"
-            b"\x00\x00\x00\x0bIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xb4"
-            b"\x00\x00\x00\x00IEND\xaeB`\x82"
-        )
-
         with (
             patch("core.backends.FreeIPAUser.get", return_value=reviewer),
-            patch("core.views_send_mail.EmailMultiAlternatives.send", return_value=1),
-            patch("django.core.files.storage.default_storage.open", return_value=io.BytesIO(png_bytes)),
+            patch("django.core.files.storage.default_storage.open", side_effect=lambda *_a, **_k: io.BytesIO(_PNG_BYTES)),
         ):
             resp = self.client.post(
                 reverse("send-mail"),
@@ -819,10 +876,13 @@ class SendMailTests(TestCase):
                 follow=True,
             )
 
+            emails = self._run_mail_jobs()
+
         self.assertEqual(resp.status_code, 200)
-        self.assertContains(resp, "Queued 1 email")
-        self.assertNotContains(resp, "Failed to queue")
+        self.assertContains(resp, "Sending 1 email")
         self.assertNotContains(resp, "Template error")
+        self.assertEqual(len(emails), 1)
+        self.assertEqual(MailJob.objects.get().status, MailJob.Status.succeeded)
 
 
 class UnifiedEmailPreviewSendMailTests(TestCase):
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import uuid
+
+from django.test import SimpleTestCase
+
+from core.templated_email import compiled_template, compiled_template_cache_stats, render_template_string
+
+
+class CompiledTemplateCacheTests(SimpleTestCase):
+    def test_repeated_renders_compile_once(self) -> None:
+        source = f"Hello {{{{ name }}}} ({uuid.uuid4()})"
+        before = compiled_template_cache_stats()
+
+        self.assertTrue(render_template_string(source, {"name": "Alice"}).startswith("Hello Alice"))
+        self.assertTrue(render_template_string(source, {"name": "Bob"}).startswith("Hello Bob"))
+
+        after = compiled_template_cache_stats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertIs(compiled_template(source), compiled_template(source))
+
+    def test_engines_are_cached_separately(self) -> None:
+        source = f"<b>{{{{ value }}}}</b> {uuid.uuid4()}"
+
+        self.assertIsNot(compiled_template(source), compiled_template(source, using="django"))
+        self.assertIn("&lt;i&gt;", compiled_template(source, using="django").render({"value": "<i>"}))
+
+    def test_inline_image_templates_are_compiled_per_use(self) -> None:
+        # Their compiled form collects rendered images, so it can't be shared.
+        source = "{% load post_office %}<img src=\"{% inline_image '/tmp/logo.png' %}\" />"
+        before = compiled_template_cache_stats()
+
+        self.assertIsNot(compiled_template(source), compiled_template(source))
+        self.assertEqual(compiled_template_cache_stats()["misses"], before["misses"])
+
+    def test_syntax_errors_raise_value_error(self) -> None:
+        with self.assertRaises(ValueError):
+            render_template_string("{% if %}", {})
+        with self.assertRaises(ValueError):
+            render_template_string("{% if %}", {})
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import hashlib
 from collections.abc import Mapping
 from typing import Any
 
 from django.conf import settings
 from django.core import signing
 
+from core.ballot_chain import chain_next_hash, genesis_chain_hash
+
 
 def make_signed_token(payload: Mapping[str, Any]) -> str:
     return signing.dumps(dict(payload), salt=settings.SECRET_KEY)
@@ -38,8 +39,7 @@ def election_genesis_chain_hash(election_id: int) -> str:
     Returns:
         A 64-character hex string representing the genesis chain hash
     """
-    data = f"election:{election_id}. alex estuvo aquí, dejándose el alma.".encode()
-    return hashlib.sha256(data).hexdigest()
+    return genesis_chain_hash(election_id)
 
 
 def election_chain_next_hash(*, previous_chain_hash: str, ballot_hash: str) -> str:
@@ -56,4 +56,4 @@ def election_chain_next_hash(*, previous_chain_hash: str, ballot_hash: str) -> s
     Returns:
         A 64-character hex string representing the new chain hash
     """
-    return hashlib.sha256(f"{previous_chain_hash}:{ballot_hash}".encode()).hexdigest()
+    return chain_next_hash(previous_chain_hash, ballot_hash)
@@ -52,6 +52,7 @@ urlpatterns = [
 
     path("elections/", views_elections.elections_list, name="elections"),
     path("elections/ballot/verify/", views_elections.ballot_verify, name="ballot-verify"),
+    path("elections/ballot/verify/proof.json", views_elections.ballot_verify_proof, name="ballot-verify-proof"),
     path("elections/<int:election_id>/edit/", views_elections.election_edit, name="election-edit"),
     path(
         "elections/<int:election_id>/eligible-users/search/",
@@ -85,6 +86,12 @@ urlpatterns = [
         name="election-conclude",
     ),
 
+    path(
+        "elections/<int:election_id>/jobs/<int:job_id>.json",
+        views_elections.election_job_status_json,
+        name="election-job-status",
+    ),
+
     path(
         "elections/<int:election_id>/public/ballots.json",
         views_elections.election_public_ballots,
@@ -95,6 +102,11 @@ urlpatterns = [
         views_elections.election_public_audit,
         name="election-public-audit",
     ),
+    path(
+        "elections/<int:election_id>/recount.json",
+        views_elections.election_recount,
+        name="election-recount",
+    ),
     path(
         "elections/<int:election_id>/audit/",
         views_elections.election_audit_log,
@@ -112,6 +124,21 @@ urlpatterns = [
         views_send_mail.send_mail_render_preview,
         name="send-mail-render-preview",
     ),
+    path(
+        "email-tools/send-mail/recipients.json",
+        views_send_mail.send_mail_batch_recipients,
+        name="send-mail-batch-recipients",
+    ),
+    path(
+        "email-tools/send-mail/jobs/<str:job_id>/status/",
+        views_send_mail.send_mail_job_status,
+        name="send-mail-job-status",
+    ),
+    path(
+        "email-tools/send-mail/template-cache.json",
+        views_send_mail.send_mail_template_cache_stats,
+        name="send-mail-template-cache-stats",
+    ),
 
     path(
         "email-tools/templates/<int:template_id>/json/",
@@ -5,31 +5,63 @@ import json
 import random
 import re
 from decimal import Decimal, InvalidOperation
+from typing import Any
 from urllib.parse import urlencode
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Count, Max, Min, Prefetch, Sum
+from django.db.models import (
+    BigIntegerField,
+    Count,
+    DateField,
+    DateTimeField,
+    F,
+    IntegerField,
+    Max,
+    Min,
+    Prefetch,
+    Q,
+    Sum,
+    Value,
+)
 from django.db.models.functions import TruncDate
-from django.http import Http404, HttpRequest, HttpResponse, HttpResponseBadRequest, HttpResponseGone, JsonResponse
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseGone,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import redirect, render
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from django.views.decorators.http import require_GET, require_http_methods, require_POST
 from post_office.models import EmailTemplate
 
 from core import elections_services
 from core.backends import FreeIPAUser
+from core.elections_jobs import election_job_status, enqueue_election_job
+from core.elections_receipt_index import IndexedReceipt, lookup_indexed_receipt, published_merkle_root
+from core.elections_roster import RosterCandidate, election_candidate_roster
 from core.elections_services import (
+    AuditEvent,
     ElectionError,
     ElectionNotOpenError,
     InvalidCredentialError,
+    create_voting_credential_mail_batch,
     election_quorum_status,
+    election_tally_input_analytics,
     eligible_voters_from_memberships,
+    freeipa_timezone_name,
     issue_voting_credentials_from_memberships_detailed,
     submit_ballot,
+    write_audit_log,
 )
 from core.email_context import user_email_context
 from core.forms_elections import (
@@ -39,13 +71,16 @@ from core.forms_elections import (
     ElectionVotingEmailForm,
     ExclusionGroupWizardFormSet,
 )
+from core.mail_batches import get_mail_batch
 from core.models import (
     AuditLogEntry,
     Ballot,
     Candidate,
     Election,
+    ElectionJob,
     ExclusionGroup,
     ExclusionGroupCandidate,
+    MailBatch,
     VotingCredential,
 )
 from core.permissions import ASTRA_ADD_ELECTION, json_permission_required
@@ -55,21 +90,71 @@ from core.templated_email import (
     render_templated_email_preview_response,
 )
 from core.user_labels import user_choice_from_freeipa, user_label
-from core.views_send_mail import _CSV_SESSION_KEY
+from core.views_send_mail import _MAIL_BATCH_SESSION_KEY
 
 _RECEIPT_RE = re.compile(r"^[0-9a-f]{64}$")
 
 
-def _get_freeipa_timezone_name(user: FreeIPAUser) -> str | None:
-    """Return the user's configured FreeIPA timezone (IANA name), if set."""
+def _render_ballot_verify(
+    request,
+    *,
+    receipt: str,
+    has_query: bool,
+    is_valid_receipt: bool,
+    found: bool = False,
+    election: Election | dict[str, object] | None = None,
+    election_status: str = "",
+    submitted_date: str = "",
+    is_superseded: bool = False,
+    public_ballots_url: str = "",
+    audit_log_url: str = "",
+    proof: dict[str, object] | None = None,
+    published_merkle_root: str = "",
+) -> HttpResponse:
+    return render(
+        request,
+        "core/ballot_verify.html",
+        {
+            "receipt": receipt,
+            "has_query": has_query,
+            "is_valid_receipt": is_valid_receipt,
+            "found": found,
+            "election": election,
+            "election_status": election_status,
+            "submitted_date": submitted_date,
+            "is_superseded": is_superseded,
+            "is_final_ballot": bool(found and not is_superseded),
+            "public_ballots_url": public_ballots_url,
+            "audit_log_url": audit_log_url,
+            "inclusion_proof": proof,
+            "inclusion_proof_json": json.dumps(proof, indent=2) if proof is not None else "",
+            "published_merkle_root": published_merkle_root,
+            "proof_matches_published_root": bool(proof and proof["root"] == published_merkle_root),
+        },
+    )
+
+
+def _immutable_receipt_response(request, response: HttpResponse) -> HttpResponse:
+    # A tallied election's answer never changes. Pages rendered for a signed-in
+    # user carry their navigation, so only anonymous ones may sit in shared caches.
+    is_public = not request.user.is_authenticated
+    patch_cache_control(
+        response,
+        max_age=settings.ELECTION_RECEIPT_VERIFY_MAX_AGE,
+        public=is_public,
+        private=not is_public,
+    )
+    return response
 
-    raw = user._user_data.get("fasTimezone")
-    if raw is None:
-        raw = user._user_data.get("fastimezone")
 
-    if isinstance(raw, list):
-        raw = raw[0] if raw else ""
-    return str(raw or "").strip() or None
+def _indexed_receipt(ballot: Ballot | None) -> IndexedReceipt | None:
+    # Tallied elections answer from their published index, skipping the proof and audit log queries.
+    if ballot is None or ballot.election.status != Election.Status.tallied:
+        return None
+    chain_head = str(ballot.election.receipt_index_chain_head or "")
+    if not chain_head:
+        return None
+    return lookup_indexed_receipt(election_id=ballot.election.id, chain_head=chain_head, receipt=ballot.ballot_hash)
 
 
 @require_GET
@@ -94,20 +179,33 @@ def ballot_verify(request):
                 "election__status",
                 "election__public_ballots_file",
                 "election__public_audit_file",
+                "election__receipt_index_chain_head",
+                "election__merkle_tree_file",
             )
             .filter(ballot_hash=receipt)
             .first()
         )
 
-    found = ballot is not None
-    election: Election | None = ballot.election if ballot is not None else None
-    election_status = str(election.status) if election is not None else ""
-
-    is_superseded = bool(ballot is not None and ballot.superseded_by_id)
-    is_final_ballot = bool(found and not is_superseded)
+    indexed = _indexed_receipt(ballot)
+    if indexed is not None:
+        response = _render_ballot_verify(
+            request,
+            receipt=receipt_raw,
+            has_query=has_query,
+            is_valid_receipt=True,
+            found=True,
+            election=indexed.election,
+            election_status=str(Election.Status.tallied),
+            submitted_date=indexed.submitted_date,
+            is_superseded=indexed.is_superseded,
+            public_ballots_url=str(indexed.election["public_ballots_url"]),
+            audit_log_url=str(indexed.election["audit_log_url"]),
+            proof=indexed.proof,
+            published_merkle_root=str(indexed.election["published_merkle_root"]) if indexed.proof else "",
+        )
+        return _immutable_receipt_response(request, response)
 
-    # Privacy guardrail: never reveal ranking, credential IDs, IPs, or precise timestamps.
-    submitted_date = ballot.created_at.date().isoformat() if ballot is not None else ""
+    election: Election | None = ballot.election if ballot is not None else None
 
     public_ballots_url = ""
     if election is not None and election.status == Election.Status.tallied:
@@ -120,22 +218,60 @@ def ballot_verify(request):
         else ""
     )
 
-    return render(
+    # Compact alternative to replaying the whole public ledger.
+    proof = elections_services.ballot_inclusion_proof(ballot=ballot) if ballot is not None else None
+
+    return _render_ballot_verify(
         request,
-        "core/ballot_verify.html",
-        {
-            "receipt": receipt_raw,
-            "has_query": has_query,
-            "is_valid_receipt": is_valid_receipt,
-            "found": found,
-            "election": election,
-            "election_status": election_status,
-            "submitted_date": submitted_date,
-            "is_superseded": is_superseded,
-            "is_final_ballot": is_final_ballot,
-            "public_ballots_url": public_ballots_url,
-            "audit_log_url": audit_log_url,
-        },
+        receipt=receipt_raw,
+        has_query=has_query,
+        is_valid_receipt=is_valid_receipt,
+        found=ballot is not None,
+        election=election,
+        election_status=str(election.status) if election is not None else "",
+        # Privacy guardrail: never reveal ranking, credential IDs, IPs, or precise timestamps.
+        submitted_date=ballot.created_at.date().isoformat() if ballot is not None else "",
+        is_superseded=bool(ballot is not None and ballot.superseded_by_id),
+        public_ballots_url=public_ballots_url,
+        audit_log_url=audit_log_url,
+        proof=proof,
+        published_merkle_root=published_merkle_root(election=election) if proof is not None else "",
+    )
+
+
+@require_GET
+def ballot_verify_proof(request):
+    """Merkle inclusion proof for a receipt, for scripted verification."""
+    receipt = str(request.GET.get("receipt") or "").strip().lower()
+    if not _RECEIPT_RE.fullmatch(receipt):
+        return JsonResponse({"ok": False, "error": "Invalid receipt."}, status=400)
+
+    ballot = (
+        Ballot.objects.select_related("election")
+        .only(
+            "ballot_hash",
+            "superseded_by_id",
+            "election__id",
+            "election__status",
+            "election__receipt_index_chain_head",
+            "election__merkle_tree_file",
+        )
+        .filter(ballot_hash=receipt)
+        .first()
+    )
+    indexed = _indexed_receipt(ballot)
+    if indexed is not None and indexed.proof is not None:
+        response = JsonResponse(
+            {"ok": True, "published_root": indexed.election["published_merkle_root"], **indexed.proof}
+        )
+        return _immutable_receipt_response(request, response)
+
+    proof = elections_services.ballot_inclusion_proof(ballot=ballot) if ballot is not None else None
+    if proof is None:
+        return JsonResponse({"ok": False, "error": "No inclusion proof is available for this receipt."}, status=404)
+
+    return JsonResponse(
+        {"ok": True, "published_root": published_merkle_root(election=ballot.election), **proof}
     )
 
 
@@ -789,7 +925,7 @@ def election_edit(request, election_id: int):
                         skipped += 1
                         continue
 
-                    tz_name = _get_freeipa_timezone_name(user)
+                    tz_name = freeipa_timezone_name(user)
 
                     try:
                         elections_services.send_voting_credential_email(
@@ -808,16 +944,20 @@ def election_edit(request, election_id: int):
                         continue
                     emailed += 1
 
-                AuditLogEntry.objects.create(
+                write_audit_log(
                     election=election,
-                    event_type="election_started",
-                    payload={
-                        "eligible_voters": len(credentials),
-                        "emailed": emailed,
-                        "skipped": skipped,
-                        "failures": failures,
-                    },
-                    is_public=True,
+                    events=[
+                        AuditEvent(
+                            event_type="election_started",
+                            payload={
+                                "eligible_voters": len(credentials),
+                                "emailed": emailed,
+                                "skipped": skipped,
+                                "failures": failures,
+                            },
+                            is_public=True,
+                        )
+                    ],
                 )
 
                 if emailed:
@@ -1015,35 +1155,10 @@ def election_detail(request, election_id: int):
     if election.status == Election.Status.draft and not (is_staff or can_manage_elections):
         raise Http404
 
-    candidates = list(Candidate.objects.filter(election=election).order_by("freeipa_username", "id"))
-
-    usernames: set[str] = set()
-    for c in candidates:
-        if c.freeipa_username:
-            usernames.add(c.freeipa_username)
-        if c.nominated_by:
-            usernames.add(c.nominated_by)
-
-    users_by_username: dict[str, FreeIPAUser] = {}
-    for username in sorted(usernames):
-        user = FreeIPAUser.get(username)
-        if user is None:
-            # Keep rendering stable even if FreeIPA doesn't return the user.
-            users_by_username[username] = FreeIPAUser(username, {"uid": [username], "memberof_group": []})
-        else:
-            users_by_username[username] = user
-
-    candidate_cards: list[dict[str, object]] = []
-    for c in candidates:
-        candidate_user = users_by_username.get(c.freeipa_username)
-        nominator_user = users_by_username.get(c.nominated_by) if c.nominated_by else None
-        candidate_cards.append(
-            {
-                "candidate": c,
-                "candidate_user": candidate_user,
-                "nominator_user": nominator_user,
-            }
-        )
+    roster = election_candidate_roster(election=election, labels=True)
+    candidates = list(roster.candidates)
+    candidate_cards = [{"candidate": c} for c in candidates]
+    full_name_by_username = {c.freeipa_username: c.full_name for c in candidates}
 
     def _natural_join(items: list[str]) -> str:
         if not items:
@@ -1055,12 +1170,7 @@ def election_detail(request, election_id: int):
         return ", ".join(items[:-1]) + f", and {items[-1]}"
 
     def _candidate_display_name(username: str) -> str:
-        user = users_by_username.get(username)
-        full_name = user.full_name if user is not None else ""
-        full_name = str(full_name or "").strip()
-        if not full_name:
-            full_name = username
-        return f"{full_name} ({username})"
+        return f"{full_name_by_username.get(username) or username} ({username})"
 
     exclusion_group_messages: list[str] = []
     exclusion_groups = list(
@@ -1087,16 +1197,12 @@ def election_detail(request, election_id: int):
 
     tally_result = election.tally_result or {}
     elected_ids = [int(x) for x in (tally_result.get("elected") or [])]
-    tally_elected: list[Candidate] = []
+    tally_elected: list[RosterCandidate] = []
     if elected_ids:
         candidates_by_id = {c.id: c for c in candidates}
         tally_elected = [candidates_by_id[cid] for cid in elected_ids if cid in candidates_by_id]
 
-    tally_winners: list[dict[str, str]] = []
-    for c in tally_elected:
-        user = users_by_username.get(c.freeipa_username)
-        full_name = user.full_name if user is not None else c.freeipa_username
-        tally_winners.append({"username": c.freeipa_username, "full_name": full_name})
+    tally_winners = [{"username": c.freeipa_username, "full_name": c.full_name} for c in tally_elected]
 
     empty_seats = election.number_of_seats - len(tally_elected)
 
@@ -1189,6 +1295,17 @@ def election_detail(request, election_id: int):
                 "counts": counts,
             }
 
+    election_jobs: list[ElectionJob] = []
+    if can_manage_elections:
+        election_jobs = list(ElectionJob.objects.filter(election=election).order_by("-id")[:5])
+
+    ballot_stats: dict[str, object] = {}
+    if can_manage_elections and election.status in {Election.Status.closed, Election.Status.tallied}:
+        ballot_stats = _ballot_stats_context(
+            analytics=election_tally_input_analytics(election=election),
+            candidates=candidates,
+        )
+
     return render(
         request,
         "core/election_detail.html",
@@ -1206,10 +1323,65 @@ def election_detail(request, election_id: int):
             "tally_elected": tally_elected,
             "tally_winners": tally_winners,
             "empty_seats": empty_seats if election.status == Election.Status.tallied else 0,
+            "election_jobs": election_jobs,
+            "has_active_election_jobs": any(job.is_active for job in election_jobs),
+            "ballot_stats": ballot_stats,
         },
     )
 
 
+def _ballot_stats_context(*, analytics: dict[str, object], candidates: list[RosterCandidate]) -> dict[str, object]:
+    total_weight = int(analytics["weight"])
+
+    def _percent(weight: int) -> float:
+        return round(weight * 100 / total_weight, 1) if total_weight else 0.0
+
+    first_preferences = sorted(
+        (
+            {
+                "candidate": c,
+                "ballots": int(analytics["first_preferences"][str(c.id)]["ballots"]),
+                "weight": int(analytics["first_preferences"][str(c.id)]["weight"]),
+            }
+            for c in candidates
+            if str(c.id) in analytics["first_preferences"]
+        ),
+        key=lambda row: (-row["weight"], row["candidate"].freeipa_username),
+    )
+    for row in first_preferences:
+        row["percent"] = _percent(row["weight"])
+
+    ranking_lengths = [
+        {"length": int(length), "ballots": int(counts["ballots"]), "weight": int(counts["weight"])}
+        for length, counts in analytics["ranking_lengths"].items()
+    ]
+    for row in ranking_lengths:
+        row["percent"] = _percent(row["weight"])
+
+    pairwise = analytics["pairwise"]
+    pairwise_candidates = [c for c in candidates if str(c.id) in pairwise]
+    pairwise_rows = []
+    for a in pairwise_candidates:
+        cells = []
+        for b in pairwise_candidates:
+            if a.id == b.id:
+                cells.append(None)
+                continue
+            weight = int(pairwise[str(a.id)][str(b.id)])
+            cells.append({"weight": weight, "wins": weight > int(pairwise[str(b.id)][str(a.id)])})
+        pairwise_rows.append({"candidate": a, "cells": cells})
+
+    return {
+        "ballots": int(analytics["ballots"]),
+        "weight": total_weight,
+        "distinct_rankings": int(analytics["distinct_rankings"]),
+        "first_preferences": first_preferences,
+        "ranking_lengths": ranking_lengths,
+        "pairwise_candidates": pairwise_candidates,
+        "pairwise_rows": pairwise_rows,
+    }
+
+
 def _eligible_voters_context(*, request, election: Election, enabled: bool) -> dict[str, object]:
     if not enabled:
         return {}
@@ -1266,76 +1438,68 @@ def election_send_mail_credentials(request: HttpRequest, election_id: int) -> Ht
         messages.error(request, "Only open elections can send credential reminders.")
         return redirect("election-detail", election_id=election.id)
 
+    job_id = str(request.GET.get("job") or "").strip()
+    if job_id.isdigit():
+        job = ElectionJob.objects.filter(
+            pk=int(job_id),
+            election=election,
+            kind=ElectionJob.Kind.credential_mail,
+            status=ElectionJob.Status.succeeded,
+        ).first()
+        if job is None:
+            raise Http404
+        batch = get_mail_batch(job.result.get("mail_batch"))
+        if batch is None:
+            # Pruned, or built before recipients were stored as batches.
+            messages.error(request, "These credential reminders have expired. Prepare them again.")
+            return redirect("election-detail", election_id=election.id)
+        return _redirect_to_credential_send_mail(request, election=election, batch=batch)
+
     target_username = str(request.GET.get("username") or "").strip()
+    if not target_username:
+        # Looking up every voter in FreeIPA is too slow for a request; a job
+        # builds the recipient list and the election page links to it when done.
+        enqueue_election_job(
+            election=election,
+            kind=ElectionJob.Kind.credential_mail,
+            requested_by=request.user.get_username(),
+        )
+        messages.success(request, "Preparing credential reminders. Progress is shown below.")
+        return redirect("election-detail", election_id=election.id)
 
     credentials_qs = VotingCredential.objects.filter(election=election).exclude(freeipa_username__isnull=True)
     if not credentials_qs.exists():
         issued = issue_voting_credentials_from_memberships_detailed(election=election)
-        by_username = {c.freeipa_username: c for c in issued if c.freeipa_username}
-        if target_username:
-            credential_list = [by_username[target_username]] if target_username in by_username else []
-        else:
-            credential_list = list(by_username.values())
+        credential_list = [c for c in issued if c.freeipa_username == target_username]
     else:
-        if target_username:
-            credential_list = list(
-                credentials_qs.filter(freeipa_username=target_username).only("freeipa_username", "public_id")
-            )
-        else:
-            credential_list = list(credentials_qs.only("freeipa_username", "public_id"))
+        credential_list = list(
+            credentials_qs.filter(freeipa_username=target_username).only("freeipa_username", "public_id")
+        )
 
-    if target_username and not credential_list:
+    if not credential_list:
         messages.error(request, "That user does not have a voting credential for this election.")
         return redirect("election-detail", election_id=election.id)
 
-    recipients: list[dict[str, str]] = []
-    for credential in credential_list:
-        username = str(credential.freeipa_username or "").strip()
-        if not username:
-            continue
-
-        user = FreeIPAUser.get(username)
-        if user is None or not user.email:
-            continue
-
-        tz_name = _get_freeipa_timezone_name(user)
+    batch = create_voting_credential_mail_batch(
+        request=request,
+        election=election,
+        credentials=credential_list,
+        created_by=request.user.get_username(),
+    )
+    return _redirect_to_credential_send_mail(request, election=election, batch=batch)
 
-        ctx = elections_services.build_voting_credential_email_context(
-            request=request,
-            election=election,
-            username=username,
-            credential_public_id=str(credential.public_id),
-            tz_name=tz_name,
-            user=user,
-        )
-        recipients.append({str(k): str(v) for k, v in ctx.items()})
 
-    if not recipients:
+def _redirect_to_credential_send_mail(
+    request: HttpRequest,
+    *,
+    election: Election,
+    batch: MailBatch,
+) -> HttpResponse:
+    if not batch.recipient_count:
         messages.error(request, "No credential recipients are available (missing email addresses?).")
         return redirect("election-detail", election_id=election.id)
 
-    request.session[_CSV_SESSION_KEY] = json.dumps(
-        {
-            "header_to_var": {
-                "Email": "email",
-                "Username": "username",
-                "First name": "first_name",
-                "Last name": "last_name",
-                "Full name": "full_name",
-                "Election ID": "election_id",
-                "Election name": "election_name",
-                "Election description": "election_description",
-                "Election URL": "election_url",
-                "Election start": "election_start_datetime",
-                "Election end": "election_end_datetime",
-                "Number of seats": "election_number_of_seats",
-                "Credential": "credential_public_id",
-                "Vote URL": "vote_url",
-                "Vote URL (with credential)": "vote_url_with_credential_fragment",
-            },
-            "recipients": recipients,
-        }
-    )
+    request.session[_MAIL_BATCH_SESSION_KEY] = str(batch.public_id)
 
     send_mail_url = reverse("send-mail")
     template_name = settings.ELECTION_VOTING_CREDENTIAL_EMAIL_TEMPLATE_NAME
@@ -1350,26 +1514,32 @@ def election_conclude(request, election_id: int):
     if election is None:
         raise Http404
 
-    skip_tally = bool(request.POST.get("skip_tally"))
-
-    try:
-        elections_services.close_election(election=election)
-    except ElectionError as exc:
-        messages.error(request, str(exc))
+    if election.status != Election.Status.open:
+        messages.error(request, "election must be open to close")
         return redirect("election-detail", election_id=election.id)
 
+    skip_tally = bool(request.POST.get("skip_tally"))
+    enqueue_election_job(
+        election=election,
+        kind=ElectionJob.Kind.close,
+        params={"tally": not skip_tally},
+        requested_by=request.user.get_username(),
+    )
+
     if skip_tally:
-        messages.success(request, "Election closed.")
-        return redirect("election-detail", election_id=election.id)
+        messages.success(request, "Closing the election. Progress is shown below.")
+    else:
+        messages.success(request, "Closing and tallying the election. Progress is shown below.")
+    return redirect("election-detail", election_id=election.id)
 
-    try:
-        elections_services.tally_election(election=election)
-    except ElectionError as exc:
-        messages.error(request, f"Election closed, but tally failed: {exc}")
-        return redirect("election-detail", election_id=election.id)
 
-    messages.success(request, "Election closed and tallied.")
-    return redirect("election-detail", election_id=election.id)
+@require_GET
+@json_permission_required(ASTRA_ADD_ELECTION)
+def election_job_status_json(request, election_id: int, job_id: int) -> JsonResponse:
+    job = ElectionJob.objects.filter(pk=job_id, election_id=election_id).first()
+    if job is None:
+        return JsonResponse({"error": "Not found."}, status=404)
+    return JsonResponse(election_job_status(job))
 
 
 @require_POST
@@ -1428,7 +1598,11 @@ def election_public_ballots(request, election_id: int):
     if election.status == Election.Status.tallied and election.public_ballots_file:
         return redirect(election.public_ballots_file.url)
 
-    return JsonResponse(elections_services.build_public_ballots_export(election=election))
+    # No stored artifact yet: stream the export straight from the ballots table.
+    return StreamingHttpResponse(
+        elections_services.iter_public_ballots_export(election=election),
+        content_type="application/json",
+    )
 
 
 @require_GET
@@ -1441,6 +1615,111 @@ def election_public_audit(request, election_id: int):
     return JsonResponse(elections_services.build_public_audit_export(election=election))
 
 
+@require_GET
+@json_permission_required(ASTRA_ADD_ELECTION)
+def election_recount(request, election_id: int):
+    """What-if recount for managers; never changes the official result."""
+    election = _get_exportable_election(election_id=election_id)
+
+    try:
+        withdrawn = [int(x) for x in request.GET.getlist("withdraw")]
+        seats_raw = str(request.GET.get("seats") or "").strip()
+        seats = int(seats_raw) if seats_raw else None
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "Invalid recount parameters."}, status=400)
+
+    try:
+        result = elections_services.recount_election(
+            election=election,
+            withdrawn_candidate_ids=withdrawn,
+            seats=seats,
+        )
+    except ElectionError as exc:
+        return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+    except ValueError as exc:
+        # tally_meek's own input checks (e.g. too many candidates for its limits).
+        return JsonResponse({"ok": False, "error": f"Recount failed: {exc}"}, status=400)
+
+    return JsonResponse({"ok": True, "withdrawn": withdrawn, "seats": seats, "result": result})
+
+
+# Rows per page of the audit log timeline.
+_AUDIT_TIMELINE_PAGE_SIZE = 60
+
+_AUDIT_TIMELINE_FIELDS = ("ballot_day", "seq", "rid", "ts", "ballots_count", "first_ts")
+
+type _TimelineCursor = tuple[int, int]
+
+
+def _parse_timeline_cursor(raw: object) -> _TimelineCursor | None:
+    sequence, _, row_id = str(raw or "").strip().partition("_")
+    if not (sequence.isdigit() and row_id.isdigit()):
+        return None
+    return int(sequence), int(row_id)
+
+
+def _format_timeline_cursor(cursor: _TimelineCursor) -> str:
+    sequence, row_id = cursor
+    return f"{sequence}_{row_id}"
+
+
+def _audit_timeline_rows(
+    *,
+    audit_qs,
+    include_ballot_summaries: bool,
+    before: _TimelineCursor | None,
+    after: _TimelineCursor | None,
+) -> tuple[list[tuple[Any, ...]], bool]:
+    """Fetch one page of the timeline, newest first, in a single query.
+
+    Audit entries and per-day ballot summaries are merged with a UNION and
+    paged on (sequence, id); a summary is keyed by its last ballot's sequence
+    and id 0.
+    Rows carry keys only, not payloads. Returns the rows and whether there are
+    more in the paging direction.
+    """
+
+    parts = [
+        audit_qs.exclude(event_type="ballot_submitted").annotate(
+            ballot_day=Value(None, output_field=DateField()),
+            seq=F("sequence"),
+            rid=F("id"),
+            ts=F("timestamp"),
+            ballots_count=Value(0, output_field=IntegerField()),
+            first_ts=Value(None, output_field=DateTimeField()),
+        )
+    ]
+    if include_ballot_summaries:
+        parts.append(
+            audit_qs.filter(event_type="ballot_submitted")
+            .annotate(ballot_day=TruncDate("timestamp"))
+            .values("ballot_day")
+            .annotate(
+                seq=Max("sequence"),
+                rid=Value(0, output_field=BigIntegerField()),
+                ts=Max("timestamp"),
+                ballots_count=Count("id"),
+                first_ts=Min("timestamp"),
+            )
+        )
+
+    if before is not None:
+        parts = [p.filter(Q(seq__lt=before[0]) | Q(seq=before[0], rid__lt=before[1])) for p in parts]
+    elif after is not None:
+        parts = [p.filter(Q(seq__gt=after[0]) | Q(seq=after[0], rid__gt=after[1])) for p in parts]
+
+    first, *rest = [p.order_by().values_list(*_AUDIT_TIMELINE_FIELDS) for p in parts]
+    query = first.union(*rest, all=True) if rest else first
+    ordering = ("seq", "rid") if after is not None else ("-seq", "-rid")
+    rows = list(query.order_by(*ordering)[: _AUDIT_TIMELINE_PAGE_SIZE + 1])
+
+    has_more = len(rows) > _AUDIT_TIMELINE_PAGE_SIZE
+    rows = rows[:_AUDIT_TIMELINE_PAGE_SIZE]
+    if after is not None:
+        rows.reverse()
+    return rows, has_more
+
+
 @require_GET
 def election_audit_log(request, election_id: int):
     """Render a human-readable election audit log.
@@ -1457,6 +1736,63 @@ def election_audit_log(request, election_id: int):
     if election.status not in {Election.Status.closed, Election.Status.tallied}:
         raise Http404
 
+    can_manage_elections = request.user.has_perm(ASTRA_ADD_ELECTION)
+    before = _parse_timeline_cursor(request.GET.get("before"))
+    after = None if before is not None else _parse_timeline_cursor(request.GET.get("after"))
+
+    # A tallied election's public log no longer changes, so its pages are cached.
+    cache_key = ""
+    if election.status == Election.Status.tallied and not can_manage_elections:
+        cursor = ""
+        if before is not None:
+            cursor = f"before:{_format_timeline_cursor(before)}"
+        elif after is not None:
+            cursor = f"after:{_format_timeline_cursor(after)}"
+        cache_key = f"election-audit-timeline:{election.id}:{cursor}"
+    timeline = cache.get(cache_key) if cache_key else None
+    if not isinstance(timeline, dict):
+        timeline = _election_audit_timeline(
+            election=election,
+            can_manage_elections=can_manage_elections,
+            before=before,
+            after=after,
+        )
+        if cache_key:
+            cache.set(cache_key, timeline, timeout=settings.ELECTION_TALLY_CACHE_TIMEOUT)
+
+    base_url = reverse("election-audit-log", args=[election.id])
+
+    def _url_for_cursor(param: str, cursor: str) -> str:
+        q = request.GET.copy()
+        q.pop("before", None)
+        q.pop("after", None)
+        q.pop("page", None)
+        q[param] = cursor
+        return f"{base_url}?{q.urlencode()}"
+
+    newer_cursor = str(timeline.pop("newer_cursor") or "")
+    older_cursor = str(timeline.pop("older_cursor") or "")
+
+    return render(
+        request,
+        "core/election_audit_log.html",
+        {
+            "election": election,
+            "can_manage_elections": can_manage_elections,
+            "newer_url": _url_for_cursor("after", newer_cursor) if newer_cursor else "",
+            "older_url": _url_for_cursor("before", older_cursor) if older_cursor else "",
+            **timeline,
+        },
+    )
+
+
+def _election_audit_timeline(
+    *,
+    election: Election,
+    can_manage_elections: bool,
+    before: _TimelineCursor | None,
+    after: _TimelineCursor | None,
+) -> dict[str, object]:
     candidates = list(
         Candidate.objects.filter(election=election).only("id", "freeipa_username").order_by("freeipa_username", "id")
     )
@@ -1467,85 +1803,61 @@ def election_audit_log(request, election_id: int):
     }
 
     audit_qs = AuditLogEntry.objects.filter(election=election)
-    can_manage_elections = request.user.has_perm(ASTRA_ADD_ELECTION)
     if not can_manage_elections:
         audit_qs = audit_qs.filter(is_public=True)
 
-    timeline_items: list[AuditLogEntry | dict[str, object]] = []
-    non_ballot_entries = list(
-        audit_qs.exclude(event_type="ballot_submitted")
-        .only("id", "timestamp", "event_type", "payload", "is_public")
-        .order_by("timestamp", "id")
+    # Managers see ballot submissions grouped by day, to keep the timeline readable.
+    rows, has_more = _audit_timeline_rows(
+        audit_qs=audit_qs,
+        include_ballot_summaries=can_manage_elections,
+        before=before,
+        after=after,
     )
-    timeline_items.extend(non_ballot_entries)
-
-    if can_manage_elections:
-        # Group ballot submissions by day for managers to keep the timeline readable.
-        ballot_qs = audit_qs.filter(event_type="ballot_submitted")
-        for row in (
-            ballot_qs.annotate(day=TruncDate("timestamp"))
-            .values("day")
-            .annotate(
-                ballots_count=Count("id"),
-                first_timestamp=Min("timestamp"),
-                last_timestamp=Max("timestamp"),
-            )
-            .order_by("day")
-        ):
-            day = row.get("day")
-            first_ts = row.get("first_timestamp")
-            last_ts = row.get("last_timestamp")
-            if not isinstance(day, datetime.date) or not isinstance(first_ts, datetime.datetime) or not isinstance(
-                last_ts, datetime.datetime
-            ):
-                continue
-            timeline_items.append(
-                {
-                    "timestamp": last_ts,
-                    "event_type": "ballots_submitted_summary",
-                    "payload": {},
-                    "ballot_date": day.isoformat(),
-                    "ballots_count": int(row.get("ballots_count") or 0),
-                    "first_timestamp": first_ts,
-                    "last_timestamp": last_ts,
-                }
-            )
-
-    def _timeline_sort_key(item: AuditLogEntry | dict[str, object]) -> tuple[datetime.datetime, int]:
-        if isinstance(item, dict):
-            ts = item.get("timestamp")
-            if isinstance(ts, datetime.datetime):
-                return (ts, 0)
-            return (datetime.datetime.min.replace(tzinfo=timezone.get_current_timezone()), 0)
-        return (item.timestamp, item.id)
-
-    # Sort newest-first to support "load older" navigation.
-    timeline_items.sort(key=_timeline_sort_key, reverse=True)
-
-    page_raw = str(request.GET.get("page") or "1").strip()
-    try:
-        page_number = int(page_raw)
-    except ValueError:
-        page_number = 1
-
-    paginator = Paginator(timeline_items, 60)
-    page_obj = paginator.get_page(page_number)
 
-    base_url = reverse("election-audit-log", args=[election.id])
-
-    def _url_for_page(page: int) -> str:
-        q = request.GET.copy()
-        q["page"] = str(page)
-        return f"{base_url}?{q.urlencode()}"
+    # A cursor row itself lies on the other side of the page, so paging
+    # back the way we came always has something to show.
+    has_newer = before is not None or (after is not None and has_more)
+    has_older = after is not None or has_more
+    newer_cursor = _format_timeline_cursor((rows[0][1], rows[0][2])) if rows and has_newer else ""
+    older_cursor = _format_timeline_cursor((rows[-1][1], rows[-1][2])) if rows and has_older else ""
+
+    # Payloads (tally rounds can be large) are only loaded for the rows on this page.
+    entry_ids = [int(row[2]) for row in rows if row[2]]
+    entries_by_id = {
+        entry.id: entry
+        for entry in AuditLogEntry.objects.filter(election=election, id__in=entry_ids).only(
+            "id", "timestamp", "sequence", "event_type", "payload", "is_public"
+        )
+    }
 
-    newer_url = _url_for_page(page_obj.previous_page_number()) if page_obj.has_previous() else ""
-    older_url = _url_for_page(page_obj.next_page_number()) if page_obj.has_next() else ""
+    timeline_items: list[AuditLogEntry | dict[str, object]] = []
+    for day, _sequence, row_id, last_ts, ballots_count, first_ts in rows:
+        if row_id:
+            entry = entries_by_id.get(int(row_id))
+            if entry is not None:
+                timeline_items.append(entry)
+            continue
+        if not isinstance(day, datetime.date) or not isinstance(first_ts, datetime.datetime) or not isinstance(
+            last_ts, datetime.datetime
+        ):
+            continue
+        timeline_items.append(
+            {
+                "timestamp": last_ts,
+                "event_type": "ballots_submitted_summary",
+                "payload": {},
+                "ballot_date": day.isoformat(),
+                "ballots_count": int(ballots_count or 0),
+                "first_timestamp": first_ts,
+                "last_timestamp": last_ts,
+            }
+        )
 
     ballot_preview_by_date: dict[str, list[dict[str, object]]] = {}
     ballot_preview_limit = 50
     if can_manage_elections:
         preview_dates: list[datetime.date] = []
-        for it in page_obj.object_list:
+        for it in timeline_items:
             if not isinstance(it, dict):
                 continue
             if str(it.get("event_type") or "") != "ballots_submitted_summary":
@@ -1564,7 +1876,7 @@ def election_audit_log(request, election_id: int):
                 rows = list(
                     ballot_qs.filter(timestamp__date=day)
                     .only("timestamp", "payload")
-                    .order_by("timestamp", "id")[:ballot_preview_limit]
+                    .order_by("sequence", "id")[:ballot_preview_limit]
                 )
                 preview: list[dict[str, object]] = []
                 for row in rows:
@@ -1593,6 +1905,8 @@ def election_audit_log(request, election_id: int):
         match event_type:
             case "election_started":
                 return ("fas fa-play", "bg-green")
+            case "credentials_issued":
+                return ("fas fa-id-card", "bg-secondary")
             case "ballot_submitted":
                 return ("fas fa-vote-yea", "bg-blue")
             case "ballots_submitted_summary":
@@ -1616,6 +1930,8 @@ def election_audit_log(request, election_id: int):
         match event_type:
             case "election_started":
                 return "Election started"
+            case "credentials_issued":
+                return "Voting credentials issued"
             case "ballot_submitted":
                 return "Ballot submitted"
             case "ballots_submitted_summary":
@@ -1662,8 +1978,9 @@ def election_audit_log(request, election_id: int):
         "tally_completed": "Results",
     }
     anchors_added: set[str] = set()
+    round_explanations: dict[int, dict[str, str]] | None = None
 
-    for item in page_obj.object_list:
+    for item in timeline_items:
         if isinstance(item, dict):
             payload = item.get("payload") if isinstance(item.get("payload"), dict) else {}
             event_type = str(item.get("event_type") or "").strip() or "unknown"
@@ -1703,6 +2020,8 @@ def election_audit_log(request, election_id: int):
         entry = item
         payload = entry.payload if isinstance(entry.payload, dict) else {}
         event_type = str(entry.event_type or "").strip() or "unknown"
+        if event_type == "tally_round":
+            payload = elections_services.tally_round_record(election=election, payload=payload)
         icon, icon_bg = _icon_for_event(event_type)
 
         event: dict[str, object] = {
@@ -1742,6 +2061,11 @@ def election_audit_log(request, election_id: int):
                         continue
                     retention_factors[cid] = str(v)
 
+            # Round records omit zero values.
+            for c in candidates:
+                retained_totals.setdefault(int(c.id), "0")
+                retention_factors.setdefault(int(c.id), "0")
+
             elected_ids_obj = payload.get("elected")
             elected_ids = {int(x) for x in elected_ids_obj} if isinstance(elected_ids_obj, list) else set()
             eliminated_obj = payload.get("eliminated")
@@ -1773,8 +2097,15 @@ def election_audit_log(request, election_id: int):
                 )
 
             event["round_rows"] = round_rows
-            event["summary_text"] = str(payload.get("summary_text") or "").strip()
-            event["audit_text"] = str(payload.get("audit_text") or "").strip()
+            # Older tallies stored the round prose inline; newer ones render it on demand.
+            explanation: dict[str, object] = payload
+            if "audit_text" not in payload:
+                if round_explanations is None:
+                    round_explanations = elections_services.tally_round_explanations(election=election)
+                round_idx = payload.get("round")
+                explanation = dict(round_explanations.get(round_idx, {})) if isinstance(round_idx, int) else {}
+            event["summary_text"] = str(explanation.get("summary_text") or "").strip()
+            event["audit_text"] = str(explanation.get("audit_text") or "").strip()
 
         if event_type == "tally_completed":
             elected_obj = payload.get("elected")
@@ -1817,26 +2148,19 @@ def election_audit_log(request, election_id: int):
         elected_count = len(tally_elected_users)
         empty_seats = election.number_of_seats - elected_count
 
-    return render(
-        request,
-        "core/election_audit_log.html",
-        {
-            "election": election,
-            "can_manage_elections": can_manage_elections,
-            "events": events,
-            "jump_links": jump_links,
-            "newer_url": newer_url,
-            "older_url": older_url,
-            "page_obj": page_obj,
-            "candidates": candidates,
-            "ballots_cast": ballots_cast,
-            "votes_cast": votes_cast,
-            "tally_result": tally_result,
-            "quota": tally_result.get("quota"),
-            "tally_elected_users": tally_elected_users,
-            "empty_seats": empty_seats,
-        },
-    )
+    return {
+        "events": events,
+        "jump_links": jump_links,
+        "newer_cursor": newer_cursor,
+        "older_cursor": older_cursor,
+        "candidates": candidates,
+        "ballots_cast": ballots_cast,
+        "votes_cast": votes_cast,
+        "tally_result": tally_result,
+        "quota": tally_result.get("quota"),
+        "tally_elected_users": tally_elected_users,
+        "empty_seats": empty_seats,
+    }
 
 
 def _parse_vote_payload(request, *, election: Election) -> tuple[str, list[int]]:
@@ -1941,23 +2265,12 @@ def election_vote_submit(request, election_id: int):
             election=election,
             credential_public_id=credential_public_id,
             ranking=ranking,
+            # The receipt email is sent by `send_vote_receipts`, off the request path.
+            queue_receipt=True,
         )
     except (InvalidCredentialError, ElectionNotOpenError) as exc:
         return JsonResponse({"ok": False, "error": str(exc)}, status=400)
 
-    freeipa_user = FreeIPAUser.get(username)
-    voter_email = str(freeipa_user.email or "").strip() if freeipa_user is not None else ""
-    if voter_email:
-        tz_name = _get_freeipa_timezone_name(freeipa_user) if freeipa_user is not None else None
-        elections_services.send_vote_receipt_email(
-            request=request,
-            election=election,
-            username=username,
-            email=voter_email,
-            receipt=receipt,
-            tz_name=tz_name,
-        )
-
     return JsonResponse(
         {
             "ok": True,
@@ -1995,23 +2308,9 @@ def election_vote(request, election_id: int):
 
     can_submit_vote = voter_votes is not None and voter_votes > 0
 
-    candidates = list(Candidate.objects.filter(election=election))
+    candidates = list(election_candidate_roster(election=election, labels=True).candidates)
     random.shuffle(candidates)
-
-    users_by_username: dict[str, FreeIPAUser] = {}
-    for c in candidates:
-        if c.freeipa_username and c.freeipa_username not in users_by_username:
-            user = FreeIPAUser.get(c.freeipa_username)
-            if user is None:
-                user = FreeIPAUser(c.freeipa_username, {"uid": [c.freeipa_username], "memberof_group": []})
-            users_by_username[c.freeipa_username] = user
-
-    candidate_display: list[dict[str, object]] = []
-    for c in candidates:
-        user = users_by_username.get(c.freeipa_username)
-        full_name = user.full_name if user is not None else c.freeipa_username
-        label = f"{full_name} ({c.freeipa_username})"
-        candidate_display.append({"candidate": c, "label": label})
+    candidate_display = [{"candidate": c, "label": c.label} for c in candidates]
 
     return render(
         request,
@@ -6,28 +6,29 @@ import json
 import logging
 import os
 import re
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 
 from django import forms
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required
-from django.core.mail import EmailMultiAlternatives
+from django.core.paginator import Paginator
 from django.core.validators import validate_email
 from django.http import HttpRequest, HttpResponse, JsonResponse, QueryDict
 from django.shortcuts import render
-from django.template import engines
 from django.urls import reverse_lazy
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
 from post_office.models import EmailTemplate
 
 from core.backends import FreeIPAGroup, FreeIPAUser
 from core.email_context import user_email_context_from_user
-from core.membership_notes import add_note
-from core.models import MembershipRequest
+from core.mail_batches import create_mail_batch, get_mail_batch, mail_batch_page
+from core.mail_jobs import enqueue_mail_job, get_mail_job, mail_job_status
+from core.models import MailBatch, MailJob
 from core.permissions import ASTRA_ADD_SEND_MAIL, json_permission_required
 from core.templated_email import (
+    compiled_template_cache_stats,
     create_email_template_unique,
     preview_drop_inline_image_tags,
     preview_rewrite_inline_image_tags_to_urls,
@@ -39,7 +40,8 @@ from core.templated_email import (
 logger = logging.getLogger(__name__)
 
 
-_CSV_SESSION_KEY = "send_mail_csv_payload_v1"
+# Holds only a MailBatch public_id; the recipients themselves stay in the database.
+_MAIL_BATCH_SESSION_KEY = "send_mail_batch_v1"
 _PREVIEW_CONTEXT_SESSION_KEY = "send_mail_preview_first_context_v1"
 
 
@@ -148,6 +150,15 @@ def _extra_context_from_query(query: QueryDict) -> dict[str, str]:
     return extra
 
 
+def _with_extra_context(recipient: dict[str, str], extra_context: dict[str, str]) -> dict[str, str]:
+    merged = dict(recipient)
+    for k, v in extra_context.items():
+        # Do not override recipient-provided values.
+        if k not in merged:
+            merged[k] = v
+    return merged
+
+
 def _apply_extra_context(
     *,
     preview: RecipientPreview | None,
@@ -157,14 +168,7 @@ def _apply_extra_context(
     if not extra_context:
         return preview, recipients
 
-    merged_recipients: list[dict[str, str]] = []
-    for recipient in recipients:
-        merged = dict(recipient)
-        for k, v in extra_context.items():
-            # Do not override recipient-provided values.
-            if k not in merged:
-                merged[k] = v
-        merged_recipients.append(merged)
+    merged_recipients = [_with_extra_context(recipient, extra_context) for recipient in recipients]
 
     base_var_names: list[str]
     if preview is not None and preview.variables:
@@ -221,7 +225,7 @@ def _detect_csv_email_var(var_names: list[str]) -> str | None:
     return None
 
 
-def _parse_csv_upload(file_obj) -> tuple[RecipientPreview, list[dict[str, str]], dict[str, str]]:
+def _mail_batch_from_csv_upload(file_obj, *, created_by: str) -> MailBatch:
     raw = file_obj.read()
     try:
         text = raw.decode("utf-8-sig")
@@ -245,61 +249,74 @@ def _parse_csv_upload(file_obj) -> tuple[RecipientPreview, list[dict[str, str]],
     if email_var is None:
         raise ValueError("CSV must contain an Email column.")
 
-    recipients: list[dict[str, str]] = []
-    for row in dict_reader:
-        ctx: dict[str, str] = {}
-        for header, value in (row or {}).items():
-            if header is None:
-                continue
-            var = header_to_var.get(str(header).strip())
-            if not var:
-                continue
-            ctx[var] = str(value or "").strip()
+    def _rows() -> Iterator[dict[str, str]]:
+        for row in dict_reader:
+            ctx: dict[str, str] = {}
+            for header, value in (row or {}).items():
+                if header is None:
+                    continue
+                var = header_to_var.get(str(header).strip())
+                if not var:
+                    continue
+                ctx[var] = str(value or "").strip()
+
+            if ctx.get(email_var, "").strip():
+                yield ctx
+
+    return create_mail_batch(
+        recipients=_rows(),
+        variables=var_names,
+        source=MailBatch.Source.csv,
+        created_by=created_by,
+    )
 
-        if not ctx.get(email_var, "").strip():
-            continue
-        recipients.append(ctx)
 
-    preview = _preview_from_recipients(recipients=recipients, var_names=var_names)
-    return preview, recipients, header_to_var
+def _preview_from_mail_batch(batch: MailBatch, *, extra_context: dict[str, str]) -> RecipientPreview:
+    var_names = [str(v) for v in batch.variables]
+    for v in extra_context.keys():
+        if v not in var_names:
+            var_names.append(v)
 
+    example_context = _with_extra_context({str(k): str(v) for k, v in batch.example_context.items()}, extra_context)
+    for var in var_names:
+        if not str(example_context.get(var, "") or "").strip():
+            example_context[var] = _variable_placeholder(var)
 
-def _preview_from_csv_session_payload(payload: dict[str, object]) -> tuple[RecipientPreview, list[dict[str, str]]]:
-    recipients_raw = payload.get("recipients")
-    if not isinstance(recipients_raw, list):
-        raise ValueError("Saved CSV recipients are unavailable.")
+    return RecipientPreview(
+        variables=[(v, str(example_context.get(v, ""))) for v in var_names],
+        recipient_count=batch.recipient_count,
+        first_context=example_context,
+    )
 
-    recipients: list[dict[str, str]] = []
-    for item in recipients_raw:
-        if not isinstance(item, dict):
-            continue
-        recipients.append({str(k): str(v or "").strip() for k, v in item.items()})
 
-    if not recipients:
-        preview = RecipientPreview(variables=[], recipient_count=0, first_context={})
-        return preview, recipients
+def _saved_mail_batch(request: HttpRequest) -> MailBatch | None:
+    return get_mail_batch(request.session.get(_MAIL_BATCH_SESSION_KEY))
 
-    first = recipients[0]
 
-    # Preserve variable order if we have a mapping; otherwise show keys from first row.
-    header_to_var_raw = payload.get("header_to_var")
-    if isinstance(header_to_var_raw, dict):
-        ordered_vars = list(header_to_var_raw.values())
-    else:
-        ordered_vars = list(first.keys())
-
-    # De-dup while preserving order.
-    seen: set[str] = set()
-    var_names: list[str] = []
-    for v in ordered_vars:
-        sv = str(v)
-        if not sv or sv in seen:
-            continue
-        seen.add(sv)
-        var_names.append(sv)
+def _mail_batch_page_payload(batch: MailBatch, *, page: int) -> dict[str, object]:
+    paginator = Paginator(range(batch.recipient_count), settings.SEND_MAIL_PREVIEW_PAGE_SIZE)
+    page_obj = paginator.get_page(page)
+    variables = [str(v) for v in batch.variables]
+    # Email first, then a few more columns; credential batches have a dozen variables.
+    columns = ["email", *[v for v in variables if v != "email"]][:4]
+    rows = mail_batch_page(batch=batch, page=page_obj.number, per_page=paginator.per_page)
+    return {
+        "page": page_obj.number,
+        "num_pages": paginator.num_pages,
+        "recipient_count": batch.recipient_count,
+        "columns": columns,
+        "rows": [[str(row.get(c, "")) for c in columns] for row in rows],
+    }
 
-    preview = _preview_from_recipients(recipients=recipients, var_names=var_names)
-    return preview, recipients
+
+def _delete_staged_files(paths: list[str]) -> None:
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except Exception:
+            logger.exception("Send mail failed to delete temp inline image path=%s", path)
 
 
 def _group_select_choices() -> list[tuple[str, str]]:
@@ -518,7 +535,8 @@ def send_mail(request: HttpRequest) -> HttpResponse:
 
     preview: RecipientPreview | None = None
     recipients: list[dict[str, str]] = []
-    header_to_var: dict[str, str] | None = None
+    mail_batch: MailBatch | None = None
+    mail_job: MailJob | None = None
 
     initial: dict[str, object] = {}
     selected_recipient_mode = ""
@@ -565,6 +583,12 @@ def send_mail(request: HttpRequest) -> HttpResponse:
                 initial["user_usernames"] = _parse_username_list(to_raw)
                 deep_link_autoload_recipients = True
 
+        job_id = str(request.GET.get("job") or "").strip()
+        if job_id:
+            mail_job = get_mail_job(job_id)
+            if mail_job is None:
+                messages.error(request, "Mail job not found.")
+
         cc_raw = str(request.GET.get("cc") or "").strip()
         if cc_raw:
             initial["cc"] = cc_raw
@@ -593,21 +617,16 @@ def send_mail(request: HttpRequest) -> HttpResponse:
                     preview, recipients = _preview_for_group(group_cn)
                 elif recipient_mode == SendMailForm.RECIPIENT_MODE_CSV:
                     if csv_file is not None:
-                        preview, recipients, header_to_var = _parse_csv_upload(csv_file)
-                        request.session[_CSV_SESSION_KEY] = json.dumps(
-                            {
-                                "header_to_var": header_to_var,
-                                "recipients": recipients,
-                            }
+                        mail_batch = _mail_batch_from_csv_upload(
+                            csv_file,
+                            created_by=str(request.user.get_username() or "").strip(),
                         )
+                        request.session[_MAIL_BATCH_SESSION_KEY] = str(mail_batch.public_id)
                     else:
-                        raw_payload = request.session.get(_CSV_SESSION_KEY)
-                        if not raw_payload:
+                        mail_batch = _saved_mail_batch(request)
+                        if mail_batch is None:
                             raise ValueError("Upload a CSV.")
-                        payload = json.loads(str(raw_payload))
-                        if not isinstance(payload, dict):
-                            raise ValueError("Upload a CSV.")
-                        preview, recipients = _preview_from_csv_session_payload(payload)
+                    preview = _preview_from_mail_batch(mail_batch, extra_context=posted_extra_context)
                 elif recipient_mode == SendMailForm.RECIPIENT_MODE_MANUAL:
                     if not manual_to:
                         raise ValueError("Add one or more recipient email addresses.")
@@ -622,12 +641,14 @@ def send_mail(request: HttpRequest) -> HttpResponse:
                 messages.error(request, str(e))
                 preview = None
                 recipients = []
+                mail_batch = None
 
-            preview, recipients = _apply_extra_context(
-                preview=preview,
-                recipients=recipients,
-                extra_context=posted_extra_context,
-            )
+            if mail_batch is None:
+                preview, recipients = _apply_extra_context(
+                    preview=preview,
+                    recipients=recipients,
+                    extra_context=posted_extra_context,
+                )
             if preview and preview.first_context:
                 request.session[_PREVIEW_CONTEXT_SESSION_KEY] = json.dumps(preview.first_context)
 
@@ -667,82 +688,40 @@ def send_mail(request: HttpRequest) -> HttpResponse:
                     created_template_id = selected_template.pk
 
             if action == "send":
-                if preview is None or not recipients:
+                if preview is None or not preview.recipient_count:
                     messages.error(request, "No recipients to send to.")
                 else:
                     try:
-                        staged_html_content, staged_files = stage_inline_images_for_sending(html_content)
+                        # Fail before queueing when an inline image is missing; the worker stages its own copies.
+                        _staged_html_content, staged_files = stage_inline_images_for_sending(html_content)
                     except ValueError as exc:
                         messages.error(request, f"Template error: {exc}")
-                        staged_html_content = ""
-                        staged_files = []
-
-                    template_engine = engines["post_office"]
-                    subject_template = template_engine.from_string(subject)
-                    # inline_image tags are HTML-only; avoid rendering them in text.
-                    text_template = template_engine.from_string(preview_drop_inline_image_tags(text_content))
-                    html_template = template_engine.from_string(staged_html_content)
-
-                    sent = 0
-                    failures = 0
-                    try:
-                        for recipient in recipients:
-                            to_email = str(recipient.get("email") or "").strip()
-                            if not to_email:
-                                continue
-                            try:
-                                rendered_subject = subject_template.render(recipient)
-                                rendered_text = text_template.render(recipient)
-                                rendered_html = html_template.render(recipient)
-
-                                email_message = EmailMultiAlternatives(
-                                    rendered_subject,
-                                    rendered_text,
-                                    settings.DEFAULT_FROM_EMAIL,
-                                    [to_email],
-                                    cc=cc,
-                                    bcc=bcc,
-                                )
-                                if rendered_html.strip():
-                                    email_message.attach_alternative(rendered_html, "text/html")
-                                    # Required for django-post-office inline images.
-                                    html_template.attach_related(email_message)
-
-                                email_message.send()
-                                sent += 1
-                            except Exception:
-                                failures += 1
-                                logger.exception("Send mail failed email=%s", to_email)
-                    finally:
-                        for path in staged_files:
-                            try:
-                                os.unlink(path)
-                            except FileNotFoundError:
-                                pass
-                            except Exception:
-                                logger.exception("Send mail failed to delete temp inline image path=%s", path)
-
-                    if sent:
-                        raw_request_id = str(posted_extra_context.get("membership_request_id") or "").strip()
-                        if raw_request_id.isdigit():
-                            mr = MembershipRequest.objects.filter(pk=int(raw_request_id)).first()
-                            if mr is not None:
-                                try:
-                                    add_note(
-                                        membership_request=mr,
-                                        username=str(request.user.get_username() or "").strip(),
-                                        action={"type": "contacted"},
-                                    )
-                                except Exception:
-                                    logger.exception(
-                                        "Send mail contacted-note failed membership_request_id=%s",
-                                        raw_request_id,
-                                    )
-
-                    if sent:
-                        messages.success(request, f"Queued {sent} email{'s' if sent != 1 else ''}.")
-                    if failures:
-                        messages.error(request, f"Failed to queue {failures} email{'s' if failures != 1 else ''}.")
+                    else:
+                        _delete_staged_files(staged_files)
+                        username = str(request.user.get_username() or "").strip()
+                        send_batch = mail_batch
+                        if send_batch is None:
+                            send_batch = create_mail_batch(
+                                recipients=recipients,
+                                variables=[var for var, _example in preview.variables],
+                                source=MailBatch.Source.send_mail,
+                                created_by=username,
+                            )
+                        mail_job = enqueue_mail_job(
+                            batch=send_batch,
+                            subject=subject,
+                            html_content=html_content,
+                            text_content=text_content,
+                            cc=cc,
+                            bcc=bcc,
+                            extra_context=posted_extra_context,
+                            requested_by=username,
+                        )
+                        count = send_batch.recipient_count
+                        messages.success(
+                            request,
+                            f"Sending {count} email{'s' if count != 1 else ''}. Progress is shown below.",
+                        )
 
             # Re-render the page with current field values.
             initial.update(
@@ -802,13 +781,10 @@ def send_mail(request: HttpRequest) -> HttpResponse:
                         raise ValueError("Select one or more users.")
                     preview, recipients = _preview_for_users(usernames)
                 elif recipient_mode == SendMailForm.RECIPIENT_MODE_CSV:
-                    raw_payload = request.session.get(_CSV_SESSION_KEY)
-                    if not raw_payload:
+                    mail_batch = _saved_mail_batch(request)
+                    if mail_batch is None:
                         raise ValueError("Upload a CSV.")
-                    payload = json.loads(str(raw_payload))
-                    if not isinstance(payload, dict):
-                        raise ValueError("Saved CSV recipients are unavailable.")
-                    preview, recipients = _preview_from_csv_session_payload(payload)
+                    preview = _preview_from_mail_batch(mail_batch, extra_context=extra_context)
                 else:
                     preview = None
                     recipients = []
@@ -816,12 +792,14 @@ def send_mail(request: HttpRequest) -> HttpResponse:
                 messages.error(request, str(e))
                 preview = None
                 recipients = []
+                mail_batch = None
 
-            preview, recipients = _apply_extra_context(
-                preview=preview,
-                recipients=recipients,
-                extra_context=extra_context,
-            )
+            if mail_batch is None:
+                preview, recipients = _apply_extra_context(
+                    preview=preview,
+                    recipients=recipients,
+                    extra_context=extra_context,
+                )
 
             if preview and preview.first_context:
                 request.session[_PREVIEW_CONTEXT_SESSION_KEY] = json.dumps(preview.first_context)
@@ -856,10 +834,11 @@ def send_mail(request: HttpRequest) -> HttpResponse:
             "templates": templates,
             "preview": preview,
             "rendered_preview": rendered_preview,
-            "csv_session_key": _CSV_SESSION_KEY,
-            "has_saved_csv_recipients": bool(request.session.get(_CSV_SESSION_KEY)),
+            "has_saved_csv_recipients": bool(request.session.get(_MAIL_BATCH_SESSION_KEY)),
+            "recipient_page": _mail_batch_page_payload(mail_batch, page=1) if mail_batch is not None else None,
             "created_template_id": created_template_id,
             "selected_recipient_mode": selected_recipient_mode,
+            "mail_job": mail_job,
         },
     )
 
@@ -894,3 +873,31 @@ def send_mail_render_preview(request: HttpRequest) -> JsonResponse:
         )
     except ValueError as exc:
         return JsonResponse({"error": f"Template error: {exc}"}, status=400)
+
+
+@require_GET
+@json_permission_required(ASTRA_ADD_SEND_MAIL)
+def send_mail_batch_recipients(request: HttpRequest) -> JsonResponse:
+    mail_batch = _saved_mail_batch(request)
+    if mail_batch is None:
+        return JsonResponse({"error": "Upload a CSV."}, status=404)
+
+    raw_page = str(request.GET.get("page") or "1").strip()
+    page = int(raw_page) if raw_page.isdigit() else 1
+    return JsonResponse(_mail_batch_page_payload(mail_batch, page=page))
+
+
+@require_GET
+@json_permission_required(ASTRA_ADD_SEND_MAIL)
+def send_mail_job_status(request: HttpRequest, job_id: str) -> JsonResponse:
+    mail_job = get_mail_job(job_id)
+    if mail_job is None:
+        return JsonResponse({"error": "Not found."}, status=404)
+    return JsonResponse(mail_job_status(mail_job))
+
+
+@require_GET
+@json_permission_required(ASTRA_ADD_SEND_MAIL)
+def send_mail_template_cache_stats(request: HttpRequest) -> JsonResponse:
+    # Per process: this reports the web worker that answers, not the run_mail_jobs worker.
+    return JsonResponse(compiled_template_cache_stats())
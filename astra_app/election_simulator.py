@@ -3,7 +3,7 @@ from __future__ import annotations
 import random
 import uuid
 
-from core.elections_meek import tally_meek
+from core.elections_meek import explain_meek_rounds, tally_meek
 
 candidates = [
     {"id": 10, "name": "A", "tiebreak_uuid": uuid.UUID("00000000-0000-0000-0000-000000000010")},
@@ -54,15 +54,17 @@ else:
     exclusions = []
 
 result = tally_meek(seats=4, ballots=ballots, candidates=candidates, exclusion_groups=exclusions)
+explanations = explain_meek_rounds(
+    result["rounds"],
+    quota=result["quota"],
+    candidate_name_by_id={c["id"]: c["name"] for c in candidates},
+)
 print("Rounds detail:")
-for round_detail in result["rounds"]:
-    data = round_detail.copy()
-    data.pop("audit_text", None)
-    data.pop("summary_text", None)
-    print(data)
+for round_detail, explanation in zip(result["rounds"], explanations, strict=True):
+    print(round_detail)
     print()
-    # print(round_detail['summary_text'])
-    print(round_detail['audit_text'])
+    # print(explanation['summary_text'])
+    print(explanation['audit_text'])
     print()
     # break
 
@@ -199,6 +199,37 @@ variable "cron_jobs" {
       minute  = "0"
       hour    = "0"
       command = "podman exec astra-app-1 python manage.py membership_operations"
+    },
+    {
+      # Closes elections past their end date and runs queued election jobs
+      # (tallies, credential issuing and emailing). Overlapping runs are safe.
+      name    = "advance-elections"
+      minute  = "*"
+      hour    = "*"
+      command = "podman exec astra-app-1 python manage.py advance_elections"
+    },
+    {
+      # Vote receipts are only queued by the vote page. Until a receipt is sent
+      # its row keeps the ballot nonce, so keep this running while elections are open.
+      name    = "send-vote-receipts"
+      minute  = "*"
+      hour    = "*"
+      command = "podman exec astra-app-1 python manage.py send_vote_receipts"
+    },
+    {
+      # The Send Mail page only queues a job; this sends it while the page polls progress.
+      name    = "run-mail-jobs"
+      minute  = "*"
+      hour    = "*"
+      command = "podman exec astra-app-1 python manage.py run_mail_jobs"
+    },
+    {
+      # Send Mail recipient batches (CSV uploads, credential reminders) hold
+      # names and email addresses; delete them after SEND_MAIL_BATCH_RETENTION_DAYS.
+      name    = "prune-mail-batches"
+      minute  = "30"
+      hour    = "0"
+      command = "podman exec astra-app-1 python manage.py prune_mail_batches"
     }
   ]
 }